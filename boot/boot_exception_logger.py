@@ -1,21 +1,20 @@
 # boot/boot_exception_logger.py
 # Global exception hook that logs uncaught exceptions to both memory and trace.
 # - Uses forward-slash paths
-# - Stores project-relative sources (handled by the loggers)
+# - Stores project-relative sources (core.path_normalizer, cached per source)
 # - Idempotent and recursion-safe
+# - Imported by boot.boot_path_initializer on every start: only sys is imported up front,
+#   traceback/pathlib and the loggers are loaded when an exception actually reaches the hook
 
 from __future__ import annotations
 
 import sys
-import traceback
-from pathlib import Path
-from typing import Optional, Tuple
 
 # We import lazily in the hook to minimize import side-effects, but cache after first call.
-_LOGGERS: Tuple[object, object, object] | None = None  # (log_memory_event, log_trace_event, REQUIRED_PHASE)
+_LOGGERS: tuple[object, object, object] | None = None  # (log_memory_event, log_trace_event, REQUIRED_PHASE)
 
 
-def _load_loggers() -> Tuple[object, object, object]:
+def _load_loggers() -> tuple[object, object, object]:
     global _LOGGERS
     if _LOGGERS is not None:
         return _LOGGERS
@@ -28,7 +27,7 @@ def _load_loggers() -> Tuple[object, object, object]:
 
 
 def _classify_tags(src_path: str) -> list[str]:
-    p = src_path.replace("\\", "/")
+    p = "/" + src_path.replace("\\", "/").lstrip("/")
     tags = ["error"]
     if "/tools/" in p:
         tags.insert(0, "tool")
@@ -48,9 +47,12 @@ def _source_from_tb(tb) -> str:
         while last.tb_next is not None:
             last = last.tb_next
         f = last.tb_frame
-        return Path(f.f_code.co_filename).as_posix()
+        from pathlib import Path
+        from core.path_normalizer import rel_posix  # type: ignore
+        return rel_posix(f.f_code.co_filename) or Path(f.f_code.co_filename).as_posix()
     except Exception:
         # Fallback to argv[0] or this file
+        from pathlib import Path
         return Path(sys.argv[0]).as_posix() if sys.argv and sys.argv[0] else Path(__file__).as_posix()
 
 
@@ -81,6 +83,7 @@ def install_global_exception_hook() -> None:
             tags = _classify_tags(src)
 
             # Short, friendly traceback tail
+            import traceback
             tb_lines = traceback.format_exception(exc_type, exc, tb)
             # Limit lines to keep entries compact
             tail = "".join(tb_lines[-10:]).strip()
@@ -116,6 +119,13 @@ def install_global_exception_hook() -> None:
             except Exception:
                 pass
 
+            # Drain batched memory/trace writes now; the process may be about to die
+            try:
+                from core.log_buffer import flush_all  # type: ignore
+                flush_all()
+            except Exception:
+                pass
+
         finally:
             sys._will_exhook_active = False
             # Preserve original behavior: print the traceback to stderr
@@ -1,36 +1,59 @@
 # boot/boot_path_initializer.py
 # Ensures the project root is on sys.path for reliable imports across tools/reflexes/tests.
 # Also installs a global exception hook so uncaught errors are logged.
+# - Startup path: only os/sys are imported here (no pathlib/typing); the root is located once per
+#   process and exported as WILL_PROJECT_ROOT, so child tools/tests start from the cached location
+# - core.path_normalizer reuses project_root() instead of detecting the root a second time
 
 from __future__ import annotations
 
 import os
 import sys
-from pathlib import Path
-from typing import Optional
 
+ROOT_ENV = "WILL_PROJECT_ROOT"
+_MARKER = os.path.join("configs", "ironroot_manifest_data.json")
 
-def _detect_project_root(start: Optional[Path] = None) -> Path:
+_PROJECT_ROOT: str | None = None
+
+
+def _is_root(p: str) -> bool:
+    return os.path.exists(os.path.join(p, _MARKER)) or (
+        os.path.isdir(os.path.join(p, "boot")) and os.path.isdir(os.path.join(p, "core"))
+    )
+
+
+def _detect_project_root(start: str | None = None) -> str:
     """
     Best-effort detection:
+      0) WILL_PROJECT_ROOT, when this file lives under it and it still looks like a project root
       1) Walk up from this file to find configs/ironroot_manifest_data.json
       2) Else the first parent containing both 'boot' and 'core'
       3) Else CWD
     """
-    here = (start or Path(__file__)).resolve()
-    candidates = [here] + list(here.parents)
-    for p in candidates:
+    cached = os.environ.get(ROOT_ENV)
+    if start is None and cached and __file__.startswith(os.path.join(cached, "")) and _is_root(cached):
+        return cached
+    here = os.path.realpath(start or __file__)
+    p = here
+    while True:
         try:
-            if (p / "configs" / "ironroot_manifest_data.json").exists():
-                return p
-            if (p / "boot").is_dir() and (p / "core").is_dir():
+            if _is_root(p):
                 return p
-        except Exception:
-            continue
-    return Path.cwd().resolve()
+        except OSError:
+            pass
+        parent = os.path.dirname(p)
+        if parent == p:
+            return os.path.realpath(os.getcwd())
+        p = parent
 
 
-_PROJECT_ROOT = _detect_project_root()
+def project_root() -> str:
+    """Resolved project root (detected on first use, then cached for this process and its children)."""
+    global _PROJECT_ROOT
+    if _PROJECT_ROOT is None:
+        _PROJECT_ROOT = _detect_project_root()
+        os.environ.setdefault(ROOT_ENV, _PROJECT_ROOT)
+    return _PROJECT_ROOT
 
 
 def inject_paths() -> None:
@@ -38,11 +61,10 @@ def inject_paths() -> None:
     Prepend the project root to sys.path if missing.
     Always uses forward slashes in debug prints.
     """
-    root = _PROJECT_ROOT
-    root_str = root.as_posix()
+    root = project_root()
     # Avoid duplicates; ensure highest priority
-    if str(root) not in sys.path:
-        sys.path.insert(0, str(root))
+    if root not in sys.path:
+        sys.path.insert(0, root)
     # Optional env normalization: prefer UTF-8 behavior
     os.environ.setdefault("PYTHONUTF8", "1")
 
@@ -1,53 +1,45 @@
 # boot/boot_trace_logger.py
-# Boot trace logging with UTF-8 writes and project-relative paths.
+# Boot trace logging with UTF-8 writes and project-relative paths (core.path_normalizer).
+# The log is rotated into gzip archives by size/age (core.log_rotation); lines are encoded by core.serializer.
+# Records go through a write-through buffer (core.log_buffer), so WILL_LOG_ASYNC=1 moves the
+# write onto the background writer like the memory/trace logs.
+# logs/ is created and core.log_rotation imported on the first write, not at import time.
 
 from __future__ import annotations
 
-import json
 import time
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
-LOG_PATH = Path("logs/boot_trace_log.json")
-LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
+from core import serializer
+from core.log_buffer import get_buffer
+from core.path_normalizer import rel_posix
 
+LOG_PATH = Path("logs/boot_trace_log.json")
 
-def _find_project_root() -> Path:
-    here = Path(__file__).resolve()
-    for p in [here] + list(here.parents):
-        try:
-            if (p / "configs" / "ironroot_manifest_data.json").exists():
-                return p
-            if (p / "boot").is_dir() and (p / "core").is_dir():
-                return p
-        except Exception:
-            continue
-    return Path.cwd().resolve()
 
+def _now_iso() -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
 
-_PROJECT_ROOT = _find_project_root()
-_PROJECT_ROOT_RESOLVED = _PROJECT_ROOT.resolve()
 
+def _write_records(records: List[Dict[str, Any]]) -> None:
+    from core import log_rotation
 
-def _rel_source(value: Optional[str], default_file: str) -> str:
-    raw = (value or default_file).replace("\\", "/")
-    try:
-        p = Path(raw).resolve()
-        return p.relative_to(_PROJECT_ROOT_RESOLVED).as_posix()
-    except Exception:
-        return Path(raw).as_posix()
+    LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with LOG_PATH.open("ab") as f:
+        f.write(serializer.ndjson(records))
+    log_rotation.maybe_rotate(LOG_PATH)
 
 
-def _now_iso() -> str:
-    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+# max_entries=1: synchronous mode still writes each boot event immediately
+_BUFFER = get_buffer("boot", _write_records, max_entries=1)
 
 
 def log_boot_event(event: str, *, source: Optional[str] = None, content: Optional[Dict[str, Any]] = None) -> None:
     rec = {
         "ts": _now_iso(),
         "event": str(event),
-        "source": _rel_source(source, __file__),
+        "source": rel_posix(source, default=__file__),
         "content": content or {},
     }
-    with LOG_PATH.open("a", encoding="utf-8", newline="\n") as f:
-        f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+    _BUFFER.append(rec)
@@ -2,3 +2,22 @@
 
 # Core system module for Will
 # Houses memory engine, manifest DB, SQLite bootstrap, and interface wrappers
+# - Importing the package is free: submodules load on first attribute access (PEP 562),
+#   so `import core` followed by `core.log_index.query(...)` only pays for log_index when it is used
+
+from __future__ import annotations
+
+import importlib
+
+
+def __getattr__(name: str):
+    if name.startswith("_"):
+        raise AttributeError(f"module 'core' has no attribute {name!r}")
+    try:
+        module = importlib.import_module(f"{__name__}.{name}")
+    except ModuleNotFoundError as e:
+        if e.name != f"{__name__}.{name}":
+            raise  # a real missing dependency inside the submodule
+        raise AttributeError(f"module 'core' has no attribute {name!r}") from None
+    globals()[name] = module
+    return module
@@ -0,0 +1,122 @@
+# core/async_runner.py
+# Run many reflex/tool entry points concurrently on one asyncio event loop.
+# - Targets are module paths ("reflexes.reflex_core.reflex_trace_ping"), (module, args) pairs or callables
+# - A module's `async def arun()` is awaited directly on the loop; plain run_cli()/run() callables
+#   are offloaded with asyncio.to_thread (the loop's bounded default executor, not a thread per call)
+# - A module's sync entry point that takes arguments (explicit args, or an argparse module) sees
+#   sys.argv = [module, *args], as with `python -m` (cf. core.step_runner); sys.argv is process-wide,
+#   so those targets hold a lock while they run. Argv-free entry points and plain callables overlap freely
+# - A semaphore caps in-flight targets; every target reports status, result/error and elapsed time
+# - Phase lock is checked once per batch; pending log batches are flushed off-loop at the end
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib
+import inspect
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from core.log_buffer import flush_all
+from core.phase_control import ensure_phase
+
+Target = Union[str, Tuple[str, Sequence[str]], Callable[..., Any]]
+
+DEFAULT_CONCURRENCY: int = 8
+
+_ARGV_LOCK = threading.Lock()
+
+
+def _label(target: Target) -> str:
+    if isinstance(target, str):
+        return target
+    if isinstance(target, tuple):
+        return " ".join([target[0], *target[1]])
+    return getattr(target, "__qualname__", repr(target))
+
+
+def resolve(target: Target) -> Tuple[str, Callable[..., Any]]:
+    """(label, callable) for a target; modules prefer arun(), then run_cli(), then run()."""
+    if callable(target):
+        return _label(target), target
+    module = target[0] if isinstance(target, tuple) else target
+    mod = importlib.import_module(module)
+    fn = getattr(mod, "arun", None) or getattr(mod, "run_cli", None) or getattr(mod, "run", None)
+    if not callable(fn):
+        raise RuntimeError(f"No callable arun/run_cli/run in module: {module}")
+    return _label(target), fn
+
+
+def _reads_argv(fn: Callable[..., Any]) -> bool:
+    """True when fn's module uses argparse, i.e. its entry point parses sys.argv."""
+    mod = sys.modules.get(getattr(fn, "__module__", None) or "")
+    if mod is None:
+        return True  # unknown origin: keep argv isolated
+    return any(v is argparse or v is argparse.ArgumentParser for v in vars(mod).values())
+
+
+def _call_with_argv(fn: Callable[..., Any], argv: List[str], kwargs: Dict[str, Any]) -> Any:
+    """Run fn with its own sys.argv; one argv-swapping target at a time."""
+    with _ARGV_LOCK:
+        saved = sys.argv
+        sys.argv = argv
+        try:
+            return fn(**kwargs)
+        finally:
+            sys.argv = saved
+
+
+async def run_one(target: Target, **kwargs: Any) -> Dict[str, Any]:
+    """Run one target and capture its outcome (exceptions are reported, never raised)."""
+    t0 = time.perf_counter()
+    label = _label(target)
+    try:
+        label, fn = resolve(target)
+        if inspect.iscoroutinefunction(fn):
+            result = await fn(**kwargs)
+        elif callable(target):
+            result = await asyncio.to_thread(fn, **kwargs)
+        else:
+            module, args = target if isinstance(target, tuple) else (target, ())
+            if args or _reads_argv(fn):
+                result = await asyncio.to_thread(_call_with_argv, fn, [module, *args], kwargs)
+            else:
+                result = await asyncio.to_thread(fn, **kwargs)
+        out: Dict[str, Any] = {"target": label, "status": "ok", "result": result}
+    except BaseException as exc:  # SystemExit from CLI entry points included
+        if isinstance(exc, (KeyboardInterrupt, asyncio.CancelledError)):
+            raise
+        out = {"target": label, "status": "error", "error": f"{type(exc).__name__}: {exc}"}
+    out["elapsed_s"] = round(time.perf_counter() - t0, 6)
+    return out
+
+
+async def run_many(
+    targets: Sequence[Target],
+    *,
+    concurrency: Optional[int] = DEFAULT_CONCURRENCY,
+    kwargs: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
+    """Run targets concurrently (at most `concurrency` at once); results keep the input order."""
+    ensure_phase()
+    gate = asyncio.Semaphore(max(1, concurrency or len(targets) or 1))
+
+    async def guarded(t: Target) -> Dict[str, Any]:
+        async with gate:
+            return await run_one(t, **(kwargs or {}))
+
+    try:
+        return list(await asyncio.gather(*(guarded(t) for t in targets)))
+    finally:
+        await asyncio.to_thread(flush_all)
+
+
+def run(targets: Sequence[Target], *, concurrency: Optional[int] = DEFAULT_CONCURRENCY) -> List[Dict[str, Any]]:
+    """Synchronous entry point: a fresh event loop for one batch of targets."""
+    return asyncio.run(run_many(targets, concurrency=concurrency))
+
+
+__all__ = ["resolve", "run_one", "run_many", "run", "DEFAULT_CONCURRENCY"]
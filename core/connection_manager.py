@@ -0,0 +1,190 @@
+# core/connection_manager.py
+# Central SQLite connection manager shared by core, tools and reflexes.
+# - Per-thread cached connections keyed by (db file, read-only flag); small LRU per thread
+# - Tuned pragmas applied once per connection (WAL, synchronous=NORMAL, mmap, cache, busy_timeout)
+# - Read-only connections (mode=ro URI) for query-heavy tools
+# - Counters for opens/reuses; a recreated DB file (new inode) gets a fresh connection
+# - sqlite3 handles stay bound to the thread that opened them (check_same_thread): close_all() and
+#   release() close only the calling thread's connections; other threads' stay open (and counted)
+# - Fork-aware: a child process never reuses (or closes) the parent's handles; it opens its own
+# Callers must not close() pooled connections; use `with conn:` for commit/rollback.
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+PathLike = Union[str, os.PathLike]
+
+# Connections kept per thread before the least recently used one is closed
+MAX_CACHED_PER_THREAD: int = 8
+
+WRITE_PRAGMAS: Tuple[str, ...] = (
+    "PRAGMA journal_mode=WAL;",
+    "PRAGMA synchronous=NORMAL;",
+    "PRAGMA foreign_keys=ON;",
+    "PRAGMA busy_timeout=5000;",
+    "PRAGMA cache_size=-16000;",       # ~16 MiB page cache
+    "PRAGMA mmap_size=268435456;",     # 256 MiB memory-mapped I/O
+    "PRAGMA temp_store=MEMORY;",
+)
+
+READ_PRAGMAS: Tuple[str, ...] = (
+    "PRAGMA busy_timeout=5000;",
+    "PRAGMA cache_size=-16000;",
+    "PRAGMA mmap_size=268435456;",
+    "PRAGMA temp_store=MEMORY;",
+    "PRAGMA query_only=ON;",
+)
+
+_LOCAL = threading.local()
+_STATS_LOCK = threading.Lock()
+_STATS: Dict[str, int] = {"opens": 0, "reuses": 0, "readonly_opens": 0, "readonly_reuses": 0, "evictions": 0}
+_ALL: "Dict[int, Tuple[sqlite3.Connection, int]]" = {}  # id -> (connection, owning thread ident), all threads
+_PID: int = os.getpid()
+_INHERITED: List[Any] = []  # parent's handles seen after a fork: kept referenced so GC never closes them here
+
+
+def _bump(key: str) -> None:
+    with _STATS_LOCK:
+        _STATS[key] += 1
+
+
+def _check_fork() -> None:
+    global _PID
+    if os.getpid() != _PID:  # forked child: the registry lists the parent's handles, not ours
+        _PID = os.getpid()
+        _INHERITED.append(list(_ALL.values()))
+        _ALL.clear()
+
+
+def _cache() -> "OrderedDict[Tuple[str, bool], Tuple[sqlite3.Connection, Optional[Tuple[int, int]]]]":
+    _check_fork()
+    cache = getattr(_LOCAL, "cache", None)
+    if cache is None or getattr(_LOCAL, "pid", None) != _PID:
+        if cache is not None:
+            _INHERITED.append(cache)
+        cache = OrderedDict()
+        _LOCAL.cache, _LOCAL.pid = cache, _PID
+    return cache
+
+
+def _identity(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+        return (st.st_dev, st.st_ino)
+    except OSError:
+        return None
+
+
+def _close_quietly(con: sqlite3.Connection) -> None:
+    try:
+        con.close()
+    except sqlite3.ProgrammingError:
+        return  # not ours to close (another thread's handle): it stays open and counted
+    except Exception:
+        pass
+    _ALL.pop(id(con), None)
+
+
+def _open(path: str, readonly: bool) -> sqlite3.Connection:
+    if readonly:
+        uri = Path(path).resolve().as_uri() + "?mode=ro"
+        con = sqlite3.connect(uri, uri=True)
+        pragmas = READ_PRAGMAS
+    else:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        con = sqlite3.connect(path)
+        pragmas = WRITE_PRAGMAS
+    for stmt in pragmas:
+        con.execute(stmt)
+    _ALL[id(con)] = (con, threading.get_ident())
+    return con
+
+
+def get_connection(db_path: Optional[PathLike] = None, *, readonly: bool = False) -> sqlite3.Connection:
+    """
+    Return this thread's cached connection for db_path (default: DB_PATH).
+    readonly=True opens the file with mode=ro (raises sqlite3.OperationalError if it is missing).
+    """
+    if db_path is None:
+        from core.sqlite_bootstrap import DB_PATH  # local: sqlite_bootstrap itself uses this manager
+        db_path = DB_PATH
+    path = os.fspath(db_path)
+    key = (path, bool(readonly))
+    cache = _cache()
+    hit = cache.get(key)
+    ident = _identity(path)
+    if hit is not None:
+        con, seen = hit
+        if seen is not None and seen == ident:
+            cache.move_to_end(key)
+            _bump("readonly_reuses" if readonly else "reuses")
+            return con
+        # File was replaced or removed underneath us: drop the stale handle
+        del cache[key]
+        _close_quietly(con)
+
+    con = _open(path, readonly)
+    _bump("readonly_opens" if readonly else "opens")
+    cache[key] = (con, _identity(path))
+    while len(cache) > MAX_CACHED_PER_THREAD:
+        _, (old, _) = cache.popitem(last=False)
+        _close_quietly(old)
+        _bump("evictions")
+    return con
+
+
+def read_connection(db_path: Optional[PathLike] = None) -> sqlite3.Connection:
+    """Read-only pooled connection (query_only, mode=ro) for audit/query tools."""
+    return get_connection(db_path, readonly=True)
+
+
+def release(db_path: PathLike) -> None:
+    """Close this thread's cached connections for one file (e.g. a finished snapshot copy)."""
+    path = os.fspath(db_path)
+    cache = _cache()
+    for key in [k for k in cache if k[0] == path]:
+        con, _ = cache.pop(key)
+        _close_quietly(con)
+
+
+def close_all() -> None:
+    """
+    Close every pooled connection opened by the calling thread and reset its cache.
+    Connections of other threads cannot be closed from here (sqlite3 binds them to their
+    thread); they stay open, are still counted by stats()["open_now"], and are closed by
+    close_all() in their own thread.
+    """
+    _check_fork()
+    me = threading.get_ident()
+    for con, owner in list(_ALL.values()):
+        if owner == me:
+            _close_quietly(con)
+    _cache().clear()
+
+
+def stats() -> Dict[str, Any]:
+    _check_fork()
+    with _STATS_LOCK:
+        out: Dict[str, Any] = dict(_STATS)
+    me = threading.get_ident()
+    out["open_now"] = len(_ALL)
+    out["open_other_threads"] = sum(1 for _, owner in list(_ALL.values()) if owner != me)
+    return out
+
+
+__all__ = [
+    "get_connection",
+    "read_connection",
+    "release",
+    "close_all",
+    "stats",
+    "WRITE_PRAGMAS",
+    "READ_PRAGMAS",
+    "MAX_CACHED_PER_THREAD",
+]
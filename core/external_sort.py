@@ -0,0 +1,76 @@
+# core/external_sort.py
+# Bounded-memory sort for large record streams (used by core.log_alignment).
+# - Items are collected in chunks of at most chunk_size, each chunk sorted and spilled to a temp run file
+# - The runs are k-way merged with heapq.merge; only one item per run is held in memory while merging
+# - Streams that fit in a single chunk never touch the disk
+# - Items must be picklable and mutually comparable under key (tuples of str/int/float are the intended use)
+
+from __future__ import annotations
+
+import heapq
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, List, Optional
+
+DEFAULT_CHUNK_SIZE: int = 200_000
+# Items per pickled block in a run file (the merge holds one block per run)
+_BLOCK: int = 1024
+
+
+def _spill(chunk: List[Any], directory: Path, n: int) -> Path:
+    path = directory / f"run-{n:05d}.pkl"
+    with path.open("wb") as f:
+        for i in range(0, len(chunk), _BLOCK):
+            pickle.dump(chunk[i:i + _BLOCK], f, protocol=pickle.HIGHEST_PROTOCOL)
+    return path
+
+
+def _read_run(path: Path) -> Iterator[Any]:
+    with path.open("rb") as f:
+        while True:
+            try:
+                block = pickle.load(f)
+            except EOFError:
+                return
+            yield from block
+
+
+def sorted_stream(
+    items: Iterable[Any],
+    *,
+    key: Optional[Callable[[Any], Any]] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    tmp_dir: Optional[Path] = None,
+    stats: Optional[dict] = None,
+) -> Iterator[Any]:
+    """
+    Yield items in sorted order holding at most chunk_size of them in memory.
+    Run files live in a private temp directory removed when the generator finishes or is closed.
+    stats (optional dict) receives "items" and "runs".
+    """
+    chunk_size = max(1, int(chunk_size))
+    chunk: List[Any] = []
+    with tempfile.TemporaryDirectory(prefix="will-xsort-", dir=tmp_dir) as tmp:
+        runs: List[Path] = []
+        count = 0
+        for item in items:
+            chunk.append(item)
+            count += 1
+            if len(chunk) >= chunk_size:
+                chunk.sort(key=key)
+                runs.append(_spill(chunk, Path(tmp), len(runs)))
+                chunk = []
+        chunk.sort(key=key)
+        if stats is not None:
+            stats.update(items=count, runs=len(runs) + (1 if chunk else 0))
+        if not runs:
+            yield from chunk
+            return
+        if chunk:
+            runs.append(_spill(chunk, Path(tmp), len(runs)))
+            chunk = []
+        yield from heapq.merge(*(_read_run(p) for p in runs), key=key)
+
+
+__all__ = ["sorted_stream", "DEFAULT_CHUNK_SIZE"]
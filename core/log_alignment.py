@@ -0,0 +1,149 @@
+# core/log_alignment.py
+# Streaming sort-merge join of memory and trace events (tools/trace_memory_alignment.py).
+# - Join key: (run_id, source, normalized event name); two events align when their timestamps are
+#   within `tolerance` seconds. Within a key, events pair greedily in time order (two pointers).
+# - Each track is projected to small tuples and externally sorted (core.external_sort), so memory is
+#   bounded by the chunk size no matter how long the history is
+# - Unmatched events whose key exists on the other side are "misaligned" (reported with the skew to the
+#   nearest counterpart); the rest are plain one-sided events (e.g. start logged only to memory)
+
+from __future__ import annotations
+
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+from core.external_sort import DEFAULT_CHUNK_SIZE, sorted_stream
+from core.log_columnar import ts_epoch
+
+DEFAULT_TOLERANCE_S: float = 2.0
+
+# (run_id, source, name, epoch seconds, ts)
+Row = Tuple[str, str, str, int, str]
+Report = Callable[[Dict[str, Any]], None]
+
+_WS = re.compile(r"\s+")
+_DETAIL = re.compile(r"\s+(?:—|-|:|\|)\s+.*$")  # "tool done — details" -> "tool done"
+
+
+def normalize_name(text: Any) -> str:
+    """Lower-case event name with whitespace collapsed and any trailing " — detail" dropped."""
+    name = _WS.sub(" ", str(text or "")).strip().lower()
+    return _DETAIL.sub("", name)
+
+
+def _run_id(rec: Dict[str, Any]) -> str:
+    rid = rec.get("run_id")
+    if rid is None and isinstance(rec.get("content"), dict):
+        rid = rec["content"].get("run_id")
+    return str(rid) if rid is not None else ""
+
+
+def project(records: Iterable[Dict[str, Any]], *, run_id: Optional[str] = None) -> Iterator[Row]:
+    """Join rows for memory entries (message) or trace records (description)."""
+    for rec in records:
+        rid = _run_id(rec)
+        if run_id is not None and rid != run_id:
+            continue
+        ts = rec.get("ts") or ""
+        name = rec.get("message") or rec.get("event_text") or rec.get("description") or ""
+        yield (rid, str(rec.get("source") or ""), normalize_name(name), ts_epoch(ts), ts)
+
+
+def _row(r: Row) -> Dict[str, Any]:
+    return {"run_id": r[0] or None, "source": r[1], "name": r[2], "ts": r[4]}
+
+
+def merge_join(
+    memory: Iterable[Row],
+    trace: Iterable[Row],
+    *,
+    tolerance: float = DEFAULT_TOLERANCE_S,
+    on_misaligned: Optional[Report] = None,
+) -> Dict[str, Any]:
+    """Join two row streams sorted by (run_id, source, name, epoch); returns alignment statistics."""
+    mi, ti = iter(memory), iter(trace)
+    m, t = next(mi, None), next(ti, None)
+    stats: Dict[str, Any] = {
+        "memory_events": 0, "trace_events": 0, "aligned": 0,
+        "memory_unmatched": 0, "trace_unmatched": 0, "misaligned": 0,
+        "max_skew_s": 0, "skew_histogram": Counter(),
+    }
+    unmatched_names: Counter = Counter()
+    skew_total = 0
+    last_m: Optional[Row] = None  # last consumed row per side, for "nearest counterpart" reports
+    last_t: Optional[Row] = None
+
+    def unmatched(side: str, row: Row, head: Optional[Row], last: Optional[Row]) -> None:
+        stats[f"{side}_unmatched"] += 1
+        unmatched_names[(side, row[2])] += 1
+        near = head if head is not None and head[:3] == row[:3] else (last if last is not None and last[:3] == row[:3] else None)
+        if near is None:
+            return
+        stats["misaligned"] += 1
+        if on_misaligned is not None:
+            on_misaligned({"side": side, "event": _row(row), "nearest": _row(near), "skew_s": near[3] - row[3]})
+
+    while m is not None or t is not None:
+        if t is None or (m is not None and m[:3] < t[:3]):
+            stats["memory_events"] += 1
+            unmatched("memory", m, t, last_t)
+            last_m, m = m, next(mi, None)
+        elif m is None or t[:3] < m[:3]:
+            stats["trace_events"] += 1
+            unmatched("trace", t, m, last_m)
+            last_t, t = t, next(ti, None)
+        else:
+            skew = t[3] - m[3]
+            if abs(skew) <= tolerance:
+                stats["memory_events"] += 1
+                stats["trace_events"] += 1
+                stats["aligned"] += 1
+                skew_total += abs(skew)
+                stats["max_skew_s"] = max(stats["max_skew_s"], abs(skew))
+                stats["skew_histogram"][abs(skew)] += 1
+                last_m, m = m, next(mi, None)
+                last_t, t = t, next(ti, None)
+            elif skew > 0:  # memory event is too early for this trace event
+                stats["memory_events"] += 1
+                unmatched("memory", m, t, last_t)
+                last_m, m = m, next(mi, None)
+            else:
+                stats["trace_events"] += 1
+                unmatched("trace", t, m, last_m)
+                last_t, t = t, next(ti, None)
+
+    total = stats["memory_events"] + stats["trace_events"]
+    stats["aligned_rate"] = round(2 * stats["aligned"] / total, 6) if total else 1.0
+    stats["mean_skew_s"] = round(skew_total / stats["aligned"], 6) if stats["aligned"] else 0.0
+    stats["skew_histogram"] = {str(k): v for k, v in sorted(stats["skew_histogram"].items())}
+    stats["top_unmatched"] = [
+        {"side": side, "name": name, "count": n} for (side, name), n in unmatched_names.most_common(20)
+    ]
+    return stats
+
+
+def align(
+    memory_records: Iterable[Dict[str, Any]],
+    trace_records: Iterable[Dict[str, Any]],
+    *,
+    tolerance: float = DEFAULT_TOLERANCE_S,
+    run_id: Optional[str] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    tmp_dir: Optional[Path] = None,
+    on_misaligned: Optional[Report] = None,
+) -> Dict[str, Any]:
+    """Externally sort both tracks, then merge-join them; sort run counts are included in the stats."""
+    sort_stats: Dict[str, Dict[str, int]] = {"memory": {}, "trace": {}}
+    mem = sorted_stream(project(memory_records, run_id=run_id), chunk_size=chunk_size, tmp_dir=tmp_dir,
+                        stats=sort_stats["memory"])
+    trc = sorted_stream(project(trace_records, run_id=run_id), chunk_size=chunk_size, tmp_dir=tmp_dir,
+                        stats=sort_stats["trace"])
+    stats = merge_join(mem, trc, tolerance=tolerance, on_misaligned=on_misaligned)
+    stats["sort"] = sort_stats
+    stats["tolerance_s"] = tolerance
+    return stats
+
+
+__all__ = ["DEFAULT_TOLERANCE_S", "normalize_name", "project", "merge_join", "align"]
@@ -0,0 +1,202 @@
+# core/log_async.py
+# Opt-in asynchronous log pipeline behind core.log_buffer (WILL_LOG_ASYNC=1).
+# - Callers enqueue (buffer, entry) into one bounded queue and return immediately
+# - A single daemon writer thread drains the queue, groups entries per buffer (order preserved)
+#   and hands each group to that buffer's flush callback as one batch
+# - Backpressure when the queue is full (WILL_LOG_ASYNC_POLICY):
+#     block        caller waits for space (default; nothing is lost)
+#     drop-oldest  the oldest queued entry is discarded to make room
+#     sample       1 in WILL_LOG_ASYNC_SAMPLE new entries is admitted (evicting the oldest), the rest dropped
+# - Every drop, wait and failed batch is counted (stats()); drain() waits for the writer to catch up
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+ASYNC_ENV = "WILL_LOG_ASYNC"
+QUEUE_ENV = "WILL_LOG_ASYNC_QUEUE"
+POLICY_ENV = "WILL_LOG_ASYNC_POLICY"
+SAMPLE_ENV = "WILL_LOG_ASYNC_SAMPLE"
+
+DEFAULT_QUEUE_SIZE: int = 10000
+DEFAULT_SAMPLE_EVERY: int = 10
+POLICIES = ("block", "drop-oldest", "sample")
+BATCH_MAX: int = 512
+
+WriteFn = Callable[[List[Any]], None]
+Item = Tuple[str, WriteFn, Any]
+
+
+def enabled() -> bool:
+    return (os.environ.get(ASYNC_ENV) or "").strip().lower() in {"1", "on", "true", "yes"}
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.environ.get(name) or default))
+    except ValueError:
+        return default
+
+
+def _policy() -> str:
+    val = (os.environ.get(POLICY_ENV) or "block").strip().lower()
+    return val if val in POLICIES else "block"
+
+
+class AsyncWriter:
+    """Bounded queue plus one background writer thread."""
+
+    def __init__(self, *, maxsize: Optional[int] = None, policy: Optional[str] = None,
+                 sample_every: Optional[int] = None) -> None:
+        self.maxsize = maxsize or _env_int(QUEUE_ENV, DEFAULT_QUEUE_SIZE)
+        self.policy = policy or _policy()
+        self.sample_every = sample_every or _env_int(SAMPLE_ENV, DEFAULT_SAMPLE_EVERY)
+        self._queue: Deque[Item] = deque()
+        self._cond = threading.Condition()
+        self._busy = False
+        self._stop = False
+        self._thread: Optional[threading.Thread] = None
+        self._pid = os.getpid()
+        self._seen_full = 0
+        self.counters: Dict[str, int] = {
+            "enqueued": 0, "written": 0, "batches": 0, "blocked": 0,
+            "dropped_oldest": 0, "dropped_sampled": 0, "write_errors": 0, "max_depth": 0,
+        }
+        self.last_error: Optional[str] = None
+
+    # ---------- producer side ----------
+
+    def submit(self, key: str, write: WriteFn, entry: Any) -> bool:
+        """Queue one entry; returns False when backpressure dropped it."""
+        with self._cond:
+            self._ensure_thread()
+            if len(self._queue) >= self.maxsize and threading.current_thread() is not self._thread:
+                if self.policy == "block":
+                    self.counters["blocked"] += 1
+                    while len(self._queue) >= self.maxsize and not self._stop:
+                        self._cond.wait(0.1)
+                elif self.policy == "sample":
+                    self._seen_full += 1
+                    if self._seen_full % self.sample_every:
+                        self.counters["dropped_sampled"] += 1
+                        return False
+                    self._queue.popleft()
+                    self.counters["dropped_oldest"] += 1
+                else:
+                    self._queue.popleft()
+                    self.counters["dropped_oldest"] += 1
+            self._queue.append((key, write, entry))
+            self.counters["enqueued"] += 1
+            self.counters["max_depth"] = max(self.counters["max_depth"], len(self._queue))
+            self._cond.notify_all()
+            return True
+
+    def drain(self, timeout: Optional[float] = 10.0) -> bool:
+        """Block until everything queued so far is written (or timeout); True when idle."""
+        if threading.current_thread() is self._thread:
+            return True  # a flush callback logging from the writer itself must not wait on itself
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            if self._thread is None or not self._thread.is_alive():
+                self._write_inline()
+                return True
+            while self._queue or self._busy:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining if remaining is not None else 0.1)
+            return True
+
+    def depth(self) -> int:
+        return len(self._queue)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            out: Dict[str, Any] = dict(self.counters)
+            out.update(enabled=True, depth=len(self._queue), policy=self.policy, maxsize=self.maxsize, last_error=self.last_error)
+            return out
+
+    def stop(self, timeout: float = 10.0) -> None:
+        self.drain(timeout)
+        with self._cond:
+            self._stop = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    # ---------- writer side ----------
+
+    def _ensure_thread(self) -> None:
+        if os.getpid() != self._pid:  # forked child: the parent's thread does not exist here
+            self._pid, self._thread, self._busy = os.getpid(), None, False
+        if self._thread is None or not self._thread.is_alive():
+            self._stop = False
+            self._thread = threading.Thread(target=self._run, name="will-log-writer", daemon=True)
+            self._thread.start()
+
+    def _take(self) -> List[Item]:
+        n = min(len(self._queue), BATCH_MAX)
+        return [self._queue.popleft() for _ in range(n)]
+
+    def _write(self, items: List[Item]) -> None:
+        groups: Dict[str, Tuple[WriteFn, List[Any]]] = {}
+        for key, write, entry in items:
+            groups.setdefault(key, (write, []))[1].append(entry)
+        for key, (write, batch) in groups.items():
+            try:
+                write(batch)
+                self.counters["written"] += len(batch)
+                self.counters["batches"] += 1
+            except Exception as exc:  # never kill the writer; the batch is counted as lost
+                self.counters["write_errors"] += 1
+                self.last_error = f"{key}: {exc!r}"
+
+    def _write_inline(self) -> None:
+        # Called with the lock held when no writer thread is running (e.g. at interpreter exit)
+        while self._queue:
+            self._write(self._take())
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._queue and not self._stop:
+                    self._cond.wait()
+                if not self._queue and self._stop:
+                    return
+                items = self._take()
+                self._busy = True
+                self._cond.notify_all()  # wake blocked producers
+            try:
+                self._write(items)
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+
+_WRITER: Optional[AsyncWriter] = None
+_WRITER_LOCK = threading.Lock()
+
+
+def writer() -> AsyncWriter:
+    """Process-wide writer, configured from the environment on first use."""
+    global _WRITER
+    with _WRITER_LOCK:
+        if _WRITER is None:
+            _WRITER = AsyncWriter()
+        return _WRITER
+
+
+def drain(timeout: Optional[float] = 10.0) -> bool:
+    return _WRITER.drain(timeout) if _WRITER is not None else True
+
+
+def stats() -> Dict[str, Any]:
+    return _WRITER.stats() if _WRITER is not None else {"enabled": enabled()}
+
+
+__all__ = ["AsyncWriter", "enabled", "writer", "drain", "stats", "POLICIES", "DEFAULT_QUEUE_SIZE"]
@@ -0,0 +1,172 @@
+# core/log_buffer.py
+# Process-wide batching for memory/trace log writes.
+# - The hot path is a list append; entries are flushed as one batch when a buffer
+#   reaches its size/age threshold, on explicit flush()/flush_all(), inside
+#   batched() blocks on exit, at interpreter exit (atexit), and from the crash hook
+# - Each buffer owns a flush callback that writes a whole batch in one go
+# - WILL_LOG_BUFFER=0 (or "off") switches every buffer to write-through
+# - WILL_LOG_ASYNC=1 hands entries to the background writer instead (core.log_async);
+#   flush()/flush_all() then wait for the writer to drain
+
+from __future__ import annotations
+
+import atexit
+import contextlib
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List
+
+from core import log_async
+
+DEFAULT_MAX_ENTRIES: int = 256
+DEFAULT_MAX_AGE_S: float = 2.0
+BUFFER_ENV = "WILL_LOG_BUFFER"
+
+FlushFn = Callable[[List[Any]], None]
+
+_REGISTRY: Dict[str, "LogBuffer"] = {}
+_REGISTRY_LOCK = threading.Lock()
+_HOLD = 0  # >0 while inside batched(): age threshold is ignored, size threshold still applies
+
+
+def _write_through() -> bool:
+    return (os.environ.get(BUFFER_ENV) or "").strip().lower() in {"0", "off", "false", "no"}
+
+
+def _async() -> bool:
+    # Explicit write-through wins: the caller asked for entries on disk before append() returns
+    return log_async.enabled() and not _write_through()
+
+
+class LogBuffer:
+    """
+    In-memory batch of pending log entries with a single flush callback.
+    Order is preserved across threads: appends and flushes share one lock.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        flush_fn: FlushFn,
+        *,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_age: float = DEFAULT_MAX_AGE_S,
+    ) -> None:
+        self.name = name
+        self.max_entries = max(1, int(max_entries))
+        self.max_age = float(max_age)
+        self._flush_fn = flush_fn
+        self._entries: List[Any] = []
+        self._first_at: float = 0.0
+        self._lock = threading.RLock()
+
+    @property
+    def pending(self) -> int:
+        return len(self._entries)
+
+    def append(self, entry: Any) -> None:
+        if self.offer(entry):
+            self.flush()
+
+    def offer(self, entry: Any) -> bool:
+        """
+        Add entry without writing; returns True when a flush is now due.
+        Lets asyncio callers (alog_* helpers) run the flush off the event loop.
+        """
+        if _async():
+            log_async.writer().submit(self.name, self._flush_fn, entry)
+            return False
+        with self._lock:
+            if not self._entries:
+                self._first_at = time.monotonic()
+            self._entries.append(entry)
+            return (
+                _write_through()
+                or len(self._entries) >= self.max_entries
+                or (_HOLD == 0 and time.monotonic() - self._first_at >= self.max_age)
+            )
+
+    def flush(self) -> int:
+        """Write all pending entries through the callback. On failure the batch is kept and the error re-raised."""
+        log_async.drain()
+        with self._lock:
+            if not self._entries:
+                return 0
+            batch, self._entries = self._entries, []
+            try:
+                self._flush_fn(batch)
+            except Exception:
+                self._entries = batch + self._entries
+                raise
+            return len(batch)
+
+
+def get_buffer(
+    name: str,
+    flush_fn: FlushFn,
+    *,
+    max_entries: int = DEFAULT_MAX_ENTRIES,
+    max_age: float = DEFAULT_MAX_AGE_S,
+) -> LogBuffer:
+    """Return the process-wide buffer registered under name, creating it on first use."""
+    with _REGISTRY_LOCK:
+        buf = _REGISTRY.get(name)
+        if buf is None:
+            buf = LogBuffer(name, flush_fn, max_entries=max_entries, max_age=max_age)
+            _REGISTRY[name] = buf
+        return buf
+
+
+def flush_all(*, raise_errors: bool = False) -> int:
+    """
+    Flush every registered buffer; returns the number of entries written.
+    Errors are swallowed by default so exit/crash paths never block on logging.
+    """
+    total = 0
+    with _REGISTRY_LOCK:
+        buffers = list(_REGISTRY.values())
+    for buf in buffers:
+        try:
+            total += buf.flush()
+        except Exception:
+            if raise_errors:
+                raise
+    return total
+
+
+def pending_counts() -> Dict[str, int]:
+    with _REGISTRY_LOCK:
+        return {name: buf.pending for name, buf in _REGISTRY.items()}
+
+
+@contextlib.contextmanager
+def batched() -> Iterator[None]:
+    """
+    Group a burst of log calls: age-based flushes are deferred for the duration
+    of the block and everything pending is flushed on exit.
+    """
+    global _HOLD
+    with _REGISTRY_LOCK:
+        _HOLD += 1
+    try:
+        yield
+    finally:
+        with _REGISTRY_LOCK:
+            _HOLD -= 1
+        flush_all()
+
+
+# Drain on normal interpreter exit (including after an uncaught exception)
+atexit.register(flush_all)
+
+
+__all__ = [
+    "LogBuffer",
+    "get_buffer",
+    "flush_all",
+    "pending_counts",
+    "batched",
+    "DEFAULT_MAX_ENTRIES",
+    "DEFAULT_MAX_AGE_S",
+]
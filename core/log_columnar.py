@@ -0,0 +1,422 @@
+# core/log_columnar.py
+# Columnar parts for sealed log data, plus vectorized group-by counts for full-history reports.
+# - compact(key, sources): each sealed memory segment / rotated gzip archive becomes one immutable part
+#   under logs/columnar/<log>/<origin>.npz (or .parquet when pyarrow is installed; WILL_COLUMNAR_FORMAT)
+# - Columns: ts (int64 epoch s), phase (float64), source / event_type (int32 dictionary codes) and
+#   tags as CSR lists (tag_offsets int64 + tag_codes int32); dictionaries and provenance live in meta.json
+# - .npz parts are written with the stdlib (standard .npy members), so numpy is only needed to speed up reads
+# - group_count(): bincount over the codes (numpy when available, collections.Counter otherwise); files that
+#   have no matching part (active segment, live trace file, archives not compacted yet) are parsed on the fly
+# - A part covers its source only while origin and first/last ts still match, so a wiped/recycled log is
+#   never answered from stale parts
+
+from __future__ import annotations
+
+import ast
+import calendar
+import io
+import json
+import math
+import os
+import struct
+import sys
+import zipfile
+from array import array
+from collections import Counter
+from itertools import compress
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from core import log_rotation
+from core.log_reader import iter_records
+
+try:  # optional accelerators
+    import numpy as _np  # type: ignore
+except ImportError:  # pragma: no cover - depends on the environment
+    _np = None
+
+try:
+    import pyarrow as _pa  # type: ignore
+    import pyarrow.parquet as _pq  # type: ignore
+except ImportError:  # pragma: no cover - depends on the environment
+    _pa = _pq = None
+
+COLUMNAR_DIR = Path("logs/columnar")
+FORMAT_ENV = "WILL_COLUMNAR_FORMAT"
+FORMATS = ("npz", "parquet")
+GROUP_BY = ("tag", "source", "event_type", "phase")
+PART_VERSION = 1
+
+PathLike = Union[str, os.PathLike]
+Record = Dict[str, Any]
+Columns = Dict[str, Any]
+
+_DICT_COLUMNS = ("source", "event_type", "tag")
+_DTYPES = {"ts": ("<i8", "q"), "phase": ("<f8", "d"), "source": ("<i4", "i"), "event_type": ("<i4", "i"),
+           "tag_offsets": ("<i8", "q"), "tag_codes": ("<i4", "i")}
+_TYPECODES = {descr: code for descr, code in _DTYPES.values()}
+_NPY_MAGIC = b"\x93NUMPY\x01\x00"
+
+
+def part_format() -> str:
+    """Format for new parts: parquet only when requested/auto and pyarrow is importable."""
+    val = (os.environ.get(FORMAT_ENV) or "auto").strip().lower()
+    if val == "npz" or _pq is None:
+        return "npz"
+    return "parquet"
+
+
+# ---------- records -> columns ----------
+
+_EPOCH_CACHE: Dict[str, int] = {}
+
+
+def ts_epoch(ts: Any) -> int:
+    """ISO-8601 "YYYY-MM-DDTHH:MM:SSZ" -> epoch seconds (-1 when missing/unparseable); memoized."""
+    if not isinstance(ts, str):
+        return -1
+    hit = _EPOCH_CACHE.get(ts)
+    if hit is None:
+        try:
+            hit = calendar.timegm((int(ts[0:4]), int(ts[5:7]), int(ts[8:10]),
+                                   int(ts[11:13]), int(ts[14:16]), int(ts[17:19]), 0, 0, 0))
+        except (ValueError, IndexError):
+            hit = -1
+        if len(_EPOCH_CACHE) > 100000:
+            _EPOCH_CACHE.clear()
+        _EPOCH_CACHE[ts] = hit
+    return hit
+
+
+def _phase(value: Any) -> float:
+    try:
+        return float(value) if value is not None else math.nan
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def to_columns(records: Iterable[Record]) -> Tuple[Columns, Dict[str, List[str]]]:
+    """Dictionary-encode records into typed columns; returns (columns, dictionaries)."""
+    cols: Columns = {name: array(code) for name, (_, code) in _DTYPES.items()}
+    cols["tag_offsets"].append(0)
+    codes: Dict[str, Dict[str, int]] = {name: {} for name in _DICT_COLUMNS}
+    first = last = None
+
+    def code(kind: str, value: Any) -> int:
+        if value is None or value == "":
+            return -1
+        table = codes[kind]
+        key = str(value)
+        c = table.get(key)
+        if c is None:
+            c = table[key] = len(table)
+        return c
+
+    for rec in records:
+        ts = rec.get("ts")
+        if isinstance(ts, str):
+            first = first or ts
+            last = ts
+        cols["ts"].append(ts_epoch(ts))
+        cols["phase"].append(_phase(rec.get("phase")))
+        cols["source"].append(code("source", rec.get("source")))
+        cols["event_type"].append(code("event_type", rec.get("event_type")))
+        tags = rec.get("tags") if isinstance(rec.get("tags"), list) else []
+        cols["tag_codes"].extend(code("tag", t) for t in tags)
+        cols["tag_offsets"].append(len(cols["tag_codes"]))
+    dicts = {name: list(table) for name, table in codes.items()}
+    cols["_first_ts"], cols["_last_ts"] = first, last
+    return cols, dicts
+
+
+# ---------- .npy / .npz (stdlib writer and fallback reader) ----------
+
+def _npy_bytes(values: array, descr: str) -> bytes:
+    header = "{'descr': '%s', 'fortran_order': False, 'shape': (%d,), }" % (descr, len(values))
+    pad = 64 - (len(_NPY_MAGIC) + 2 + len(header) + 1) % 64
+    header = header + " " * (pad % 64) + "\n"
+    body = values
+    if sys.byteorder == "big":
+        body = array(values.typecode, values)
+        body.byteswap()
+    return _NPY_MAGIC + struct.pack("<H", len(header)) + header.encode("latin1") + body.tobytes()
+
+
+def _npy_array(data: bytes) -> array:
+    if not data.startswith(_NPY_MAGIC):
+        raise ValueError("not a version 1.0 .npy member")
+    (hlen,) = struct.unpack("<H", data[8:10])
+    header = ast.literal_eval(data[10:10 + hlen].decode("latin1"))
+    out = array(_TYPECODES[header["descr"]])
+    out.frombytes(data[10 + hlen:])
+    if sys.byteorder == "big":
+        out.byteswap()
+    return out
+
+
+def _write_npz(dest: Path, cols: Columns, meta: Dict[str, Any]) -> None:
+    tmp = dest.with_name(dest.name + ".tmp")
+    with zipfile.ZipFile(tmp, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for name, (descr, _) in _DTYPES.items():
+            zf.writestr(f"{name}.npy", _npy_bytes(cols[name], descr))
+        zf.writestr("meta.json", json.dumps(meta, ensure_ascii=False))
+    os.replace(tmp, dest)
+
+
+def _read_npz(path: Path) -> Tuple[Columns, Dict[str, Any]]:
+    with zipfile.ZipFile(path) as zf:
+        meta = json.loads(zf.read("meta.json"))
+        if _np is not None:
+            cols = {name: _np.load(io.BytesIO(zf.read(f"{name}.npy")), allow_pickle=False) for name in _DTYPES}
+        else:
+            cols = {name: _npy_array(zf.read(f"{name}.npy")) for name in _DTYPES}
+    return cols, meta
+
+
+# ---------- parquet (pyarrow only) ----------
+
+def _write_parquet(dest: Path, cols: Columns, meta: Dict[str, Any]) -> None:
+    tags = _pa.ListArray.from_arrays(
+        _pa.array(list(cols["tag_offsets"]), _pa.int64()).cast(_pa.int32()),
+        _pa.array(list(cols["tag_codes"]), _pa.int32()),
+    )
+    table = _pa.table({
+        "ts": _pa.array(list(cols["ts"]), _pa.int64()),
+        "phase": _pa.array(list(cols["phase"]), _pa.float64()),
+        "source": _pa.array(list(cols["source"]), _pa.int32()),
+        "event_type": _pa.array(list(cols["event_type"]), _pa.int32()),
+        "tags": tags,
+    }).replace_schema_metadata({"will": json.dumps(meta, ensure_ascii=False)})
+    tmp = dest.with_name(dest.name + ".tmp")
+    _pq.write_table(table, tmp, compression="zstd")
+    os.replace(tmp, dest)
+
+
+def _read_parquet(path: Path) -> Tuple[Columns, Dict[str, Any]]:
+    table = _pq.read_table(path)
+    meta = json.loads(table.schema.metadata[b"will"])
+    tags = table.column("tags").combine_chunks()
+    cols = {name: table.column(name).to_numpy() if _np is not None else table.column(name).to_pylist()
+            for name in ("ts", "phase", "source", "event_type")}
+    offsets, values = tags.offsets, tags.values
+    cols["tag_offsets"] = offsets.to_numpy() if _np is not None else offsets.to_pylist()
+    cols["tag_codes"] = values.to_numpy() if _np is not None else values.to_pylist()
+    return cols, meta
+
+
+# ---------- parts ----------
+
+def _part_dir(key: str, root: Optional[Path]) -> Path:
+    return Path(root or COLUMNAR_DIR) / log_rotation.archive_slug(key)
+
+
+def origin_of(path: PathLike) -> str:
+    """Stable identity of a source: segment stem (live or archived), else the file name."""
+    name = Path(path).name
+    if name.endswith(".gz"):
+        stem = name.split(".", 1)[0]
+        return stem if stem.startswith("segment-") else name
+    return Path(name).stem if name.startswith("segment-") else name
+
+
+def parts(key: str, *, root: Optional[Path] = None) -> Dict[str, Dict[str, Any]]:
+    """origin -> {"path", "first_ts", "last_ts", "records"} for every part of one log."""
+    out: Dict[str, Dict[str, Any]] = {}
+    d = _part_dir(key, root)
+    if not d.exists():
+        return out
+    for p in sorted(d.iterdir()):
+        if p.suffix not in (".npz", ".parquet"):
+            continue
+        try:
+            if p.suffix == ".parquet":
+                meta = json.loads(_pq.read_schema(p).metadata[b"will"])
+            else:
+                with zipfile.ZipFile(p) as zf:
+                    meta = json.loads(zf.read("meta.json"))
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+            continue
+        out[meta["origin"]] = dict(meta, path=p.as_posix())
+    return out
+
+
+def _read_part(path: Path) -> Tuple[Columns, Dict[str, Any]]:
+    return _read_parquet(path) if path.suffix == ".parquet" else _read_npz(path)
+
+
+def _records_of(path: Path) -> Iterator[Record]:
+    return log_rotation.iter_archive(path) if path.name.endswith(".gz") else iter_records(path)
+
+
+def sources(key: str, sealed: Sequence[Dict[str, Any]] = (), *, base_dir: Optional[Path] = None) -> List[Dict[str, Any]]:
+    """
+    Immutable inputs for one log: sealed segment entries (with base_dir) plus its rotated archives.
+    Each item is {"path", "origin", "first_ts", "last_ts"}.
+    """
+    out = []
+    for e in sealed:
+        path = Path(base_dir or key) / e["name"]
+        if path.exists():
+            out.append({"path": path.as_posix(), "origin": origin_of(path),
+                        "first_ts": e.get("first_ts"), "last_ts": e.get("last_ts")})
+    for e in log_rotation.archives_for(key):
+        out.append({"path": e["path"], "origin": origin_of(e["path"]),
+                    "first_ts": e.get("first_ts"), "last_ts": e.get("last_ts")})
+    return out
+
+
+def _covered(part: Optional[Dict[str, Any]], src: Dict[str, Any]) -> bool:
+    return part is not None and part.get("first_ts") == src.get("first_ts") and part.get("last_ts") == src.get("last_ts")
+
+
+def compact(
+    key: str,
+    inputs: Sequence[Dict[str, Any]],
+    *,
+    root: Optional[Path] = None,
+    fmt: Optional[str] = None,
+) -> List[Path]:
+    """Write a part for every input (see sources()) that has no current part; returns new part paths."""
+    fmt = fmt or part_format()
+    existing = parts(key, root=root)
+    d = _part_dir(key, root)
+    written: List[Path] = []
+    for src in inputs:
+        if _covered(existing.get(src["origin"]), src):
+            continue
+        cols, dicts = to_columns(_records_of(Path(src["path"])))
+        meta = {
+            "version": PART_VERSION,
+            "log": key,
+            "origin": src["origin"],
+            "source_file": src["path"],
+            "first_ts": src.get("first_ts") or cols["_first_ts"],
+            "last_ts": src.get("last_ts") or cols["_last_ts"],
+            "records": len(cols["ts"]),
+            "dictionaries": dicts,
+        }
+        d.mkdir(parents=True, exist_ok=True)
+        stale = existing.get(src["origin"])
+        dest = d / f"{src['origin']}.{fmt}"
+        (_write_parquet if fmt == "parquet" else _write_npz)(dest, cols, meta)
+        if stale and Path(stale["path"]) != dest:
+            Path(stale["path"]).unlink(missing_ok=True)
+        written.append(dest)
+    return written
+
+
+# ---------- group-by ----------
+
+def _label(by: str, value: Any) -> str:
+    return repr(float(value)) if by == "phase" else str(value)
+
+
+def _count_numpy(cols: Columns, names: List[str], by: str, lo: Optional[int], hi: Optional[int]) -> Dict[str, int]:
+    ts = _np.asarray(cols["ts"])
+    mask = None
+    if lo is not None:
+        mask = ts >= lo
+    if hi is not None:
+        mask = (ts <= hi) if mask is None else (mask & (ts <= hi))
+    if by == "phase":
+        ph = _np.asarray(cols["phase"], dtype=_np.float64)
+        ph = ph[mask] if mask is not None else ph
+        vals, counts = _np.unique(ph[~_np.isnan(ph)], return_counts=True)
+        return {_label(by, v): int(c) for v, c in zip(vals.tolist(), counts.tolist())}
+    if by == "tag":
+        codes = _np.asarray(cols["tag_codes"], dtype=_np.int64)
+        if mask is not None:
+            codes = codes[_np.repeat(mask, _np.diff(_np.asarray(cols["tag_offsets"])))]
+    else:
+        codes = _np.asarray(cols[by], dtype=_np.int64)
+        codes = codes[mask] if mask is not None else codes
+    codes = codes[codes >= 0]
+    counts = _np.bincount(codes, minlength=len(names)) if len(codes) else _np.zeros(len(names), dtype=_np.int64)
+    return {names[i]: int(c) for i, c in enumerate(counts.tolist()) if c}
+
+
+def _count_stdlib(cols: Columns, names: List[str], by: str, lo: Optional[int], hi: Optional[int]) -> Dict[str, int]:
+    mask = None
+    if lo is not None or hi is not None:
+        lo_, hi_ = lo or 0, (hi if hi is not None else float("inf"))
+        mask = [lo_ <= t <= hi_ for t in cols["ts"]]
+    if by == "phase":
+        vals = cols["phase"] if mask is None else compress(cols["phase"], mask)
+        return {_label(by, v): n for v, n in Counter(v for v in vals if v == v).items()}
+    if by == "tag":
+        codes: Iterable[int] = cols["tag_codes"]
+        if mask is not None:
+            off = cols["tag_offsets"]
+            codes = [c for i, keep in enumerate(mask) if keep for c in cols["tag_codes"][off[i]:off[i + 1]]]
+    else:
+        codes = cols[by] if mask is None else compress(cols[by], mask)
+    return {names[c]: n for c, n in Counter(codes).items() if c >= 0}
+
+
+def _count(cols: Columns, dicts: Dict[str, List[str]], by: str, lo: Optional[int], hi: Optional[int]) -> Dict[str, int]:
+    names = dicts.get(by, []) if by != "phase" else []
+    if lo is not None or hi is not None:
+        lo = max(lo or 0, 0)  # rows without a ts (-1) never match a time range
+    fn = _count_numpy if _np is not None else _count_stdlib
+    return fn(cols, names, by, lo, hi)
+
+
+def group_count(
+    key: str,
+    by: str = "tag",
+    *,
+    live: Sequence[PathLike] = (),
+    sealed: Sequence[Dict[str, Any]] = (),
+    base_dir: Optional[Path] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    root: Optional[Path] = None,
+) -> Dict[str, int]:
+    """
+    Full-history counts of one log grouped by tag/source/event_type/phase (inclusive ISO range).
+    Sealed inputs with a current part are answered from the part; live files and anything
+    not compacted yet are parsed. Missing values are not counted.
+    """
+    if by not in GROUP_BY:
+        raise ValueError(f"group-by must be one of {GROUP_BY}, got {by!r}")
+    lo = ts_epoch(since) if since else None
+    hi = ts_epoch(until) if until else None
+    have = parts(key, root=root)
+    total: Counter = Counter()
+    done: set = set()  # origins already counted (a live sealed segment and its archive hold the same records)
+    for src in sources(key, sealed, base_dir=base_dir):
+        if src["origin"] in done:
+            continue
+        done.add(src["origin"])
+        part = have.get(src["origin"])
+        if _covered(part, src):
+            if since and part.get("last_ts") and part["last_ts"] < since:
+                continue
+            if until and part.get("first_ts") and part["first_ts"] > until:
+                continue
+            cols, meta = _read_part(Path(part["path"]))
+            total.update(_count(cols, meta["dictionaries"], by, lo, hi))
+        else:
+            cols, dicts = to_columns(_records_of(Path(src["path"])))
+            total.update(_count(cols, dicts, by, lo, hi))
+    for path in live:
+        if origin_of(path) in done:
+            continue
+        cols, dicts = to_columns(_records_of(Path(path)))
+        total.update(_count(cols, dicts, by, lo, hi))
+    return dict(total.most_common())
+
+
+__all__ = [
+    "COLUMNAR_DIR",
+    "FORMATS",
+    "GROUP_BY",
+    "part_format",
+    "ts_epoch",
+    "to_columns",
+    "origin_of",
+    "sources",
+    "parts",
+    "compact",
+    "group_count",
+]
@@ -0,0 +1,192 @@
+# core/log_db_sink.py
+# SQLite sink for the memory/trace log tracks (memory_events / trace_events).
+# - Pooled per-thread connection from core.connection_manager; writes serialized by a lock
+# - Batches land via executemany inside a single transaction
+# - Sink selection: WILL_LOG_SINK = "file" (default) | "both" | "db"; the DB is opt-in
+# - Logging never changes the schema: the sink requires a bootstrapped DB (python -m core.sqlite_bootstrap
+#   or tools.db_migrate) and raises SinkSchemaError otherwise, so the log buffer keeps the batch
+# - forced_mode("file") pins the sink for a block (tools that must not write the DB they inspect)
+# - run_id (the record's top-level field, resolved at log time) goes into an indexed column
+
+from __future__ import annotations
+
+import contextlib
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, Iterator, Iterable, List, Optional, Set, Tuple
+
+from core import serializer
+from core.connection_manager import get_connection, release
+from core.sqlite_bootstrap import DB_PATH
+
+SINK_ENV = "WILL_LOG_SINK"
+DEFAULT_SINK = "file"
+_SINKS = {"both", "db", "file"}
+
+# Columns the INSERTs below write (migrations m0001 + m0002)
+REQUIRED_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    "memory_events": ("ts", "tag", "payload", "message", "run_id"),
+    "trace_events": ("ts", "level", "tag", "message", "context", "run_id"),
+}
+
+_LOCK = threading.Lock()
+_READY: Set[Tuple[str, int, int]] = set()  # DB files (path, st_dev, st_ino) whose event tables were checked
+_FORCED: List[str] = []  # forced_mode() stack; the innermost mode wins over WILL_LOG_SINK
+
+
+class SinkSchemaError(RuntimeError):
+    """Raised when will_data.db is missing or lacks the event tables/columns the sink writes."""
+
+
+def sink_mode() -> str:
+    if _FORCED:
+        return _FORCED[-1]
+    val = (os.environ.get(SINK_ENV) or DEFAULT_SINK).strip().lower()
+    return val if val in _SINKS else DEFAULT_SINK
+
+
+def writes_db() -> bool:
+    return sink_mode() in {"both", "db"}
+
+
+def writes_file() -> bool:
+    return sink_mode() in {"both", "file"}
+
+
+@contextlib.contextmanager
+def forced_mode(mode: str) -> Iterator[None]:
+    """
+    Use `mode` for every log write in the block, whatever WILL_LOG_SINK says.
+    Everything pending when the block ends (including entries buffered before it)
+    is flushed before the override is lifted.
+    """
+    from core.log_buffer import flush_all
+
+    if mode not in _SINKS:
+        raise ValueError(f"unknown log sink: {mode!r}")
+    _FORCED.append(mode)
+    try:
+        yield
+    finally:
+        try:
+            flush_all()
+        finally:
+            _FORCED.pop()
+
+
+def _schema_problems(con: sqlite3.Connection) -> List[str]:
+    problems: List[str] = []
+    for table, cols in REQUIRED_COLUMNS.items():
+        have = {r[1] for r in con.execute(f"PRAGMA table_info({table})")}
+        if not have:
+            problems.append(f"{table} missing")
+        else:
+            problems += [f"{table}.{c} missing" for c in cols if c not in have]
+    return problems
+
+
+def _conn() -> sqlite3.Connection:
+    """This thread's connection to a DB whose event tables are in place (checked once per DB file)."""
+    try:
+        st = os.stat(DB_PATH)
+    except OSError:
+        raise SinkSchemaError(f"{DB_PATH.as_posix()} does not exist; bootstrap it before enabling the DB log sink")
+    key = (DB_PATH.as_posix(), st.st_dev, st.st_ino)
+    con = get_connection(DB_PATH)
+    if key not in _READY:
+        problems = _schema_problems(con)
+        if problems:
+            raise SinkSchemaError(
+                "will_data.db is not migrated for the log sink (" + "; ".join(problems) + "); run python -m tools.db_migrate"
+            )
+        _READY.add(key)
+    return con
+
+
+def close() -> None:
+    """Release this thread's sink connection (reopened lazily on the next write)."""
+    with _LOCK:
+        release(DB_PATH)
+
+
+def _run_id_of(record: Dict[str, Any]) -> Optional[str]:
+    return str(record["run_id"]) if record.get("run_id") is not None else None
+
+
+def _tag_of(tags: Any) -> str:
+    return ",".join(str(t) for t in (tags or []))
+
+
+def _json(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    return serializer.dumps(value, default=str)
+
+
+def _executemany(sql: str, rows: List[Tuple[Any, ...]]) -> int:
+    if not rows:
+        return 0
+    with _LOCK:
+        con = _conn()
+        with con:  # one transaction per batch
+            con.executemany(sql, rows)
+    return len(rows)
+
+
+def memory_rows(entries: Iterable[Dict[str, Any]]) -> Iterator[Tuple[Any, ...]]:
+    """memory_events rows (REQUIRED_COLUMNS order) for memory entries as built by core.memory_interface."""
+    for e in entries:
+        yield (
+            e.get("ts"),
+            _tag_of(e.get("tags")),
+            _json(e),
+            e.get("message") or e.get("event_text"),
+            _run_id_of(e),
+        )
+
+
+def trace_rows(records: Iterable[Dict[str, Any]]) -> Iterator[Tuple[Any, ...]]:
+    """trace_events rows (REQUIRED_COLUMNS order) for trace records as built by core.trace_logger."""
+    for r in records:
+        tags = r.get("tags") or []
+        yield (
+            r.get("ts"),
+            "error" if "error" in tags else "info",
+            _tag_of(tags),
+            r.get("description"),
+            _json(r.get("content")),
+            _run_id_of(r),
+        )
+
+
+def insert_sql(table: str) -> str:
+    cols = REQUIRED_COLUMNS[table]
+    return f"INSERT INTO {table} ({', '.join(cols)}) VALUES ({', '.join('?' for _ in cols)})"
+
+
+def write_memory_events(entries: Iterable[Dict[str, Any]]) -> int:
+    """Insert memory entries (as built by core.memory_interface) into memory_events."""
+    return _executemany(insert_sql("memory_events"), list(memory_rows(entries)))
+
+
+def write_trace_events(records: Iterable[Dict[str, Any]]) -> int:
+    """Insert trace records (as built by core.trace_logger) into trace_events."""
+    return _executemany(insert_sql("trace_events"), list(trace_rows(records)))
+
+
+__all__ = [
+    "sink_mode",
+    "writes_db",
+    "writes_file",
+    "forced_mode",
+    "memory_rows",
+    "trace_rows",
+    "insert_sql",
+    "write_memory_events",
+    "write_trace_events",
+    "close",
+    "DEFAULT_SINK",
+    "REQUIRED_COLUMNS",
+    "SinkSchemaError",
+]
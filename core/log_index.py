@@ -0,0 +1,312 @@
+# core/log_index.py
+# Persistent tag/time index over the NDJSON log files (trace log + memory segments).
+# - Sidecar SQLite file logs/log_index.db: tag -> (file, byte offset), hourly bucket -> (file, offset),
+#   run_id -> (file, offset) (top-level run_id field, else content.run_id)
+# - Writers call note_append(path) after each batch; only the bytes past the indexed high-water
+#   mark are parsed, so maintenance is O(batch). WILL_LOG_INDEX=0 skips write-time maintenance.
+# - Queries catch the index up first (covers files written with indexing off, or by older code),
+#   then read only the matching lines via core.log_reader.records_at; time-bounded queries that
+#   reach back past the live files also read the matching gzip archives (core.log_rotation)
+# - The index is derived data: a replaced/truncated log file is simply re-indexed from offset 0;
+#   inserts are idempotent, so two processes catching up the same bytes is harmless
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from core.connection_manager import get_connection
+from core.log_reader import is_ndjson, iter_records, records_at, tail
+from core.log_rotation import archived_records
+
+INDEX_PATH = Path("logs/log_index.db")
+INDEX_ENV = "WILL_LOG_INDEX"
+
+PathLike = Union[str, os.PathLike]
+Record = Dict[str, Any]
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS log_index_files (file TEXT PRIMARY KEY, inode INTEGER, indexed_bytes INTEGER NOT NULL);",
+    "CREATE TABLE IF NOT EXISTS log_index_records (file TEXT NOT NULL, offset INTEGER NOT NULL, bucket TEXT, "
+    "PRIMARY KEY (file, offset)) WITHOUT ROWID;",
+    "CREATE INDEX IF NOT EXISTS idx_log_index_records_bucket ON log_index_records(bucket, file, offset);",
+    "CREATE TABLE IF NOT EXISTS log_index_tags (tag TEXT NOT NULL, file TEXT NOT NULL, offset INTEGER NOT NULL, "
+    "PRIMARY KEY (tag, file, offset)) WITHOUT ROWID;",
+    "CREATE TABLE IF NOT EXISTS log_index_runs (run_id TEXT NOT NULL, file TEXT NOT NULL, offset INTEGER NOT NULL, "
+    "PRIMARY KEY (run_id, file, offset)) WITHOUT ROWID;",
+)
+_TABLES = ("log_index_files", "log_index_records", "log_index_tags", "log_index_runs")
+# Bumped when the index layout changes; an older index is dropped and rebuilt (it is derived data)
+SCHEMA_VERSION = 2
+
+_READY: set = set()  # (index path, inode) whose schema exists
+_LOCK = threading.RLock()
+
+
+def enabled() -> bool:
+    return (os.environ.get(INDEX_ENV) or "").strip().lower() not in {"0", "off", "false", "no"}
+
+
+def _key(path: PathLike) -> str:
+    return Path(path).as_posix()
+
+
+def _conn(index_path: Optional[Path] = None) -> sqlite3.Connection:
+    index_path = Path(index_path or INDEX_PATH)
+    con = get_connection(index_path)
+    ident = (index_path.as_posix(), os.stat(index_path).st_ino)
+    if ident not in _READY:
+        with con:
+            if con.execute("PRAGMA user_version;").fetchone()[0] < SCHEMA_VERSION:
+                for table in _TABLES:
+                    con.execute(f"DROP TABLE IF EXISTS {table};")
+            for stmt in _SCHEMA:
+                con.execute(stmt)
+            con.execute(f"PRAGMA user_version = {SCHEMA_VERSION};")
+        _READY.add(ident)
+    return con
+
+
+def _bucket(ts: Any) -> Optional[str]:
+    # ISO-8601 "YYYY-MM-DDTHH:MM:SSZ" -> "YYYY-MM-DDTHH"
+    return ts[:13] if isinstance(ts, str) and len(ts) >= 13 else None
+
+
+def _run_id(rec: Record) -> Optional[str]:
+    rid = rec.get("run_id")
+    if rid is None and isinstance(rec.get("content"), dict):
+        rid = rec["content"].get("run_id")
+    return str(rid) if rid is not None else None
+
+
+def _scan(path: Path, start: int) -> Tuple[List[Tuple[int, Optional[str], List[str], Optional[str]]], int]:
+    """(offset, bucket, tags, run_id) for each complete line from start; returns the new high-water mark."""
+    rows: List[Tuple[int, Optional[str], List[str], Optional[str]]] = []
+    with path.open("rb") as f:
+        f.seek(start)
+        pos = start
+        for line in f:
+            if not line.endswith(b"\n"):
+                break  # partial line still being written; picked up next time
+            if line.strip():
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    rec = None
+                if isinstance(rec, dict):
+                    tags = rec.get("tags") if isinstance(rec.get("tags"), list) else []
+                    rows.append((pos, _bucket(rec.get("ts")), [str(t) for t in tags], _run_id(rec)))
+            pos += len(line)
+    return rows, pos
+
+
+def catch_up(path: PathLike, *, index_path: Optional[Path] = None) -> int:
+    """Index whatever was appended to path since the last call; returns records added."""
+    path = Path(path)
+    try:
+        st = os.stat(path)
+    except OSError:
+        return 0
+    key = _key(path)
+    with _LOCK:
+        con = _conn(index_path)
+        row = con.execute("SELECT inode, indexed_bytes FROM log_index_files WHERE file = ?;", (key,)).fetchone()
+        start = 0
+        if row is not None:
+            inode, indexed = row
+            if inode == st.st_ino and indexed <= st.st_size:
+                if indexed == st.st_size:
+                    return 0
+                start = indexed
+        if start == 0 and not is_ndjson(path):
+            return 0  # legacy JSON array: not offset-addressable, queries scan it instead
+        rows, hwm = _scan(path, start)
+        with con:
+            if start == 0:
+                for table in _TABLES[1:]:
+                    con.execute(f"DELETE FROM {table} WHERE file = ?;", (key,))
+            con.executemany(
+                "INSERT OR REPLACE INTO log_index_records (file, offset, bucket) VALUES (?, ?, ?);",
+                [(key, off, bucket) for off, bucket, _, _ in rows],
+            )
+            con.executemany(
+                "INSERT OR IGNORE INTO log_index_tags (tag, file, offset) VALUES (?, ?, ?);",
+                [(tag, key, off) for off, _, tags, _ in rows for tag in tags],
+            )
+            con.executemany(
+                "INSERT OR IGNORE INTO log_index_runs (run_id, file, offset) VALUES (?, ?, ?);",
+                [(rid, key, off) for off, _, _, rid in rows if rid is not None],
+            )
+            con.execute(
+                "INSERT OR REPLACE INTO log_index_files (file, inode, indexed_bytes) VALUES (?, ?, ?);",
+                (key, st.st_ino, hwm),
+            )
+        return len(rows)
+
+
+def forget(path: PathLike, *, index_path: Optional[Path] = None) -> None:
+    """Drop a rotated/archived file from the index."""
+    key = _key(path)
+    try:
+        with _LOCK:
+            con = _conn(index_path)
+            with con:
+                for table in _TABLES:
+                    con.execute(f"DELETE FROM {table} WHERE file = ?;", (key,))
+    except (OSError, sqlite3.Error):
+        pass
+
+
+def note_append(path: PathLike) -> None:
+    """Write-path hook: keep the index current. Never raises; queries repair any gap."""
+    if not enabled():
+        return
+    try:
+        catch_up(path)
+    except (OSError, sqlite3.Error):
+        pass
+
+
+def _offsets(
+    con: sqlite3.Connection,
+    key: str,
+    tag: Optional[str],
+    since: Optional[str],
+    until: Optional[str],
+    limit: Optional[int],
+    run_id: Optional[str] = None,
+) -> List[int]:
+    joins: List[str] = []
+    params: List[Any] = []
+    if tag is not None:
+        joins.append("JOIN log_index_tags t ON t.file = r.file AND t.offset = r.offset AND t.tag = ?")
+        params.append(tag)
+    if run_id is not None:
+        joins.append("JOIN log_index_runs u ON u.file = r.file AND u.offset = r.offset AND u.run_id = ?")
+        params.append(run_id)
+    where = ["r.file = ?"]
+    params.append(key)
+    if since:
+        where.append("r.bucket >= ?")
+        params.append(since[:13])
+    if until:
+        where.append("r.bucket <= ?")
+        params.append(until[:13])
+    sql = f"SELECT r.offset FROM log_index_records r {' '.join(joins)} WHERE " + " AND ".join(where)
+    sql += " ORDER BY r.offset DESC" if limit else " ORDER BY r.offset"
+    return [r[0] for r in con.execute(sql, params).fetchall()]
+
+
+def query(
+    paths: Union[PathLike, Sequence[PathLike]],
+    *,
+    tag: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    limit: Optional[int] = None,
+    index_path: Optional[Path] = None,
+    run_id: Optional[str] = None,
+) -> List[Record]:
+    """
+    Records (oldest-first, across paths in the given order) matching tag, run_id and the
+    inclusive ISO timestamp range; limit keeps only the newest N matches.
+    Only index hits are parsed; legacy JSON-array files fall back to a scan.
+    With since/until, rotated archives overlapping the range are included.
+    """
+    files = [Path(paths)] if isinstance(paths, (str, os.PathLike)) else [Path(p) for p in paths]
+    limit = limit if limit and limit > 0 else None
+
+    def match(rec: Record) -> bool:
+        ts = rec.get("ts") or ""
+        return (
+            (tag is None or tag in (rec.get("tags") or []))
+            and (run_id is None or _run_id(rec) == run_id)
+            and (not since or ts >= since)
+            and (not until or ts <= until)
+        )
+
+    if tag is None and run_id is None and not since and not until:
+        if len(files) == 1:
+            return tail(files[0], limit)
+        return _collect(files, limit, lambda p, n: tail(p, n))
+
+    def fetch(path: Path, n: Optional[int]) -> List[Record]:
+        if not is_ndjson(path):
+            return tail(path, n, predicate=match)
+        catch_up(path, index_path=index_path)
+        with _LOCK:
+            offsets = _offsets(_conn(index_path), _key(path), tag, since, until, n, run_id)
+        if n:
+            found: List[Record] = []
+            for rec in records_at(path, offsets):  # newest first
+                if match(rec):
+                    found.append(rec)
+                    if len(found) >= n:
+                        break
+            found.reverse()
+            return found
+        return [rec for rec in records_at(path, offsets) if match(rec)]
+
+    live = _collect(files, limit, fetch)
+    keep = limit - len(live) if limit else None
+    if keep is None or keep > 0:
+        older = archived_records(files, since=since, until=until, predicate=match)
+        live = (older[-keep:] if keep else older) + live
+    return live
+
+
+def _collect(files: List[Path], limit: Optional[int], fetch) -> List[Record]:
+    if not limit:
+        return [rec for p in files for rec in fetch(p, None)]
+    out: List[List[Record]] = []
+    need = limit
+    for p in reversed(files):  # newest file first until limit is satisfied
+        got = fetch(p, need)
+        out.append(got)
+        need -= len(got)
+        if need <= 0:
+            break
+    return [rec for chunk in reversed(out) for rec in chunk]
+
+
+def count(paths: Union[PathLike, Sequence[PathLike]], *, tag: Optional[str] = None,
+          index_path: Optional[Path] = None) -> int:
+    """Number of records (optionally with tag) answered from the index without parsing the logs."""
+    files = [Path(paths)] if isinstance(paths, (str, os.PathLike)) else [Path(p) for p in paths]
+    total = 0
+    for path in files:
+        if not is_ndjson(path):
+            total += sum(1 for r in iter_records(path) if tag is None or tag in (r.get("tags") or []))
+            continue
+        catch_up(path, index_path=index_path)
+        with _LOCK:
+            con = _conn(index_path)
+            if tag is None:
+                sql, params = "SELECT count(*) FROM log_index_records WHERE file = ?;", (_key(path),)
+            else:
+                sql, params = "SELECT count(*) FROM log_index_tags WHERE file = ? AND tag = ?;", (_key(path), tag)
+            total += int(con.execute(sql, params).fetchone()[0])
+    return total
+
+
+def tag_counts(paths: Iterable[PathLike], *, index_path: Optional[Path] = None) -> Dict[str, int]:
+    """Tag -> record count across paths (indexed NDJSON files only)."""
+    out: Dict[str, int] = {}
+    for path in paths:
+        if not is_ndjson(Path(path)):
+            continue
+        catch_up(path, index_path=index_path)
+        with _LOCK:
+            rows = _conn(index_path).execute(
+                "SELECT tag, count(*) FROM log_index_tags WHERE file = ? GROUP BY tag;", (_key(path),)
+            ).fetchall()
+        for tag, n in rows:
+            out[tag] = out.get(tag, 0) + int(n)
+    return out
+
+
+__all__ = ["INDEX_PATH", "enabled", "catch_up", "forget", "note_append", "query", "count", "tag_counts"]
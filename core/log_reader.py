@@ -0,0 +1,178 @@
+# core/log_reader.py
+# Shared reader for the NDJSON log files (logs/reflex_trace_log.json, boot trace, memory segments).
+# - The file is mmapped; records are parsed lazily, one line at a time, oldest-first
+# - tail() seeks backwards from the end of the map, so `--limit N` parses ~N lines, not the file
+# - Legacy layout: a file whose first byte is "[" is a single JSON array and is loaded whole
+# - Malformed lines are skipped by readers and reported by is_valid()
+
+from __future__ import annotations
+
+import json
+import mmap
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+Record = Dict[str, Any]
+Predicate = Callable[[Record], bool]
+
+
+@contextmanager
+def _mapped(path: Path) -> Iterator[Optional[mmap.mmap]]:
+    """Read-only map of path; None when the file is missing or empty (mmap rejects size 0)."""
+    try:
+        f = Path(path).open("rb")
+    except FileNotFoundError:
+        yield None
+        return
+    with f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            yield None
+            return
+        try:
+            yield mm
+        finally:
+            mm.close()
+
+
+def _first_byte(mm: mmap.mmap) -> bytes:
+    """First non-whitespace byte of the map (b"" when the file is all whitespace)."""
+    pos, size = 0, len(mm)
+    while pos < size and mm[pos:pos + 1] in (b" ", b"\t", b"\r", b"\n"):
+        pos += 1
+    return mm[pos:pos + 1]
+
+
+def _parse(line: bytes) -> Optional[Record]:
+    if not line.strip():
+        return None
+    try:
+        obj = json.loads(line)
+    except ValueError:
+        return None
+    return obj if isinstance(obj, dict) else None
+
+
+def _legacy_array(mm: mmap.mmap) -> List[Record]:
+    try:
+        data = json.loads(mm[:])
+    except ValueError:
+        return []
+    if isinstance(data, dict):
+        return [data]
+    return [r for r in data if isinstance(r, dict)] if isinstance(data, list) else []
+
+
+def iter_records(path: Path, *, predicate: Optional[Predicate] = None) -> Iterator[Record]:
+    """Yield records oldest-first; lines are decoded only as the caller advances."""
+    with _mapped(path) as mm:
+        if mm is None:
+            return
+        if _first_byte(mm) == b"[":
+            for rec in _legacy_array(mm):
+                if predicate is None or predicate(rec):
+                    yield rec
+            return
+        pos, size = 0, len(mm)
+        while pos < size:
+            end = mm.find(b"\n", pos)
+            if end < 0:
+                end = size
+            rec = _parse(mm[pos:end])
+            pos = end + 1
+            if rec is not None and (predicate is None or predicate(rec)):
+                yield rec
+
+
+def iter_reverse(path: Path, *, predicate: Optional[Predicate] = None) -> Iterator[Record]:
+    """Yield records newest-first by scanning line breaks backwards from the end of the file."""
+    with _mapped(path) as mm:
+        if mm is None:
+            return
+        if _first_byte(mm) == b"[":
+            for rec in reversed(_legacy_array(mm)):
+                if predicate is None or predicate(rec):
+                    yield rec
+            return
+        end = len(mm)
+        while end > 0:
+            start = mm.rfind(b"\n", 0, end - 1) + 1 if end > 1 else 0
+            rec = _parse(mm[start:end])
+            end = start
+            if rec is not None and (predicate is None or predicate(rec)):
+                yield rec
+
+
+def tail(path: Path, limit: Optional[int], *, predicate: Optional[Predicate] = None) -> List[Record]:
+    """The last `limit` matching records in file order; limit None/<=0 means all of them."""
+    if not limit or limit <= 0:
+        return list(iter_records(path, predicate=predicate))
+    out: List[Record] = []
+    for rec in iter_reverse(path, predicate=predicate):
+        out.append(rec)
+        if len(out) >= limit:
+            break
+    out.reverse()
+    return out
+
+
+def records_at(path: Path, offsets: Iterable[int]) -> Iterator[Record]:
+    """Parse the lines starting at the given byte offsets (as recorded by core.log_index)."""
+    with _mapped(path) as mm:
+        if mm is None:
+            return
+        size = len(mm)
+        for off in offsets:
+            if off < 0 or off >= size:
+                continue
+            end = mm.find(b"\n", off)
+            rec = _parse(mm[off:end if end >= 0 else size])
+            if rec is not None:
+                yield rec
+
+
+def is_ndjson(path: Path) -> bool:
+    """False for a legacy single-array file (and for missing/empty files)."""
+    with _mapped(path) as mm:
+        return mm is not None and _first_byte(mm) not in (b"[", b"")
+
+
+def count_records(path: Path) -> int:
+    return sum(1 for _ in iter_records(path))
+
+
+def is_valid(path: Path) -> bool:
+    """
+    True when every non-blank line is JSON (or the whole file is one JSON document).
+    A missing file is invalid; an empty one is valid.
+    """
+    if not Path(path).exists():
+        return False
+    with _mapped(path) as mm:
+        if mm is None:
+            return True
+        pos, size = 0, len(mm)
+        while pos < size:
+            end = mm.find(b"\n", pos)
+            if end < 0:
+                end = size
+            line = mm[pos:end]
+            pos = end + 1
+            if not line.strip():
+                continue
+            try:
+                json.loads(line)
+            except ValueError:
+                break
+        else:
+            return True
+        try:  # legacy pretty-printed array/object
+            json.loads(mm[:])
+            return True
+        except ValueError:
+            return False
+
+
+__all__ = ["iter_records", "iter_reverse", "tail", "records_at", "is_ndjson", "count_records", "is_valid"]
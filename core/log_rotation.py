@@ -0,0 +1,345 @@
+# core/log_rotation.py
+# Size/age rotation of the append-only logs into gzip archives, plus range-aware archive readers.
+# - Shared by core.trace_logger, core.memory_interface and boot.boot_trace_logger
+# - maybe_rotate(path): once a log passes WILL_LOG_ROTATE_BYTES (default 8 MiB) or its first record
+#   is older than WILL_LOG_ROTATE_AGE_S (default 0 = off), it is renamed aside, gzipped into
+#   logs/archive/<log>/ and recorded in logs/archive/manifest.json (first/last ts, records, bytes)
+# - archive_segments(store): same policy for sealed memory segments (core.segment_store)
+# - Readers consult archives only when a time range reaches back before the active file;
+#   iter_history() streams a log's whole history (archives, then live files) for full audits
+# - Archive names carry their time span, so a lost manifest entry is recovered from the directory
+
+from __future__ import annotations
+
+import calendar
+import gzip
+import json
+import os
+import re
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Union
+
+from core.log_reader import iter_records, iter_reverse
+
+ARCHIVE_DIR = Path("logs/archive")
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+BYTES_ENV = "WILL_LOG_ROTATE_BYTES"
+AGE_ENV = "WILL_LOG_ROTATE_AGE_S"
+DEFAULT_MAX_BYTES: int = 8 * 1024 * 1024
+DEFAULT_MAX_AGE_S: float = 0.0
+
+PathLike = Union[str, os.PathLike]
+Record = Dict[str, Any]
+
+_LOCK = threading.RLock()
+_NAME_RE = re.compile(r"^(?P<stem>.+)\.(?P<first>\d{8}T\d{6}Z|none)_(?P<last>\d{8}T\d{6}Z|none)\.(?P<seq>\d+)\.gz$")
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name) or default)
+    except ValueError:
+        return default
+
+
+def max_bytes() -> int:
+    return int(_env_number(BYTES_ENV, DEFAULT_MAX_BYTES))
+
+
+def max_age_s() -> float:
+    return _env_number(AGE_ENV, DEFAULT_MAX_AGE_S)
+
+
+def log_key(path: PathLike) -> str:
+    """Logical log name: the file itself, or the segment directory for memory segments."""
+    p = Path(path)
+    if p.name.startswith("segment-") and (p.parent / "index.json").exists():
+        return p.parent.as_posix()
+    return p.as_posix()
+
+
+def archive_slug(key: str) -> str:
+    """Directory name under logs/archive/ for a log key (also used by core.log_columnar)."""
+    return Path(key).name.replace(".", "_")
+
+
+def _compact(ts: Optional[str]) -> str:
+    return re.sub(r"[-:]", "", ts)[:16] if ts else "none"
+
+
+def _expand(compact: str) -> Optional[str]:
+    if compact == "none":
+        return None
+    c = compact
+    return f"{c[0:4]}-{c[4:6]}-{c[6:8]}T{c[9:11]}:{c[11:13]}:{c[13:15]}Z"
+
+
+def _ts_epoch(ts: Optional[str]) -> Optional[float]:
+    try:
+        return float(calendar.timegm(time.strptime(ts, "%Y-%m-%dT%H:%M:%SZ"))) if ts else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _edges(path: Path) -> Dict[str, Optional[str]]:
+    first = next(iter_records(path), None)
+    last = next(iter_reverse(path), None)
+    return {"first_ts": (first or {}).get("ts"), "last_ts": (last or {}).get("ts")}
+
+
+# ---------- manifest ----------
+
+def _manifest_path(root: Path) -> Path:
+    return root / MANIFEST_NAME
+
+
+def load_manifest(root: Optional[Path] = None) -> Dict[str, Any]:
+    """Manifest entries, reconciled with the archive files actually on disk."""
+    root = Path(root or ARCHIVE_DIR)
+    try:
+        data = json.loads(_manifest_path(root).read_text(encoding="utf-8"))
+        entries = [e for e in data.get("archives", []) if isinstance(e, dict)]
+    except (OSError, ValueError):
+        entries = []
+    known = {e.get("path") for e in entries}
+    on_disk = {p.as_posix() for p in root.glob("*/*.gz")} if root.exists() else set()
+    entries = [e for e in entries if e.get("path") in on_disk]
+    for path in sorted(on_disk - known):
+        m = _NAME_RE.match(Path(path).name)
+        if m is None:
+            continue
+        entries.append({
+            "log": None, "slug": Path(path).parent.name, "path": path,
+            "first_ts": _expand(m["first"]), "last_ts": _expand(m["last"]), "records": None,
+        })
+    return {"version": MANIFEST_VERSION, "archives": entries}
+
+
+def _save_manifest(root: Path, data: Dict[str, Any]) -> None:
+    root.mkdir(parents=True, exist_ok=True)
+    tmp = _manifest_path(root).with_suffix(f".tmp{os.getpid()}.json")
+    tmp.write_text(json.dumps(data, ensure_ascii=False, indent=2) + "\n", encoding="utf-8", newline="\n")
+    os.replace(tmp, _manifest_path(root))
+
+
+# ---------- rotation ----------
+
+def _archive(src: Path, key: str, name: str, meta: Dict[str, Any], root: Path) -> Dict[str, Any]:
+    """gzip src into the archive dir, record it in the manifest and remove src."""
+    with _LOCK:
+        manifest = load_manifest(root)
+        slug = archive_slug(key)
+        dest_dir = root / slug
+        dest_dir.mkdir(parents=True, exist_ok=True)
+        seq = 1 + sum(1 for e in manifest["archives"] if e.get("slug") == slug)
+        dest = dest_dir / f"{name}.{_compact(meta.get('first_ts'))}_{_compact(meta.get('last_ts'))}.{seq:06d}.gz"
+        tmp = dest.with_name(dest.name + ".tmp")
+        size = src.stat().st_size
+        with src.open("rb") as fin, tmp.open("wb") as fout:
+            with gzip.GzipFile(filename=name, fileobj=fout, mode="wb", compresslevel=6, mtime=0) as gz:
+                shutil.copyfileobj(fin, gz, 1024 * 1024)
+        os.replace(tmp, dest)
+        src.unlink()
+        entry = {
+            "log": key,
+            "slug": slug,
+            "path": dest.as_posix(),
+            "first_ts": meta.get("first_ts"),
+            "last_ts": meta.get("last_ts"),
+            "records": meta.get("records"),
+            "bytes": size,
+            "stored_bytes": dest.stat().st_size,
+            "rotated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        }
+        manifest["archives"].append(entry)
+        _save_manifest(root, manifest)
+        return entry
+
+
+def _due(size: int, first_ts: Optional[str], *, limit_bytes: int, limit_age: float) -> bool:
+    if limit_bytes > 0 and size >= limit_bytes:
+        return True
+    if limit_age > 0:
+        born = _ts_epoch(first_ts)
+        return born is not None and time.time() - born >= limit_age
+    return False
+
+
+def maybe_rotate(
+    path: PathLike,
+    *,
+    limit_bytes: Optional[int] = None,
+    limit_age: Optional[float] = None,
+    root: Optional[Path] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Rotate path into a gzip archive when it is due; returns the manifest entry or None.
+    The log is renamed aside first, so concurrent appenders simply start a fresh file.
+    """
+    path = Path(path)
+    limit_bytes = max_bytes() if limit_bytes is None else limit_bytes
+    limit_age = max_age_s() if limit_age is None else limit_age
+    try:
+        size = path.stat().st_size
+    except OSError:
+        return None
+    if size == 0:
+        return None
+    first_ts = _edges(path)["first_ts"] if limit_age > 0 else None
+    if not _due(size, first_ts, limit_bytes=limit_bytes, limit_age=limit_age):
+        return None
+    aside = path.with_name(f"{path.name}.rotating-{os.getpid()}")
+    try:
+        os.replace(path, aside)
+    except OSError:
+        return None  # another writer rotated it first
+    meta = _edges(aside)
+    meta["records"] = sum(1 for _ in iter_records(aside))
+    return _archive(aside, path.as_posix(), path.name, meta, Path(root or ARCHIVE_DIR))
+
+
+def archive_segments(
+    store: Any,
+    *,
+    limit_bytes: Optional[int] = None,
+    limit_age: Optional[float] = None,
+    root: Optional[Path] = None,
+) -> List[Path]:
+    """
+    Archive sealed segments of a core.segment_store.SegmentStore, oldest first, while the
+    live sealed bytes exceed limit_bytes or a segment's first record is older than limit_age.
+    Returns the segment paths that were archived (and dropped from the store's index).
+    """
+    limit_bytes = max_bytes() if limit_bytes is None else limit_bytes
+    limit_age = max_age_s() if limit_age is None else limit_age
+    sealed = store.sealed_entries()
+    live = sum(int(e.get("bytes") or 0) for e in sealed)
+    done: List[Path] = []
+    for entry in sealed:
+        size = int(entry.get("bytes") or 0)
+        if not _due(live, entry.get("first_ts"), limit_bytes=limit_bytes, limit_age=limit_age):
+            break
+        seg = store.base_dir / entry["name"]
+        if seg.exists():
+            _archive(seg, store.base_dir.as_posix(), Path(entry["name"]).stem, entry, Path(root or ARCHIVE_DIR))
+        store.drop_sealed(entry["name"])
+        done.append(seg)
+        live -= size
+    return done
+
+
+# ---------- readers ----------
+
+def archives_for(
+    key: str,
+    *,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    root: Optional[Path] = None,
+) -> List[Dict[str, Any]]:
+    """Archive entries of one log overlapping [since, until], oldest first."""
+    slug = archive_slug(key)
+    out = []
+    for e in load_manifest(root)["archives"]:
+        if e.get("slug") != slug:
+            continue
+        if since and e.get("last_ts") and e["last_ts"] < since:
+            continue
+        if until and e.get("first_ts") and e["first_ts"] > until:
+            continue
+        out.append(e)
+    return sorted(out, key=lambda e: (e.get("first_ts") or "", e["path"]))
+
+
+def archived_count(key: str, *, root: Optional[Path] = None) -> int:
+    """Records already rotated out of one log, from the manifest (archives it lacks are read)."""
+    total = 0
+    for entry in archives_for(key, root=root):
+        n = entry.get("records")
+        total += n if isinstance(n, int) else sum(1 for _ in iter_archive(entry["path"]))
+    return total
+
+
+def iter_archive(path: PathLike) -> Iterator[Record]:
+    """Records of one gzip archive (NDJSON lines, or a legacy JSON array)."""
+    with gzip.open(path, "rb") as f:
+        if f.peek(64)[:64].lstrip().startswith(b"["):
+            data = json.loads(f.read() or b"[]")
+            yield from (r for r in (data if isinstance(data, list) else [data]) if isinstance(r, dict))
+            return
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(rec, dict):
+                yield rec
+
+
+def iter_history(key: str, live: Sequence[PathLike], *, root: Optional[Path] = None) -> Iterator[Record]:
+    """Every record of one log oldest-first: its archives (streamed from gzip), then the live files."""
+    for entry in archives_for(key, root=root):
+        yield from iter_archive(entry["path"])
+    for path in live:
+        yield from iter_records(path)
+
+
+def archived_records(
+    paths: Sequence[PathLike],
+    *,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    predicate: Optional[Callable[[Record], bool]] = None,
+    root: Optional[Path] = None,
+) -> List[Record]:
+    """
+    Archived records of the logs behind paths that fall in [since, until].
+    Nothing is opened unless since/until reaches back before the oldest live record.
+    """
+    if not since and not until:
+        return []
+    files = [Path(p) for p in paths]
+    live_first = [(_edges(p)["first_ts"] if p.exists() else None) for p in files]
+    oldest_live = min((t for t in live_first if t), default=None)
+    if since and oldest_live and since >= oldest_live:
+        return []
+    keys: List[str] = []
+    for p in files:
+        k = log_key(p)
+        if k not in keys:
+            keys.append(k)
+    out: List[Record] = []
+    for key in keys:
+        for entry in archives_for(key, since=since, until=until, root=root):
+            for rec in iter_archive(entry["path"]):
+                ts = rec.get("ts") or ""
+                if since and ts < since:
+                    continue
+                if until and ts > until:
+                    continue
+                if predicate is None or predicate(rec):
+                    out.append(rec)
+    return out
+
+
+__all__ = [
+    "ARCHIVE_DIR",
+    "DEFAULT_MAX_BYTES",
+    "log_key",
+    "archive_slug",
+    "maybe_rotate",
+    "archive_segments",
+    "load_manifest",
+    "archives_for",
+    "archived_count",
+    "iter_archive",
+    "iter_history",
+    "archived_records",
+]
@@ -6,11 +6,11 @@ inject_paths()
 import json
 import sqlite3
 import pathlib
-import contextlib
 from typing import List, Dict, Any
 
 # Always use the shared DB path (never hardcode)
 from core.sqlite_bootstrap import DB_PATH
+from core.connection_manager import read_connection
 
 
 def _rows_to_dicts(cursor: sqlite3.Cursor, rows: list) -> List[Dict[str, Any]]:
@@ -59,20 +59,19 @@ def fetch_all_manifest() -> List[Dict[str, Any]]:
     Never raises; returns [] on any unexpected issue.
     """
     # 1) Try database first
-    with contextlib.ExitStack() as stack:
-        try:
-            con = stack.enter_context(sqlite3.connect(DB_PATH))
-            cur = con.cursor()
-            cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='manifest'")
-            if cur.fetchone():
-                cur.execute("SELECT * FROM manifest")
-                rows = cur.fetchall()
-                if rows:
-                    results = _rows_to_dicts(cur, rows)
-                    return [_ensure_file_path_key(r) for r in results]
-        except Exception:
-            # Silent fallback — tests only require robust read semantics.
-            pass
+    try:
+        con = read_connection(DB_PATH)  # pooled, read-only; missing DB raises -> fallback
+        cur = con.cursor()
+        cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='manifest'")
+        if cur.fetchone():
+            cur.execute("SELECT * FROM manifest")
+            rows = cur.fetchall()
+            if rows:
+                results = _rows_to_dicts(cur, rows)
+                return [_ensure_file_path_key(r) for r in results]
+    except Exception:
+        # Silent fallback — tests only require robust read semantics.
+        pass
 
     # 2) Fallback to JSON manifest
     try:
@@ -1,7 +1,19 @@
 # core/memory_interface.py
-# Memory logging with UTF-8 writes and normalized, project-relative source paths.
-# Writes a single JSON **array** at logs/will_memory_log.json.
+# Memory logging with UTF-8 writes and normalized, project-relative source paths (core.path_normalizer).
+# Default backend appends to rolling NDJSON segments under logs/will_memory_log.d/
+# (see core.segment_store); the legacy single JSON **array** at logs/will_memory_log.json
+# is still available as a backend (WILL_MEMORY_BACKEND=json) and as an on-demand export.
+# Entries are batched in-process (core.log_buffer) and written one batch at a time,
+# to the files and/or the memory_events table per WILL_LOG_SINK (core.log_db_sink).
+# Segment appends keep the tag/time sidecar index current (core.log_index); old sealed segments
+# (or the legacy JSON file) are rotated into gzip archives by size/age (core.log_rotation);
+# iter_memory_log()/read_memory_log()/export_memory_log() stream those archives before the live files.
+# Log files are written compact via core.serializer; export_memory_log() stays pretty-printed.
 # Compatible with both positional ("message", ...) and keyword-only (event_text=...) calling styles.
+# Entries carry a top-level run_id (run_id= argument or core.run_context.run_scope).
+# alog_memory_event() is the asyncio counterpart: due flushes run in a worker thread, not on the loop.
+# Import is cheap: no directories are created and the sink/index/rotation modules (sqlite3, gzip)
+# and asyncio are only imported when a batch is written or an async call is made.
 
 from __future__ import annotations
 
@@ -9,25 +21,28 @@ from boot.boot_path_initializer import inject_paths  # required path injection
 inject_paths()
 
 import json
+import os
 import time
-from pathlib import Path, PurePosixPath
-from typing import Any, Dict, List, Optional, Sequence
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence
 
-# Log destination (JSON array)
+from core import serializer
+from core.log_buffer import get_buffer
+from core.path_normalizer import rel_posix
+from core.run_context import resolve_run_id
+from core.segment_store import SegmentStore, write_json_array
+
+# Legacy log destination (JSON array) — also the default export target
 LOG_PATH = Path("logs/will_memory_log.json")
-LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
 
+# Segmented store (NDJSON segments + index.json)
+SEGMENT_DIR = Path("logs/will_memory_log.d")
 
-def _find_project_root() -> Path:
-    """
-    Heuristic: walk up until we find a marker directory typical for this repo,
-    defaulting to current working dir if not found.
-    """
-    here = Path(".").resolve()
-    for p in [here] + list(here.parents):
-        if (p / "configs").exists() or (p / "core").exists():
-            return p
-    return here
+# Backend selector: "segments" (default) | "json" (legacy whole-array rewrite)
+BACKEND_ENV = "WILL_MEMORY_BACKEND"
+_BACKENDS = {"segments", "json"}
+
+_STORE: Optional[SegmentStore] = None
 
 
 def _now_iso() -> str:
@@ -35,20 +50,18 @@ def _now_iso() -> str:
     return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
 
 
-def _rel_posix(path: Optional[str]) -> Optional[str]:
-    if not path:
-        return None
-    try:
-        root = _find_project_root()
-        p = Path(path)
-        if p.is_absolute():
-            try:
-                p = p.relative_to(root)
-            except Exception:
-                return PurePosixPath(p).as_posix()
-        return PurePosixPath(p).as_posix()
-    except Exception:
-        return path.replace("\\", "/") if isinstance(path, str) else path
+def _backend() -> str:
+    val = (os.environ.get(BACKEND_ENV) or "segments").strip().lower()
+    return val if val in _BACKENDS else "segments"
+
+
+def _store() -> SegmentStore:
+    """Process-wide segment store; imports a pre-existing legacy array log exactly once."""
+    global _STORE
+    if _STORE is None:
+        _STORE = SegmentStore(SEGMENT_DIR)
+        _STORE.import_json_array(LOG_PATH)
+    return _STORE
 
 
 def _read_log_list() -> List[Dict[str, Any]]:
@@ -70,14 +83,87 @@ def _read_log_list() -> List[Dict[str, Any]]:
 
 
 def _write_log_list(data: List[Dict[str, Any]]) -> None:
-    # Pretty-print for human inspection; UTF-8; forward slashes in paths
+    # Compact machine log (export_memory_log() gives the pretty view); UTF-8; forward slashes in paths
+    LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
     tmp = LOG_PATH.with_suffix(".tmp.json")
-    with tmp.open("w", encoding="utf-8", newline="\n") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-        f.write("\n")
+    with tmp.open("wb") as f:
+        f.write(serializer.dumpb(data) + b"\n")
     tmp.replace(LOG_PATH)
 
 
+def _append_entries(entries: List[Dict[str, Any]]) -> None:
+    from core import log_db_sink, log_index, log_rotation  # deferred: first batch pays the import
+
+    # DB first: if the sink refuses the batch, nothing was written and the buffer keeps it whole
+    if log_db_sink.writes_db():
+        log_db_sink.write_memory_events(entries)
+    if log_db_sink.writes_file():
+        if _backend() == "json":
+            data = _read_log_list()
+            data.extend(entries)
+            _write_log_list(data)
+            log_rotation.maybe_rotate(LOG_PATH)
+        else:
+            target = _store().active_segment()  # append_many may roll past it
+            _store().append_many(entries)
+            log_index.note_append(target)
+            for seg in log_rotation.archive_segments(_store()):
+                log_index.forget(seg)
+
+
+# Pending entries live here until a size/age threshold, flush(), or process exit
+_BUFFER = get_buffer("memory", _append_entries)
+
+
+def append_entry(entry: Dict[str, Any]) -> None:
+    """Buffer a ready-made entry as-is (for helpers with their own entry shape, e.g. core.memory_log_db)."""
+    _BUFFER.append(entry)
+
+
+def flush() -> int:
+    """Write any buffered memory entries now; returns how many were written."""
+    return _BUFFER.flush()
+
+
+def memory_log_location() -> Path:
+    """Where the active backend keeps memory events (segment dir or legacy JSON file)."""
+    return LOG_PATH if _backend() == "json" else SEGMENT_DIR
+
+
+def memory_log_files() -> List[Path]:
+    """Files currently holding memory events, oldest first (for integrity checks)."""
+    flush()
+    return [LOG_PATH] if _backend() == "json" else _store().segments()
+
+
+def iter_memory_log() -> Iterator[Dict[str, Any]]:
+    """
+    Yield the whole memory history oldest-first: rotated gzip archives (core.log_rotation),
+    then the active backend's files. Pending entries are flushed first.
+    """
+    from core import log_rotation
+
+    yield from log_rotation.iter_history(memory_log_location().as_posix(), memory_log_files())
+
+
+def read_memory_log() -> List[Dict[str, Any]]:
+    """Compatibility reader: the legacy JSON-array view of the full memory history as a list."""
+    return list(iter_memory_log())
+
+
+def export_memory_log(dest: Optional[Path] = None) -> Path:
+    """
+    Materialize the legacy JSON-array view (pretty-printed, archives included) for tools that
+    read the file directly. Defaults to logs/will_memory_log.json. Under the json backend that
+    file is the live log itself, so the default target is left as is (live records only).
+    """
+    target = Path(dest) if dest is not None else LOG_PATH
+    flush()
+    if _backend() == "json" and target == LOG_PATH:
+        return target
+    return write_json_array(iter_memory_log(), target)
+
+
 def log_memory_event(
     *args,
     event_text: Optional[str] = None,
@@ -87,6 +173,7 @@ def log_memory_event(
     tags: Optional[Sequence[str]] = None,
     content: Optional[Dict[str, Any]] = None,
     metadata: Optional[Dict[str, Any]] = None,
+    run_id: Optional[str] = None,
 ) -> Dict[str, Any]:
     """
     Append a memory log entry.
@@ -103,15 +190,56 @@ def log_memory_event(
         tags: optional list of tags.
         content: optional structured payload.
         metadata: optional dict (accepted for test compatibility).
+        run_id: correlation id; defaults to the active run_scope() (content["run_id"] is not consulted).
 
     Returns:
-        The entry dict that was appended.
+        The entry dict that was appended (buffered; see flush()).
+    """
+    entry = _make_entry(args, event_text, event_type, source, phase, tags, content, metadata, run_id)
+    append_entry(entry)
+    return entry
+
+
+async def alog_memory_event(
+    *args,
+    event_text: Optional[str] = None,
+    event_type: str = "info",
+    source: Optional[str] = None,
+    phase: Optional[float] = None,
+    tags: Optional[Sequence[str]] = None,
+    content: Optional[Dict[str, Any]] = None,
+    metadata: Optional[Dict[str, Any]] = None,
+    run_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    asyncio counterpart of log_memory_event (same arguments and entry).
+    The entry is buffered on the event loop; when that makes a batch due, the
+    file/DB write is offloaded with asyncio.to_thread.
     """
+    entry = _make_entry(args, event_text, event_type, source, phase, tags, content, metadata, run_id)
+    if _BUFFER.offer(entry):
+        import asyncio
+
+        await asyncio.to_thread(_BUFFER.flush)
+    return entry
+
+
+def _make_entry(
+    args: Sequence[Any],
+    event_text: Optional[str],
+    event_type: str,
+    source: Optional[str],
+    phase: Optional[float],
+    tags: Optional[Sequence[str]],
+    content: Optional[Dict[str, Any]],
+    metadata: Optional[Dict[str, Any]],
+    run_id: Optional[str] = None,
+) -> Dict[str, Any]:
     # Accept positional-first message for backward compatibility
     if event_text is None and len(args) >= 1:
         event_text = str(args[0])
 
-    src = _rel_posix(source) if source else None
+    src = rel_posix(source)
 
     entry: Dict[str, Any] = {
         "ts": _now_iso(),
@@ -123,13 +251,22 @@ def log_memory_event(
         "content": content,
         "phase": phase,
     }
+    rid = resolve_run_id(run_id)
+    if rid is not None:
+        entry["run_id"] = rid
     if metadata is not None:
         entry["metadata"] = metadata
-
-    data = _read_log_list()
-    data.append(entry)
-    _write_log_list(data)
     return entry
 
 
-__all__ = ["log_memory_event"]
+__all__ = [
+    "log_memory_event",
+    "alog_memory_event",
+    "append_entry",
+    "flush",
+    "iter_memory_log",
+    "read_memory_log",
+    "export_memory_log",
+    "memory_log_location",
+    "memory_log_files",
+]
@@ -0,0 +1,54 @@
+# core/migrations/__init__.py
+# Numbered schema migrations for will_data.db, applied by core.schema_migrator.
+# - One module per step: mNNNN_<name>.py defining DESCRIPTION, up(cur) and verify(cur)
+# - up() runs inside the migrator's transaction and must not commit
+# - verify() returns a list of problems (empty == OK)
+# - Shared DDL helpers below are for migrations only; runtime code relies on the migrated layout
+
+from __future__ import annotations
+
+import sqlite3
+from typing import Dict, List, Mapping, Optional
+
+
+def table_columns(cur: sqlite3.Cursor, table: str) -> List[str]:
+    cur.execute(f"PRAGMA table_info({table})")
+    return [r[1] for r in cur.fetchall()]
+
+
+def has_index(cur: sqlite3.Cursor, name: str) -> bool:
+    cur.execute("SELECT 1 FROM sqlite_master WHERE type='index' AND name=?", (name,))
+    return cur.fetchone() is not None
+
+
+def add_columns(cur: sqlite3.Cursor, table: str, columns: Mapping[str, str]) -> None:
+    """Add missing columns to an existing table (CREATE TABLE IF NOT EXISTS won't)."""
+    have = set(table_columns(cur, table))
+    for name, decl in columns.items():
+        if name not in have:
+            cur.execute(f"ALTER TABLE {table} ADD COLUMN {name} {decl}")
+
+
+def rebuild_table(cur: sqlite3.Cursor, table: str, create_sql: str, copy: Mapping[str, Optional[str]]) -> None:
+    """
+    Recreate `table` with create_sql (which must create `table`) and copy rows across.
+    copy maps new column -> SQL expression over the old row (None = leave to the column default);
+    expressions may only reference columns the old table actually has.
+    """
+    old = f"_{table}_old"
+    cur.execute(f"ALTER TABLE {table} RENAME TO {old}")
+    cur.execute(create_sql)
+    pairs = [(col, expr) for col, expr in copy.items() if expr is not None]
+    if pairs:
+        cols = ", ".join(c for c, _ in pairs)
+        exprs = ", ".join(e for _, e in pairs)
+        cur.execute(f"INSERT INTO {table} ({cols}) SELECT {exprs} FROM {old} ORDER BY rowid")
+    cur.execute(f"DROP TABLE {old}")
+
+
+def missing_columns(cur: sqlite3.Cursor, table: str, expected: List[str]) -> List[str]:
+    have = set(table_columns(cur, table))
+    return [f"{table}.{c} missing" for c in expected if c not in have]
+
+
+__all__ = ["table_columns", "has_index", "add_columns", "rebuild_table", "missing_columns"]
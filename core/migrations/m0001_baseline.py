@@ -0,0 +1,93 @@
+# core/migrations/m0001_baseline.py
+# Baseline IronRoot tables as shipped by the original core.sqlite_bootstrap (idempotent).
+
+from __future__ import annotations
+
+import sqlite3
+from typing import List
+
+
+DESCRIPTION = "baseline tables (boot/manifest/memory/reflex/trace/snapshot/test_ticks)"
+
+_TABLES = {
+    # boot_events — general boot/report log table used by early-phase tests
+    "boot_events": """
+        CREATE TABLE IF NOT EXISTS boot_events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            ts TEXT NOT NULL,
+            event TEXT,
+            details TEXT
+        )
+    """,
+    # manifest — file registry
+    "manifest": """
+        CREATE TABLE IF NOT EXISTS manifest (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            path TEXT UNIQUE NOT NULL,
+            added_ts TEXT,
+            phase TEXT
+        )
+    """,
+    # memory_events — for dual-logging memory track
+    "memory_events": """
+        CREATE TABLE IF NOT EXISTS memory_events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            ts TEXT NOT NULL,
+            tag TEXT NOT NULL,
+            payload TEXT
+        )
+    """,
+    # reflex_registry — registry of reflex/tool handlers
+    "reflex_registry": """
+        CREATE TABLE IF NOT EXISTS reflex_registry (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            ts TEXT NOT NULL,
+            reflex_name TEXT NOT NULL,
+            module TEXT,
+            path TEXT,
+            enabled INTEGER DEFAULT 1
+        )
+    """,
+    # trace_events — for dual-logging trace track
+    "trace_events": """
+        CREATE TABLE IF NOT EXISTS trace_events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            ts TEXT NOT NULL,
+            level TEXT NOT NULL,
+            tag TEXT NOT NULL,
+            message TEXT,
+            context TEXT
+        )
+    """,
+    # snapshot_index — used by snapshot tools (layout unified in m0003)
+    "snapshot_index": """
+        CREATE TABLE IF NOT EXISTS snapshot_index (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            ts TEXT NOT NULL,
+            run_id TEXT NOT NULL,
+            mode TEXT NOT NULL,
+            tables_changed INTEGER DEFAULT 0
+        )
+    """,
+    # test_ticks — helper table used by tests (defaults added in m0004)
+    "test_ticks": """
+        CREATE TABLE IF NOT EXISTS test_ticks (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            ts TEXT NOT NULL,
+            tick TEXT NOT NULL
+        )
+    """,
+}
+
+
+def up(cur: sqlite3.Cursor) -> None:
+    for ddl in _TABLES.values():
+        cur.execute(ddl)
+    # Pre-migration builds stamped a bare version table; schema_migrations supersedes it
+    cur.execute("DROP TABLE IF EXISTS schema_version")
+
+
+def verify(cur: sqlite3.Cursor) -> List[str]:
+    cur.execute("SELECT name FROM sqlite_master WHERE type='table'")
+    have = {r[0] for r in cur.fetchall()}
+    return [f"{table} missing" for table in _TABLES if table not in have]
@@ -0,0 +1,33 @@
+# core/migrations/m0002_event_run_ids.py
+# memory_events/trace_events columns written by core.log_db_sink, plus the audit/query indexes.
+
+from __future__ import annotations
+
+import sqlite3
+from typing import List
+
+from core.migrations import add_columns, has_index, missing_columns
+
+DESCRIPTION = "message/run_id columns and ts/tag/run_id indexes on the event tables"
+
+_COLUMNS = {
+    "memory_events": {"message": "TEXT", "run_id": "TEXT"},
+    "trace_events": {"run_id": "TEXT"},
+}
+_INDEXED = ("ts", "tag", "run_id")
+
+
+def up(cur: sqlite3.Cursor) -> None:
+    for table, cols in _COLUMNS.items():
+        add_columns(cur, table, cols)
+    for table in _COLUMNS:
+        for col in _INDEXED:
+            cur.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_{col} ON {table} ({col})")
+
+
+def verify(cur: sqlite3.Cursor) -> List[str]:
+    problems: List[str] = []
+    for table, cols in _COLUMNS.items():
+        problems += missing_columns(cur, table, list(cols))
+        problems += [f"idx_{table}_{c} missing" for c in _INDEXED if not has_index(cur, f"idx_{table}_{c}")]
+    return problems
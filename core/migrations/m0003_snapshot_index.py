@@ -0,0 +1,51 @@
+# core/migrations/m0003_snapshot_index.py
+# Unifies the two historical snapshot_index layouts into one:
+# - bootstrap layout: (id, ts, run_id, mode, tables_changed)
+# - snapshot_manager layout: (snapshot_id PK, run_id, created_at, pre_checksum, post_checksum, run_dir, status)
+
+from __future__ import annotations
+
+import sqlite3
+from typing import List
+
+from core.migrations import has_index, missing_columns, rebuild_table, table_columns
+
+DESCRIPTION = "single snapshot_index layout (+ run_id index)"
+
+COLUMNS = [
+    "id", "snapshot_id", "run_id", "created_at", "mode", "tables_changed",
+    "pre_checksum", "post_checksum", "run_dir", "status",
+]
+
+_CREATE = """
+    CREATE TABLE snapshot_index (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        snapshot_id TEXT UNIQUE,
+        run_id TEXT NOT NULL,
+        created_at TEXT NOT NULL DEFAULT (datetime('now')),
+        mode TEXT,
+        tables_changed INTEGER DEFAULT 0,
+        pre_checksum TEXT,
+        post_checksum TEXT,
+        run_dir TEXT,
+        status TEXT
+    )
+"""
+
+
+def up(cur: sqlite3.Cursor) -> None:
+    have = set(table_columns(cur, "snapshot_index"))
+    if have != set(COLUMNS):
+        # Old snapshot_manager rows have no id: AUTOINCREMENT renumbers them in rowid order
+        copy = {c: (c if c in have else None) for c in COLUMNS}
+        if "created_at" not in have and "ts" in have:
+            copy["created_at"] = "ts"
+        rebuild_table(cur, "snapshot_index", _CREATE, copy)
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_snapshot_index_run_id ON snapshot_index (run_id)")
+
+
+def verify(cur: sqlite3.Cursor) -> List[str]:
+    problems = missing_columns(cur, "snapshot_index", COLUMNS)
+    if not has_index(cur, "idx_snapshot_index_run_id"):
+        problems.append("idx_snapshot_index_run_id missing")
+    return problems
@@ -0,0 +1,45 @@
+# core/migrations/m0004_test_ticks.py
+# test_ticks gets column defaults so reflex_table_tick's `INSERT ... DEFAULT VALUES` works,
+# and legacy reflex-created tables (id, created_at) are folded into the (id, ts, tick) layout.
+
+from __future__ import annotations
+
+import sqlite3
+from typing import Dict, List, Optional
+
+from core.migrations import missing_columns, rebuild_table, table_columns
+
+DESCRIPTION = "test_ticks defaults (ts/tick) and legacy created_at layout"
+
+_CREATE = """
+    CREATE TABLE test_ticks (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        ts TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%SZ', 'now')),
+        tick TEXT NOT NULL DEFAULT 'tick'
+    )
+"""
+
+
+def _defaults(cur: sqlite3.Cursor) -> Dict[str, Optional[str]]:
+    cur.execute("PRAGMA table_info(test_ticks)")
+    return {r[1]: r[4] for r in cur.fetchall()}  # 4 = dflt_value
+
+
+def up(cur: sqlite3.Cursor) -> None:
+    dflt = _defaults(cur)
+    if set(dflt) == {"id", "ts", "tick"} and dflt["ts"] is not None and dflt["tick"] is not None:
+        return
+    have = set(table_columns(cur, "test_ticks"))
+    copy = {
+        "id": "id",
+        "ts": "ts" if "ts" in have else ("created_at" if "created_at" in have else None),
+        "tick": "tick" if "tick" in have else None,
+    }
+    rebuild_table(cur, "test_ticks", _CREATE, copy)
+
+
+def verify(cur: sqlite3.Cursor) -> List[str]:
+    problems = missing_columns(cur, "test_ticks", ["id", "ts", "tick"])
+    if not problems and any(v is None for k, v in _defaults(cur).items() if k in {"ts", "tick"}):
+        problems.append("test_ticks ts/tick defaults missing")
+    return problems
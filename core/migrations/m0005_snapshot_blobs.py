@@ -0,0 +1,21 @@
+# core/migrations/m0005_snapshot_blobs.py
+# snapshot_index columns for the content-addressed snapshot store (core.snapshot_store).
+
+from __future__ import annotations
+
+import sqlite3
+from typing import List
+
+from core.migrations import add_columns, missing_columns
+
+DESCRIPTION = "snapshot_index blob pointers (pre_blob/post_blob), phase and pruned_at"
+
+_COLUMNS = {"pre_blob": "TEXT", "post_blob": "TEXT", "phase": "TEXT", "pruned_at": "TEXT"}
+
+
+def up(cur: sqlite3.Cursor) -> None:
+    add_columns(cur, "snapshot_index", _COLUMNS)
+
+
+def verify(cur: sqlite3.Cursor) -> List[str]:
+    return missing_columns(cur, "snapshot_index", list(_COLUMNS))
@@ -0,0 +1,67 @@
+# core/path_normalizer.py
+# Shared source-path normalization for the memory/trace/boot loggers and the exception hook.
+# - Project root comes from boot.boot_path_initializer.project_root() (detected once per process)
+# - rel_posix() maps a source to a project-relative, forward-slash path; results are LRU-cached,
+#   so the warm path is a dict lookup with no stat()/resolve()/getcwd() calls
+# - Relative sources are normalized as plain strings (never resolved against the cwd)
+
+from __future__ import annotations
+
+import os
+import posixpath
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from boot.boot_path_initializer import project_root as _boot_root
+
+CACHE_SIZE: int = 4096
+
+_ROOT: Optional[Path] = None
+
+
+def project_root() -> Path:
+    """Resolved project root (computed on first use, then cached for the process)."""
+    global _ROOT
+    if _ROOT is None:
+        _ROOT = Path(_boot_root())
+    return _ROOT
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _normalize(raw: str) -> str:
+    text = raw.replace("\\", "/")
+    if not os.path.isabs(text):
+        norm = posixpath.normpath(text)
+        return text if norm == "." else norm
+    try:
+        p = Path(text).resolve()
+    except (OSError, RuntimeError):
+        return text
+    try:
+        return p.relative_to(project_root()).as_posix()
+    except ValueError:
+        return p.as_posix()
+
+
+def rel_posix(source: Any, default: Optional[str] = None) -> Optional[str]:
+    """
+    Project-relative forward-slash form of source (str or PathLike); falls back to
+    default when source is empty, and returns None when both are empty.
+    """
+    value = source if source else default
+    if not value:
+        return None
+    return _normalize(os.fspath(value) if not isinstance(value, str) else value)
+
+
+def cache_info() -> Dict[str, int]:
+    info = _normalize.cache_info()
+    return {"hits": info.hits, "misses": info.misses, "size": info.currsize, "maxsize": info.maxsize or 0}
+
+
+def clear_cache() -> None:
+    _normalize.cache_clear()
+
+
+__all__ = ["project_root", "rel_posix", "cache_info", "clear_cache", "CACHE_SIZE"]
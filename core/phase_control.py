@@ -1,12 +1,15 @@
 ﻿# core/phase_control.py
+# Phase lock. The resolved phase is cached per source file and revalidated with one stat()
+# (mtime_ns, size, inode), so repeated ensure_phase() calls in a process do not re-read the configs.
 
 from boot.boot_path_initializer import inject_paths  # required path injection
 inject_paths()
 
 import os
+import re
 import json
 from pathlib import Path
-from typing import Optional, Any
+from typing import Any, Callable, Dict, Optional, Tuple
 
 # Phase lock — update as you progress through phases
 # After sealing 0.6 -> 0.7, REQUIRED_PHASE must be 0.7
@@ -38,20 +41,56 @@ def _read_phase_from_env() -> Optional[float]:
     return None
 
 
-def _read_phase_from_manifest() -> Optional[float]:
-    """
-    Prefer the manifest's explicit current phase if present:
-      configs/ironroot_manifest_data.json -> {"current_phase": 0.7, ...}
-    Falls back to a top-level "phase" if that convention is used.
-    """
-    p = Path("configs/ironroot_manifest_data.json")
-    if not p.exists():
+MANIFEST_PATH = Path("configs/ironroot_manifest_data.json")
+HISTORY_PATH = Path("configs/phase_history.json")
+
+# The manifest keeps "current_phase" as its first key; a small prefix read avoids parsing ~20 KB
+_PREFIX_BYTES = 512
+_PREFIX_RE = re.compile(rb'^(?:\xef\xbb\xbf)?\s*\{\s*"current_phase"\s*:\s*(-?\d+(?:\.\d+)?|"[^"\\]*")\s*[,}]')
+
+# path -> ((st_mtime_ns, st_size, st_ino) or None when missing, resolved phase)
+_CACHE: Dict[str, Tuple[Optional[Tuple[int, int, int]], Optional[float]]] = {}
+_STATS: Dict[str, int] = {"hits": 0, "misses": 0, "prefix_parses": 0, "full_parses": 0}
+
+
+def _fingerprint(p: Path) -> Optional[Tuple[int, int, int]]:
+    try:
+        st = os.stat(p)
+    except OSError:
         return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def _cached(p: Path, parse: Callable[[Path], Optional[float]]) -> Optional[float]:
+    """parse(p), reused until the file's (mtime_ns, size, inode) changes; one stat() per call."""
+    key = os.fspath(p)
+    fp = _fingerprint(p)
+    hit = _CACHE.get(key)
+    if hit is not None and hit[0] == fp:
+        _STATS["hits"] += 1
+        return hit[1]
+    _STATS["misses"] += 1
+    value = parse(p) if fp is not None else None
+    _CACHE[key] = (fp, value)
+    return value
+
+
+def _parse_manifest(p: Path) -> Optional[float]:
     try:
-        data = json.loads(p.read_text(encoding="utf-8"))
+        with p.open("rb") as f:
+            head = f.read(_PREFIX_BYTES)
+            m = _PREFIX_RE.match(head)
+            if m is not None:
+                ph = _parse_phase(m.group(1).strip(b'"').decode("utf-8"))
+                if ph is not None:
+                    _STATS["prefix_parses"] += 1
+                    return ph
+            data = json.loads((head + f.read()).decode("utf-8-sig"))
     except Exception:
         return None
-
+    _STATS["full_parses"] += 1
+    if not isinstance(data, dict):
+        return None
     for key in ("current_phase", "phase"):
         ph = _parse_phase(data.get(key))
         if ph is not None:
@@ -59,19 +98,20 @@ def _read_phase_from_manifest() -> Optional[float]:
     return None
 
 
-def _read_phase_from_history() -> Optional[float]:
+def _read_phase_from_manifest() -> Optional[float]:
     """
-    Next priority: the tail of configs/phase_history.json["history"].
-    We scan from the end to find the most recent numeric 'phase'.
-    Entries may look like:
-      {"phase": 0.6, "action": "sealed", "timestamp": "..."}
-      {"phase": "0.7", "ts": "..."}
+    Prefer the manifest's explicit current phase if present:
+      configs/ironroot_manifest_data.json -> {"current_phase": 0.7, ...}
+    Falls back to a top-level "phase" if that convention is used.
+    Cached per file fingerprint; a leading "current_phase" key is read without a full parse.
     """
-    p = Path("configs/phase_history.json")
-    if not p.exists():
-        return None
+    return _cached(MANIFEST_PATH, _parse_manifest)
+
+
+def _parse_history(p: Path) -> Optional[float]:
     try:
         data = json.loads(p.read_text(encoding="utf-8"))
+        _STATS["full_parses"] += 1
         hist = data.get("history", []) or []
         # scan from newest to oldest for the first numeric phase
         for item in reversed(hist):
@@ -83,6 +123,29 @@ def _read_phase_from_history() -> Optional[float]:
     return None
 
 
+def _read_phase_from_history() -> Optional[float]:
+    """
+    Next priority: the tail of configs/phase_history.json["history"].
+    We scan from the end to find the most recent numeric 'phase'.
+    Entries may look like:
+      {"phase": 0.6, "action": "sealed", "timestamp": "..."}
+      {"phase": "0.7", "ts": "..."}
+    Cached per file fingerprint like the manifest.
+    """
+    return _cached(HISTORY_PATH, _parse_history)
+
+
+def phase_cache_info() -> Dict[str, int]:
+    """Hit/miss counters of the phase resolver (plus how many prefix vs full parses the misses took)."""
+    return dict(_STATS, size=len(_CACHE))
+
+
+def clear_phase_cache() -> None:
+    _CACHE.clear()
+    for k in _STATS:
+        _STATS[k] = 0
+
+
 def get_current_phase() -> float:
     """
     Current runtime phase.
@@ -115,4 +178,4 @@ def ensure_phase(required: Optional[float] = None) -> None:
         )
 
 
-__all__ = ["REQUIRED_PHASE", "get_current_phase", "ensure_phase"]
+__all__ = ["REQUIRED_PHASE", "get_current_phase", "ensure_phase", "phase_cache_info", "clear_phase_cache"]
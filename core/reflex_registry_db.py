@@ -4,12 +4,12 @@ from boot.boot_path_initializer import inject_paths  # required path injection
 inject_paths()
 
 import sqlite3
-import contextlib
 import pathlib
 from typing import List, Dict, Any
 
 # Always use the shared DB path (never hardcode)
 from core.sqlite_bootstrap import DB_PATH
+from core.connection_manager import read_connection
 
 
 def _rows_to_dicts(cursor: sqlite3.Cursor, rows: list) -> List[Dict[str, Any]]:
@@ -41,22 +41,21 @@ def fetch_all_reflexes() -> List[Dict[str, Any]]:
 
     Never raises; returns [] on any unexpected issue or if the table is missing/empty.
     """
-    with contextlib.ExitStack() as stack:
-        try:
-            con = stack.enter_context(sqlite3.connect(DB_PATH))
-            cur = con.cursor()
-            cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='reflex_registry'")
-            if not cur.fetchone():
-                return []
-            cur.execute("SELECT * FROM reflex_registry")
-            rows = cur.fetchall()
-            if not rows:
-                return []
-            results = _rows_to_dicts(cur, rows)
-            return [_normalize_possible_paths(r) for r in results]
-        except Exception:
-            # Tests expect robustness: on any issue, return an empty list rather than raising.
+    try:
+        con = read_connection(DB_PATH)  # pooled, read-only; missing DB raises -> []
+        cur = con.cursor()
+        cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='reflex_registry'")
+        if not cur.fetchone():
             return []
+        cur.execute("SELECT * FROM reflex_registry")
+        rows = cur.fetchall()
+        if not rows:
+            return []
+        results = _rows_to_dicts(cur, rows)
+        return [_normalize_possible_paths(r) for r in results]
+    except Exception:
+        # Tests expect robustness: on any issue, return an empty list rather than raising.
+        return []
 
 
 __all__ = ["fetch_all_reflexes"]
@@ -0,0 +1,207 @@
+# core/repo_scanner.py
+# Single-pass repository scanner shared by the static compliance tools.
+# - One os.walk of the tree (pruning __pycache__/.venv/venv/.git); each file some checker wants is read once,
+#   decoded once (strict UTF-8, with an errors="ignore" fallback) and, when a checker asks for it,
+#   ast.parse()d once; every interested checker sees the same ScannedFile
+# - Checkers are plugins: subclasses of Checker registered with @register("name") (the tools register
+#   theirs at import); wants(rel) selects files, check(file) returns a small picklable per-file result,
+#   summarize()/render() turn the collected results into the tool's report
+# - jobs > 1 spreads the files over a pool of worker processes (fork where available); the checkers reach
+#   each worker through the pool initializer, so spawn (Windows) works too as long as they pickle
+#   (module-level classes); results come back pickled and are always returned in path order
+
+from __future__ import annotations
+
+import ast
+import multiprocessing
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Type
+
+PRUNE_DIRS = frozenset({"__pycache__", ".venv", "venv", ".git"})
+DEFAULT_CHUNKSIZE: int = 16
+
+_REGISTRY: Dict[str, Type["Checker"]] = {}
+# Per-process counters (files read, ASTs built); scan() reports the deltas of each file
+_STATS: Dict[str, int] = {"read": 0, "parsed": 0}
+
+
+class ScannedFile:
+    """One file as seen by every checker: raw bytes, decoded text and (lazily) its AST."""
+
+    __slots__ = ("root", "rel", "raw", "text", "utf8_ok", "_tree", "_parsed")
+
+    def __init__(self, root: str, rel: str, raw: Optional[bytes]) -> None:
+        self.root = root
+        self.rel = rel
+        self.raw = raw
+        if raw is None:  # unreadable
+            self.text, self.utf8_ok = "", False
+        else:
+            try:
+                self.text, self.utf8_ok = raw.decode("utf-8"), True
+            except UnicodeDecodeError:
+                self.text, self.utf8_ok = raw.decode("utf-8", errors="ignore"), False
+        self._tree: Optional[ast.AST] = None
+        self._parsed = False
+
+    @property
+    def path(self) -> Path:
+        return Path(self.root) / self.rel
+
+    @property
+    def suffix(self) -> str:
+        return os.path.splitext(self.rel)[1]
+
+    @property
+    def tree(self) -> Optional[ast.AST]:
+        """Module AST (parsed on first access, shared by all checkers); None if the file does not parse."""
+        if not self._parsed:
+            self._parsed = True
+            _STATS["parsed"] += 1
+            try:
+                self._tree = ast.parse(self.text)
+            except Exception:
+                self._tree = None
+        return self._tree
+
+
+class Checker:
+    """Base class for scanner plugins (see tools/compliance_sweep.py for the registered set)."""
+
+    name: str = ""
+
+    def wants(self, rel: str) -> bool:
+        """Whether this checker looks at the file (posix path relative to the scan root)."""
+        return rel.endswith(".py")
+
+    def check(self, f: ScannedFile) -> Any:
+        raise NotImplementedError
+
+    def summarize(self, results: List[Tuple[str, Any]]) -> Dict[str, Any]:
+        """Report data from (path, check result) pairs in path order."""
+        return {"scanned": len(results)}
+
+    def render(self, summary: Dict[str, Any]) -> List[str]:
+        """Console lines for a summary (the tool's historical output)."""
+        return [f"{self.name}: scanned {summary.get('scanned', 0)} files"]
+
+
+def register(name: str) -> Callable[[Type[Checker]], Type[Checker]]:
+    """Class decorator: make a Checker available to the combined sweep under name."""
+    def deco(cls: Type[Checker]) -> Type[Checker]:
+        cls.name = name
+        _REGISTRY[name] = cls
+        return cls
+    return deco
+
+
+def registered() -> Dict[str, Type[Checker]]:
+    return dict(_REGISTRY)
+
+
+def walk(root: Path) -> Iterable[str]:
+    """Every file under root as a posix path relative to root, pruned directories skipped."""
+    base = os.fspath(root)
+    for dirpath, dirnames, filenames in os.walk(base):
+        dirnames[:] = sorted(d for d in dirnames if d not in PRUNE_DIRS)
+        rel_dir = os.path.relpath(dirpath, base)
+        for name in sorted(filenames):
+            yield name if rel_dir == "." else f"{rel_dir}/{name}".replace(os.sep, "/")
+
+
+# Checkers of the running scan (the parent's, or a pool worker's copy set by _init_worker)
+_ACTIVE: Tuple[Checker, ...] = ()
+
+
+def _init_worker(checkers: Tuple[Checker, ...]) -> None:
+    global _ACTIVE
+    _ACTIVE = checkers
+
+
+def _scan_one(task: Tuple[str, str, Tuple[int, ...]]) -> Tuple[str, Dict[int, Any], Dict[str, int]]:
+    root, rel, which = task
+    before = dict(_STATS)
+    try:
+        raw: Optional[bytes] = (Path(root) / rel).read_bytes()
+    except OSError:
+        raw = None
+    _STATS["read"] += 1
+    f = ScannedFile(root, rel, raw)
+    out = {i: _ACTIVE[i].check(f) for i in which}
+    return rel, out, {k: _STATS[k] - before[k] for k in _STATS}
+
+
+def _pool_context() -> Any:
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("fork" if "fork" in methods else None)
+
+
+def scan(
+    root: Path,
+    checkers: Sequence[Checker],
+    *,
+    jobs: int = 1,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+) -> Tuple[Dict[str, List[Tuple[str, Any]]], Dict[str, int]]:
+    """
+    Walk root once and run every checker on the files it wants.
+    Returns ({checker name: [(path, result), ...]}, {"walked", "read", "parsed", "jobs"}).
+    Paths are reported as (root / rel).as_posix(), like the tools' former rglob() output.
+    """
+    global _ACTIVE
+    names = [c.name for c in checkers]
+    if len(set(names)) != len(names):
+        raise ValueError(f"duplicate checker names: {names}")
+    root_s = os.fspath(root)
+    tasks: List[Tuple[str, str, Tuple[int, ...]]] = []
+    walked = 0
+    for rel in walk(Path(root_s)):
+        walked += 1
+        which = tuple(i for i, c in enumerate(checkers) if c.wants(rel))
+        if which:
+            tasks.append((root_s, rel, which))
+
+    stats = {"walked": walked, "read": 0, "parsed": 0, "jobs": max(1, jobs)}
+    collected: List[Tuple[str, Dict[int, Any]]] = []
+    previous, _ACTIVE = _ACTIVE, tuple(checkers)
+    try:
+        if jobs <= 1 or len(tasks) < 2:
+            for rel, out, delta in map(_scan_one, tasks):
+                collected.append((rel, out))
+                for k in ("read", "parsed"):
+                    stats[k] += delta[k]
+        else:
+            with _pool_context().Pool(processes=jobs, initializer=_init_worker, initargs=(_ACTIVE,)) as pool:
+                for rel, out, delta in pool.imap_unordered(_scan_one, tasks, chunksize=max(1, chunksize)):
+                    collected.append((rel, out))
+                    for k in ("read", "parsed"):
+                        stats[k] += delta[k]
+    finally:
+        _ACTIVE = previous
+
+    collected.sort(key=lambda item: item[0])
+    results: Dict[str, List[Tuple[str, Any]]] = {c.name: [] for c in checkers}
+    for rel, out in collected:
+        shown = (Path(root_s) / rel).as_posix()
+        for i, res in out.items():
+            results[checkers[i].name].append((shown, res))
+    return results, stats
+
+
+def run(root: Path, checkers: Sequence[Checker], *, jobs: int = 1) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, int]]:
+    """scan() followed by each checker's summarize(): ({name: summary}, stats)."""
+    results, stats = scan(root, checkers, jobs=jobs)
+    return {c.name: c.summarize(results[c.name]) for c in checkers}, stats
+
+
+__all__ = [
+    "PRUNE_DIRS",
+    "ScannedFile",
+    "Checker",
+    "register",
+    "registered",
+    "walk",
+    "scan",
+    "run",
+]
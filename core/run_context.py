@@ -0,0 +1,37 @@
+# core/run_context.py
+# Ambient run_id for the memory/trace loggers.
+# - run_scope(run_id) binds a run for the current thread/task (contextvars; copied into asyncio.to_thread)
+# - resolve_run_id(): explicit run_id= argument, else the bound run. content["run_id"] is NOT used:
+#   tools that merely take a run id as a parameter (alignment, auditor) must not be attributed to that run
+# - The resolved id is written as a top-level "run_id" field (and the DB run_id column) at write time
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, Optional
+
+_RUN_ID: ContextVar[Optional[str]] = ContextVar("will_run_id", default=None)
+
+
+def current_run_id() -> Optional[str]:
+    return _RUN_ID.get()
+
+
+@contextmanager
+def run_scope(run_id: Optional[str]) -> Iterator[Optional[str]]:
+    """Tag every event logged inside the block with run_id (nesting restores the outer run)."""
+    token = _RUN_ID.set(str(run_id) if run_id is not None else None)
+    try:
+        yield run_id
+    finally:
+        _RUN_ID.reset(token)
+
+
+def resolve_run_id(explicit: Any = None) -> Optional[str]:
+    if explicit is not None:
+        return str(explicit)
+    return _RUN_ID.get()
+
+
+__all__ = ["current_run_id", "run_scope", "resolve_run_id"]
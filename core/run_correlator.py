@@ -0,0 +1,158 @@
+# core/run_correlator.py
+# Single-pass memory↔trace correlation of run lifecycles, keyed by run_id.
+# - Each track is streamed oldest-first (DB cursor by id, or archives + live NDJSON files) and the two
+#   streams are merged by timestamp (heapq.merge), so the full history is audited in one pass
+# - Lifecycle events are matched on their exact message ("snapshot_wrapper start" / "... done"),
+#   the run_id comes from the dedicated column/field written at log time (content.run_id for old rows)
+# - Only (ts, track, kind, run_id) tuples are kept per event; content is parsed only for legacy rows
+
+from __future__ import annotations
+
+import ast
+import heapq
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from core import log_rotation
+from core.connection_manager import read_connection
+from core.log_index import query
+
+LIFECYCLE: Dict[str, str] = {"snapshot_wrapper start": "start", "snapshot_wrapper done": "done"}
+ISSUE_KEYS = ("memory_only_starts", "trace_only_starts", "memory_only_dones", "trace_only_dones", "duplicates")
+
+# (ts, track, kind, run_id)
+Event = Tuple[str, str, str, str]
+
+NO_RUN_ID = "no-runid"
+
+# table -> (text column, content column); see core/migrations/m0001_baseline.py and m0002
+_EVENT_COLUMNS: Dict[str, Tuple[str, str]] = {
+    "memory_events": ("message", "payload"),
+    "trace_events": ("message", "context"),
+}
+
+
+def _legacy_run_id(raw: Any) -> Optional[str]:
+    """run_id from a content string written before the run_id column/field existed."""
+    if not isinstance(raw, str) or "run_id" not in raw:
+        return None
+    for parse in (json.loads, ast.literal_eval):
+        try:
+            obj = parse(raw)
+        except Exception:
+            continue
+        if isinstance(obj, dict) and obj.get("run_id") is not None:
+            return str(obj["run_id"])
+        return None
+    return None
+
+
+def db_events(
+    db_path: Path,
+    table: str,
+    track: str,
+    *,
+    run_id: Optional[str] = None,
+    window: Optional[int] = None,
+) -> Iterator[Event]:
+    """Lifecycle events of one events table, oldest first (last `window` rows when given)."""
+    text_col, content_col = _EVENT_COLUMNS[table]
+    cols = f"id, ts, {text_col}, run_id, CASE WHEN run_id IS NULL THEN {content_col} END"
+    where, params = [f"{text_col} IN ({', '.join('?' for _ in LIFECYCLE)})"], list(LIFECYCLE)
+    if run_id is not None:
+        where.append("run_id = ?")
+        params.append(run_id)
+    sql = f"SELECT {cols} FROM {table} WHERE {' AND '.join(where)}"
+    if window:
+        sql = f"SELECT * FROM ({sql} ORDER BY id DESC LIMIT ?) ORDER BY id"
+        params.append(int(window))
+    else:
+        sql += " ORDER BY id"
+    for _id, ts, text, rid, legacy in read_connection(db_path).execute(sql, params):
+        yield (ts or "", track, LIFECYCLE[text], rid or _legacy_run_id(legacy) or NO_RUN_ID)
+
+
+def _record_event(rec: Dict[str, Any], track: str) -> Optional[Event]:
+    kind = LIFECYCLE.get((rec.get("message") or rec.get("description") or "").strip())
+    if kind is None:
+        return None
+    rid = rec.get("run_id")
+    if rid is None and isinstance(rec.get("content"), dict):
+        rid = rec["content"].get("run_id")
+    return (rec.get("ts") or "", track, kind, str(rid) if rid is not None else NO_RUN_ID)
+
+
+def file_events(
+    key: str,
+    files: Sequence[Path],
+    track: str,
+    *,
+    run_id: Optional[str] = None,
+    window: Optional[int] = None,
+) -> Iterator[Event]:
+    """
+    Lifecycle events of one NDJSON log, oldest first: rotated archives of `key`, then the live files.
+    run_id narrows the live files through the sidecar index; window keeps the newest N snapshot records.
+    """
+    if window:
+        records: Iterable[Dict[str, Any]] = query(list(files), tag="snapshot", run_id=run_id, limit=window)
+    else:
+        if run_id is not None:
+            archived = log_rotation.iter_history(key, [])
+            records = (r for part in (archived, query(list(files), run_id=run_id)) for r in part)
+        else:
+            records = log_rotation.iter_history(key, files)
+    for rec in records:
+        ev = _record_event(rec, track)
+        if ev is not None and (run_id is None or ev[3] == run_id):
+            yield ev
+
+
+def correlate(memory: Iterable[Event], trace: Iterable[Event]) -> Dict[str, Any]:
+    """
+    Merge both tracks by timestamp in one pass and classify every run's lifecycle.
+    Issue lists (ISSUE_KEYS) plus informational ones: "incomplete" (a start without any done,
+    e.g. a run still in progress) and "out_of_order" (a done seen before any start of that run).
+    """
+    counts: Dict[str, List[int]] = {}  # run_id -> [memory start, trace start, memory done, trace done]
+    out_of_order: set = set()
+    slot = {("memory", "start"): 0, ("trace", "start"): 1, ("memory", "done"): 2, ("trace", "done"): 3}
+    events = 0
+    for _ts, track, kind, rid in heapq.merge(memory, trace, key=lambda e: e[0]):
+        events += 1
+        c = counts.get(rid)
+        if c is None:
+            c = counts[rid] = [0, 0, 0, 0]
+        if kind == "done" and not (c[0] or c[1]):
+            out_of_order.add(rid)
+        c[slot[(track, kind)]] += 1
+
+    report: Dict[str, Any] = {k: [] for k in ISSUE_KEYS}
+    report["incomplete"] = []
+    for rid in sorted(counts):
+        ms, ts, md, td = counts[rid]
+        if ms and not ts:
+            report["memory_only_starts"].append(rid)
+        if ts and not ms:
+            report["trace_only_starts"].append(rid)
+        if md and not td:
+            report["memory_only_dones"].append(rid)
+        if td and not md:
+            report["trace_only_dones"].append(rid)
+        if max(ms, ts, md, td) > 1:
+            report["duplicates"].append(rid)
+        if (ms or ts) and not (md or td):
+            report["incomplete"].append(rid)
+    report["out_of_order"] = sorted(out_of_order)
+    report["runs"] = len(counts)
+    report["events"] = events
+    return report
+
+
+def issues(report: Dict[str, Any]) -> Dict[str, List[str]]:
+    """The non-empty issue lists of a correlate() report."""
+    return {k: report[k] for k in ISSUE_KEYS if report.get(k)}
+
+
+__all__ = ["LIFECYCLE", "ISSUE_KEYS", "NO_RUN_ID", "db_events", "file_events", "correlate", "issues"]
@@ -0,0 +1,162 @@
+# core/schema_migrator.py
+# Versioned schema migrations for will_data.db.
+# - Steps live in core/migrations/mNNNN_<name>.py (DESCRIPTION, up(cur), verify(cur))
+# - Applied versions are recorded in schema_migrations (version, name, applied_ts)
+# - All pending steps run in ONE transaction (BEGIN IMMEDIATE); any failed up/verify rolls back everything
+# - dry_run executes the same steps and verifications, then rolls back
+
+from __future__ import annotations
+
+import datetime
+import importlib
+import pkgutil
+import re
+import sqlite3
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+MIGRATIONS_PACKAGE = "core.migrations"
+_NAME_RE = re.compile(r"^m(\d{4})_(\w+)$")
+
+
+class MigrationError(RuntimeError):
+    """Raised when a migration step fails or its verify() reports problems."""
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    description: str
+    up: Callable[[sqlite3.Cursor], None]
+    verify: Callable[[sqlite3.Cursor], List[str]]
+
+
+@lru_cache(maxsize=1)
+def _discover() -> Tuple[Migration, ...]:
+    pkg = importlib.import_module(MIGRATIONS_PACKAGE)
+    found: List[Migration] = []
+    for info in pkgutil.iter_modules(pkg.__path__):
+        m = _NAME_RE.match(info.name)
+        if not m:
+            continue
+        mod = importlib.import_module(f"{MIGRATIONS_PACKAGE}.{info.name}")
+        found.append(
+            Migration(
+                version=int(m.group(1)),
+                name=m.group(2),
+                description=getattr(mod, "DESCRIPTION", ""),
+                up=mod.up,
+                verify=getattr(mod, "verify", lambda cur: []),
+            )
+        )
+    found.sort(key=lambda mig: mig.version)
+    versions = [mig.version for mig in found]
+    if len(set(versions)) != len(versions):
+        raise MigrationError(f"duplicate migration versions in {MIGRATIONS_PACKAGE}: {versions}")
+    return tuple(found)
+
+
+def migrations() -> List[Migration]:
+    return list(_discover())
+
+
+def latest_version() -> int:
+    found = _discover()
+    return found[-1].version if found else 0
+
+
+def _ensure_ledger(cur: sqlite3.Cursor) -> None:
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_ts TEXT NOT NULL
+        )
+        """
+    )
+
+
+def applied_versions(con: sqlite3.Connection) -> List[int]:
+    cur = con.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='schema_migrations'")
+    if cur.fetchone() is None:
+        return []
+    return [r[0] for r in con.execute("SELECT version FROM schema_migrations ORDER BY version")]
+
+
+def current_version(con: sqlite3.Connection) -> int:
+    done = applied_versions(con)
+    return done[-1] if done else 0
+
+
+def pending(con: sqlite3.Connection) -> List[Migration]:
+    done = set(applied_versions(con))
+    return [mig for mig in _discover() if mig.version not in done]
+
+
+def verify_schema(con: sqlite3.Connection) -> List[str]:
+    """Run every migration's verify() against the live schema; returns problems (empty == OK)."""
+    cur = con.cursor()
+    problems: List[str] = []
+    for mig in _discover():
+        problems += [f"m{mig.version:04d}: {p}" for p in mig.verify(cur)]
+    return problems
+
+
+def migrate(con: sqlite3.Connection, *, dry_run: bool = False, target: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Bring the database up to `target` (default: latest) in a single transaction.
+    Returns {"from", "to", "applied": [...], "dry_run"}; raises MigrationError (after rollback) on failure.
+    """
+    if not pending(con) and not dry_run:
+        version = current_version(con)
+        return {"from": version, "to": version, "applied": [], "dry_run": False}
+
+    if con.in_transaction:
+        con.commit()
+    cur = con.cursor()
+    cur.execute("BEGIN IMMEDIATE")
+    try:
+        _ensure_ledger(cur)
+        start = current_version(con)  # re-read under the write lock (another process may have migrated)
+        todo = [m for m in pending(con) if target is None or m.version <= target]
+        applied: List[str] = []
+        for mig in todo:
+            label = f"m{mig.version:04d}_{mig.name}"
+            try:
+                mig.up(cur)
+            except sqlite3.Error as e:
+                raise MigrationError(f"{label}: up failed: {e}") from e
+            problems = mig.verify(cur)
+            if problems:
+                raise MigrationError(f"{label}: verify failed: {'; '.join(problems)}")
+            cur.execute(
+                "INSERT INTO schema_migrations (version, name, applied_ts) VALUES (?, ?, ?)",
+                (mig.version, mig.name, datetime.datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")),
+            )
+            applied.append(label)
+        end = todo[-1].version if todo else start
+    except BaseException:
+        con.rollback()
+        raise
+    if dry_run:
+        con.rollback()
+    else:
+        con.commit()
+    return {"from": start, "to": end, "applied": applied, "dry_run": dry_run}
+
+
+__all__ = [
+    "Migration",
+    "MigrationError",
+    "MIGRATIONS_PACKAGE",
+    "migrations",
+    "latest_version",
+    "applied_versions",
+    "current_version",
+    "pending",
+    "verify_schema",
+    "migrate",
+]
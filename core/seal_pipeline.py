@@ -0,0 +1,226 @@
+# core/seal_pipeline.py
+# Cached execution of a declarative seal pipeline (tools/phase_0_5_sealer.py).
+# - Steps (core.step_runner.Step) declare their inputs: file globs and will_data.db tables, plus `after`
+#   dependencies; the pipeline runs as a DAG (in-process, or across a pre-forked pool with jobs > 1)
+# - Right before a step would run (its dependencies are done), its inputs are hashed: sha256 of every
+#   matching file and of every declared table's rows. A step whose digest equals the one recorded at the
+#   last green seal is not run; its recorded result is reported as "cached"
+# - The cache (root/seal_cache.json) is only rewritten when the whole pipeline is green. File hashes are
+#   memoized by (size, mtime_ns), so unchanged files are only stat()ed
+# - Steps that write (bootstrap, the snapshot tests) should declare code inputs only; readers of their
+#   output depend on them and declare the tables they read
+# - memory_events/trace_events specs follow the log sink: when the sink does not write the DB, the same
+#   WHERE clause is evaluated over the NDJSON history (archives + live logs) loaded into an in-memory
+#   mirror of the table, so a wrapper run between seals still invalidates its readers
+
+from __future__ import annotations
+
+import fnmatch
+import hashlib
+import json
+import os
+import re
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from core import log_db_sink, log_rotation
+from core.connection_manager import read_connection
+from core.log_buffer import flush_all
+from core.log_db_sink import sink_mode
+from core.memory_interface import memory_log_files, memory_log_location
+from core.sqlite_bootstrap import DB_PATH
+from core.step_runner import OK_STATUSES, Step, first_failure, run_steps
+from core.trace_logger import LOG_PATH as TRACE_PATH
+
+CACHE_PATH = Path("root/seal_cache.json")
+CACHE_VERSION = 1
+
+_TABLE = re.compile(r"^(\w+)(?:\s+WHERE\s+(.+))?$", re.IGNORECASE | re.DOTALL)
+_CHUNK = 1 << 20
+
+
+def load_cache(path: Path = CACHE_PATH) -> Dict[str, Any]:
+    try:
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        if isinstance(data, dict) and data.get("version") == CACHE_VERSION:
+            data.setdefault("steps", {})
+            data.setdefault("files", {})
+            return data
+    except (OSError, ValueError):
+        pass
+    return {"version": CACHE_VERSION, "steps": {}, "files": {}}
+
+
+def save_cache(data: Dict[str, Any], path: Path = CACHE_PATH) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp.json")
+    tmp.write_text(json.dumps(data, ensure_ascii=False, indent=2, sort_keys=True) + "\n", encoding="utf-8", newline="\n")
+    tmp.replace(path)
+
+
+def expand_inputs(patterns: Iterable[str], root: Path = Path(".")) -> List[str]:
+    """Files (posix, relative to root) matched by the include globs minus the "!glob" excludes."""
+    include = [p for p in patterns if not p.startswith("!")]
+    exclude = [p[1:] for p in patterns if p.startswith("!")]
+    found = set()
+    for pattern in include:
+        for p in root.glob(pattern):
+            if p.is_file():
+                rel = p.relative_to(root).as_posix()
+                if not any(fnmatch.fnmatch(rel, x) for x in exclude):
+                    found.add(rel)
+    return sorted(found)
+
+
+def file_digest(path: str, memo: Dict[str, Any], seen: Dict[str, Any]) -> str:
+    """sha256 of a file, reusing the memoized digest while size and mtime are unchanged."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return "missing"
+    hit = memo.get(path)
+    if hit and hit[0] == st.st_size and hit[1] == st.st_mtime_ns:
+        seen[path] = hit
+        return hit[2]
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(_CHUNK), b""):
+            h.update(block)
+    seen[path] = [st.st_size, st.st_mtime_ns, h.hexdigest()]
+    return h.hexdigest()
+
+
+def _rows_digest(con: sqlite3.Connection, table: str, where: Optional[str]) -> str:
+    sql = f"SELECT * FROM {table}" + (f" WHERE {where}" if where else "")
+    if table != "sqlite_master":
+        sql += " ORDER BY rowid"
+    else:
+        sql += " ORDER BY type, name"
+    h = hashlib.sha256()
+    try:
+        for row in con.execute(sql):
+            h.update(repr(row).encode("utf-8"))
+            h.update(b"\n")
+    except sqlite3.OperationalError:
+        return "missing"
+    return h.hexdigest()
+
+
+def _parse_spec(spec: str) -> Tuple[str, Optional[str]]:
+    m = _TABLE.match(spec.strip())
+    if m is None:
+        raise ValueError(f"bad table spec: {spec!r}")
+    return m.group(1), m.group(2)
+
+
+def table_digest(spec: str, db_path: Path = DB_PATH) -> str:
+    """sha256 of a table's rows in rowid order ("table WHERE <sql>" hashes a subset); "missing" if absent."""
+    table, where = _parse_spec(spec)
+    if not Path(db_path).exists():
+        return "missing"
+    return _rows_digest(read_connection(db_path), table, where)
+
+
+def _log_history(table: str) -> Iterable[Dict[str, Any]]:
+    flush_all()
+    if table == "memory_events":
+        return log_rotation.iter_history(memory_log_location().as_posix(), memory_log_files())
+    return log_rotation.iter_history(TRACE_PATH.as_posix(), [TRACE_PATH])
+
+
+def log_digest(spec: str) -> str:
+    """table_digest() of a memory_events/trace_events spec, computed from the NDJSON logs and archives."""
+    table, where = _parse_spec(spec)
+    rows = log_db_sink.memory_rows if table == "memory_events" else log_db_sink.trace_rows
+    con = sqlite3.connect(":memory:")
+    try:
+        con.execute(f"CREATE TABLE {table} ({', '.join(log_db_sink.REQUIRED_COLUMNS[table])})")
+        con.executemany(log_db_sink.insert_sql(table), rows(_log_history(table)))
+        return _rows_digest(con, table, where)
+    finally:
+        con.close()
+
+
+def spec_digest(spec: str, db_path: Path = DB_PATH) -> str:
+    """Digest of a declared table input, read from wherever the log sink puts log tables."""
+    table, _ = _parse_spec(spec)
+    if table in log_db_sink.REQUIRED_COLUMNS and not log_db_sink.writes_db():
+        return log_digest(spec)
+    return table_digest(spec, db_path)
+
+
+def input_digest(
+    step: Step,
+    *,
+    memo: Dict[str, Any],
+    seen: Dict[str, Any],
+    db_path: Path = DB_PATH,
+    root: Path = Path("."),
+) -> str:
+    """Digest over the step definition, its declared files and tables, and (for table readers) the log sink."""
+    files = {rel: file_digest((root / rel).as_posix(), memo, seen) for rel in expand_inputs(step.inputs, root)}
+    tables = {spec: spec_digest(spec, db_path) for spec in step.tables}
+    detail = {
+        "step": [step.module, list(step.args), step.entry],
+        "sink": sink_mode() if step.tables else None,
+        "files": files,
+        "tables": tables,
+    }
+    return hashlib.sha256(json.dumps(detail, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def run_pipeline(
+    steps: Sequence[Step],
+    *,
+    jobs: int = 1,
+    cache_path: Path = CACHE_PATH,
+    use_cache: bool = True,
+    db_path: Path = DB_PATH,
+) -> Dict[str, Any]:
+    """
+    Run the DAG, answering unchanged steps from the cache.
+    Returns {"results": [...], "green": bool, "cached": n, "ran": n}.
+    """
+    cache = load_cache(cache_path)
+    memo: Dict[str, Any] = cache["files"]
+    seen: Dict[str, Any] = {}
+    digests: Dict[str, str] = {}
+
+    def reuse(step: Step) -> Optional[Dict[str, Any]]:
+        digests[step.key] = input_digest(step, memo=memo, seen=seen, db_path=db_path)
+        hit = cache["steps"].get(step.key)
+        if use_cache and hit and hit.get("digest") == digests[step.key] and hit["result"]["status"] == "ok":
+            return dict(hit["result"], status="cached", elapsed_s=0.0, pid=None)
+        return None
+
+    results = run_steps(steps, jobs=jobs, reuse=reuse)
+    green = first_failure(results) is None and all(r["status"] in OK_STATUSES for r in results)
+    if green:
+        recorded: Dict[str, Any] = {}
+        for r in results:
+            prev = cache["steps"].get(r["step"])
+            result = prev["result"] if r["status"] == "cached" else r
+            recorded[r["step"]] = {"digest": digests[r["step"]], "result": result}
+        save_cache({"version": CACHE_VERSION, "steps": recorded, "files": seen}, cache_path)
+    return {
+        "results": results,
+        "green": green,
+        "cached": sum(1 for r in results if r["status"] == "cached"),
+        "ran": sum(1 for r in results if r["status"] in ("ok", "failed")),
+    }
+
+
+__all__ = [
+    "CACHE_PATH",
+    "load_cache",
+    "save_cache",
+    "expand_inputs",
+    "file_digest",
+    "table_digest",
+    "log_digest",
+    "spec_digest",
+    "input_digest",
+    "run_pipeline",
+]
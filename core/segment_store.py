@@ -0,0 +1,259 @@
+# core/segment_store.py
+# Append-only segmented NDJSON storage for high-volume logs.
+# - Records are appended to rolling segment files (segment-000001.ndjson, ...)
+# - A small sidecar index (index.json) lists sealed segments and the active one
+# - Appends cost O(batch), never O(history); UTF-8 writes, forward slashes
+# - Record lines are encoded by core.serializer (compact; orjson/msgspec when installed)
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from core import serializer
+
+# Roll to a new segment once the active one grows past this many bytes
+SEGMENT_MAX_BYTES: int = 4 * 1024 * 1024
+
+INDEX_NAME = "index.json"
+INDEX_VERSION = 1
+
+
+def _segment_name(seq: int) -> str:
+    return f"segment-{seq:06d}.ndjson"
+
+
+def _first_last_ts(path: Path) -> Dict[str, Optional[str]]:
+    """Peek the first and last record timestamps of a segment (reads only the edges)."""
+    first: Optional[str] = None
+    last: Optional[str] = None
+    try:
+        with path.open("rb") as f:
+            head = f.readline()
+            if head.strip():
+                first = json.loads(head).get("ts")
+            size = f.seek(0, os.SEEK_END)
+            f.seek(max(0, size - 64 * 1024))
+            tail = [ln for ln in f.read().splitlines() if ln.strip()]
+            if tail:
+                last = json.loads(tail[-1]).get("ts")
+    except Exception:
+        pass
+    return {"first_ts": first, "last_ts": last}
+
+
+class SegmentStore:
+    """
+    Directory of NDJSON segments plus a sidecar index.
+
+    Layout:
+      <base_dir>/index.json            -> {"version", "active", "segments": [...], "imported": [...]}
+      <base_dir>/segment-000001.ndjson -> one JSON record per line
+    Sealed segments carry record counts and first/last timestamps so readers
+    can skip or size them without parsing.
+    """
+
+    def __init__(self, base_dir: Path, *, max_bytes: int = SEGMENT_MAX_BYTES) -> None:
+        self.base_dir = Path(base_dir)
+        self.max_bytes = int(max_bytes)
+        self._index: Optional[Dict[str, Any]] = None
+        self._index_mtime: Optional[int] = None
+
+    # ---------- index ----------
+
+    @property
+    def index_path(self) -> Path:
+        return self.base_dir / INDEX_NAME
+
+    def _fresh_index(self) -> Dict[str, Any]:
+        return {"version": INDEX_VERSION, "active": _segment_name(1), "segments": [], "imported": []}
+
+    def _load_index(self) -> Dict[str, Any]:
+        # Re-read only when another process has rolled a segment since our last look
+        try:
+            mtime = self.index_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            if self._index is None:
+                self._index = self._fresh_index()
+            return self._index
+        if self._index is None or mtime != self._index_mtime:
+            try:
+                data = json.loads(self.index_path.read_text(encoding="utf-8"))
+                if not isinstance(data, dict) or "active" not in data:
+                    raise ValueError("bad index")
+            except Exception:
+                data = self._rebuild_index()
+            self._index = data
+            self._index_mtime = mtime
+        return self._index
+
+    def _save_index(self, data: Dict[str, Any]) -> None:
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.index_path.with_suffix(".tmp.json")
+        tmp.write_text(json.dumps(data, ensure_ascii=False, indent=2) + "\n", encoding="utf-8", newline="\n")
+        tmp.replace(self.index_path)
+        self._index = data
+        self._index_mtime = self.index_path.stat().st_mtime_ns
+
+    def _rebuild_index(self) -> Dict[str, Any]:
+        """Recover the index from segment files on disk (used when index.json is missing/corrupt)."""
+        names = sorted(p.name for p in self.base_dir.glob("segment-*.ndjson"))
+        data = self._fresh_index()
+        if not names:
+            return data
+        for name in names[:-1]:
+            data["segments"].append(self._seal_entry(name))
+        data["active"] = names[-1]
+        return data
+
+    def _seal_entry(self, name: str) -> Dict[str, Any]:
+        path = self.base_dir / name
+        with path.open("rb") as f:
+            records = sum(1 for ln in f if ln.strip())
+        entry: Dict[str, Any] = {"name": name, "records": records, "bytes": path.stat().st_size}
+        entry.update(_first_last_ts(path))
+        return entry
+
+    def _roll(self, data: Dict[str, Any]) -> None:
+        sealed = data["active"]
+        seq = int(sealed.split("-")[1].split(".")[0]) + 1
+        data = dict(data)
+        data["segments"] = list(data["segments"]) + [self._seal_entry(sealed)]
+        data["active"] = _segment_name(seq)
+        self._save_index(data)
+
+    # ---------- writes ----------
+
+    def append(self, record: Dict[str, Any]) -> None:
+        self.append_many([record])
+
+    def append_many(self, records: Iterable[Dict[str, Any]]) -> int:
+        """Append records to the active segment; rolls once it exceeds max_bytes. Returns count written."""
+        records = list(records)
+        if not records:
+            return 0
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+        data = self._load_index()
+        active = self.base_dir / data["active"]
+        with active.open("ab") as f:
+            f.write(serializer.ndjson(records))
+            size = f.tell()
+        if not self.index_path.exists():
+            self._save_index(data)
+        if size >= self.max_bytes:
+            self._roll(data)
+        return len(records)
+
+    def import_json_array(self, path: Path) -> int:
+        """
+        One-time import of a legacy JSON-array log into the store.
+        The file name is remembered in the index (even when the file is absent)
+        so later exports to the same path are never re-imported.
+        """
+        path = Path(path)
+        data = self._load_index()
+        if path.name in data.get("imported", []):
+            return 0
+        items: Any = []
+        if path.exists():
+            text = path.read_text(encoding="utf-8")
+            try:
+                items = json.loads(text) if text.strip() else []
+            except json.JSONDecodeError:
+                # Legacy newline-delimited variant: salvage line by line
+                items = []
+                for line in text.splitlines():
+                    try:
+                        items.append(json.loads(line))
+                    except Exception:
+                        continue
+        if isinstance(items, dict):
+            items = [items]
+        count = self.append_many(r for r in items if isinstance(r, dict)) if isinstance(items, list) else 0
+        data = dict(self._load_index())
+        data["imported"] = list(data.get("imported", [])) + [path.name]
+        self._save_index(data)
+        return count
+
+    # ---------- reads ----------
+
+    def segment_entries(self) -> List[Dict[str, Any]]:
+        """Sealed segment entries followed by the active segment (records/ts unknown until sealed)."""
+        data = self._load_index()
+        active = {"name": data["active"], "records": None, "first_ts": None, "last_ts": None}
+        return list(data["segments"]) + [active]
+
+    def sealed_entries(self) -> List[Dict[str, Any]]:
+        return list(self._load_index()["segments"])
+
+    def drop_sealed(self, name: str) -> None:
+        """Forget a sealed segment (after core.log_rotation archived it)."""
+        data = dict(self._load_index())
+        data["segments"] = [e for e in data["segments"] if e.get("name") != name]
+        self._save_index(data)
+
+    def active_segment(self) -> Path:
+        """The segment the next append_many() writes to."""
+        return self.base_dir / self._load_index()["active"]
+
+    def segments(self) -> List[Path]:
+        return [self.base_dir / e["name"] for e in self.segment_entries() if (self.base_dir / e["name"]).exists()]
+
+    def iter_records(self) -> Iterator[Dict[str, Any]]:
+        """Yield records oldest-first across all segments; malformed lines are skipped."""
+        for seg in self.segments():
+            with seg.open("r", encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        obj = json.loads(line)
+                    except Exception:
+                        continue
+                    if isinstance(obj, dict):
+                        yield obj
+
+    def read_all(self) -> List[Dict[str, Any]]:
+        return list(self.iter_records())
+
+    def count(self) -> int:
+        total = 0
+        for e in self.segment_entries():
+            if e.get("records") is not None:
+                total += int(e["records"])
+                continue
+            path = self.base_dir / e["name"]
+            if path.exists():
+                with path.open("rb") as f:
+                    total += sum(1 for ln in f if ln.strip())
+        return total
+
+    def export_json_array(self, dest: Path, *, indent: Optional[int] = 2) -> Path:
+        """Write the legacy single-array view of every record to dest (streamed, UTF-8)."""
+        return write_json_array(self.iter_records(), dest, indent=indent)
+
+
+def write_json_array(records: Iterable[Dict[str, Any]], dest: Path, *, indent: Optional[int] = 2) -> Path:
+    """Stream records into dest as one JSON array (atomic replace, UTF-8)."""
+    dest = Path(dest)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dest.with_suffix(".tmp.json")
+    pad = " " * indent if indent else ""
+    nl = "\n" if indent else ""
+    with tmp.open("w", encoding="utf-8", newline="\n") as f:
+        f.write("[")
+        first = True
+        for rec in records:
+            body = json.dumps(rec, ensure_ascii=False, indent=indent)
+            if indent:
+                body = "\n".join(pad + ln for ln in body.splitlines())
+            f.write(("" if first else ",") + nl + body)
+            first = False
+        f.write(("" if first else nl) + "]\n")
+    tmp.replace(dest)
+    return dest
+
+
+__all__ = ["SegmentStore", "SEGMENT_MAX_BYTES", "write_json_array"]
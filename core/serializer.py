@@ -0,0 +1,130 @@
+# core/serializer.py
+# Pluggable JSON encoder for the log writers and snapshot metadata.
+# - Backends: orjson or msgspec when installed, stdlib json otherwise (WILL_JSON_BACKEND=auto|orjson|msgspec|json)
+# - Output is always UTF-8 (the ensure_ascii=False equivalent); compact by default, pretty=True gives indent=2
+# - Anything the fast backend rejects (ints over 64 bits, non-str keys it cannot coerce, ...) is retried
+#   with stdlib json, so a backend switch never loses an event that used to serialize
+# - Checksums/canonical forms stay on stdlib json (core.snapshot_manager) so digests do not depend on
+#   which backend happens to be installed
+# - The optional backends are imported on first use (backend()/available()), not at import time
+
+from __future__ import annotations
+
+import json
+import os
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+# Optional fast backends, bound by _load_backends() the first time a backend is needed
+_orjson: Any = None
+_msgspec: Any = None
+_LOADED = False
+
+BACKEND_ENV = "WILL_JSON_BACKEND"
+BACKENDS = ("orjson", "msgspec", "json")
+
+Default = Optional[Callable[[Any], Any]]
+
+
+def _json_encode(obj: Any, pretty: bool, sort_keys: bool, default: Default) -> bytes:
+    if pretty:
+        text = json.dumps(obj, ensure_ascii=False, indent=2, sort_keys=sort_keys, default=default)
+    else:
+        text = json.dumps(obj, ensure_ascii=False, separators=(",", ":"), sort_keys=sort_keys, default=default)
+    return text.encode("utf-8")
+
+
+def _orjson_encode(obj: Any, pretty: bool, sort_keys: bool, default: Default) -> bytes:
+    opts = _orjson.OPT_NON_STR_KEYS
+    if pretty:
+        opts |= _orjson.OPT_INDENT_2
+    if sort_keys:
+        opts |= _orjson.OPT_SORT_KEYS
+    return _orjson.dumps(obj, default=default, option=opts)
+
+
+_MSGSPEC_ENCODERS: Dict[tuple, Any] = {}
+
+
+def _msgspec_encode(obj: Any, pretty: bool, sort_keys: bool, default: Default) -> bytes:
+    key = (sort_keys, default)
+    enc = _MSGSPEC_ENCODERS.get(key)
+    if enc is None:
+        kwargs: Dict[str, Any] = {"enc_hook": default}
+        if sort_keys:
+            kwargs["order"] = "sorted"
+        enc = _MSGSPEC_ENCODERS[key] = _msgspec.json.Encoder(**kwargs)
+    out = enc.encode(obj)
+    return _msgspec.json.format(out, indent=2) if pretty else out
+
+
+_ENCODERS = {"orjson": _orjson_encode, "msgspec": _msgspec_encode, "json": _json_encode}
+_FAST_ERRORS: tuple = (TypeError, ValueError)
+
+_ACTIVE: Optional[str] = None
+
+
+def _load_backends() -> None:
+    global _orjson, _msgspec, _FAST_ERRORS, _LOADED
+    if _LOADED:
+        return
+    try:
+        import orjson as _orjson  # type: ignore
+    except ImportError:  # pragma: no cover - depends on the environment
+        _orjson = None
+    try:
+        import msgspec as _msgspec  # type: ignore
+    except ImportError:  # pragma: no cover - depends on the environment
+        _msgspec = None
+    if _msgspec is not None:
+        _FAST_ERRORS = (TypeError, ValueError, _msgspec.EncodeError)
+    _LOADED = True
+
+
+def available() -> List[str]:
+    """Backends importable in this environment, fastest first."""
+    _load_backends()
+    return [n for n, mod in (("orjson", _orjson), ("msgspec", _msgspec), ("json", json)) if mod is not None]
+
+
+def backend() -> str:
+    """Active backend name (resolved from WILL_JSON_BACKEND on first use, then cached)."""
+    global _ACTIVE
+    if _ACTIVE is None:
+        wanted = (os.environ.get(BACKEND_ENV) or "auto").strip().lower()
+        have = available()
+        _ACTIVE = wanted if wanted in have else have[0]
+    return _ACTIVE
+
+
+def set_backend(name: Optional[str]) -> str:
+    """Force a backend (None re-reads the environment); unavailable names fall back to the best available."""
+    global _ACTIVE
+    _ACTIVE = None
+    if name is not None:
+        _ACTIVE = name if name in available() else available()[0]
+    return backend()
+
+
+def dumpb(obj: Any, *, pretty: bool = False, sort_keys: bool = False, default: Default = None) -> bytes:
+    """UTF-8 JSON bytes for obj with the active backend."""
+    name = backend()
+    if name == "json":
+        return _json_encode(obj, pretty, sort_keys, default)
+    try:
+        return _ENCODERS[name](obj, pretty, sort_keys, default)
+    except _FAST_ERRORS:
+        return _json_encode(obj, pretty, sort_keys, default)
+
+
+def dumps(obj: Any, *, pretty: bool = False, sort_keys: bool = False, default: Default = None) -> str:
+    """JSON text for obj (same output as dumpb, decoded)."""
+    return dumpb(obj, pretty=pretty, sort_keys=sort_keys, default=default).decode("utf-8")
+
+
+def ndjson(records: Iterable[Any], *, default: Default = None) -> bytes:
+    """One compact JSON document per line, newline-terminated, ready for a binary append."""
+    lines = [dumpb(r, default=default) for r in records]
+    return b"\n".join(lines) + b"\n" if lines else b""
+
+
+__all__ = ["BACKENDS", "available", "backend", "set_backend", "dumpb", "dumps", "ndjson"]
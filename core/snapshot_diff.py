@@ -0,0 +1,180 @@
+# core/snapshot_diff.py
+# SQL-side diff engine for snapshot DB copies (used by core.snapshot_manager.compare_snapshots).
+# - ATTACHes pre/post copies read-only on one in-memory connection; nothing is loaded into Python dicts
+# - Keyed tables (PRIMARY KEY): added/removed via NOT EXISTS anti-joins, changed via a keyed join
+# - Keyless tables: rows are their own key (EXCEPT both ways), matching the old dict-by-row semantics
+# - Optional per-row NDJSON output, streamed with fetchmany() so memory stays bounded
+
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, IO, Iterator, List, Optional, Sequence, Tuple
+
+from core import serializer
+
+DEFAULT_BATCH: int = 1000
+
+
+def _q(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _tables(con: sqlite3.Connection, schema: str) -> List[str]:
+    cur = con.execute(f"SELECT name FROM {schema}.sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%' ORDER BY name;")
+    return [r[0] for r in cur.fetchall()]
+
+
+def _table_info(con: sqlite3.Connection, schema: str, table: str) -> Tuple[List[str], List[str]]:
+    """(columns in declared order, primary-key columns in key order)"""
+    rows = con.execute(f"PRAGMA {schema}.table_info({_q(table)});").fetchall()
+    cols = [r[1] for r in rows]
+    pk = [r[1] for r in sorted((r for r in rows if r[5]), key=lambda r: r[5])]
+    return cols, pk
+
+
+def _json_default(v: Any) -> Any:
+    if isinstance(v, (bytes, bytearray, memoryview)):
+        return bytes(v).hex()
+    return str(v)
+
+
+def _stream(con: sqlite3.Connection, sql: str, batch: int) -> Iterator[Sequence[Any]]:
+    cur = con.execute(sql)
+    while True:
+        rows = cur.fetchmany(batch)
+        if not rows:
+            return
+        yield from rows
+
+
+def _count(con: sqlite3.Connection, sql: str) -> int:
+    return int(con.execute(f"SELECT count(*) FROM ({sql});").fetchone()[0])
+
+
+class _Plan:
+    """SELECT statements (one per change kind) for one table present on both sides."""
+
+    def __init__(self, table: str, pre_cols: List[str], post_cols: List[str], key: List[str]) -> None:
+        t = _q(table)
+        self.key = key
+        self.post_cols = post_cols
+        self.pre_cols = pre_cols
+        if key:
+            on = " AND ".join(f"q.{_q(k)} IS p.{_q(k)}" for k in key)
+            post_sel = ", ".join(f"p.{_q(c)}" for c in post_cols)
+            pre_sel = ", ".join(f"q.{_q(c)}" for c in pre_cols)
+            order_p = ", ".join(f"p.{_q(k)}" for k in key)
+            order_q = ", ".join(f"q.{_q(k)}" for k in key)
+            self.added = f"SELECT {post_sel} FROM post.{t} p WHERE NOT EXISTS (SELECT 1 FROM pre.{t} q WHERE {on}) ORDER BY {order_p}"
+            self.removed = f"SELECT {pre_sel} FROM pre.{t} q WHERE NOT EXISTS (SELECT 1 FROM post.{t} p WHERE {on}) ORDER BY {order_q}"
+            if pre_cols == post_cols:
+                differs = " OR ".join(f"p.{_q(c)} IS NOT q.{_q(c)}" for c in post_cols if c not in key) or "0"
+            else:
+                differs = "1"  # layout changed: every surviving row compares unequal
+            self.changed = f"SELECT {pre_sel}, {post_sel} FROM post.{t} p JOIN pre.{t} q ON {on} WHERE {differs} ORDER BY {order_p}"
+        else:
+            cols = ", ".join(_q(c) for c in post_cols)
+            self.added = f"SELECT {cols} FROM post.{t} EXCEPT SELECT {cols} FROM pre.{t}"
+            self.removed = f"SELECT {cols} FROM pre.{t} EXCEPT SELECT {cols} FROM post.{t}"
+            self.changed = None
+
+
+def _emit(out: IO[str], table: str, op: str, cols: Sequence[str], row: Sequence[Any], key: List[str],
+          before: Optional[Dict[str, Any]] = None) -> None:
+    rec = dict(zip(cols, row))
+    record: Dict[str, Any] = {"table": table, "op": op, "key": {k: rec.get(k) for k in key} if key else None}
+    if op == "changed":
+        record["before"], record["after"] = before, rec
+    elif op == "added":
+        record["after"] = rec
+    else:
+        record["before"] = rec
+    out.write(serializer.dumps(record, default=_json_default) + "\n")
+
+
+def _diff_table(con: sqlite3.Connection, table: str, in_pre: bool, in_post: bool,
+                out: Optional[IO[str]], batch: int) -> Dict[str, int]:
+    pre_cols, pre_pk = _table_info(con, "pre", table) if in_pre else ([], [])
+    post_cols, post_pk = _table_info(con, "post", table) if in_post else ([], [])
+    key = post_pk or pre_pk  # prefer post pk if exists
+
+    # One-sided tables (or a key the other side lacks): every row is added/removed
+    if not (in_pre and in_post) or any(k not in pre_cols or k not in post_cols for k in key) or (not key and pre_cols != post_cols):
+        added_sql = f"SELECT * FROM post.{_q(table)}" if in_post else None
+        removed_sql = f"SELECT * FROM pre.{_q(table)}" if in_pre else None
+        res = {"added": 0, "removed": 0, "changed": 0}
+        for op, sql, cols in (("added", added_sql, post_cols), ("removed", removed_sql, pre_cols)):
+            if sql is None:
+                continue
+            if out is None:
+                res[op] = _count(con, sql)
+            else:
+                for row in _stream(con, sql, batch):
+                    _emit(out, table, op, cols, row, key)
+                    res[op] += 1
+        return res
+
+    plan = _Plan(table, pre_cols, post_cols, key)
+    if out is None:
+        return {
+            "added": _count(con, plan.added),
+            "removed": _count(con, plan.removed),
+            "changed": _count(con, plan.changed) if plan.changed else 0,
+        }
+
+    res = {"added": 0, "removed": 0, "changed": 0}
+    for row in _stream(con, plan.added, batch):
+        _emit(out, table, "added", post_cols, row, key)
+        res["added"] += 1
+    for row in _stream(con, plan.removed, batch):
+        _emit(out, table, "removed", pre_cols if key else post_cols, row, key)
+        res["removed"] += 1
+    if plan.changed:
+        n = len(pre_cols)
+        for row in _stream(con, plan.changed, batch):
+            _emit(out, table, "changed", post_cols, row[n:], key, before=dict(zip(pre_cols, row[:n])))
+            res["changed"] += 1
+    return res
+
+
+def diff_databases(
+    pre_db: Path,
+    post_db: Path,
+    *,
+    rows_path: Optional[Path] = None,
+    batch_size: int = DEFAULT_BATCH,
+) -> Dict[str, Any]:
+    """
+    Diff two SQLite files table by table.
+    Returns {"tables_changed": [...], "row_changes": {table: {added, removed, changed}}};
+    with rows_path, every changed row is also written there as one NDJSON record.
+    """
+    # Ephemeral in-memory host connection (not pooled): both copies are ATTACHed read-only
+    con = sqlite3.connect(":memory:", uri=True)
+    try:
+        con.execute("ATTACH DATABASE ? AS pre;", (Path(pre_db).resolve().as_uri() + "?mode=ro",))
+        con.execute("ATTACH DATABASE ? AS post;", (Path(post_db).resolve().as_uri() + "?mode=ro",))
+        pre_tables, post_tables = set(_tables(con, "pre")), set(_tables(con, "post"))
+
+        out: Optional[IO[str]] = None
+        if rows_path is not None:
+            Path(rows_path).parent.mkdir(parents=True, exist_ok=True)
+            out = Path(rows_path).open("w", encoding="utf-8", newline="\n")
+        try:
+            changed: List[str] = []
+            row_changes: Dict[str, Dict[str, int]] = {}
+            for t in sorted(pre_tables | post_tables):
+                res = _diff_table(con, t, t in pre_tables, t in post_tables, out, max(1, int(batch_size)))
+                if res["added"] or res["removed"] or res["changed"]:
+                    changed.append(t)
+                    row_changes[t] = res
+        finally:
+            if out is not None:
+                out.close()
+    finally:
+        con.close()
+    return {"tables_changed": changed, "row_changes": row_changes}
+
+
+__all__ = ["diff_databases", "DEFAULT_BATCH"]
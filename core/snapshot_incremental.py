@@ -0,0 +1,241 @@
+# core/snapshot_incremental.py
+# Incremental snapshot state for core.snapshot_manager (mode="incremental").
+# - No DB copy: per table we keep the rowid high-water mark (hwm), row count and
+#   SHA-256 hashes of fixed rowid chunks, folded into a Merkle-style root
+# - Chunk hashes are built SQL-side (quote() + group_concat per chunk); Python only hashes
+#   one string per chunk, never per-row dicts
+# - The previous state (.snapshots/incremental_state.json) is reused:
+#     * unchanged DB files (size/mtime of db + WAL) -> the whole state is carried over
+#     * append-only log tables -> only chunks from the old hwm upwards are rehashed, provided the rows
+#       added above the old hwm account for the whole row count change (a pruned/deleted old row
+#       fails that check and the table is rehashed in full)
+#     * every other table is rehashed chunk-wise (they are small config/test tables)
+# - Pass full=True (or WILL_SNAPSHOT_FULL=1) to rehash everything, e.g. for periodic verification
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+CHUNK_ROWS: int = 1024
+STATE_VERSION: int = 1
+FULL_ENV = "WILL_SNAPSHOT_FULL"
+
+# Log tracks only ever INSERT (see core.log_db_sink / sqlite_bootstrap.insert_boot_report_entry),
+# so chunks wholly below their previous hwm are trusted instead of rehashed once the row count
+# confirms nothing below the hwm went away. An in-place UPDATE of old rows keeps the count and is
+# only caught by a full rehash (full=True / WILL_SNAPSHOT_FULL=1).
+APPEND_ONLY_TABLES = frozenset({"memory_events", "trace_events", "boot_events"})
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def merkle_root(hashes: List[str]) -> str:
+    """Pairwise SHA-256 fold of an ordered hash list (empty list -> hash of "")."""
+    level = list(hashes)
+    if not level:
+        return _sha256("")
+    while len(level) > 1:
+        if len(level) % 2:
+            level.append(level[-1])
+        level = [_sha256(level[i] + level[i + 1]) for i in range(0, len(level), 2)]
+    return level[0]
+
+
+def file_fingerprint(db_path: Path) -> Dict[str, Optional[Tuple[int, int]]]:
+    """(size, mtime_ns) of the DB file and its WAL; any write changes at least one of them."""
+    out: Dict[str, Optional[Tuple[int, int]]] = {}
+    for key, p in (("db", db_path), ("wal", Path(f"{db_path}-wal"))):
+        try:
+            st = os.stat(p)
+            out[key] = (st.st_size, st.st_mtime_ns)
+        except OSError:
+            out[key] = None
+    return out
+
+
+def _columns(conn: sqlite3.Connection, table: str) -> List[str]:
+    return [r[1] for r in conn.execute(f'PRAGMA table_info("{table}");').fetchall()]
+
+
+def _has_rowid(conn: sqlite3.Connection, table: str) -> bool:
+    try:
+        conn.execute(f'SELECT rowid FROM "{table}" LIMIT 0;')
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+def _row_expr(cols: List[str]) -> str:
+    # quote() gives an unambiguous SQL literal per value; char(31) separates fields
+    return " || char(31) || ".join(f'quote("{c}")' for c in cols) or "''"
+
+
+def _hash_chunks(conn: sqlite3.Connection, table: str, cols: List[str], from_rowid: int) -> Dict[str, Dict[str, Any]]:
+    expr = _row_expr(["rowid"] + cols)
+    sql = (
+        f"SELECT rowid / {CHUNK_ROWS} AS chunk, count(*), group_concat(enc, char(30)) "
+        f'FROM (SELECT rowid, {expr} AS enc FROM "{table}" WHERE rowid >= ? ORDER BY rowid) '
+        "GROUP BY chunk ORDER BY chunk;"
+    )
+    return {
+        str(chunk): {"rows": n, "hash": _sha256(blob or "")}
+        for chunk, n, blob in conn.execute(sql, (from_rowid,))
+    }
+
+
+def _table_state(
+    conn: sqlite3.Connection,
+    table: str,
+    schema_sql: Optional[str],
+    prev: Optional[Dict[str, Any]],
+    *,
+    full: bool,
+) -> Dict[str, Any]:
+    cols = _columns(conn, table)
+    if not _has_rowid(conn, table):
+        # WITHOUT ROWID: one chunk ordered by every column
+        order = ", ".join(f'"{c}"' for c in cols)
+        blob, n = conn.execute(
+            f'SELECT group_concat(enc, char(30)), count(*) FROM (SELECT {_row_expr(cols)} AS enc FROM "{table}" ORDER BY {order});'
+        ).fetchone()
+        chunks = {"0": {"rows": n, "hash": _sha256(blob or "")}}
+        return {"schema": schema_sql, "hwm": None, "row_count": n, "chunks": chunks,
+                "root": merkle_root([chunks["0"]["hash"]]), "rehashed_chunks": 1}
+
+    count, hwm = conn.execute(f'SELECT count(*), coalesce(max(rowid), 0) FROM "{table}";').fetchone()
+    reuse = (
+        not full
+        and prev is not None
+        and table in APPEND_ONLY_TABLES
+        and prev.get("schema") == schema_sql
+        and prev.get("hwm") is not None
+        and hwm >= prev["hwm"]
+    )
+    if reuse:
+        (above,) = conn.execute(f'SELECT count(*) FROM "{table}" WHERE rowid > ?;', (int(prev["hwm"]),)).fetchone()
+        reuse = count - int(prev.get("row_count", -1)) == above
+    if reuse:
+        start_chunk = int(prev["hwm"]) // CHUNK_ROWS  # the old top chunk may have grown
+        chunks = {k: v for k, v in prev["chunks"].items() if int(k) < start_chunk}
+        fresh = _hash_chunks(conn, table, cols, start_chunk * CHUNK_ROWS)
+    else:
+        chunks = {}
+        fresh = _hash_chunks(conn, table, cols, 0)
+    chunks.update(fresh)
+    ordered = sorted(chunks, key=int)
+    return {
+        "schema": schema_sql,
+        "hwm": hwm,
+        "row_count": count,
+        "chunks": {k: chunks[k] for k in ordered},
+        "root": merkle_root([chunks[k]["hash"] for k in ordered]),
+        "rehashed_chunks": len(fresh),
+    }
+
+
+def compute_state(
+    conn: sqlite3.Connection,
+    db_path: Path,
+    prev: Optional[Dict[str, Any]] = None,
+    *,
+    full: Optional[bool] = None,
+) -> Dict[str, Any]:
+    """Build the incremental state of every table, reusing `prev` (a previous state) where safe."""
+    if full is None:
+        full = (os.environ.get(FULL_ENV) or "").strip().lower() in {"1", "true", "yes", "on"}
+    if prev is not None and prev.get("version") != STATE_VERSION:
+        prev = None
+    fingerprint = file_fingerprint(db_path)
+    if not full and prev is not None and prev.get("fingerprint") == _jsonable(fingerprint):
+        tables = {t: dict(s, rehashed_chunks=0) for t, s in prev["tables"].items()}
+        return {"version": STATE_VERSION, "fingerprint": prev["fingerprint"], "tables": tables,
+                "root": prev["root"], "reused": True}
+
+    schema = dict(conn.execute("SELECT name, sql FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%' ORDER BY name;").fetchall())
+    prev_tables = (prev or {}).get("tables", {})
+    tables = {t: _table_state(conn, t, sql, prev_tables.get(t), full=full) for t, sql in schema.items()}
+    root = merkle_root([_sha256(f"{t}:{s['root']}") for t, s in sorted(tables.items())])
+    return {"version": STATE_VERSION, "fingerprint": _jsonable(fingerprint), "tables": tables,
+            "root": root, "reused": False}
+
+
+def _jsonable(fp: Dict[str, Optional[Tuple[int, int]]]) -> Dict[str, Optional[List[int]]]:
+    return {k: (list(v) if v is not None else None) for k, v in fp.items()}
+
+
+def load_state(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def save_state(path: Path, state: Dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps(state, ensure_ascii=False, separators=(",", ":")), encoding="utf-8", newline="\n")
+    os.replace(tmp, path)
+
+
+def _chunk_rows(state: Dict[str, Any], chunk: int) -> int:
+    return (state["chunks"].get(str(chunk)) or {}).get("rows", 0)
+
+
+def diff_states(pre: Dict[str, Any], post: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Table-level diff of two states. Per changed table: rows appended above the pre hwm
+    (exact for append-only changes), changed chunks overall and below the pre hwm
+    (in-place updates/deletes), and the row count delta. Created/dropped tables report
+    their whole row count as added/removed with chunk fields set to None.
+    """
+    pre_t, post_t = pre.get("tables", {}), post.get("tables", {})
+    changed: List[str] = []
+    row_changes: Dict[str, Dict[str, Any]] = {}
+    for t in sorted(set(pre_t) | set(post_t)):
+        a, b = pre_t.get(t), post_t.get(t)
+        if a is not None and b is not None and a["root"] == b["root"]:
+            continue
+        changed.append(t)
+        if a is None or b is None:
+            added, removed = (b or {}).get("row_count", 0), (a or {}).get("row_count", 0)
+            row_changes[t] = {"added": added, "removed": removed, "chunks_changed": None,
+                              "chunks_changed_below_hwm": None, "row_count_delta": added - removed}
+            continue
+        moved = [
+            k for k in sorted(set(a["chunks"]) | set(b["chunks"]), key=int)
+            if (a["chunks"].get(k) or {}).get("hash") != (b["chunks"].get(k) or {}).get("hash")
+        ]
+        if a.get("hwm") is None:  # WITHOUT ROWID: no hwm, only the count delta is meaningful
+            added, below = max(0, b["row_count"] - a["row_count"]), moved
+        else:
+            boundary = int(a["hwm"]) // CHUNK_ROWS
+            added = sum(v["rows"] for k, v in b["chunks"].items() if int(k) > boundary)
+            added += max(0, _chunk_rows(b, boundary) - _chunk_rows(a, boundary))
+            below = [k for k in moved if int(k) < boundary]
+        row_changes[t] = {
+            "added": added,
+            "removed": max(0, added - (b["row_count"] - a["row_count"])),
+            "chunks_changed": len(moved),
+            "chunks_changed_below_hwm": len(below),
+            "row_count_delta": b["row_count"] - a["row_count"],
+        }
+    return {"tables_changed": changed, "row_changes": row_changes}
+
+
+__all__ = [
+    "CHUNK_ROWS",
+    "APPEND_ONLY_TABLES",
+    "merkle_root",
+    "file_fingerprint",
+    "compute_state",
+    "load_state",
+    "save_state",
+    "diff_states",
+]
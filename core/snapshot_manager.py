@@ -3,17 +3,28 @@
 # - Provides take_snapshot() and compare_snapshots() for CLI/reflex wrappers
 # - Uses UTF-8 JSON writes and forward slashes for all paths
 # - Stores artifacts under .snapshots/<ISO>/pre|post|diff plus audit.jsonl
+# - incremental mode keeps no DB copy: chunked row hashes vs the previous state (core.snapshot_incremental)
+# - store_snapshot_blobs() moves finished copies into the content-addressed store (core.snapshot_store)
+# - Metadata/audit files are encoded by core.serializer; table checksums stay on stdlib json (canonical)
 from __future__ import annotations
 
 import json
 import sqlite3
 import hashlib
 import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
 # Single source of truth for DB path
-from core.sqlite_bootstrap import DB_PATH
+from core.sqlite_bootstrap import DB_PATH, ensure_tables
+from core.connection_manager import get_connection, read_connection, release
+from core import snapshot_incremental as incremental
+from core.snapshot_diff import diff_databases
+from core import serializer, snapshot_store
+
+SNAPSHOT_MODES = ("off", "light", "heavy", "incremental")
+HASH_POOLS = ("thread", "process")
 
 # ---------- helpers ----------
 
@@ -53,36 +64,84 @@ def _table_pk_cols(conn: sqlite3.Connection, table: str) -> List[str]:
             cols.append(name)
     return cols
 
-def _table_rows(conn: sqlite3.Connection, table: str, pk_cols: List[str]) -> List[Dict[str, Any]]:
-    cur = conn.execute(f"SELECT * FROM {table};")
+def _json_default(v: Any) -> Any:
+    if isinstance(v, (bytes, bytearray, memoryview)):
+        return bytes(v).hex()
+    raise TypeError(f"unsupported value in snapshot row: {type(v).__name__}")
+
+def _stream_checksum(conn: sqlite3.Connection, table: str, pk_cols: List[str], batch: int = 1000) -> Tuple[int, str]:
+    """
+    (row_count, sha256) of the table as a canonical JSON array of row objects
+    (sorted keys, compact, UTF-8), ordered by PK (else by every column).
+    Rows are fed to hashlib one at a time, so the digest equals hashing the whole
+    json.dumps(rows) string without ever building it.
+    """
+    cur = conn.execute(f"SELECT * FROM {table} LIMIT 0;")
     colnames = [d[0] for d in cur.description]
-    rows = [dict(zip(colnames, r)) for r in cur.fetchall()]
-    # Normalize types to JSON-friendly (no bytes) and keep ordering stable by PK if possible
-    def row_key(r: Dict[str, Any]) -> Tuple:
-        if pk_cols:
-            return tuple(r.get(c) for c in pk_cols)
-        # Fallback to all values
-        return tuple(r.get(c) for c in colnames)
-    rows.sort(key=row_key)
-    return rows
-
-def _rows_checksum(rows: List[Dict[str, Any]]) -> str:
-    # Canonical JSON checksum (sorted keys, UTF-8)
-    enc = json.dumps(rows, sort_keys=True, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
-    return hashlib.sha256(enc).hexdigest()
+    order = ", ".join(f'"{c}"' for c in (pk_cols or colnames))
+    cur = conn.execute(f"SELECT * FROM {table} ORDER BY {order};")
+    h = hashlib.sha256(b"[")
+    n = 0
+    while True:
+        rows = cur.fetchmany(batch)
+        if not rows:
+            break
+        for r in rows:
+            enc = json.dumps(dict(zip(colnames, r)), sort_keys=True, ensure_ascii=False,
+                             separators=(",", ":"), default=_json_default)
+            h.update(((b"," if n else b"") + enc.encode("utf-8")))
+            n += 1
+    h.update(b"]")
+    return n, h.hexdigest()
+
+def _table_meta(conn: sqlite3.Connection, table: str, mode: str) -> Dict[str, Any]:
+    pk_cols = _table_pk_cols(conn, table)
+    if mode == "heavy":
+        count, checksum = _stream_checksum(conn, table, pk_cols)
+    else:
+        count, checksum = conn.execute(f"SELECT count(*) FROM {table};").fetchone()[0], None
+    return {"row_count": count, "pk": pk_cols, "checksum": checksum}
+
+def _table_meta_job(db_path: str, table: str, mode: str) -> Tuple[str, Dict[str, Any]]:
+    """Pool task: own read-only connection per worker (thread or process)."""
+    try:
+        return table, _table_meta(read_connection(db_path), table, mode)
+    finally:
+        release(db_path)
+
+def _tables_meta(db_copy: Path, tables: List[str], mode: str, workers: int, pool: str) -> Dict[str, Any]:
+    if workers <= 1 or len(tables) <= 1:
+        conn = read_connection(db_copy)
+        return {t: _table_meta(conn, t, mode) for t in tables}
+    executor_cls = ProcessPoolExecutor if pool == "process" else ThreadPoolExecutor
+    with executor_cls(max_workers=min(workers, len(tables))) as ex:
+        done = dict(ex.map(_table_meta_job, [db_copy.as_posix()] * len(tables), tables, [mode] * len(tables)))
+    return {t: done[t] for t in tables}  # keep table order stable in tables.json
 
 # ---------- public API ----------
 
-def take_snapshot(*, label: str, run_id: str, mode: str = "heavy") -> Dict[str, Any]:
+def take_snapshot(
+    *,
+    label: str,
+    run_id: str,
+    mode: str = "heavy",
+    workers: int = 1,
+    pool: str = "thread",
+) -> Dict[str, Any]:
     """Create a snapshot of the DB.
     Returns metadata dict with paths (as posix strings) and checksums.
     label: "pre" or "post"
-    mode: "off" | "light" | "heavy" (off returns minimal metadata without copying)
+    mode: "off" | "light" | "heavy" | "incremental"
+      (off returns minimal metadata without copying; incremental stores chunk hashes, no copy)
+    workers/pool: per-table checksums run concurrently on `workers` read-only connections
+      using a "thread" or "process" pool (workers <= 1 keeps it serial)
     """
     if label not in {"pre", "post"}:
         raise ValueError("label must be 'pre' or 'post'")
-    if mode not in {"off", "light", "heavy"}:
-        raise ValueError("mode must be off|light|heavy")
+    if mode not in SNAPSHOT_MODES:
+        raise ValueError("mode must be " + "|".join(SNAPSHOT_MODES))
+    if pool not in HASH_POOLS:
+        raise ValueError("pool must be " + "|".join(HASH_POOLS))
 
     root = _project_root()
     stamp = _now_iso()
@@ -108,6 +167,8 @@ def take_snapshot(*, label: str, run_id: str, mode: str = "heavy") -> Dict[str,
 
     # Decide target dir from label
     target_dir = pre_dir if label == "pre" else post_dir
+    if mode == "incremental":
+        return _take_incremental(meta, root, target_dir)
     db_copy = target_dir / "will_data.db"
     schema_json = target_dir / "schema.json"
     tables_json = target_dir / "tables.json"
@@ -115,131 +176,144 @@ def take_snapshot(*, label: str, run_id: str, mode: str = "heavy") -> Dict[str,
 
     # Copy/backup DB atomically
     # Use sqlite backup API for consistency
-    with sqlite3.connect(DB_PATH.as_posix()) as src, sqlite3.connect(db_copy.as_posix()) as dst:
-        src.backup(dst)  # type: ignore[attr-defined]
+    dst = sqlite3.connect(db_copy.as_posix())
+    try:
+        get_connection(DB_PATH).backup(dst)
+        # The copy inherits WAL mode; a rollback journal keeps read-only opens from leaving -wal/-shm files
+        dst.execute("PRAGMA journal_mode=DELETE;")
+    finally:
+        dst.close()
 
     # Compute file checksum
     meta["db_checksum"] = _sha256_file(db_copy)
 
     # Schema dump + table checksums/counts
-    with sqlite3.connect(db_copy.as_posix()) as conn:
+    conn = read_connection(db_copy)
+    try:
         # Schema: name -> sql
         srows = conn.execute("SELECT name, sql FROM sqlite_master WHERE type='table' ORDER BY name;").fetchall()
         schema = {name: sql for (name, sql) in srows}
-        schema_json.write_text(json.dumps(schema, ensure_ascii=False, indent=2), encoding="utf-8", newline="\n")
-
-        tables_meta: Dict[str, Any] = {}
-        for t in _list_tables(conn):
-            pk_cols = _table_pk_cols(conn, t)
-            rows = _table_rows(conn, t, pk_cols)
-            tables_meta[t] = {
-                "row_count": len(rows),
-                "pk": pk_cols,
-                "checksum": _rows_checksum(rows) if mode == "heavy" else None,
-            }
-        tables_json.write_text(json.dumps(tables_meta, ensure_ascii=False, indent=2), encoding="utf-8", newline="\n")
+        schema_json.write_text(serializer.dumps(schema, pretty=True), encoding="utf-8", newline="\n")
+
+        tables_meta = _tables_meta(db_copy, _list_tables(conn), mode, workers, pool)
+        tables_json.write_text(serializer.dumps(tables_meta, pretty=True), encoding="utf-8", newline="\n")
+    finally:
+        release(db_copy)  # the copy is reopened by compare_snapshots; don't pin its file handle
 
     # Write minimal meta JSON (UTF-8)
-    meta_json.write_text(json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8", newline="\n")
+    meta_json.write_text(serializer.dumps(meta, pretty=True), encoding="utf-8", newline="\n")
 
     return meta
 
-def compare_snapshots(pre_meta: Dict[str, Any], post_meta: Dict[str, Any]) -> Dict[str, Any]:
+def _incremental_state_path(root: Path) -> Path:
+    return root / ".snapshots" / "incremental_state.json"
+
+
+def _take_incremental(meta: Dict[str, Any], root: Path, target_dir: Path) -> Dict[str, Any]:
+    """Incremental snapshot: state of the live DB, reusing the previous snapshot's chunk hashes."""
+    ensure_tables()  # read-only handle below needs the DB to exist
+    state_path = _incremental_state_path(root)
+    state = incremental.compute_state(read_connection(DB_PATH), Path(DB_PATH), incremental.load_state(state_path))
+    incremental.save_state(state_path, state)
+
+    tables_meta = {
+        t: {"row_count": s["row_count"], "hwm": s["hwm"], "root": s["root"], "rehashed_chunks": s["rehashed_chunks"]}
+        for t, s in state["tables"].items()
+    }
+    meta["db_checksum"] = None  # no copy to checksum; state_root identifies the DB content
+    meta["state_root"] = state["root"]
+    meta["state_reused"] = state["reused"]
+    (target_dir / "state.json").write_text(serializer.dumps(state), encoding="utf-8", newline="\n")
+    (target_dir / "tables.json").write_text(serializer.dumps(tables_meta, pretty=True), encoding="utf-8", newline="\n")
+    (target_dir / "snapshot_meta.json").write_text(serializer.dumps(meta, pretty=True), encoding="utf-8", newline="\n")
+    return meta
+
+
+def compare_snapshots(pre_meta: Dict[str, Any], post_meta: Dict[str, Any], *, row_diff: bool = False) -> Dict[str, Any]:
     """Compute table-level and row-level diffs between pre and post DB copies.
     Writes a diff JSON file under run_dir/diff/report.json and returns the summary dict.
+    row_diff=True also streams one NDJSON record per added/removed/changed row to diff/rows.ndjson.
     """
     run_dir = Path(pre_meta["run_dir"])  # same for post
     diff_dir = Path(pre_meta["diff_dir"])  # posix -> Path
+    if pre_meta.get("mode") == "incremental":
+        pre_state = incremental.load_state(Path(pre_meta["pre_dir"]) / "state.json") or {}
+        post_state = incremental.load_state(Path(post_meta["post_dir"]) / "state.json") or {}
+        summary = {"run_id": pre_meta.get("run_id"), "mode": "incremental"}
+        summary.update(incremental.diff_states(pre_state, post_state))
+        (diff_dir / "report.json").write_text(serializer.dumps(summary, pretty=True), encoding="utf-8", newline="\n")
+        return summary
+
     pre_db = Path(pre_meta["pre_dir"]) / "will_data.db"
     post_db = Path(post_meta["post_dir"]) / "will_data.db"
 
-    summary: Dict[str, Any] = {
-        "run_id": pre_meta.get("run_id"),
-        "tables_changed": [],
-        "row_changes": {},  # table -> {added: n, removed: n, changed: n}
-    }
-
-    def load_table_rows(db_path: Path, table: str, pk_cols: List[str]) -> Dict[Tuple, Dict[str, Any]]:
-        with sqlite3.connect(db_path.as_posix()) as conn:
-            rows = _table_rows(conn, table, pk_cols)
-            col_order = [k for k in (rows[0].keys() if rows else [])]
-            # map by key
-            res = {}
-            for r in rows:
-                key = tuple(r.get(c) for c in pk_cols) if pk_cols else tuple(r.get(c) for c in col_order)
-                res[key] = r
-            return res
-
-    with sqlite3.connect(pre_db.as_posix()) as cpre, sqlite3.connect(post_db.as_posix()) as cpost:
-        pre_tables = _list_tables(cpre)
-        post_tables = _list_tables(cpost)
-        all_tables = sorted(set(pre_tables) | set(post_tables))
-
-        row_changes: Dict[str, Dict[str, int]] = {}
-
-        for t in all_tables:
-            pre_pk = _table_pk_cols(cpre, t) if t in pre_tables else []
-            post_pk = _table_pk_cols(cpost, t) if t in post_tables else []
-            pk = post_pk or pre_pk  # prefer post pk if exists
-            pre_rows = load_table_rows(pre_db, t, pk) if t in pre_tables else {}
-            post_rows = load_table_rows(post_db, t, pk) if t in post_tables else {}
-
-            pre_keys = set(pre_rows.keys())
-            post_keys = set(post_rows.keys())
-
-            added_keys = post_keys - pre_keys
-            removed_keys = pre_keys - post_keys
-            common = pre_keys & post_keys
-
-            changed = 0
-            for k in common:
-                if pre_rows[k] != post_rows[k]:
-                    changed += 1
-
-            if added_keys or removed_keys or changed:
-                summary["tables_changed"].append(t)
-                row_changes[t] = {
-                    "added": len(added_keys),
-                    "removed": len(removed_keys),
-                    "changed": changed,
-                }
-
-        summary["row_changes"] = row_changes
+    summary: Dict[str, Any] = {"run_id": pre_meta.get("run_id")}
+    # table -> {added: n, removed: n, changed: n}; computed SQL-side over ATTACHed copies
+    summary.update(diff_databases(pre_db, post_db, rows_path=(diff_dir / "rows.ndjson") if row_diff else None))
 
     # Persist diff JSON report
     diff_json = diff_dir / "report.json"
-    diff_json.write_text(json.dumps(summary, ensure_ascii=False, indent=2), encoding="utf-8", newline="\n")
+    diff_json.write_text(serializer.dumps(summary, pretty=True), encoding="utf-8", newline="\n")
 
     return summary
 
+def store_snapshot_blobs(*metas: Optional[Dict[str, Any]], compression: Optional[str] = None) -> None:
+    """
+    After compare_snapshots: move each snapshot's DB copy into .snapshots/blobs keyed by its
+    db_checksum (identical states are stored once), dropping any SQLite sidecar files with it.
+    Adds meta["blob"] and rewrites snapshot_meta.json.
+    Metas without a copy (off/incremental, or already stored) are skipped.
+    """
+    for meta in metas:
+        if not meta or not meta.get("db_checksum") or meta.get("blob"):
+            continue
+        target_dir = Path(meta["pre_dir"] if meta.get("label") == "pre" else meta["post_dir"])
+        db_copy = target_dir / "will_data.db"
+        if not db_copy.exists():
+            continue
+        release(db_copy)
+        meta["blob"] = snapshot_store.put(db_copy, meta["db_checksum"], compression=compression)
+        for suffix in ("-wal", "-shm", "-journal"):
+            Path(f"{db_copy}{suffix}").unlink(missing_ok=True)
+        (target_dir / "snapshot_meta.json").write_text(
+            serializer.dumps(meta, pretty=True), encoding="utf-8", newline="\n"
+        )
+
+
 def write_audit_line(run_dir: Path, record: Dict[str, Any]) -> None:
     audit_path = run_dir / "audit.jsonl"
-    line = json.dumps(record, ensure_ascii=False)
+    line = serializer.dumps(record)
     with audit_path.open("a", encoding="utf-8", newline="\n") as f:
         f.write(line + "\n")
 
 
-def index_snapshot(*, run_id: str, run_dir: Path, pre_checksum: Optional[str], post_checksum: Optional[str], status: str) -> None:
+def index_snapshot(
+    *,
+    run_id: str,
+    run_dir: Path,
+    pre_checksum: Optional[str],
+    post_checksum: Optional[str],
+    status: str,
+    mode: Optional[str] = None,
+    tables_changed: Optional[int] = None,
+    pre_blob: Optional[str] = None,
+    post_blob: Optional[str] = None,
+    phase: Optional[float] = None,
+) -> None:
     """Record a small index row in live DB for searchability.
-    Creates table snapshot_index if not exists: (snapshot_id TEXT PK, run_id TEXT, created_at TEXT, pre_checksum TEXT, post_checksum TEXT, run_dir TEXT, status TEXT)
+    snapshot_index layout is owned by core/migrations (m0003, m0005).
     """
-    with sqlite3.connect(DB_PATH.as_posix()) as conn:
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS snapshot_index (
-                snapshot_id TEXT PRIMARY KEY,
-                run_id TEXT NOT NULL,
-                created_at TEXT NOT NULL,
-                pre_checksum TEXT,
-                post_checksum TEXT,
-                run_dir TEXT NOT NULL,
-                status TEXT NOT NULL
-            );
-            """
-        )
-        snapshot_id = f"{run_id}-{_now_iso()}"
+    ensure_tables()
+    if phase is None:
+        from core.phase_control import get_current_phase
+        phase = get_current_phase()
+    snapshot_id = f"{run_id}-{_now_iso()}"
+    conn = get_connection(DB_PATH)
+    with conn:
         conn.execute(
-            "INSERT INTO snapshot_index (snapshot_id, run_id, created_at, pre_checksum, post_checksum, run_dir, status) VALUES (?, ?, datetime('now'), ?, ?, ?, ?);",
-            (snapshot_id, run_id, pre_checksum, post_checksum, run_dir.as_posix(), status),
+            "INSERT INTO snapshot_index (snapshot_id, run_id, created_at, mode, tables_changed, pre_checksum, post_checksum, "
+            "run_dir, status, pre_blob, post_blob, phase) "
+            "VALUES (?, ?, datetime('now'), ?, ?, ?, ?, ?, ?, ?, ?, ?);",
+            (snapshot_id, run_id, mode, int(tables_changed or 0), pre_checksum, post_checksum, run_dir.as_posix(), status,
+             pre_blob, post_blob, str(phase) if phase is not None else None),
         )
-        conn.commit()
@@ -0,0 +1,207 @@
+# core/snapshot_store.py
+# Content-addressed blob store for snapshot DB copies (.snapshots/blobs).
+# - Blobs are keyed by the snapshot's db_checksum (sha256 of the copied DB file);
+#   identical DB states share one blob no matter how many runs captured them
+# - Optional compression: "gzip" (stdlib) or "zstd" (needs the zstandard package; falls back to gzip)
+#   selected per call or via WILL_SNAPSHOT_COMPRESSION (default "none")
+# - Retention (keep last N runs + last M per phase) and GC of unreferenced blobs are driven
+#   by snapshot_index rows (pre_blob/post_blob, phase, pruned_at — see core/migrations/m0005)
+
+from __future__ import annotations
+
+import gzip
+import os
+import shutil
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+try:  # optional dependency
+    import zstandard as _zstd  # type: ignore
+except Exception:  # pragma: no cover - depends on environment
+    _zstd = None
+
+COMPRESSION_ENV = "WILL_SNAPSHOT_COMPRESSION"
+COMPRESSIONS = ("none", "gzip", "zstd")
+_SUFFIX = {"none": ".db", "gzip": ".db.gz", "zstd": ".db.zst"}
+
+
+def _project_root() -> Path:
+    here = Path(__file__).resolve()
+    for p in [here] + list(here.parents):
+        if (p / "configs" / "ironroot_manifest_data.json").exists():
+            return p
+        if (p / "boot").is_dir() and (p / "core").is_dir():
+            return p
+    return Path.cwd().resolve()
+
+
+def blob_root() -> Path:
+    return _project_root() / ".snapshots" / "blobs"
+
+
+def resolve_compression(compression: Optional[str] = None) -> str:
+    """Requested (or env) compression; zstd degrades to gzip when zstandard is unavailable."""
+    value = (compression or os.environ.get(COMPRESSION_ENV) or "none").strip().lower()
+    if value not in COMPRESSIONS:
+        raise ValueError("compression must be " + "|".join(COMPRESSIONS))
+    if value == "zstd" and _zstd is None:
+        return "gzip"
+    return value
+
+
+def _candidates(digest: str, root: Path) -> List[Path]:
+    base = root / digest[:2]
+    return [base / f"{digest}{suffix}" for suffix in _SUFFIX.values()]
+
+
+def find_blob(digest: str, root: Optional[Path] = None) -> Optional[Path]:
+    """Path of the stored blob for digest (any compression), or None."""
+    for p in _candidates(digest, root or blob_root()):
+        if p.exists():
+            return p
+    return None
+
+
+def put(src: Path, digest: str, *, compression: Optional[str] = None, root: Optional[Path] = None) -> Dict[str, Any]:
+    """
+    Move the DB copy at src into the store under digest and remove src.
+    If the blob already exists the copy is simply dropped (deduplicated).
+    """
+    root = root or blob_root()
+    src = Path(src)
+    size = src.stat().st_size
+    existing = find_blob(digest, root)
+    if existing is not None:
+        src.unlink()
+        return {"hash": digest, "path": existing.as_posix(), "bytes": size,
+                "stored_bytes": existing.stat().st_size, "deduped": True}
+
+    comp = resolve_compression(compression)
+    dest = root / digest[:2] / f"{digest}{_SUFFIX[comp]}"
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dest.with_name(dest.name + f".tmp{os.getpid()}")
+    if comp == "none":
+        os.replace(src, tmp)  # same filesystem: a rename, no data copy
+    else:
+        with src.open("rb") as fin, tmp.open("wb") as fout:
+            if comp == "zstd":
+                _zstd.ZstdCompressor(level=3).copy_stream(fin, fout)
+            else:
+                with gzip.GzipFile(fileobj=fout, mode="wb", compresslevel=6, mtime=0) as gz:
+                    shutil.copyfileobj(fin, gz, 1024 * 1024)
+        src.unlink()
+    os.replace(tmp, dest)
+    return {"hash": digest, "path": dest.as_posix(), "bytes": size,
+            "stored_bytes": dest.stat().st_size, "deduped": False, "compression": comp}
+
+
+def materialize(digest: str, dest: Path, *, root: Optional[Path] = None) -> Path:
+    """Write the (decompressed) blob for digest to dest and return dest."""
+    blob = find_blob(digest, root)
+    if blob is None:
+        raise FileNotFoundError(f"snapshot blob not found: {digest}")
+    dest = Path(dest)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    with dest.open("wb") as fout:
+        if blob.name.endswith(".zst"):
+            if _zstd is None:
+                raise RuntimeError("zstandard is required to read " + blob.as_posix())
+            with blob.open("rb") as fin:
+                _zstd.ZstdDecompressor().copy_stream(fin, fout)
+        elif blob.name.endswith(".gz"):
+            with gzip.open(blob, "rb") as fin:
+                shutil.copyfileobj(fin, fout, 1024 * 1024)
+        else:
+            with blob.open("rb") as fin:
+                shutil.copyfileobj(fin, fout, 1024 * 1024)
+    return dest
+
+
+def iter_blobs(root: Optional[Path] = None) -> Iterable[Path]:
+    root = root or blob_root()
+    if not root.exists():
+        return []
+    return sorted(p for p in root.glob("*/*") if p.is_file() and ".tmp" not in p.name)
+
+
+def _blob_digest(path: Path) -> str:
+    return path.name.split(".", 1)[0]
+
+
+def select_retained(rows: List[Dict[str, Any]], *, keep_last: int, keep_per_phase: int) -> Set[int]:
+    """
+    Ids of snapshot_index rows to keep: the newest keep_last overall plus the newest
+    keep_per_phase within each phase. rows must be ordered newest first.
+    """
+    keep: Set[int] = {r["id"] for r in rows[: max(0, keep_last)]}
+    per_phase: Dict[Any, int] = {}
+    for r in rows:
+        n = per_phase.get(r.get("phase"), 0)
+        if n < keep_per_phase:
+            keep.add(r["id"])
+        per_phase[r.get("phase")] = n + 1
+    return keep
+
+
+def gc(
+    conn: sqlite3.Connection,
+    *,
+    keep_last: int = 20,
+    keep_per_phase: int = 3,
+    dry_run: bool = False,
+    grace_s: float = 3600.0,
+    root: Optional[Path] = None,
+) -> Dict[str, Any]:
+    """
+    Apply retention to snapshot_index and delete blobs no retained row references.
+    Pruned rows keep their history but get pruned_at set; their run directories are removed.
+    Blobs younger than grace_s are spared (a run may have stored them but not indexed them yet).
+    """
+    root = root or blob_root()
+    cur = conn.execute(
+        "SELECT id, phase, run_dir, pre_blob, post_blob FROM snapshot_index WHERE pruned_at IS NULL ORDER BY id DESC;"
+    )
+    rows = [dict(zip(("id", "phase", "run_dir", "pre_blob", "post_blob"), r)) for r in cur.fetchall()]
+    keep = select_retained(rows, keep_last=keep_last, keep_per_phase=keep_per_phase)
+    prune = [r for r in rows if r["id"] not in keep]
+    referenced = {h for r in rows if r["id"] in keep for h in (r["pre_blob"], r["post_blob"]) if h}
+
+    cutoff = time.time() - grace_s
+    orphans = [p for p in iter_blobs(root) if _blob_digest(p) not in referenced and p.stat().st_mtime < cutoff]
+    freed = sum(p.stat().st_size for p in orphans)
+    if not dry_run:
+        stamp = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        with conn:
+            conn.executemany("UPDATE snapshot_index SET pruned_at = ? WHERE id = ?;", [(stamp, r["id"]) for r in prune])
+        for r in prune:
+            run_dir = Path(r["run_dir"] or "")
+            if r["run_dir"] and run_dir.is_dir() and ".snapshots" in run_dir.parts:
+                shutil.rmtree(run_dir, ignore_errors=True)
+        for p in orphans:
+            p.unlink(missing_ok=True)
+            try:
+                p.parent.rmdir()  # drop the shard directory once empty
+            except OSError:
+                pass
+    return {
+        "kept_runs": len(keep),
+        "pruned_runs": [r["id"] for r in prune],
+        "deleted_blobs": [_blob_digest(p) for p in orphans],
+        "freed_bytes": freed,
+        "dry_run": dry_run,
+    }
+
+
+__all__ = [
+    "COMPRESSIONS",
+    "blob_root",
+    "resolve_compression",
+    "find_blob",
+    "put",
+    "materialize",
+    "iter_blobs",
+    "select_retained",
+    "gc",
+]
@@ -1,29 +1,38 @@
 # core/sqlite_bootstrap.py
+# - Schema comes from numbered migrations (core/migrations) applied by core.schema_migrator;
+#   a per-process cache keyed on DB file identity (path, st_dev, st_ino) skips the check after the first call
 
 from boot.boot_path_initializer import inject_paths  # required path injection
 inject_paths()
 
-import os
 import sqlite3
 import json
 import datetime
 import contextlib
-from pathlib import Path, PurePosixPath
-from typing import Optional, Dict, Any, Iterable, List
+import os
+import threading
+from pathlib import PurePosixPath
+from typing import Optional, Dict, Any, Iterable, List, Mapping, Tuple, Union
 
 # Single source of truth for DB path (must expose .as_posix() for early tests)
 DB_PATH: PurePosixPath = PurePosixPath("root/will_data.db")
 
+from core.connection_manager import get_connection
+from core.schema_migrator import MigrationError, current_version, latest_version, migrate, verify_schema
+
+# Highest migration shipped in core/migrations; older DBs are migrated once per process.
+SCHEMA_VERSION: int = latest_version()
+
+_SCHEMA_LOCK = threading.Lock()
+_SCHEMA_CACHE: Dict[Tuple[str, int, int], int] = {}  # (path, st_dev, st_ino) -> verified version
+
 
 def _connect() -> sqlite3.Connection:
     """
-    Returns a sqlite3 connection to the IronRoot database.
-    Callers must not hardcode paths; always use DB_PATH.
+    Returns this thread's pooled connection to the IronRoot database (see core.connection_manager).
+    Callers must not hardcode paths; always use DB_PATH. Never close() the returned handle.
     """
-    Path(DB_PATH).parent.mkdir(parents=True, exist_ok=True)
-    con = sqlite3.connect(os.fspath(DB_PATH))
-    con.execute("PRAGMA foreign_keys = ON;")
-    return con
+    return get_connection(DB_PATH)
 
 
 def _rows_to_dicts(cursor: sqlite3.Cursor, rows: Iterable[Iterable[Any]]) -> List[Dict[str, Any]]:
@@ -31,101 +40,39 @@ def _rows_to_dicts(cursor: sqlite3.Cursor, rows: Iterable[Iterable[Any]]) -> Lis
     return [dict(zip(cols, r)) for r in rows]
 
 
-def ensure_tables() -> None:
-    """
-    Create required tables if they do not already exist.
-    This is phase-agnostic and safe to run multiple times.
-    """
-    with contextlib.closing(_connect()) as con, contextlib.closing(con.cursor()) as cur:
-        # boot_events — general boot/report log table used by early-phase tests
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS boot_events (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                ts TEXT NOT NULL,
-                event TEXT,
-                details TEXT
-            )
-            """
-        )
-
-        # manifest — file registry
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS manifest (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                path TEXT UNIQUE NOT NULL,
-                added_ts TEXT,
-                phase TEXT
-            )
-            """
-        )
-
-        # memory_events — for dual-logging memory track
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS memory_events (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                ts TEXT NOT NULL,
-                tag TEXT NOT NULL,
-                payload TEXT
-            )
-            """
-        )
-
-        # reflex_registry — registry of reflex/tool handlers
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS reflex_registry (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                ts TEXT NOT NULL,
-                reflex_name TEXT NOT NULL,
-                module TEXT,
-                path TEXT,
-                enabled INTEGER DEFAULT 1
-            )
-            """
-        )
-
-        # trace_events — for dual-logging trace track
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS trace_events (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                ts TEXT NOT NULL,
-                level TEXT NOT NULL,
-                tag TEXT NOT NULL,
-                message TEXT,
-                context TEXT
-            )
-            """
-        )
-
-        # snapshot_index — used by snapshot tools
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS snapshot_index (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                ts TEXT NOT NULL,
-                run_id TEXT NOT NULL,
-                mode TEXT NOT NULL,
-                tables_changed INTEGER DEFAULT 0
-            )
-            """
-        )
+def _file_key() -> Optional[Tuple[str, int, int]]:
+    try:
+        st = os.stat(DB_PATH)
+    except OSError:
+        return None
+    return (DB_PATH.as_posix(), st.st_dev, st.st_ino)
 
-        # test_ticks — helper table used by tests
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS test_ticks (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                ts TEXT NOT NULL,
-                tick TEXT NOT NULL
-            )
-            """
-        )
 
-        con.commit()
+def ensure_tables(*, force: bool = False) -> None:
+    """
+    Bring the database to the current schema (see core.schema_migrator / core/migrations).
+    This is phase-agnostic and safe to run multiple times: after the first call per
+    process and DB file it is a single stat(); migrations only run when the DB is
+    behind SCHEMA_VERSION. force=True also re-verifies the live schema.
+    """
+    key = _file_key()
+    if not force and key is not None and _SCHEMA_CACHE.get(key) == SCHEMA_VERSION:
+        return
+    with _SCHEMA_LOCK:
+        con = _connect()
+        migrate(con)
+        if force:
+            problems = verify_schema(con)
+            if problems:
+                raise MigrationError("schema verification failed: " + "; ".join(problems))
+        key = _file_key()  # the connect above may have created the file
+        if key is not None:
+            _SCHEMA_CACHE[key] = SCHEMA_VERSION
+
+
+def schema_version() -> int:
+    """Return the latest migration applied to the database (0 if never bootstrapped)."""
+    return current_version(_connect())
 
 
 # Back-compat alias expected by some tools (e.g., tools.check_db_tables)
@@ -136,33 +83,60 @@ def create_tables() -> None:
 
 def list_tables() -> List[str]:
     """Return a sorted list of tables in the database."""
-    with contextlib.closing(_connect()) as con, contextlib.closing(con.cursor()) as cur:
+    con = _connect()
+    with contextlib.closing(con.cursor()) as cur:
         cur.execute("SELECT name FROM sqlite_master WHERE type='table'")
         return sorted([r[0] for r in cur.fetchall()])
 
 
+def _boot_row(event: str, ts: Optional[str], details: Optional[Dict[str, Any]]) -> Tuple[str, str, Optional[str]]:
+    if ts is None:
+        ts = datetime.datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
+    payload = json.dumps(details, ensure_ascii=False) if isinstance(details, dict) else None
+    return ts, event, payload
+
+
 def insert_boot_report_entry(event: str, *, ts: Optional[str] = None, details: Optional[Dict[str, Any]] = None) -> int:
     """
     Public API expected by early-phase tests.
     Inserts a row into boot_events and returns the row id.
     """
     ensure_tables()
-    if ts is None:
-        ts = datetime.datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
-    payload = json.dumps(details, ensure_ascii=False) if isinstance(details, dict) else None
+    ts, event, payload = _boot_row(event, ts, details)
 
-    with contextlib.closing(_connect()) as con, contextlib.closing(con.cursor()) as cur:
+    con = _connect()
+    with con, contextlib.closing(con.cursor()) as cur:
         cur.execute(
             "INSERT INTO boot_events (ts, event, details) VALUES (?, ?, ?)",
             (ts, event, payload),
         )
-        con.commit()
         return int(cur.lastrowid)
 
 
-def bootstrap() -> None:
-    """Idempotent bootstrap entrypoint used by `py -m core.sqlite_bootstrap`."""
+def insert_boot_report_entries(entries: Iterable[Union[str, Mapping[str, Any]]]) -> int:
+    """
+    Bulk variant of insert_boot_report_entry: one transaction, one executemany.
+    Each entry is an event string or a mapping with "event" and optional "ts"/"details".
+    Returns the number of rows inserted.
+    """
+    rows = []
+    for e in entries:
+        if isinstance(e, str):
+            rows.append(_boot_row(e, None, None))
+        else:
+            rows.append(_boot_row(str(e.get("event", "")), e.get("ts"), e.get("details")))
+    if not rows:
+        return 0
     ensure_tables()
+    con = _connect()
+    with con:
+        con.executemany("INSERT INTO boot_events (ts, event, details) VALUES (?, ?, ?)", rows)
+    return len(rows)
+
+
+def bootstrap() -> None:
+    """Idempotent bootstrap entrypoint used by `py -m core.sqlite_bootstrap` (always re-runs DDL)."""
+    ensure_tables(force=True)
 
 
 if __name__ == "__main__":
@@ -172,9 +146,12 @@ if __name__ == "__main__":
 
 __all__ = [
     "DB_PATH",
+    "SCHEMA_VERSION",
     "ensure_tables",
+    "schema_version",
     "create_tables",  # back-compat
     "list_tables",
     "insert_boot_report_entry",
+    "insert_boot_report_entries",
     "bootstrap",
 ]
@@ -0,0 +1,205 @@
+# core/step_runner.py
+# In-process runner for tool/test entry points (used by tools/phase_0_5_sealer.py).
+# - A Step names a module and its argv; the module is imported once and its entry point is called with
+#   sys.argv = [module, *args]: run_cli(), an explicit `entry` attribute, or a test module's test_* functions
+# - stdout/stderr are captured per step and SystemExit/exceptions become exit codes, as with `python -m`;
+#   pending log batches are flushed after every step (what process exit used to do)
+# - jobs > 1: steps whose `after` dependencies succeeded run in a pool of worker processes forked once,
+#   after the step modules were imported in the parent (workers inherit them, nothing is re-imported)
+# - Fail-closed: after the first failing step no further step is started (the rest are "skipped")
+# - run_steps(reuse=...) lets a caller answer a step from a cache ("cached" counts as success);
+#   declared inputs (files/tables) are used by core.seal_pipeline for that
+# - Every result carries the step's wall time and the pid that ran it
+
+from __future__ import annotations
+
+import contextlib
+import importlib
+import io
+import multiprocessing
+import os
+import queue
+import sys
+import time
+import traceback
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from core.connection_manager import close_all
+from core.log_buffer import flush_all
+
+OUTPUT_LIMIT: int = 3000
+OK_STATUSES = ("ok", "cached")
+
+Reuse = Callable[["Step"], Optional[Dict[str, Any]]]
+
+
+@dataclass(frozen=True)
+class Step:
+    module: str
+    args: Tuple[str, ...] = ()
+    after: Tuple[str, ...] = ()  # names of steps that must succeed first
+    entry: Optional[str] = None  # attribute to call instead of run_cli()
+    name: str = ""
+    inputs: Tuple[str, ...] = ()  # file globs relative to the project root ("!glob" excludes)
+    tables: Tuple[str, ...] = ()  # will_data.db tables read by the step ("table WHERE <sql>" narrows)
+
+    @property
+    def key(self) -> str:
+        return self.name or self.module
+
+    def command(self) -> str:
+        return " ".join(["py -m", self.module, *self.args])
+
+
+def entry_points(step: Step) -> List[Callable[[], Any]]:
+    """Callables that make up a step (imports the module)."""
+    mod = importlib.import_module(step.module)
+    if step.entry:
+        return [getattr(mod, step.entry)]
+    fn = getattr(mod, "run_cli", None)
+    if callable(fn):
+        return [fn]
+    tests = [
+        obj for name, obj in vars(mod).items()
+        if name.startswith("test_") and callable(obj) and getattr(obj, "__module__", None) == mod.__name__
+    ]
+    if not tests:
+        raise RuntimeError(f"No run_cli() or test_* functions in module: {step.module}")
+    return tests
+
+
+def _exit_code(code: Any) -> int:
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    print(code, file=sys.stderr)
+    return 1
+
+
+def run_step(step: Step) -> Dict[str, Any]:
+    """Run one step in this process with its own argv and captured output; never raises."""
+    t0 = time.perf_counter()
+    out, err = io.StringIO(), io.StringIO()
+    argv = sys.argv[:]
+    sys.argv = [step.module, *step.args]
+    code = 0
+    try:
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+            try:
+                for fn in entry_points(step):
+                    fn()
+            except SystemExit as e:
+                code = _exit_code(e.code)
+            except Exception:
+                traceback.print_exc()
+                code = 1
+            finally:
+                flush_all()
+    finally:
+        sys.argv = argv
+    brief = (out.getvalue() or err.getvalue()).strip()
+    return {
+        "step": step.key,
+        "command": step.command(),
+        "status": "ok" if code == 0 else "failed",
+        "exit": code,
+        "output": brief[:OUTPUT_LIMIT],
+        "elapsed_s": round(time.perf_counter() - t0, 6),
+        "pid": os.getpid(),
+    }
+
+
+def _skipped(step: Step) -> Dict[str, Any]:
+    return {"step": step.key, "command": step.command(), "status": "skipped", "exit": None,
+            "output": "", "elapsed_s": 0.0, "pid": None}
+
+
+def _check(steps: Sequence[Step]) -> None:
+    seen: set = set()
+    for step in steps:
+        if step.key in seen:
+            raise ValueError(f"duplicate step name: {step.key}")
+        missing = [d for d in step.after if d not in seen]
+        if missing:
+            raise ValueError(f"step {step.key} depends on unknown or later steps: {missing}")
+        seen.add(step.key)
+
+
+def _preload(steps: Sequence[Step]) -> None:
+    for step in steps:
+        try:
+            entry_points(step)
+        except Exception:
+            pass  # reported by the step itself when it runs
+
+
+def _pool_context() -> Any:
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("fork" if "fork" in methods else None)
+
+
+def run_steps(steps: Sequence[Step], *, jobs: int = 1, reuse: Optional[Reuse] = None) -> List[Dict[str, Any]]:
+    """
+    Run steps fail-closed; results come back in input order.
+    jobs <= 1 runs them one after another in this process (input order must respect `after`).
+    reuse(step) is called in this process once the step's dependencies are done; a returned
+    result is recorded instead of running the step.
+    """
+    steps = list(steps)
+    _check(steps)
+    results: Dict[str, Dict[str, Any]] = {}
+    if jobs <= 1:
+        for step in steps:
+            res = reuse(step) if reuse is not None else None
+            results[step.key] = res = res or run_step(step)
+            if res["status"] not in OK_STATUSES:
+                break
+        return [results.get(s.key) or _skipped(s) for s in steps]
+
+    done: "queue.Queue[Tuple[str, Dict[str, Any]]]" = queue.Queue()
+    pending = list(steps)
+    running = 0
+    failed = False
+    with contextlib.ExitStack() as stack:
+        pool = None
+        while True:
+            ready = [] if failed else [
+                s for s in pending if all(results.get(d, {}).get("status") in OK_STATUSES for d in s.after)
+            ]
+            for step in ready:
+                pending.remove(step)
+                res = reuse(step) if reuse is not None else None
+                if res is not None:
+                    results[step.key] = res
+                    continue
+                if pool is None:  # first step that really runs: fork the workers now
+                    _preload([step, *pending])
+                    # Nothing buffered or connected may be inherited by the workers
+                    flush_all()
+                    close_all()
+                    pool = stack.enter_context(_pool_context().Pool(processes=min(jobs, len(steps)) or 1))
+                running += 1
+                pool.apply_async(
+                    run_step, (step,),
+                    callback=lambda res, k=step.key: done.put((k, res)),
+                    error_callback=lambda exc, s=step: done.put((s.key, dict(
+                        _skipped(s), status="failed", exit=1, output=f"{type(exc).__name__}: {exc}"))),
+                )
+            if not running:
+                if ready and pending:
+                    continue  # reused steps may have unblocked others
+                break
+            key, res = done.get()
+            running -= 1
+            results[key] = res
+            failed = failed or res["status"] not in OK_STATUSES
+    return [results.get(s.key) or _skipped(s) for s in steps]
+
+
+def first_failure(results: Sequence[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    return next((r for r in results if r["status"] == "failed"), None)
+
+
+__all__ = ["Step", "OUTPUT_LIMIT", "OK_STATUSES", "entry_points", "run_step", "run_steps", "first_failure"]
@@ -1,59 +1,54 @@
 # core/trace_logger.py
-# Trace logging with UTF-8 writes and normalized, project-relative source paths.
+# Trace logging with UTF-8 writes and normalized, project-relative source paths (core.path_normalizer).
+# Records are batched in-process (core.log_buffer) and appended one batch per write,
+# to the NDJSON file and/or the trace_events table per WILL_LOG_SINK (core.log_db_sink).
+# File appends keep the tag/time sidecar index current (core.log_index) and rotate the file
+# into gzip archives by size/age (core.log_rotation). Lines are encoded by core.serializer.
+# alog_trace_event() is the asyncio counterpart: due flushes run in a worker thread, not on the loop.
+# Records carry a top-level run_id (run_id= argument or core.run_context.run_scope).
+# Import is cheap: logs/ is created and the sink/index/rotation modules and asyncio are imported
+# on first write / first async call, not at import time.
 
 from __future__ import annotations
 
-import json
 import time
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Union
 
-LOG_PATH = Path("logs/reflex_trace_log.json")
-LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
+from core import serializer
+from core.log_buffer import get_buffer
+from core.path_normalizer import rel_posix
+from core.run_context import resolve_run_id
 
+LOG_PATH = Path("logs/reflex_trace_log.json")
 
-def _find_project_root() -> Path:
-    here = Path(__file__).resolve()
-    for p in [here] + list(here.parents):
-        try:
-            if (p / "configs" / "ironroot_manifest_data.json").exists():
-                return p
-            if (p / "boot").is_dir() and (p / "core").is_dir():
-                return p
-        except Exception:
-            continue
-    return Path.cwd().resolve()
 
+def _now_iso() -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
 
-_PROJECT_ROOT = _find_project_root()
-_PROJECT_ROOT_RESOLVED = _PROJECT_ROOT.resolve()
 
+def _write_records(records: List[Dict[str, Any]]) -> None:
+    from core import log_db_sink, log_index, log_rotation  # deferred: first batch pays the import
 
-def _norm_slashes(value: Optional[str]) -> Optional[str]:
-    if value is None:
-        return None
-    return value.replace("\\", "/")
+    # DB first: if the sink refuses the batch, nothing was written and the buffer keeps it whole
+    if log_db_sink.writes_db():
+        log_db_sink.write_trace_events(records)
+    if log_db_sink.writes_file():
+        LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with LOG_PATH.open("ab") as f:
+            f.write(serializer.ndjson(records))
+        log_index.note_append(LOG_PATH)
+        if log_rotation.maybe_rotate(LOG_PATH):
+            log_index.forget(LOG_PATH)
 
 
-def _rel_source(value: Optional[str], default_file: str) -> str:
-    raw = _norm_slashes(value)
-    try:
-        if raw:
-            p = Path(raw).resolve()
-        else:
-            p = Path(default_file).resolve()
-    except Exception:
-        return (raw or default_file).replace("\\", "/")
+# Pending records live here until a size/age threshold, flush(), or process exit
+_BUFFER = get_buffer("trace", _write_records)
 
-    try:
-        rel = p.relative_to(_PROJECT_ROOT_RESOLVED)
-        return rel.as_posix()
-    except Exception:
-        return p.as_posix()
 
-
-def _now_iso() -> str:
-    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+def flush() -> int:
+    """Write any buffered trace records now; returns how many were written."""
+    return _BUFFER.flush()
 
 
 def log_trace_event(
@@ -63,23 +58,54 @@ def log_trace_event(
     tags: Optional[List[str]] = None,
     content: Optional[Union[str, Dict[str, Any], List[Any]]] = None,
     phase: Optional[Union[int, float, str]] = None,
+    run_id: Optional[str] = None,
 ) -> None:
     """
     Append a trace event (NDJSON) to logs/reflex_trace_log.json.
     - Always UTF-8
     - `source` stored as project-relative path when possible (forward slashes)
+    - Buffered: the record reaches disk on the next batch flush (see flush())
+    - run_id defaults to the active run_scope() (content["run_id"] is not consulted)
+    """
+    _BUFFER.append(_make_record(description, source, tags, content, phase, run_id))
+
+
+async def alog_trace_event(
+    description: str,
+    *,
+    source: Optional[str] = None,
+    tags: Optional[List[str]] = None,
+    content: Optional[Union[str, Dict[str, Any], List[Any]]] = None,
+    phase: Optional[Union[int, float, str]] = None,
+    run_id: Optional[str] = None,
+) -> None:
     """
-    src = _rel_source(source, default_file=__file__)
+    asyncio counterpart of log_trace_event (same arguments and record).
+    A flush made due by this record is offloaded with asyncio.to_thread.
+    """
+    if _BUFFER.offer(_make_record(description, source, tags, content, phase, run_id)):
+        import asyncio
+
+        await asyncio.to_thread(_BUFFER.flush)
+
 
-    rec: Dict[str, Any] = {
+def _make_record(
+    description: str,
+    source: Optional[str],
+    tags: Optional[List[str]],
+    content: Optional[Union[str, Dict[str, Any], List[Any]]],
+    phase: Optional[Union[int, float, str]],
+    run_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    record: Dict[str, Any] = {
         "ts": _now_iso(),
         "description": str(description),
-        "source": src,
+        "source": rel_posix(source, default=__file__),
         "tags": list(tags or []),
         "content": content,
         "phase": phase,
     }
-
-    line = json.dumps(rec, ensure_ascii=False)
-    with LOG_PATH.open("a", encoding="utf-8", newline="\n") as f:
-        f.write(line + "\n")
+    rid = resolve_run_id(run_id)
+    if rid is not None:
+        record["run_id"] = rid
+    return record
@@ -4,11 +4,9 @@
 from boot.boot_path_initializer import inject_paths
 inject_paths()
 
-import sqlite3
-from pathlib import Path
-
 from core.phase_control import ensure_phase, REQUIRED_PHASE
-from core.sqlite_bootstrap import DB_PATH
+from core.sqlite_bootstrap import DB_PATH, ensure_tables
+from core.connection_manager import get_connection
 from core.memory_interface import log_memory_event
 from core.trace_logger import log_trace_event
 
@@ -16,18 +14,11 @@ from core.trace_logger import log_trace_event
 def run_cli():
     ensure_phase()  # fail-closed if not REQUIRED_PHASE
 
-    # Force a deterministic DB change
-    with sqlite3.connect(Path(DB_PATH).as_posix()) as conn:
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS test_ticks (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                created_at TEXT NOT NULL DEFAULT (datetime('now'))
-            );
-            """
-        )
+    # Force a deterministic DB change (test_ticks layout: core/migrations/m0004_test_ticks.py)
+    ensure_tables()
+    conn = get_connection(DB_PATH)
+    with conn:
         conn.execute("INSERT INTO test_ticks DEFAULT VALUES;")
-        conn.commit()
 
     # Dual logging
     src = __file__.replace("\\", "/")
@@ -5,21 +5,21 @@ from boot.boot_path_initializer import inject_paths
 inject_paths()
 
 from core.phase_control import ensure_phase, REQUIRED_PHASE
-from core.memory_interface import log_memory_event
-from core.trace_logger import log_trace_event
+from core.memory_interface import log_memory_event, alog_memory_event
+from core.trace_logger import log_trace_event, alog_trace_event
 
-def run_cli():
-    ensure_phase()  # fail-closed if not REQUIRED_PHASE
-
-    # Dual logging: memory + trace
-    log_memory_event(
+def _memory_event():
+    return dict(
         event_text="reflex_trace_ping memory",
         source=__file__.replace("\\", "/"),
         tags=["reflex", "test", "trace"],
         content={"msg": "ping"},
         phase=REQUIRED_PHASE,
     )
-    log_trace_event(
+
+
+def _trace_event():
+    return dict(
         description="reflex_trace_ping executed",
         source=__file__.replace("\\", "/"),
         tags=["reflex", "test", "trace"],
@@ -27,7 +27,23 @@ def run_cli():
         phase=REQUIRED_PHASE,
     )
 
+
+def run_cli():
+    ensure_phase()  # fail-closed if not REQUIRED_PHASE
+
+    # Dual logging: memory + trace
+    log_memory_event(**_memory_event())
+    log_trace_event(**_trace_event())
+
     print("✅ trace_ping ok")
 
+
+async def arun():
+    """asyncio entry point (core.async_runner): same events as run_cli, logged without blocking the loop."""
+    ensure_phase()
+    await alog_memory_event(**_memory_event())
+    await alog_trace_event(**_trace_event())
+    return "ok"
+
 if __name__ == "__main__":
     run_cli()
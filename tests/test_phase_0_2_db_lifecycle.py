@@ -7,11 +7,11 @@ import time
 import json
 
 from core.phase_control import REQUIRED_PHASE, ensure_phase
-from core.memory_interface import log_memory_event
+from core.memory_interface import log_memory_event, read_memory_log
 from core.trace_logger import log_trace_event
+from core.log_buffer import flush_all
 
 
-MEM_LOG = Path("logs/will_memory_log.json")
 TRACE_LOG = Path("logs/reflex_trace_log.json")
 
 
@@ -27,8 +27,9 @@ def _safe_count_lines(p: Path) -> int:
 def run_cli() -> None:
     ensure_phase()
 
-    # Baseline counts
-    mem_before = _safe_count_lines(MEM_LOG)
+    # Baseline counts (drain batched writes so the files are current)
+    flush_all()
+    mem_before = len(read_memory_log())
     trace_before = _safe_count_lines(TRACE_LOG)
 
     log_memory_event(
@@ -56,7 +57,8 @@ def run_cli() -> None:
     )
 
     # Re-count
-    mem_after = _safe_count_lines(MEM_LOG)
+    flush_all()
+    mem_after = len(read_memory_log())
     trace_after = _safe_count_lines(TRACE_LOG)
 
     assert mem_after >= mem_before + 1, f"Memory log did not grow: before={mem_before} after={mem_after}"
@@ -0,0 +1,114 @@
+# tests/test_phase_0_7_async_runner.py
+# Verifies asyncio logging helpers and concurrent reflex execution on one event loop.
+
+from boot.boot_path_initializer import inject_paths
+inject_paths()
+
+import asyncio
+import sys
+import threading
+import time
+
+from core import async_runner
+from core.memory_interface import alog_memory_event
+from core.trace_logger import alog_trace_event
+
+
+def test_alog_helpers_return_entries_without_blocking():
+    async def main():
+        entry = await alog_memory_event("async memory", source=__file__, tags=["test", "async"])
+        await alog_trace_event("async trace", source=__file__, tags=["test", "async"])
+        return entry
+
+    entry = asyncio.run(main())
+    assert entry["message"] == "async memory"
+    assert entry["source"] == "tests/test_phase_0_7_async_runner.py"
+
+
+def test_sync_targets_overlap_and_async_targets_stay_on_loop():
+    loop_thread = {}
+
+    def blocking():
+        time.sleep(0.2)
+        return threading.current_thread().name
+
+    async def native():
+        loop_thread["name"] = threading.current_thread().name
+        await asyncio.sleep(0.2)
+        return "native"
+
+    def broken():
+        raise SystemExit(3)
+
+    t0 = time.perf_counter()
+    results = async_runner.run([blocking, blocking, native, native, broken], concurrency=5)
+    elapsed = time.perf_counter() - t0
+
+    assert elapsed < 0.6, "targets should run concurrently, not back to back"
+    assert [r["status"] for r in results] == ["ok", "ok", "ok", "ok", "error"]
+    assert results[0]["result"] != threading.current_thread().name  # offloaded to a worker thread
+    assert loop_thread["name"] == threading.current_thread().name   # coroutine ran on the loop
+    assert results[4]["error"].startswith("SystemExit")
+
+
+def test_module_targets_prefer_arun():
+    label, fn = async_runner.resolve("reflexes.reflex_core.reflex_trace_ping")
+    assert fn.__name__ == "arun"
+    results = async_runner.run([label] * 3)
+    assert [r["result"] for r in results] == ["ok", "ok", "ok"]
+
+
+def test_module_run_cli_gets_its_own_argv(tmp_path, monkeypatch):
+    pkg = tmp_path / "will_async_targets"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("", encoding="utf-8")
+    (pkg / "cli.py").write_text(
+        "import argparse, sys, time\n"
+        "def run_cli():\n"
+        "    parser = argparse.ArgumentParser()\n"
+        "    parser.add_argument('--name', default='none')\n"
+        "    args = parser.parse_args()\n"
+        "    time.sleep(0.01)\n"
+        "    return (sys.argv[0], args.name)\n",
+        encoding="utf-8",
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    host_argv = ["run_reflexes_async", "-m", "x", "-m", "y"]
+    monkeypatch.setattr("sys.argv", host_argv)
+    try:
+        results = async_runner.run(
+            ["will_async_targets.cli"] + [("will_async_targets.cli", ("--name", f"n{i}")) for i in range(4)],
+            concurrency=5,
+        )
+    finally:
+        for name in ("will_async_targets", "will_async_targets.cli"):
+            sys.modules.pop(name, None)
+    assert [r["status"] for r in results] == ["ok"] * 5
+    assert [r["result"] for r in results] == [("will_async_targets.cli", "none")] + [
+        ("will_async_targets.cli", f"n{i}") for i in range(4)
+    ]
+    assert results[1]["target"] == "will_async_targets.cli --name n0"
+    assert sys.argv is host_argv
+
+
+def test_argv_free_module_targets_overlap(tmp_path, monkeypatch):
+    pkg = tmp_path / "will_async_plain"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("", encoding="utf-8")
+    (pkg / "slow.py").write_text(
+        "import time\n"
+        "def run_cli():\n"
+        "    time.sleep(0.2)\n"
+        "    return 'slept'\n",
+        encoding="utf-8",
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    try:
+        t0 = time.perf_counter()
+        results = async_runner.run(["will_async_plain.slow"] * 3, concurrency=3)
+        elapsed = time.perf_counter() - t0
+    finally:
+        for name in ("will_async_plain", "will_async_plain.slow"):
+            sys.modules.pop(name, None)
+    assert [r["result"] for r in results] == ["slept"] * 3
+    assert elapsed < 0.5, "argv-free run_cli targets should not serialize on the argv lock"
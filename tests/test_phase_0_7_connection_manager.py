@@ -0,0 +1,83 @@
+# tests/test_phase_0_7_connection_manager.py
+# Verifies pooled connection reuse, read-only handles and stale-file detection in core.connection_manager.
+
+from boot.boot_path_initializer import inject_paths
+inject_paths()
+
+import sqlite3
+import threading
+
+import pytest
+
+from core.connection_manager import close_all, get_connection, read_connection, release, stats
+
+
+def test_same_thread_reuses_connection(tmp_path):
+    db = tmp_path / "pool.db"
+    con = get_connection(db)
+    before = stats()["reuses"]
+    assert get_connection(db) is con
+    assert stats()["reuses"] == before + 1
+    assert con.execute("PRAGMA journal_mode;").fetchone()[0] == "wal"
+
+    seen = []
+    t = threading.Thread(target=lambda: seen.append(get_connection(db)))
+    t.start(); t.join()
+    assert seen and seen[0] is not con  # one connection per thread
+    release(db)
+
+
+def test_readonly_connection_rejects_writes(tmp_path):
+    db = tmp_path / "ro.db"
+    with get_connection(db) as con:
+        con.execute("CREATE TABLE t (x INTEGER);")
+        con.execute("INSERT INTO t VALUES (1);")
+    ro = read_connection(db)
+    assert ro.execute("SELECT COUNT(*) FROM t;").fetchone()[0] == 1
+    with pytest.raises(sqlite3.OperationalError):
+        ro.execute("INSERT INTO t VALUES (2);")
+    release(db)
+
+
+def test_recreated_file_gets_fresh_connection(tmp_path):
+    db = tmp_path / "swap.db"
+    first = get_connection(db)
+    for f in tmp_path.glob("swap.db*"):
+        f.unlink()  # DB replaced underneath the cached handle
+    second = get_connection(db)
+    assert second is not first
+    second.execute("CREATE TABLE fresh (x INTEGER);")
+    release(db)
+
+
+def test_close_all_leaves_other_threads_connections_open(tmp_path):
+    db = tmp_path / "owned.db"
+    opened, closed, done = threading.Event(), threading.Event(), threading.Event()
+    seen = {}
+
+    def worker():
+        con = get_connection(db)
+        opened.set()
+        closed.wait(5)
+        seen["usable"] = con.execute("SELECT 1").fetchone() == (1,)  # main's close_all() left it alone
+        close_all()
+        try:
+            con.execute("SELECT 1")
+            seen["closed"] = False
+        except sqlite3.ProgrammingError:
+            seen["closed"] = True  # closed by its own thread's close_all()
+        done.set()
+
+    t = threading.Thread(target=worker)
+    t.start()
+    opened.wait(5)
+    before = stats()
+    close_all()
+    after = stats()
+    assert after["open_other_threads"] == before["open_other_threads"] >= 1
+    assert after["open_now"] >= after["open_other_threads"]
+    closed.set()
+    done.wait(5)
+    t.join()
+    assert seen["usable"] is True and seen["closed"] is True
+    assert stats()["open_other_threads"] < after["open_other_threads"]
@@ -0,0 +1,63 @@
+# tests/test_phase_0_7_log_alignment.py
+# Verifies the bounded-memory external sort and the memory↔trace sort-merge alignment.
+
+from boot.boot_path_initializer import inject_paths
+inject_paths()
+
+import random
+
+from core.external_sort import sorted_stream
+from core.log_alignment import align, normalize_name
+
+
+def test_external_sort_spills_runs_and_cleans_up(tmp_path):
+    items = [(random.randrange(50), str(i)) for i in range(1000)]
+    stats = {}
+    out = list(sorted_stream(iter(items), chunk_size=64, tmp_dir=tmp_path, stats=stats))
+    assert out == sorted(items)
+    assert stats == {"items": 1000, "runs": 16}
+    assert list(tmp_path.iterdir()) == []  # run files removed once the stream is exhausted
+    assert list(sorted_stream([3, 1, 2], chunk_size=10)) == [1, 2, 3]
+
+
+def _mem(ts, msg, rid="r1", src="tools/x.py"):
+    return {"ts": f"2026-01-01T00:00:{ts:02d}Z", "message": msg, "source": src, "run_id": rid}
+
+
+def _trc(ts, desc, rid="r1", src="tools/x.py"):
+    return {"ts": f"2026-01-01T00:00:{ts:02d}Z", "description": desc, "source": src, "content": {"run_id": rid}}
+
+
+def test_align_pairs_within_tolerance_and_reports_misaligned(tmp_path):
+    memory = [
+        _mem(1, "Snapshot_Wrapper   start"),
+        _mem(10, "snapshot_wrapper done — ok"),
+        _mem(20, "memory only"),
+        _mem(30, "late pair"),
+        _mem(5, "snapshot_wrapper start", rid="r2"),
+    ]
+    trace = [
+        _trc(2, "snapshot_wrapper start"),
+        _trc(10, "snapshot_wrapper done"),
+        _trc(40, "late pair"),
+        _trc(6, "snapshot_wrapper start", rid="r2"),
+        _trc(7, "trace only", rid="r2"),
+    ]
+    pairs = []
+    stats = align(iter(memory), iter(trace), tolerance=2, chunk_size=2, tmp_dir=tmp_path, on_misaligned=pairs.append)
+
+    assert stats["aligned"] == 3 and stats["max_skew_s"] == 1
+    assert stats["memory_unmatched"] == 2 and stats["trace_unmatched"] == 2
+    assert stats["misaligned"] == 2
+    assert sorted((p["side"], p["event"]["name"], p["skew_s"]) for p in pairs) == [
+        ("memory", "late pair", 10), ("trace", "late pair", -10),
+    ]
+    assert stats["sort"]["memory"] == {"items": 5, "runs": 3}
+
+    only_r2 = align(iter(memory), iter(trace), tolerance=2, run_id="r2")
+    assert (only_r2["memory_events"], only_r2["trace_events"], only_r2["aligned"]) == (1, 2, 1)
+
+
+def test_normalize_name():
+    assert normalize_name("  Tool  DONE — details: x ") == "tool done"
+    assert normalize_name(None) == ""
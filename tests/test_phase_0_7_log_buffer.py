@@ -0,0 +1,46 @@
+# tests/test_phase_0_7_log_buffer.py
+# Verifies batching semantics of core.log_buffer (thresholds, batched(), failure safety).
+
+from boot.boot_path_initializer import inject_paths
+inject_paths()
+
+import pytest
+
+from core.log_buffer import LogBuffer, batched, get_buffer
+
+
+def test_size_threshold_flushes_one_batch():
+    batches = []
+    buf = LogBuffer("t-size", batches.append, max_entries=3, max_age=3600)
+    for i in range(7):
+        buf.append(i)
+    assert batches == [[0, 1, 2], [3, 4, 5]]
+    assert buf.pending == 1
+    assert buf.flush() == 1
+    assert batches[-1] == [6]
+
+
+def test_batched_block_drains_on_exit():
+    batches = []
+    buf = get_buffer("t-batched", batches.append, max_entries=1000, max_age=0)
+    with batched():
+        buf.append("a")
+        buf.append("b")
+        assert batches == []  # age threshold is deferred inside the block
+    assert batches == [["a", "b"]]
+
+
+def test_failed_flush_keeps_entries():
+    calls = {"n": 0}
+
+    def flaky(batch):
+        calls["n"] += 1
+        if calls["n"] == 1:
+            raise OSError("disk full")
+
+    buf = LogBuffer("t-flaky", flaky, max_entries=100, max_age=3600)
+    buf.append("x")
+    with pytest.raises(OSError):
+        buf.flush()
+    assert buf.pending == 1
+    assert buf.flush() == 1
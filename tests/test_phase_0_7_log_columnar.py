@@ -0,0 +1,94 @@
+# tests/test_phase_0_7_log_columnar.py
+# Verifies columnar parts for sealed segments/archives and full-history group-by counts.
+
+from boot.boot_path_initializer import inject_paths
+inject_paths()
+
+import zipfile
+from collections import Counter
+
+from core import log_columnar, log_rotation
+from core.segment_store import SegmentStore
+
+
+def _records(n, hour=1):
+    return [
+        {
+            "ts": f"2026-01-01T{hour + i // 60:02d}:{i % 60:02d}:00Z",
+            "source": f"tools/t{i % 3}.py",
+            "event_type": "info" if i % 2 else "warn",
+            "phase": 0.7 if i % 4 else 0.6,
+            "tags": ["tool", f"t{i % 5}"] if i % 7 else [],
+        }
+        for i in range(n)
+    ]
+
+
+def _expected(records, by):
+    out = Counter()
+    for r in records:
+        if by == "tag":
+            out.update(r["tags"])
+        elif by == "phase":
+            out[repr(float(r["phase"]))] += 1
+        else:
+            out[r[by]] += 1
+    return dict(out)
+
+
+def test_compact_and_group_count_match_a_full_scan(tmp_path, monkeypatch):
+    monkeypatch.setattr(log_rotation, "ARCHIVE_DIR", tmp_path / "archive")
+    root = tmp_path / "columnar"
+    store = SegmentStore(tmp_path / "mem.d", max_bytes=2000)
+    records = _records(90)
+    store.append_many(records[:45])
+    store.append_many(records[45:])
+    sealed = store.sealed_entries()
+    assert sealed, "fixture should roll at least one sealed segment"
+    key = store.base_dir.as_posix()
+    args = dict(live=store.segments(), sealed=sealed, base_dir=store.base_dir, root=root)
+
+    before = {by: log_columnar.group_count(key, by, **args) for by in log_columnar.GROUP_BY}
+    written = log_columnar.compact(key, log_columnar.sources(key, sealed, base_dir=store.base_dir), root=root)
+    assert len(written) == len(sealed)
+    assert log_columnar.compact(key, log_columnar.sources(key, sealed, base_dir=store.base_dir), root=root) == []
+
+    for by in log_columnar.GROUP_BY:
+        assert log_columnar.group_count(key, by, **args) == before[by] == _expected(records, by)
+
+    window = [r for r in records if "2026-01-01T01:30:00Z" <= r["ts"] <= "2026-01-01T02:10:00Z"]
+    got = log_columnar.group_count(key, "source", since="2026-01-01T01:30:00Z", until="2026-01-01T02:10:00Z", **args)
+    assert got == _expected(window, "source")
+
+    # Parts are plain .npz archives of .npy members
+    with zipfile.ZipFile(written[0]) as zf:
+        assert {"ts.npy", "tag_codes.npy", "meta.json"} <= set(zf.namelist())
+        assert zf.read("ts.npy").startswith(b"\x93NUMPY")
+
+
+def test_archived_segments_and_stale_parts(tmp_path, monkeypatch):
+    monkeypatch.setattr(log_rotation, "ARCHIVE_DIR", tmp_path / "archive")
+    root = tmp_path / "columnar"
+    store = SegmentStore(tmp_path / "mem.d", max_bytes=1500)
+    records = _records(60)
+    store.append_many(records)
+    key = store.base_dir.as_posix()
+    log_columnar.compact(key, log_columnar.sources(key, store.sealed_entries(), base_dir=store.base_dir), root=root)
+
+    # Sealed segments move into gzip archives: the same parts still answer, nothing is double counted
+    log_rotation.archive_segments(store, limit_bytes=1)
+    assert store.sealed_entries() == []
+    got = log_columnar.group_count(key, "tag", live=store.segments(), base_dir=store.base_dir, root=root)
+    assert got == _expected(records, "tag")
+
+    # A recycled log reusing segment names is never answered from the old parts
+    for p in list(store.base_dir.iterdir()):
+        p.unlink()
+    for p in (tmp_path / "archive").rglob("*.gz"):
+        p.unlink()
+    fresh = SegmentStore(tmp_path / "mem.d", max_bytes=1500)
+    newer = _records(30, hour=9)
+    fresh.append_many(newer)
+    got = log_columnar.group_count(key, "tag", live=fresh.segments(), sealed=fresh.sealed_entries(),
+                                   base_dir=fresh.base_dir, root=root)
+    assert got == _expected(newer, "tag")
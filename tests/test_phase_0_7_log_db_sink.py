@@ -0,0 +1,66 @@
+# tests/test_phase_0_7_log_db_sink.py
+# Verifies the opt-in DB log sink: file-only default, no schema changes from logging, batch kept on refusal.
+
+from boot.boot_path_initializer import inject_paths
+inject_paths()
+
+import sqlite3
+from pathlib import PurePosixPath
+
+import pytest
+
+import core.log_db_sink as sink
+import core.sqlite_bootstrap as sb
+from core.connection_manager import close_all
+from core.log_buffer import LogBuffer
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    path = PurePosixPath((tmp_path / "sink.db").as_posix())
+    monkeypatch.setattr(sb, "DB_PATH", path)
+    monkeypatch.setattr(sink, "DB_PATH", path)
+    monkeypatch.setenv(sink.SINK_ENV, "db")
+    yield path
+    close_all()
+
+
+def _tables(path):
+    con = sqlite3.connect(path.as_posix())
+    try:
+        return {r[0] for r in con.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+    finally:
+        con.close()
+
+
+def test_default_sink_is_file_only(monkeypatch):
+    monkeypatch.delenv(sink.SINK_ENV, raising=False)
+    assert sink.sink_mode() == "file"
+    assert sink.writes_file() and not sink.writes_db()
+
+
+def test_sink_never_creates_or_migrates_the_schema(db):
+    entry = {"ts": "2026-01-01T00:00:00Z", "tags": ["t"], "event_text": "x"}
+    with pytest.raises(sink.SinkSchemaError):
+        sink.write_memory_events([entry])
+
+    # Legacy layout (event tables without the m0002 columns) stays untouched
+    con = sqlite3.connect(db.as_posix())
+    con.execute("CREATE TABLE memory_events (id INTEGER PRIMARY KEY, ts TEXT, tag TEXT, payload TEXT)")
+    con.commit()
+    con.close()
+    with pytest.raises(sink.SinkSchemaError, match="memory_events.run_id missing"):
+        sink.write_memory_events([entry])
+    assert _tables(db) == {"memory_events"}
+
+    # Refused batches stay buffered; once the DB is migrated they land
+    written = []
+    buf = LogBuffer("sink_test", lambda batch: written.append(sink.write_memory_events(batch)))
+    buf.offer(entry)
+    with pytest.raises(sink.SinkSchemaError):
+        buf.flush()
+    assert buf.pending == 1
+    close_all()
+    sb.ensure_tables()
+    assert buf.flush() == 1 and written == [1]
+    assert sink.write_trace_events([{"ts": "t", "tags": ["error"], "description": "d", "run_id": "r1"}]) == 1
@@ -0,0 +1,51 @@
+# tests/test_phase_0_7_log_index.py
+# Verifies the tag/time sidecar index: incremental catch-up, index-driven queries, rebuild on rewrite.
+
+from boot.boot_path_initializer import inject_paths
+inject_paths()
+
+import json
+from pathlib import Path
+
+from core import log_index, log_reader
+
+
+def _append(path: Path, records) -> None:
+    with path.open("a", encoding="utf-8", newline="\n") as f:
+        f.write("".join(json.dumps(r) + "\n" for r in records))
+
+
+def _rec(i: int, hour: int, *tags: str):
+    return {"ts": f"2026-01-01T{hour:02d}:00:{i % 60:02d}Z", "description": f"e{i}", "tags": list(tags)}
+
+
+def test_incremental_index_and_queries(tmp_path, monkeypatch):
+    log, idx = tmp_path / "trace.json", tmp_path / "idx.db"
+    _append(log, [_rec(i, 1, "snapshot" if i % 10 == 0 else "noise") for i in range(100)])
+    assert log_index.catch_up(log, index_path=idx) == 100
+    _append(log, [_rec(i, 2, "snapshot", "done") for i in range(100, 103)])
+    assert log_index.catch_up(log, index_path=idx) == 3  # only the appended bytes
+    assert log_index.catch_up(log, index_path=idx) == 0
+
+    parsed = []
+    real = log_reader._parse
+    monkeypatch.setattr(log_reader, "_parse", lambda line: parsed.append(1) or real(line))
+    hits = log_index.query(log, tag="snapshot", index_path=idx)
+    assert [r["description"] for r in hits][-3:] == ["e100", "e101", "e102"]
+    assert len(hits) == 13 and len(parsed) == 13  # only index hits were parsed
+
+    assert [r["description"] for r in log_index.query(log, tag="snapshot", limit=2, index_path=idx)] == ["e101", "e102"]
+    late = log_index.query(log, since="2026-01-01T02:00:00Z", index_path=idx)
+    assert [r["description"] for r in late] == ["e100", "e101", "e102"]
+    assert log_index.count(log, tag="done", index_path=idx) == 3
+    assert log_index.count(log, index_path=idx) == 103
+
+
+def test_rewritten_file_is_reindexed(tmp_path):
+    log, idx = tmp_path / "trace.json", tmp_path / "idx.db"
+    _append(log, [_rec(i, 1, "old") for i in range(5)])
+    log_index.catch_up(log, index_path=idx)
+    log.unlink()
+    _append(log, [_rec(0, 3, "new")])
+    assert [r["tags"] for r in log_index.query(log, tag="new", index_path=idx)] == [["new"]]
+    assert log_index.query(log, tag="old", index_path=idx) == []
@@ -0,0 +1,52 @@
+# tests/test_phase_0_7_log_reader.py
+# Verifies the mmap NDJSON reader: lazy forward reads, backward tail, legacy arrays, validation.
+
+from boot.boot_path_initializer import inject_paths
+inject_paths()
+
+import json
+from pathlib import Path
+
+from core import log_reader
+
+
+def _write(path: Path, records, *, junk: bool = False) -> None:
+    lines = [json.dumps(r) for r in records]
+    if junk:
+        lines.insert(1, "{not json")
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8", newline="\n")
+
+
+def test_tail_reads_from_the_end(tmp_path, monkeypatch):
+    path = tmp_path / "trace.json"
+    _write(path, [{"i": i, "tags": ["even" if i % 2 == 0 else "odd"]} for i in range(1000)], junk=True)
+
+    parsed = []
+    real = log_reader._parse
+    monkeypatch.setattr(log_reader, "_parse", lambda line: parsed.append(1) or real(line))
+    out = log_reader.tail(path, 3)
+    assert [r["i"] for r in out] == [997, 998, 999]
+    assert len(parsed) <= 5  # trailing newline + 3 records, never the whole file
+
+    evens = log_reader.tail(path, 2, predicate=lambda r: "even" in r["tags"])
+    assert [r["i"] for r in evens] == [996, 998]
+    assert log_reader.count_records(path) == 1000  # junk line skipped
+    assert [r["i"] for r in log_reader.tail(path, 0)][:2] == [0, 1]
+
+
+def test_legacy_array_and_validation(tmp_path):
+    legacy = tmp_path / "legacy.json"
+    legacy.write_text(json.dumps([{"i": 1}, {"i": 2}], indent=2), encoding="utf-8")
+    assert [r["i"] for r in log_reader.iter_records(legacy)] == [1, 2]
+    assert [r["i"] for r in log_reader.tail(legacy, 1)] == [2]
+    assert log_reader.is_valid(legacy)
+
+    broken = tmp_path / "broken.json"
+    _write(broken, [{"i": 1}, {"i": 2}], junk=True)
+    assert not log_reader.is_valid(broken)
+
+    empty = tmp_path / "empty.json"
+    empty.write_text("", encoding="utf-8")
+    assert log_reader.is_valid(empty) and log_reader.tail(empty, 5) == []
+    assert not log_reader.is_valid(tmp_path / "missing.json")
+    assert list(log_reader.iter_records(tmp_path / "missing.json")) == []
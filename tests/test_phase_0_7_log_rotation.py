@@ -0,0 +1,81 @@
+# tests/test_phase_0_7_log_rotation.py
+# Verifies size rotation into gzip archives, the manifest, segment archiving and range-aware reads.
+
+from boot.boot_path_initializer import inject_paths
+inject_paths()
+
+import json
+from pathlib import Path
+
+from core import log_index, log_rotation
+from core.segment_store import SegmentStore
+
+
+def _append(path: Path, hour: int, n: int, tag: str) -> None:
+    with path.open("a", encoding="utf-8", newline="\n") as f:
+        for i in range(n):
+            f.write(json.dumps({"ts": f"2026-01-01T{hour:02d}:00:{i:02d}Z", "tags": [tag], "i": i}) + "\n")
+
+
+def test_size_rotation_and_range_queries(tmp_path, monkeypatch):
+    log, root, idx = tmp_path / "trace.json", tmp_path / "archive", tmp_path / "idx.db"
+    _append(log, 1, 20, "old")
+    assert log_rotation.maybe_rotate(log, limit_bytes=10**6, root=root) is None
+    entry = log_rotation.maybe_rotate(log, limit_bytes=100, root=root)
+    assert entry["records"] == 20 and entry["first_ts"] == "2026-01-01T01:00:00Z"
+    assert not log.exists() and Path(entry["path"]).name.endswith(".gz")
+    assert [r["i"] for r in log_rotation.iter_archive(entry["path"])] == list(range(20))
+
+    assert log_rotation.archived_count(log.as_posix(), root=root) == 20
+
+    _append(log, 5, 3, "new")
+    # Manifest is rebuilt from archive names when it goes missing
+    (root / "manifest.json").unlink()
+    assert log_rotation.archives_for(log.as_posix(), root=root)[0]["last_ts"] == "2026-01-01T01:00:19Z"
+    assert log_rotation.archived_count(log.as_posix(), root=root) == 20  # no records in the manifest: counted
+
+    monkeypatch.setattr(log_rotation, "ARCHIVE_DIR", root)
+    assert [r["tags"] for r in log_index.query(log, index_path=idx)] == [["new"]] * 3  # live only
+    recent = log_index.query(log, since="2026-01-01T05:00:00Z", index_path=idx)
+    assert len(recent) == 3  # range starts inside the live file: archives untouched
+    full = log_index.query(log, tag="old", since="2026-01-01T00:00:00Z", index_path=idx)
+    assert [r["i"] for r in full] == list(range(20))
+    last = log_index.query(log, since="2026-01-01T00:00:00Z", limit=5, index_path=idx)
+    assert [r["tags"][0] for r in last] == ["old", "old", "new", "new", "new"]
+
+def test_sealed_segments_are_archived(tmp_path):
+    store = SegmentStore(tmp_path / "mem.d", max_bytes=200)
+    for i in range(30):
+        store.append({"ts": f"2026-01-01T00:00:{i:02d}Z", "message": f"m{i}"})
+    sealed = store.sealed_entries()
+    assert len(sealed) >= 2
+
+    done = log_rotation.archive_segments(store, limit_bytes=1, root=tmp_path / "archive")
+    assert len(done) == len(sealed) and store.sealed_entries() == []
+    archived = log_rotation.archives_for(store.base_dir.as_posix(), root=tmp_path / "archive")
+    restored = [r["message"] for e in archived for r in log_rotation.iter_archive(e["path"])]
+    live = [r["message"] for r in store.iter_records()]
+    assert restored + live == [f"m{i}" for i in range(30)]
+
+
+def test_memory_readers_include_archived_segments(tmp_path, monkeypatch):
+    from core import memory_interface as mi
+
+    seg_dir = tmp_path / "will_memory_log.d"
+    monkeypatch.setattr(mi, "SEGMENT_DIR", seg_dir)
+    monkeypatch.setattr(mi, "LOG_PATH", tmp_path / "will_memory_log.json")
+    monkeypatch.setattr(mi, "_STORE", SegmentStore(seg_dir, max_bytes=200))
+    monkeypatch.setattr(log_rotation, "ARCHIVE_DIR", tmp_path / "archive")
+    monkeypatch.setenv(log_rotation.BYTES_ENV, "1")
+    monkeypatch.delenv(mi.BACKEND_ENV, raising=False)
+    mi.flush()
+
+    for i in range(30):
+        mi.log_memory_event(f"m{i}", source="tests", tags=["rot"])
+    mi.flush()
+    assert log_rotation.archives_for(seg_dir.as_posix())  # sealed segments went to gzip
+    assert len(list(mi._store().iter_records())) < 30
+
+    assert [e["message"] for e in mi.read_memory_log()] == [f"m{i}" for i in range(30)]
+    exported = json.loads(mi.export_memory_log(tmp_path / "export.json").read_text(encoding="utf-8"))
+    assert [e["message"] for e in exported] == [f"m{i}" for i in range(30)]
@@ -0,0 +1,35 @@
+# tests/test_phase_0_7_path_normalizer.py
+# Verifies cached source-path normalization: correct relative paths and a syscall-free warm path.
+
+from boot.boot_path_initializer import inject_paths
+inject_paths()
+
+from core import path_normalizer
+from core.path_normalizer import project_root, rel_posix
+from core.trace_logger import log_trace_event
+from core.memory_interface import log_memory_event
+from core.log_buffer import flush_all
+from tools.bench_path_normalizer import count_syscalls
+
+
+def test_normalization_rules():
+    root = project_root()
+    assert rel_posix((root / "tools" / "trace_inspector.py").as_posix()) == "tools/trace_inspector.py"
+    assert rel_posix("tools\\trace_inspector.py") == "tools/trace_inspector.py"
+    assert rel_posix("./core//x.py") == "core/x.py"
+    assert rel_posix("/definitely/outside/file.py") == "/definitely/outside/file.py"
+    assert rel_posix(None) is None and rel_posix("", default="core/a.py") == "core/a.py"
+
+
+def test_warm_path_makes_no_syscalls():
+    src = (project_root() / "reflexes" / "reflex_core" / "reflex_trace_ping.py").as_posix()
+    rel_posix(src)  # cold: resolves once
+    flush_all()  # an age-triggered flush inside the loop would do file I/O
+    before = path_normalizer.cache_info()["hits"]
+    with count_syscalls() as counts:
+        for _ in range(100):
+            assert rel_posix(src) == "reflexes/reflex_core/reflex_trace_ping.py"
+            log_memory_event("path warm", source=src, tags=["test"])
+            log_trace_event("path warm", source=src, tags=["test"])
+    assert sum(counts.values()) == 0, counts
+    assert path_normalizer.cache_info()["hits"] >= before + 300
@@ -0,0 +1,60 @@
+# tests/test_phase_0_7_phase_cache.py
+# Verifies the cached phase resolver: hit/miss counters, prefix parse and invalidation on file change.
+
+from boot.boot_path_initializer import inject_paths
+inject_paths()
+
+import json
+import os
+
+import pytest
+
+from core import phase_control
+from core.phase_control import clear_phase_cache, get_current_phase, phase_cache_info
+
+
+@pytest.fixture
+def configs(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for key in ("WILL_CURRENT_PHASE", "FLOWMASTER_CURRENT_PHASE"):
+        monkeypatch.delenv(key, raising=False)
+    (tmp_path / "configs").mkdir()
+    clear_phase_cache()
+    yield tmp_path / "configs"
+    clear_phase_cache()
+
+
+def _write(path, data):
+    path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+
+
+def test_repeated_checks_hit_the_cache(configs):
+    _write(configs / "ironroot_manifest_data.json", {"current_phase": 0.4, "manifest": {"core": ["x"] * 500}})
+    assert [get_current_phase() for _ in range(5)] == [0.4] * 5
+    info = phase_cache_info()
+    assert (info["misses"], info["hits"]) == (1, 4)
+    assert (info["prefix_parses"], info["full_parses"]) == (1, 0)
+
+
+def test_file_change_invalidates(configs):
+    manifest = configs / "ironroot_manifest_data.json"
+    _write(manifest, {"current_phase": 0.4})
+    assert get_current_phase() == 0.4
+    st = os.stat(manifest)
+    _write(manifest, {"current_phase": 0.5})  # same size: mtime_ns/inode still differ
+    os.utime(manifest, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert get_current_phase() == 0.5
+    assert phase_cache_info()["misses"] == 2
+
+
+def test_full_parse_and_history_fallback(configs):
+    _write(configs / "ironroot_manifest_data.json", {"manifest": {"current_phase": 9}, "phase": "0.3"})
+    assert get_current_phase() == 0.3  # nested key must not satisfy the prefix parse
+    assert phase_cache_info()["full_parses"] == 1
+
+    _write(configs / "ironroot_manifest_data.json", {"manifest": {}})
+    _write(configs / "phase_history.json", {"history": [{"phase": 0.1}, {"phase": "0.2"}, {"note": "x"}]})
+    assert get_current_phase() == 0.2
+
+    (configs / "phase_history.json").unlink()
+    assert get_current_phase() == phase_control.REQUIRED_PHASE
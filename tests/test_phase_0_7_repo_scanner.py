@@ -0,0 +1,99 @@
+# tests/test_phase_0_7_repo_scanner.py
+# Verifies the single-pass repo scanner: one read/parse per file for all checkers, pruning, pool parity,
+# and that the compliance tools register their checkers.
+
+from boot.boot_path_initializer import inject_paths
+inject_paths()
+
+import importlib
+import multiprocessing
+
+import pytest
+
+from core import repo_scanner
+from core.repo_scanner import Checker, ScannedFile
+
+
+class _Lines(Checker):
+    name = "lines"
+
+    def check(self, f: ScannedFile):
+        return (f.text.count("\n"), f.tree is not None)
+
+
+class _MoreLines(_Lines):
+    name = "more_lines"
+
+
+class _Utf8(Checker):
+    name = "utf8_probe"
+
+    def wants(self, rel):
+        return rel.endswith((".py", ".txt"))
+
+    def check(self, f: ScannedFile):
+        return f.utf8_ok
+
+
+@pytest.fixture
+def tree(tmp_path):
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "a.py").write_text("x = 1\ny = 2\n", encoding="utf-8")
+    (tmp_path / "pkg" / "broken.py").write_text("def (:\n", encoding="utf-8")
+    (tmp_path / "notes.txt").write_bytes(b"caf\xe9\n")
+    (tmp_path / "image.bin").write_bytes(b"\x00\x01")
+    for pruned in ("__pycache__", ".git", ".venv"):
+        (tmp_path / pruned).mkdir()
+        (tmp_path / pruned / "hidden.py").write_text("z = 3\n", encoding="utf-8")
+    return tmp_path
+
+
+def test_each_file_is_read_and_parsed_once(tree):
+    results, stats = repo_scanner.scan(tree, [_Lines(), _Utf8(), _MoreLines()])
+    # 3 wanted files read once each; the two .py files parsed once although two checkers look at them
+    assert (stats["walked"], stats["read"], stats["parsed"]) == (4, 3, 2)
+    assert [p.rsplit("/", 1)[1] for p, _ in results["lines"]] == ["a.py", "broken.py"]
+    assert [res for _, res in results["lines"]] == [(2, True), (1, False)]
+    assert dict((p.rsplit("/", 1)[1], ok) for p, ok in results["utf8_probe"]) == {
+        "notes.txt": False, "a.py": True, "broken.py": True,
+    }
+    assert results["more_lines"] == results["lines"]
+    with pytest.raises(ValueError):
+        repo_scanner.scan(tree, [_Lines(), _Lines()])
+
+
+def test_pruned_directories_are_not_walked(tree):
+    seen = list(repo_scanner.walk(tree))
+    assert sorted(seen) == ["image.bin", "notes.txt", "pkg/a.py", "pkg/broken.py"]
+
+
+def test_pool_matches_sequential(tree):
+    for i in range(20):
+        (tree / "pkg" / f"m{i}.py").write_text("v = 0\n" * i, encoding="utf-8")
+    seq = repo_scanner.run(tree, [_Lines(), _Utf8()], jobs=1)
+    par = repo_scanner.run(tree, [_Lines(), _Utf8()], jobs=2)
+    assert par[0] == seq[0]
+    assert {k: par[1][k] for k in ("walked", "read", "parsed")} == {k: seq[1][k] for k in ("walked", "read", "parsed")}
+
+
+@pytest.mark.skipif("spawn" not in multiprocessing.get_all_start_methods(), reason="needs spawn")
+def test_pool_without_fork_gets_the_checkers(tree, monkeypatch):
+    # Windows has no fork: spawned workers import this module afresh and get the checkers via the initializer
+    for i in range(8):
+        (tree / "pkg" / f"s{i}.py").write_text("w = 1\n" * i, encoding="utf-8")
+    seq = repo_scanner.run(tree, [_Lines(), _Utf8()], jobs=1)
+    monkeypatch.setattr(repo_scanner, "_pool_context", lambda: multiprocessing.get_context("spawn"))
+    spawned = repo_scanner.run(tree, [_Lines(), _Utf8()], jobs=2)
+    assert spawned[0] == seq[0]
+
+
+def test_compliance_tools_register_their_checkers(tree):
+    sweep = importlib.import_module("tools.compliance_sweep")
+    checkers = sweep.load_checkers({"compliance_guard": {"cur_phase": 0.7}}, [])
+    names = [c.name for c in checkers]
+    assert {"compliance_guard", "phase_guard", "memory_log_calls", "utf8", "fix_encoding"} <= set(names)
+    summaries, stats = repo_scanner.run(tree, checkers)
+    assert summaries["utf8"]["non_utf8"] == [(tree / "notes.txt").as_posix()]
+    assert summaries["phase_guard"]["scanned"] == 2 and stats["parsed"] == 2
+    with pytest.raises(SystemExit):
+        sweep.load_checkers({}, ["no_such_checker"])
@@ -0,0 +1,67 @@
+# tests/test_phase_0_7_run_correlator.py
+# Verifies write-time run_id tagging and the single-pass memory↔trace lifecycle correlation.
+
+from boot.boot_path_initializer import inject_paths
+inject_paths()
+
+import json
+
+from core import log_index, log_rotation
+from core.memory_interface import log_memory_event
+from core.run_context import run_scope
+from core.run_correlator import correlate, file_events, issues
+
+
+def test_run_id_is_resolved_at_write_time():
+    assert "run_id" not in log_memory_event("no run", source=__file__)
+    # A run id passed as a parameter (e.g. an auditor's --run-id) does not attribute the event to that run
+    assert "run_id" not in log_memory_event("from content", content={"run_id": "c1"})
+    with run_scope("outer"):
+        assert log_memory_event("ambient")["run_id"] == "outer"
+        with run_scope("inner"):
+            assert log_memory_event("nested")["run_id"] == "inner"
+        assert log_memory_event("explicit", run_id="x9", content={"run_id": "c1"})["run_id"] == "x9"
+    assert "run_id" not in log_memory_event("after scope")
+
+
+def _ev(ts, track, kind, rid):
+    return (f"2026-01-01T00:00:{ts:02d}Z", track, kind, rid)
+
+
+def test_correlate_reports_every_lifecycle_problem():
+    memory = [_ev(1, "memory", "start", "ok"), _ev(2, "memory", "start", "mem-only"), _ev(3, "memory", "start", "dup"),
+              _ev(4, "memory", "start", "dup"), _ev(5, "memory", "done", "ok"), _ev(6, "memory", "done", "late")]
+    trace = [_ev(1, "trace", "start", "ok"), _ev(3, "trace", "start", "dup"), _ev(5, "trace", "done", "ok"),
+             _ev(6, "trace", "done", "late")]
+    report = correlate(iter(memory), iter(trace))
+    assert report["memory_only_starts"] == ["mem-only"]
+    assert report["duplicates"] == ["dup"]
+    assert report["incomplete"] == ["dup", "mem-only"]
+    assert report["out_of_order"] == ["late"]
+    assert report["runs"] == 4 and report["events"] == 10
+    assert set(issues(report)) == {"memory_only_starts", "duplicates"}
+
+
+def test_file_events_stream_archives_then_live(tmp_path, monkeypatch):
+    monkeypatch.setattr(log_rotation, "ARCHIVE_DIR", tmp_path / "archive")
+    monkeypatch.setattr(log_index, "INDEX_PATH", tmp_path / "idx.db")
+    log = tmp_path / "trace.json"
+
+    def write(rows):
+        with log.open("a", encoding="utf-8", newline="\n") as f:
+            for ts, text, rid in rows:
+                rec = {"ts": f"2026-01-01T00:00:{ts:02d}Z", "description": text, "tags": ["snapshot"]}
+                if rid == "legacy":
+                    rec["content"] = {"run_id": rid}  # written before the run_id field existed
+                else:
+                    rec["run_id"] = rid
+                f.write(json.dumps(rec) + "\n")
+
+    write([(1, "snapshot_wrapper start", "legacy"), (2, "snapshot_wrapper done", "legacy")])
+    assert log_rotation.maybe_rotate(log, limit_bytes=1)
+    write([(3, "snapshot_wrapper start", "r2"), (4, "unrelated", "r2"), (5, "snapshot_wrapper done", "r2")])
+
+    events = list(file_events(log.as_posix(), [log], "trace"))
+    assert [(e[2], e[3]) for e in events] == [("start", "legacy"), ("done", "legacy"), ("start", "r2"), ("done", "r2")]
+    assert [e[3] for e in file_events(log.as_posix(), [log], "trace", run_id="r2")] == ["r2", "r2"]
+    assert len(list(file_events(log.as_posix(), [log], "trace", window=1))) == 1
@@ -0,0 +1,108 @@
+# tests/test_phase_0_7_schema_version.py
+# Verifies memoized ensure_tables() (migration ledger + per-file cache), legacy layout migration
+# and bulk boot event inserts.
+
+from boot.boot_path_initializer import inject_paths
+inject_paths()
+
+from pathlib import PurePosixPath
+
+import sqlite3
+
+import pytest
+
+import core.log_db_sink as log_db_sink
+import core.schema_migrator as migrator
+import core.sqlite_bootstrap as sb
+from core.connection_manager import close_all
+
+
+def test_ensure_tables_migrates_once_per_db_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(sb, "DB_PATH", PurePosixPath((tmp_path / "schema.db").as_posix()))
+    calls = []
+    real_migrate = sb.migrate
+    monkeypatch.setattr(sb, "migrate", lambda con, **kw: (calls.append(1), real_migrate(con, **kw))[1])
+
+    sb.ensure_tables()
+    sb.ensure_tables()
+    sb.insert_boot_report_entry("single")
+    assert len(calls) == 1
+    assert sb.schema_version() == sb.SCHEMA_VERSION == migrator.latest_version()
+    assert migrator.verify_schema(sb._connect()) == []
+
+
+def test_legacy_snapshot_index_is_migrated(tmp_path):
+    db = tmp_path / "legacy.db"
+    con = sqlite3.connect(db.as_posix())
+    # snapshot_manager's old layout, plus a reflex-created test_ticks
+    con.execute(
+        "CREATE TABLE snapshot_index (snapshot_id TEXT PRIMARY KEY, run_id TEXT NOT NULL, created_at TEXT NOT NULL, "
+        "pre_checksum TEXT, post_checksum TEXT, run_dir TEXT NOT NULL, status TEXT NOT NULL)"
+    )
+    con.execute("INSERT INTO snapshot_index VALUES ('s1', 'r1', '2025-01-01 00:00:00', 'a', 'b', 'x/y', 'ok')")
+    con.execute("CREATE TABLE test_ticks (id INTEGER PRIMARY KEY AUTOINCREMENT, created_at TEXT NOT NULL)")
+    con.execute("INSERT INTO test_ticks (created_at) VALUES ('2025-01-01 00:00:00')")
+    con.commit()
+
+    dry = migrator.migrate(con, dry_run=True)
+    assert dry["dry_run"] and dry["to"] == migrator.latest_version()
+    assert migrator.current_version(con) == 0  # rolled back
+
+    migrator.migrate(con)
+    assert migrator.verify_schema(con) == []
+    row = con.execute("SELECT id, snapshot_id, run_id, created_at, status FROM snapshot_index").fetchone()
+    assert row == (1, "s1", "r1", "2025-01-01 00:00:00", "ok")
+    con.execute("INSERT INTO test_ticks DEFAULT VALUES")
+    assert con.execute("SELECT ts FROM test_ticks ORDER BY id").fetchone()[0] == "2025-01-01 00:00:00"
+    assert migrator.migrate(con)["applied"] == []
+    con.close()
+
+
+def test_failed_verify_rolls_back(tmp_path, monkeypatch):
+    con = sqlite3.connect((tmp_path / "broken.db").as_posix())
+    broken = migrator.Migration(9999, "broken", "", lambda cur: cur.execute("CREATE TABLE t9999 (x)"), lambda cur: ["nope"])
+    shipped = tuple(migrator.migrations())
+    monkeypatch.setattr(migrator, "_discover", lambda: shipped + (broken,))
+    with pytest.raises(migrator.MigrationError):
+        migrator.migrate(con)
+    assert migrator.current_version(con) == 0
+    assert con.execute("SELECT name FROM sqlite_master WHERE name='t9999'").fetchone() is None
+    con.close()
+
+
+def test_bulk_boot_entries_single_call(tmp_path, monkeypatch):
+    monkeypatch.setattr(sb, "DB_PATH", PurePosixPath((tmp_path / "bulk.db").as_posix()))
+    n = sb.insert_boot_report_entries(
+        ["boot start", {"event": "boot step", "details": {"step": 2}}, {"event": "boot done", "ts": "2025-01-01T00:00:00Z"}]
+    )
+    assert n == 3
+    rows = sb._connect().execute("SELECT event, details FROM boot_events ORDER BY id").fetchall()
+    assert [r[0] for r in rows] == ["boot start", "boot step", "boot done"]
+    assert rows[1][1] == '{"step": 2}'
+    assert sb.insert_boot_report_entries([]) == 0
+
+
+def test_db_migrate_dry_run_leaves_db_untouched(tmp_path, monkeypatch, capsys):
+    from tools import db_migrate
+
+    db = PurePosixPath((tmp_path / "dry.db").as_posix())
+    con = sqlite3.connect(db.as_posix())
+    # Event tables the DB sink could write to, but no migration ledger
+    for table, cols in log_db_sink.REQUIRED_COLUMNS.items():
+        con.execute(f"CREATE TABLE {table} (id INTEGER PRIMARY KEY, {', '.join(cols)})")
+    con.commit()
+    con.close()
+    for mod in (sb, log_db_sink, db_migrate):
+        monkeypatch.setattr(mod, "DB_PATH", db)
+    monkeypatch.setenv(log_db_sink.SINK_ENV, "both")
+    monkeypatch.setattr("sys.argv", ["db_migrate", "--dry-run"])
+
+    db_migrate.run_cli()
+    assert '"dry_run": true' in capsys.readouterr().out
+    assert log_db_sink.sink_mode() == "both"
+    close_all()
+    con = sqlite3.connect(db.as_posix())
+    assert con.execute("SELECT name FROM sqlite_master WHERE name='schema_migrations'").fetchone() is None
+    assert con.execute("SELECT COUNT(*) FROM memory_events").fetchone()[0] == 0
+    assert con.execute("SELECT COUNT(*) FROM trace_events").fetchone()[0] == 0
+    con.close()
@@ -0,0 +1,132 @@
+# tests/test_phase_0_7_seal_pipeline.py
+# Verifies the cached seal pipeline: input globs, table digests, cache hits/invalidation, green-only persistence.
+
+from boot.boot_path_initializer import inject_paths
+inject_paths()
+
+import sqlite3
+import sys
+import textwrap
+
+import pytest
+
+from core import seal_pipeline
+from core.connection_manager import close_all
+from core.step_runner import Step
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    pkg = tmp_path / "will_seal_steps"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("", encoding="utf-8")
+    (pkg / "check.py").write_text(textwrap.dedent("""
+        import sys
+        def run_cli():
+            text = open(sys.argv[1], encoding="utf-8").read()
+            if "bad" in text:
+                sys.exit(2)
+            print("checked", sys.argv[1])
+    """), encoding="utf-8")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "a.txt").write_text("alpha", encoding="utf-8")
+    (tmp_path / "data" / "b.txt").write_text("beta", encoding="utf-8")
+    (tmp_path / "data" / "skip.log").write_text("x", encoding="utf-8")
+    db = tmp_path / "will_data.db"
+    con = sqlite3.connect(db)
+    con.execute("CREATE TABLE events (id INTEGER PRIMARY KEY, message TEXT)")
+    con.execute("INSERT INTO events (message) VALUES ('snapshot_wrapper start'), ('other')")
+    con.commit()
+    con.close()
+    yield tmp_path, db
+    close_all()
+    for name in list(sys.modules):
+        if name.startswith("will_seal_steps"):
+            del sys.modules[name]
+
+
+def _steps():
+    return [
+        Step("will_seal_steps.check", ("data/a.txt",), name="a", inputs=("data/a.txt",)),
+        Step("will_seal_steps.check", ("data/b.txt",), name="b", after=("a",),
+             inputs=("data/*", "!data/*.log"), tables=("events WHERE message LIKE 'snapshot_wrapper %'",)),
+    ]
+
+
+def test_expand_inputs_applies_excludes(workspace):
+    assert seal_pipeline.expand_inputs(["data/*", "!*.log"]) == ["data/a.txt", "data/b.txt"]
+
+
+def test_table_digest_tracks_only_selected_rows(workspace):
+    _, db = workspace
+    spec = "events WHERE message LIKE 'snapshot_wrapper %'"
+    before = seal_pipeline.table_digest(spec, db)
+    con = sqlite3.connect(db)
+    con.execute("INSERT INTO events (message) VALUES ('unrelated')")
+    con.commit()
+    assert seal_pipeline.table_digest(spec, db) == before
+    con.execute("INSERT INTO events (message) VALUES ('snapshot_wrapper done')")
+    con.commit()
+    con.close()
+    assert seal_pipeline.table_digest(spec, db) != before
+    assert seal_pipeline.table_digest("no_such_table", db) == "missing"
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_unchanged_inputs_are_cached(workspace, jobs):
+    tmp, db = workspace
+    cache = tmp / "root" / "seal_cache.json"
+    first = seal_pipeline.run_pipeline(_steps(), jobs=jobs, cache_path=cache, db_path=db)
+    assert first["green"] and (first["ran"], first["cached"]) == (2, 0)
+    second = seal_pipeline.run_pipeline(_steps(), jobs=jobs, cache_path=cache, db_path=db)
+    assert [r["status"] for r in second["results"]] == ["cached", "cached"]
+    assert second["results"][1]["output"] == "checked data/b.txt"
+
+    # Excluded files never invalidate; a declared file or table row does
+    (tmp / "data" / "skip.log").write_text("changed", encoding="utf-8")
+    assert seal_pipeline.run_pipeline(_steps(), jobs=jobs, cache_path=cache, db_path=db)["cached"] == 2
+    (tmp / "data" / "b.txt").write_text("beta 2", encoding="utf-8")
+    third = seal_pipeline.run_pipeline(_steps(), jobs=jobs, cache_path=cache, db_path=db)
+    assert [r["status"] for r in third["results"]] == ["cached", "ok"]
+    assert seal_pipeline.run_pipeline(_steps(), jobs=jobs, cache_path=cache, db_path=db, use_cache=False)["ran"] == 2
+
+
+def test_failed_seal_keeps_last_green_cache(workspace):
+    tmp, db = workspace
+    cache = tmp / "root" / "seal_cache.json"
+    seal_pipeline.run_pipeline(_steps(), cache_path=cache, db_path=db)
+    saved = cache.read_text(encoding="utf-8")
+    (tmp / "data" / "a.txt").write_text("bad", encoding="utf-8")
+    run = seal_pipeline.run_pipeline(_steps(), cache_path=cache, db_path=db)
+    assert not run["green"]
+    assert [r["status"] for r in run["results"]] == ["failed", "skipped"]
+    assert cache.read_text(encoding="utf-8") == saved
+    (tmp / "data" / "a.txt").write_text("alpha", encoding="utf-8")
+    assert seal_pipeline.run_pipeline(_steps(), cache_path=cache, db_path=db)["cached"] == 2
+
+
+def test_log_tables_follow_the_file_sink(workspace, monkeypatch):
+    from core import memory_interface
+    from core.trace_logger import log_trace_event
+
+    tmp, db = workspace
+    monkeypatch.setenv("WILL_LOG_SINK", "file")
+    monkeypatch.setattr(memory_interface, "_STORE", None)
+    spec = "trace_events WHERE message IN ('snapshot_wrapper start', 'snapshot_wrapper done')"
+    steps = [Step("will_seal_steps.check", ("data/a.txt",), name="reader", inputs=("data/a.txt",), tables=(spec,))]
+    cache = tmp / "root" / "seal_cache.json"
+
+    log_trace_event("snapshot_wrapper start", source="tests", tags=["snapshot"], content={"run_id": "r1"})
+    first = seal_pipeline.log_digest(spec)
+    log_trace_event("unrelated", source="tests", tags=["snapshot"])
+    assert seal_pipeline.log_digest(spec) == first
+    assert seal_pipeline.spec_digest(spec, db) == first  # the DB is not consulted under the file sink
+
+    assert seal_pipeline.run_pipeline(steps, cache_path=cache, db_path=db)["ran"] == 1
+    assert seal_pipeline.run_pipeline(steps, cache_path=cache, db_path=db)["cached"] == 1
+    # A wrapper run between seals (lifecycle records in the NDJSON log) re-runs the reader
+    log_trace_event("snapshot_wrapper done", source="tests", tags=["snapshot"], content={"run_id": "r1"})
+    assert seal_pipeline.log_digest(spec) != first
+    assert [r["status"] for r in seal_pipeline.run_pipeline(steps, cache_path=cache, db_path=db)["results"]] == ["ok"]
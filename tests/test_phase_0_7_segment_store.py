@@ -0,0 +1,44 @@
+# tests/test_phase_0_7_segment_store.py
+# Verifies the segmented memory store: append, roll, legacy import and JSON-array export.
+
+from boot.boot_path_initializer import inject_paths
+inject_paths()
+
+import json
+from pathlib import Path
+
+from core.segment_store import SegmentStore
+
+
+def test_segments_roll_and_read_back_in_order(tmp_path: Path):
+    store = SegmentStore(tmp_path / "mem.d", max_bytes=256)
+    for i in range(40):
+        store.append({"ts": f"2025-01-01T00:00:{i:02d}Z", "message": f"event {i}"})
+
+    assert len(store.segments()) > 1, "expected the store to roll into several segments"
+    records = store.read_all()
+    assert [r["message"] for r in records] == [f"event {i}" for i in range(40)]
+    assert store.count() == 40
+
+    index = json.loads((tmp_path / "mem.d" / "index.json").read_text(encoding="utf-8"))
+    sealed = index["segments"][0]
+    assert sealed["first_ts"] == "2025-01-01T00:00:00Z"
+    assert sealed["records"] >= 1
+
+
+def test_legacy_import_and_export_roundtrip(tmp_path: Path):
+    legacy = tmp_path / "will_memory_log.json"
+    legacy.write_text(json.dumps([{"ts": "t0", "message": "old"}]), encoding="utf-8")
+
+    store = SegmentStore(tmp_path / "mem.d")
+    assert store.import_json_array(legacy) == 1
+    store.append({"ts": "t1", "message": "new"})
+
+    store.export_json_array(legacy)
+    exported = json.loads(legacy.read_text(encoding="utf-8"))
+    assert [r["message"] for r in exported] == ["old", "new"]
+
+    # A second store over the same directory must not re-import the export
+    again = SegmentStore(tmp_path / "mem.d")
+    assert again.import_json_array(legacy) == 0
+    assert again.count() == 2
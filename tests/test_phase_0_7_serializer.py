@@ -0,0 +1,56 @@
+# tests/test_phase_0_7_serializer.py
+# Verifies the pluggable JSON encoder: backend parity, stdlib fallback and compact log lines.
+
+from boot.boot_path_initializer import inject_paths
+inject_paths()
+
+import json
+
+import pytest
+
+from core import serializer
+
+EVENT = {
+    "ts": "2025-01-01T00:00:00Z",
+    "message": "héllo — ✓",
+    "tags": ["a", "b"],
+    "content": {"n": 3, "f": 0.25, "ok": True, "none": None, "nested": {"x": [1, 2]}},
+}
+
+
+@pytest.fixture(autouse=True)
+def _restore_backend():
+    yield
+    serializer.set_backend(None)
+
+
+@pytest.mark.parametrize("name", serializer.available())
+def test_backends_agree_with_stdlib(name):
+    serializer.set_backend(name)
+    assert serializer.backend() == name
+    assert json.loads(serializer.dumpb(EVENT)) == EVENT
+    assert serializer.dumps(EVENT, pretty=True) == json.dumps(EVENT, ensure_ascii=False, indent=2)
+    assert serializer.dumps({"b": 1, "a": 2}, sort_keys=True) == '{"a":2,"b":1}'
+    assert "héllo" in serializer.dumps(EVENT)  # UTF-8, not \\u escapes
+
+
+@pytest.mark.parametrize("name", serializer.available())
+def test_unsupported_values_fall_back_to_stdlib(name):
+    serializer.set_backend(name)
+    big = {"n": 2 ** 80}
+    assert json.loads(serializer.dumps(big)) == big
+    assert serializer.dumps({"p": object()}, default=lambda o: "obj") == '{"p":"obj"}'
+    with pytest.raises(TypeError):
+        serializer.dumps({"p": object()})
+
+
+def test_ndjson_and_env_selection(monkeypatch):
+    blob = serializer.ndjson([EVENT, {"i": 2}])
+    lines = blob.decode("utf-8").split("\n")
+    assert lines[-1] == "" and [json.loads(ln) for ln in lines[:-1]] == [EVENT, {"i": 2}]
+    assert serializer.ndjson([]) == b""
+
+    monkeypatch.setenv(serializer.BACKEND_ENV, "json")
+    assert serializer.set_backend(None) == "json"
+    monkeypatch.setenv(serializer.BACKEND_ENV, "no-such-backend")
+    assert serializer.set_backend(None) == serializer.available()[0]
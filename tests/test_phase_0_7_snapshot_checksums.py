@@ -0,0 +1,63 @@
+# tests/test_phase_0_7_snapshot_checksums.py
+# Verifies the streaming table checksum matches the canonical JSON digest, serially and pooled.
+
+from boot.boot_path_initializer import inject_paths
+inject_paths()
+
+import hashlib
+import json
+import multiprocessing
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from core.connection_manager import read_connection, stats
+from core.snapshot_manager import _stream_checksum, _table_meta_job, _tables_meta
+
+
+def _canonical(rows):
+    enc = json.dumps(rows, sort_keys=True, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(enc).hexdigest()
+
+
+def test_streaming_checksum_matches_whole_table_json(tmp_path):
+    db = tmp_path / "sums.db"
+    con = sqlite3.connect(db.as_posix())
+    con.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, msg TEXT, n REAL)")
+    con.execute("CREATE TABLE k (name TEXT)")  # keyless: ordered by every column
+    con.executemany("INSERT INTO t (id, msg, n) VALUES (?, ?, ?)", [(i, f"é{i}", i / 3) for i in range(2500, 0, -1)])
+    con.executemany("INSERT INTO k (name) VALUES (?)", [("b",), ("a",), ("c",)])
+    con.commit()
+
+    rows = [{"id": i, "msg": f"é{i}", "n": i / 3} for i in range(1, 2501)]
+    assert _stream_checksum(con, "t", ["id"], batch=7) == (2500, _canonical(rows))
+    assert _stream_checksum(con, "k", []) == (3, _canonical([{"name": "a"}, {"name": "b"}, {"name": "c"}]))
+    con.close()
+
+    serial = _tables_meta(db, ["k", "t"], "heavy", 1, "thread")
+    assert _tables_meta(db, ["k", "t"], "heavy", 2, "thread") == serial
+    assert _tables_meta(db, ["k", "t"], "heavy", 2, "process") == serial
+    assert list(serial) == ["k", "t"]
+
+
+def _worker_opens(db_path):
+    before = stats()
+    _table_meta_job(db_path, "t", "heavy")
+    after = stats()
+    return after["readonly_opens"] - before["readonly_opens"], after["readonly_reuses"] - before["readonly_reuses"]
+
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="needs fork")
+def test_forked_workers_open_their_own_connection(tmp_path):
+    db = tmp_path / "forked.db"
+    con = sqlite3.connect(db.as_posix())
+    con.execute("CREATE TABLE t (id INTEGER PRIMARY KEY)")
+    con.executemany("INSERT INTO t (id) VALUES (?)", [(i,) for i in range(50)])
+    con.commit()
+    con.close()
+
+    read_connection(db)  # parent holds a cached handle when the pool forks, as take_snapshot does
+    with ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context("fork")) as ex:
+        results = list(ex.map(_worker_opens, [db.as_posix()] * 2))
+    assert results == [(1, 0), (1, 0)]
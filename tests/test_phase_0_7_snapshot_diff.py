@@ -0,0 +1,49 @@
+# tests/test_phase_0_7_snapshot_diff.py
+# Verifies the ATTACH-based diff engine (counts + streamed NDJSON row records).
+
+from boot.boot_path_initializer import inject_paths
+inject_paths()
+
+import json
+import sqlite3
+from pathlib import Path
+
+from core.snapshot_diff import diff_databases
+
+
+def _make(path: Path, ticks, tags) -> None:
+    con = sqlite3.connect(path.as_posix())
+    con.execute("CREATE TABLE test_ticks (id INTEGER PRIMARY KEY, tick TEXT)")
+    con.execute("CREATE TABLE tags (name TEXT)")  # keyless: rows are their own key
+    con.executemany("INSERT INTO test_ticks (id, tick) VALUES (?, ?)", ticks)
+    con.executemany("INSERT INTO tags (name) VALUES (?)", [(t,) for t in tags])
+    con.commit()
+    con.close()
+
+
+def test_keyed_and_keyless_diff(tmp_path):
+    pre, post = tmp_path / "pre.db", tmp_path / "post.db"
+    _make(pre, [(1, "a"), (2, "b"), (3, "c")], ["x", "y"])
+    _make(post, [(1, "a"), (2, "B"), (4, "d"), (5, "e")], ["x", "z"])
+
+    rows_path = tmp_path / "rows.ndjson"
+    res = diff_databases(pre, post, rows_path=rows_path, batch_size=1)
+    assert res["tables_changed"] == ["tags", "test_ticks"]
+    assert res["row_changes"]["test_ticks"] == {"added": 2, "removed": 1, "changed": 1}
+    assert res["row_changes"]["tags"] == {"added": 1, "removed": 1, "changed": 0}
+
+    records = [json.loads(line) for line in rows_path.read_text(encoding="utf-8").splitlines()]
+    changed = [r for r in records if r["op"] == "changed"]
+    assert changed == [{"table": "test_ticks", "op": "changed", "key": {"id": 2},
+                        "before": {"id": 2, "tick": "b"}, "after": {"id": 2, "tick": "B"}}]
+    assert len(records) == 6
+
+    # Counts-only mode agrees with the streamed mode
+    assert diff_databases(pre, post) == res
+
+
+def test_identical_copies_have_no_changes(tmp_path):
+    pre, post = tmp_path / "pre.db", tmp_path / "post.db"
+    _make(pre, [(1, "a")], ["x"])
+    _make(post, [(1, "a")], ["x"])
+    assert diff_databases(pre, post) == {"tables_changed": [], "row_changes": {}}
@@ -0,0 +1,75 @@
+# tests/test_phase_0_7_snapshot_incremental.py
+# Verifies incremental snapshot state: chunk reuse for append-only tables and change detection.
+
+from boot.boot_path_initializer import inject_paths
+inject_paths()
+
+import sqlite3
+from pathlib import Path
+
+from core.snapshot_incremental import CHUNK_ROWS, compute_state, diff_states
+
+
+def _db(tmp_path: Path) -> sqlite3.Connection:
+    con = sqlite3.connect((tmp_path / "inc.db").as_posix())
+    con.execute("CREATE TABLE memory_events (id INTEGER PRIMARY KEY, message TEXT)")
+    con.execute("CREATE TABLE manifest (id INTEGER PRIMARY KEY, path TEXT)")
+    con.executemany("INSERT INTO memory_events (message) VALUES (?)", [(f"m{i}",) for i in range(3 * CHUNK_ROWS)])
+    con.executemany("INSERT INTO manifest (path) VALUES (?)", [("a.py",), ("b.py",)])
+    con.commit()
+    return con
+
+
+def test_append_only_table_rehashes_only_new_chunks(tmp_path):
+    con = _db(tmp_path)
+    db = tmp_path / "inc.db"
+    pre = compute_state(con, db, full=True)
+    assert pre["tables"]["memory_events"]["rehashed_chunks"] == 4  # chunks 0..3 (rowids start at 1)
+
+    con.executemany("INSERT INTO memory_events (message) VALUES (?)", [("new",)] * 5)
+    con.commit()
+    post = compute_state(con, db, pre, full=False)
+    assert post["tables"]["memory_events"]["rehashed_chunks"] == 1
+    assert post["tables"]["memory_events"]["root"] == compute_state(con, db, full=True)["tables"]["memory_events"]["root"]
+
+    diff = diff_states(pre, post)
+    assert diff["tables_changed"] == ["memory_events"]
+    assert diff["row_changes"]["memory_events"]["added"] == 5
+    assert diff["row_changes"]["memory_events"]["chunks_changed_below_hwm"] == 0
+    con.close()
+
+
+def test_in_place_update_is_detected(tmp_path):
+    con = _db(tmp_path)
+    db = tmp_path / "inc.db"
+    pre = compute_state(con, db, full=True)
+    assert compute_state(con, db, pre)["reused"] is True  # untouched file -> state carried over
+
+    con.execute("UPDATE manifest SET path = 'c.py' WHERE id = 1")
+    con.commit()
+    post = compute_state(con, db, pre)
+    diff = diff_states(pre, post)
+    assert diff["tables_changed"] == ["manifest"]
+    assert diff["row_changes"]["manifest"]["row_count_delta"] == 0
+    assert diff["row_changes"]["manifest"]["chunks_changed"] == 1
+    con.close()
+
+
+def test_delete_below_hwm_forces_full_rehash(tmp_path):
+    con = _db(tmp_path)
+    db = tmp_path / "inc.db"
+    pre = compute_state(con, db, full=True)
+
+    # Prune an old row and append one: the count is unchanged overall but not explained by the append
+    con.execute("DELETE FROM memory_events WHERE id = 10")
+    con.execute("INSERT INTO memory_events (message) VALUES ('new')")
+    con.commit()
+    post = compute_state(con, db, pre)
+    assert post["tables"]["memory_events"]["rehashed_chunks"] == 4
+    assert post["tables"]["memory_events"]["root"] == compute_state(con, db, full=True)["tables"]["memory_events"]["root"]
+
+    diff = diff_states(pre, post)
+    assert diff["tables_changed"] == ["memory_events"]
+    assert diff["row_changes"]["memory_events"]["chunks_changed_below_hwm"] == 1
+    assert diff["row_changes"]["memory_events"]["removed"] == 1
+    con.close()
@@ -0,0 +1,102 @@
+# tests/test_phase_0_7_snapshot_store.py
+# Verifies the content-addressed snapshot store: dedup, compressed round-trip, retention + GC.
+
+from boot.boot_path_initializer import inject_paths
+inject_paths()
+
+import hashlib
+import os
+import sqlite3
+import time
+from pathlib import Path
+
+from core import snapshot_store
+
+
+def _copy(path: Path, payload: bytes) -> str:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(payload)
+    return hashlib.sha256(payload).hexdigest()
+
+
+def test_identical_copies_share_one_blob(tmp_path):
+    root = tmp_path / "blobs"
+    digest = _copy(tmp_path / "a" / "will_data.db", b"same-state" * 100)
+    _copy(tmp_path / "b" / "will_data.db", b"same-state" * 100)
+
+    first = snapshot_store.put(tmp_path / "a" / "will_data.db", digest, compression="none", root=root)
+    second = snapshot_store.put(tmp_path / "b" / "will_data.db", digest, compression="none", root=root)
+    assert first["deduped"] is False and second["deduped"] is True
+    assert first["path"] == second["path"]
+    assert len(list(snapshot_store.iter_blobs(root))) == 1
+    assert not (tmp_path / "b" / "will_data.db").exists()
+
+
+def test_gzip_round_trip(tmp_path):
+    root = tmp_path / "blobs"
+    payload = b"row\n" * 5000
+    digest = _copy(tmp_path / "will_data.db", payload)
+    info = snapshot_store.put(tmp_path / "will_data.db", digest, compression="gzip", root=root)
+    assert info["compression"] == "gzip" and info["stored_bytes"] < info["bytes"]
+
+    out = snapshot_store.materialize(digest, tmp_path / "restored.db", root=root)
+    assert out.read_bytes() == payload
+
+
+def test_retention_and_gc(tmp_path):
+    root = tmp_path / "blobs"
+    con = sqlite3.connect(":memory:")
+    con.execute("CREATE TABLE snapshot_index (id INTEGER PRIMARY KEY, phase TEXT, run_dir TEXT, "
+                "pre_blob TEXT, post_blob TEXT, pruned_at TEXT)")
+    digests = []
+    for i in range(4):
+        d = _copy(tmp_path / f"c{i}.db", f"state-{i}".encode())
+        snapshot_store.put(tmp_path / f"c{i}.db", d, compression="none", root=root)
+        digests.append(d)
+    old = time.time() - 7200
+    for p in snapshot_store.iter_blobs(root):
+        os.utime(p, (old, old))
+    # runs 1..3 (phase 0.6, 0.7, 0.7); run 3 shares its pre blob with run 2's post
+    con.executemany(
+        "INSERT INTO snapshot_index (id, phase, run_dir, pre_blob, post_blob) VALUES (?, ?, ?, ?, ?)",
+        [(1, "0.6", None, digests[0], digests[1]), (2, "0.7", None, digests[1], digests[2]),
+         (3, "0.7", None, digests[2], digests[3])],
+    )
+
+    dry = snapshot_store.gc(con, keep_last=1, keep_per_phase=1, dry_run=True, root=root)
+    assert dry["pruned_runs"] == [2] and dry["deleted_blobs"] == []  # run 1 is its phase's newest
+    assert con.execute("SELECT count(*) FROM snapshot_index WHERE pruned_at IS NOT NULL").fetchone()[0] == 0
+
+    res = snapshot_store.gc(con, keep_last=1, keep_per_phase=0, root=root)
+    assert res["pruned_runs"] == [2, 1]
+    assert sorted(res["deleted_blobs"]) == sorted([digests[0], digests[1]])
+    assert snapshot_store.find_blob(digests[2], root) is not None
+    assert snapshot_store.find_blob(digests[0], root) is None
+
+
+def test_stored_snapshots_leave_no_db_files_in_run_dir(tmp_path, monkeypatch):
+    from core import snapshot_manager
+    from core.connection_manager import close_all
+
+    db = tmp_path / "root" / "will_data.db"
+    db.parent.mkdir()
+    con = sqlite3.connect(db.as_posix())
+    con.execute("PRAGMA journal_mode=WAL")
+    con.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, v TEXT)")
+    con.execute("INSERT INTO t (v) VALUES ('a')")
+    con.commit()
+    con.close()
+    monkeypatch.setattr(snapshot_manager, "DB_PATH", db.as_posix())
+    monkeypatch.setattr(snapshot_manager, "_project_root", lambda: tmp_path)
+    monkeypatch.setattr(snapshot_store, "_project_root", lambda: tmp_path)
+    try:
+        pre = snapshot_manager.take_snapshot(label="pre", run_id="r1", mode="heavy")
+        post = snapshot_manager.take_snapshot(label="post", run_id="r1", mode="heavy")
+        snapshot_manager.compare_snapshots(pre, post)
+        snapshot_manager.store_snapshot_blobs(pre, post, compression="none")
+    finally:
+        close_all()
+    assert pre["blob"]["path"] == post["blob"]["path"]
+    for meta in (pre, post):
+        run_files = sorted(p.name for p in Path(meta["run_dir"]).rglob("*") if p.is_file())
+        assert not [n for n in run_files if n.startswith("will_data.db")], run_files
@@ -0,0 +1,71 @@
+# tests/test_phase_0_7_startup.py
+# Startup budget for tool entry points: lazy imports, deferred side effects, cached project root.
+
+from boot.boot_path_initializer import inject_paths
+inject_paths()
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+import boot.boot_path_initializer as bpi
+from tools.bench_startup import DEFAULT_BUDGET_MS, HEAVY_MODULES, parse_importtime, run_once, total_us
+
+SAMPLE = """import time: self [us] | cumulative | imported package
+import time:       100 |        100 |   _io
+import time:       400 |        500 | site
+import time:       300 |        300 |   core.run_context
+import time:       200 |        500 | core.memory_interface
+Current phase: 0.5
+import time:      1000 |       1000 | sqlite3
+"""
+
+
+def test_parse_importtime_splits_at_first_output():
+    startup, later = parse_importtime(SAMPLE)
+    assert [e[3] for e in startup] == ["_io", "site", "core.run_context", "core.memory_interface"]
+    assert [e[2] for e in startup] == [1, 0, 1, 0]
+    assert total_us(startup) == 1000
+    assert [e[3] for e in later] == ["sqlite3"]
+
+
+def test_import_has_no_side_effects(tmp_path):
+    # Importing the loggers must not create logs/ or pull in asyncio/sqlite3
+    code = (
+        "import sys; import tools.print_current_phase, core.memory_interface, core.trace_logger, "
+        "boot.boot_trace_logger; import os; "
+        "print(os.path.exists('logs'), sorted(m for m in ('asyncio', 'sqlite3', 'gzip') if m in sys.modules))"
+    )
+    env = dict(os.environ, PYTHONPATH=bpi.project_root())
+    out = subprocess.run([sys.executable, "-c", code], cwd=tmp_path, env=env, capture_output=True, text=True)
+    assert out.returncode == 0, out.stderr
+    assert out.stdout.strip() == "False []"
+
+
+def test_cached_root_is_reused(monkeypatch):
+    root = bpi.project_root()
+    assert os.environ[bpi.ROOT_ENV] == root
+    assert bpi._detect_project_root() == root
+    # A stale value that does not contain this checkout is ignored
+    monkeypatch.setenv(bpi.ROOT_ENV, os.path.dirname(os.path.dirname(root)) or "/")
+    assert bpi._detect_project_root() == root
+
+
+def test_core_submodules_load_on_attribute_access():
+    import core
+
+    assert core.path_normalizer.rel_posix("a\\b.py") == "a/b.py"
+    with pytest.raises(AttributeError):
+        core.no_such_module
+
+
+def test_print_current_phase_cold_start_budget():
+    budget = float(os.environ.get("WILL_STARTUP_BUDGET_MS") or DEFAULT_BUDGET_MS)
+    runs = [run_once("tools.print_current_phase") for _ in range(3)]
+    assert all(r["returncode"] == 0 for r in runs)
+    heavy = {name for r in runs for _s, _c, _d, name in r["startup"]}.intersection(HEAVY_MODULES)
+    assert not heavy, f"heavy modules imported at startup: {sorted(heavy)}"
+    best = min(r["startup_import_ms"] for r in runs)
+    assert best <= budget, f"cold start imports took {best} ms (budget {budget} ms)"
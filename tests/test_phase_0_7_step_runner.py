@@ -0,0 +1,119 @@
+# tests/test_phase_0_7_step_runner.py
+# Verifies the in-process step runner: argv/output/exit isolation, fail-closed order and the worker pool.
+
+from boot.boot_path_initializer import inject_paths
+inject_paths()
+
+import os
+import sys
+import textwrap
+
+import pytest
+
+from core.step_runner import Step, first_failure, run_step, run_steps
+
+
+@pytest.fixture
+def steps_pkg(tmp_path, monkeypatch):
+    pkg = tmp_path / "will_steps"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("", encoding="utf-8")
+    mods = {
+        "echo": """
+            import sys
+            def run_cli():
+                print("argv=" + " ".join(sys.argv[1:]))
+        """,
+        "exits": """
+            import sys
+            def run_cli():
+                sys.exit(int(sys.argv[1]) if len(sys.argv) > 1 else None)
+        """,
+        "boom": """
+            def run_cli():
+                raise ValueError("kaput")
+        """,
+        "test_mod": """
+            CALLS = []
+            def test_one():
+                CALLS.append(1)
+                print("one")
+            def test_two():
+                CALLS.append(2)
+            def helper():
+                raise AssertionError("not a test")
+        """,
+        "writer": """
+            import os, sys
+            def run_cli():
+                with open(sys.argv[1], "w", encoding="utf-8") as f:
+                    f.write(str(os.getpid()))
+        """,
+        "reader": """
+            import os, sys
+            def run_cli():
+                print(open(sys.argv[1], encoding="utf-8").read(), os.getpid())
+        """,
+    }
+    for name, body in mods.items():
+        (pkg / f"{name}.py").write_text(textwrap.dedent(body), encoding="utf-8")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield "will_steps"
+    for name in list(sys.modules):
+        if name == "will_steps" or name.startswith("will_steps."):
+            del sys.modules[name]
+
+
+def test_run_step_isolates_argv_output_and_exit(steps_pkg):
+    argv = sys.argv[:]
+    res = run_step(Step(f"{steps_pkg}.echo", ("--tag", "snapshot")))
+    assert (res["status"], res["exit"], res["output"]) == ("ok", 0, "argv=--tag snapshot")
+    assert sys.argv == argv
+    assert run_step(Step(f"{steps_pkg}.exits", ("3",)))["exit"] == 3
+    assert run_step(Step(f"{steps_pkg}.exits"))["exit"] == 0
+    boom = run_step(Step(f"{steps_pkg}.boom"))
+    assert boom["exit"] == 1 and "ValueError: kaput" in boom["output"]
+    assert run_step(Step(f"{steps_pkg}.missing"))["status"] == "failed"
+
+
+def test_test_module_runs_its_test_functions(steps_pkg):
+    res = run_step(Step(f"{steps_pkg}.test_mod"))
+    assert res["status"] == "ok" and res["output"] == "one"
+    assert sys.modules[f"{steps_pkg}.test_mod"].CALLS == [1, 2]
+
+
+def test_sequential_is_fail_closed(steps_pkg):
+    results = run_steps([
+        Step(f"{steps_pkg}.echo"),
+        Step(f"{steps_pkg}.exits", ("2",)),
+        Step(f"{steps_pkg}.echo", name="after_failure"),
+    ])
+    assert [r["status"] for r in results] == ["ok", "failed", "skipped"]
+    assert first_failure(results)["step"] == f"{steps_pkg}.exits"
+    assert all(r["pid"] in (os.getpid(), None) for r in results)
+
+
+def test_parallel_pool_respects_dependencies(steps_pkg, tmp_path):
+    marker = str(tmp_path / "marker.txt")
+    results = run_steps([
+        Step(f"{steps_pkg}.writer", (marker,)),
+        Step(f"{steps_pkg}.reader", (marker,), after=(f"{steps_pkg}.writer",)),
+        Step(f"{steps_pkg}.echo", ("x",)),
+    ], jobs=2)
+    assert [r["status"] for r in results] == ["ok", "ok", "ok"]
+    assert all(r["pid"] != os.getpid() for r in results)
+    written_by = open(marker, encoding="utf-8").read()
+    assert results[1]["output"].startswith(written_by)
+
+
+def test_parallel_failure_skips_dependents(steps_pkg):
+    results = run_steps([
+        Step(f"{steps_pkg}.boom"),
+        Step(f"{steps_pkg}.echo", after=(f"{steps_pkg}.boom",)),
+    ], jobs=2)
+    assert [r["status"] for r in results] == ["failed", "skipped"]
+
+
+def test_rejects_unknown_dependencies():
+    with pytest.raises(ValueError):
+        run_steps([Step("a", after=("b",)), Step("b")])
@@ -0,0 +1,102 @@
+# tools/bench_path_normalizer.py
+# Micro-benchmark for logger source-path normalization (core.path_normalizer).
+# - Path injection first, phase lock, dual logging
+# - Reports per-call time and filesystem syscalls (stat/lstat/getcwd) for the cold and warm paths
+
+from boot.boot_path_initializer import inject_paths
+inject_paths()
+
+import argparse
+import json
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+from core.phase_control import ensure_phase, REQUIRED_PHASE
+from core import path_normalizer
+from core.memory_interface import log_memory_event
+from core.trace_logger import log_trace_event
+
+_WATCHED = ("stat", "lstat", "getcwd")
+
+
+@contextmanager
+def count_syscalls() -> Iterator[Dict[str, int]]:
+    """Count os.stat/os.lstat/os.getcwd calls made inside the block (what Path.resolve() uses)."""
+    counts = {name: 0 for name in _WATCHED}
+    originals = {name: getattr(os, name) for name in _WATCHED}
+
+    def wrap(name):
+        real = originals[name]
+
+        def counted(*a, **kw):
+            counts[name] += 1
+            return real(*a, **kw)
+        return counted
+
+    for name in _WATCHED:
+        setattr(os, name, wrap(name))
+    try:
+        yield counts
+    finally:
+        for name, real in originals.items():
+            setattr(os, name, real)
+
+
+def bench(sources: List[str], rounds: int) -> Dict[str, Dict[str, float]]:
+    path_normalizer.clear_cache()
+    out: Dict[str, Dict[str, float]] = {}
+    for label, n in (("cold", 1), ("warm", rounds)):
+        with count_syscalls() as counts:
+            t0 = time.perf_counter()
+            for _ in range(n):
+                for s in sources:
+                    path_normalizer.rel_posix(s)
+            elapsed = time.perf_counter() - t0
+        calls = n * len(sources)
+        out[label] = {
+            "calls": calls,
+            "us_per_call": round(elapsed / calls * 1e6, 3),
+            "syscalls_per_call": round(sum(counts.values()) / calls, 3),
+        }
+    return out
+
+
+def run_cli() -> None:
+    ensure_phase()
+    src = Path(__file__).as_posix()
+
+    parser = argparse.ArgumentParser(description="Benchmark logger source-path normalization.")
+    parser.add_argument("--rounds", type=int, default=10000, help="Warm-path repetitions per source.")
+    args = parser.parse_args()
+
+    root = path_normalizer.project_root()
+    sources = [
+        Path(__file__).resolve().as_posix(),
+        (root / "core" / "trace_logger.py").as_posix(),
+        "tools\\trace_inspector.py",
+        "reflexes/reflex_core/reflex_trace_ping.py",
+    ]
+    report = bench(sources, max(1, args.rounds))
+    print(json.dumps(report, indent=2))
+
+    log_memory_event(
+        event_text="bench_path_normalizer report",
+        source=src,
+        tags=["tool", "bench", "path_normalizer"],
+        content=report,
+        phase=REQUIRED_PHASE,
+    )
+    log_trace_event(
+        description="bench_path_normalizer report",
+        source=src,
+        tags=["tool", "bench", "path_normalizer"],
+        content=report,
+        phase=REQUIRED_PHASE,
+    )
+
+
+if __name__ == "__main__":
+    run_cli()
@@ -0,0 +1,101 @@
+# tools/bench_serializer.py
+# Micro-benchmark for the log/snapshot JSON encoder backends (core.serializer).
+# - Path injection first, phase lock, dual logging
+# - Reports events/sec per available backend on a realistic memory-log event (compact line, pretty, NDJSON batch)
+
+from boot.boot_path_initializer import inject_paths
+inject_paths()
+
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+from core.phase_control import ensure_phase, REQUIRED_PHASE
+from core import serializer
+from core.memory_interface import log_memory_event
+from core.trace_logger import log_trace_event
+
+
+def sample_event() -> Dict[str, Any]:
+    """Shape of a typical wrapper/reflex memory entry (see core.memory_interface)."""
+    return {
+        "ts": "2025-01-01T12:00:00Z",
+        "event_type": "info",
+        "message": "trace_memory_snapshot done — reflexes.reflex_core.reflex_trace_ping",
+        "source": "tools/trace_memory_snapshot.py",
+        "phase": REQUIRED_PHASE,
+        "tags": ["snapshot", "done", "wrapper", "reflex"],
+        "content": {
+            "run_id": "0267a650-e481-4c75-a880-ea9f1182f84e",
+            "module": "reflexes.reflex_core.reflex_trace_ping",
+            "snapshot_mode": "heavy",
+            "pre_checksum": "9f2c" * 16,
+            "post_checksum": "a1b3" * 16,
+            "diff": {"memory_events": {"added": 2, "removed": 0, "changed": 0},
+                     "trace_events": {"added": 2, "removed": 0, "changed": 0}},
+            "elapsed_s": 0.012345,
+            "ok": True,
+        },
+        "metadata": {"host": "dev", "pid": 4242},
+    }
+
+
+def bench(rounds: int, batch: int) -> Dict[str, Dict[str, float]]:
+    event = sample_event()
+    events = [event] * batch
+    out: Dict[str, Dict[str, float]] = {}
+    previous = serializer.backend()
+    try:
+        for name in serializer.available():
+            serializer.set_backend(name)
+            row: Dict[str, float] = {}
+            for label, fn, n in (
+                ("compact", lambda: serializer.dumpb(event), rounds),
+                ("pretty", lambda: serializer.dumpb(event, pretty=True), rounds),
+                ("ndjson_batch", lambda: serializer.ndjson(events), max(1, rounds // batch)),
+            ):
+                t0 = time.perf_counter()
+                for _ in range(n):
+                    fn()
+                elapsed = time.perf_counter() - t0
+                per = n * (batch if label == "ndjson_batch" else 1)
+                row[f"{label}_events_per_s"] = round(per / elapsed) if elapsed else 0
+            row["bytes_compact"] = len(serializer.dumpb(event))
+            out[name] = row
+    finally:
+        serializer.set_backend(previous)
+    return out
+
+
+def run_cli() -> None:
+    ensure_phase()
+    src = Path(__file__).as_posix()
+
+    parser = argparse.ArgumentParser(description="Benchmark JSON encoder backends on a log event.")
+    parser.add_argument("--rounds", type=int, default=50000, help="Events encoded per measurement.")
+    parser.add_argument("--batch", type=int, default=100, help="Events per NDJSON batch.")
+    args = parser.parse_args()
+
+    report = {"active": serializer.backend(), "results": bench(max(1, args.rounds), max(1, args.batch))}
+    print(json.dumps(report, indent=2))
+
+    log_memory_event(
+        event_text="bench_serializer report",
+        source=src,
+        tags=["tool", "bench", "serializer"],
+        content=report,
+        phase=REQUIRED_PHASE,
+    )
+    log_trace_event(
+        description="bench_serializer report",
+        source=src,
+        tags=["tool", "bench", "serializer"],
+        content=report,
+        phase=REQUIRED_PHASE,
+    )
+
+
+if __name__ == "__main__":
+    run_cli()
@@ -0,0 +1,158 @@
+# tools/bench_startup.py
+# Cold-start benchmark for tool/reflex entry points, based on `python -X importtime`.
+# - Path injection first, phase lock, dual logging
+# - Each run is a fresh interpreter (`python -X importtime -m <module>`) in a scratch directory holding a
+#   copy of the phase configs, so the benchmark never writes to the real logs/
+# - stdout is unbuffered and merged with stderr: imports listed before the tool's first output line are
+#   startup cost, the rest happen while it runs or at exit (e.g. the final log flush)
+# - Reports the median startup import time, wall time, the most expensive modules and any heavy module
+#   (asyncio, sqlite3, ...) pulled in at startup; exits 1 when the median exceeds --budget-ms
+
+from boot.boot_path_initializer import inject_paths, project_root
+inject_paths()
+
+import argparse
+import json
+import os
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from core.phase_control import ensure_phase, HISTORY_PATH, MANIFEST_PATH, REQUIRED_PHASE
+from core.memory_interface import log_memory_event
+from core.trace_logger import log_trace_event
+
+DEFAULT_MODULE = "tools.print_current_phase"
+DEFAULT_BUDGET_MS: float = 200.0
+# Modules that must stay off the startup path of a plain tool (they load on first use)
+HEAVY_MODULES = ("asyncio", "sqlite3", "gzip", "shutil", "orjson", "msgspec", "numpy", "pyarrow")
+
+# "import time:       self |  cumulative | <indent>name"
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)\s*$")
+
+# (self_us, cumulative_us, depth, module)
+Entry = Tuple[int, int, int, str]
+
+
+def parse_importtime(text: str) -> Tuple[List[Entry], List[Entry]]:
+    """
+    Split merged `-X importtime` output into (startup, later) entries.
+    Startup ends at the first line that is not importtime output (the program's first print).
+    """
+    startup: List[Entry] = []
+    later: List[Entry] = []
+    target = startup
+    for line in text.splitlines():
+        m = _LINE.match(line)
+        if m is None:
+            if line.startswith("import time:"):
+                continue  # header line
+            if line.strip():
+                target = later
+            continue
+        target.append((int(m.group(1)), int(m.group(2)), (len(m.group(3)) - 1) // 2, m.group(4)))
+    return startup, later
+
+
+def total_us(entries: List[Entry]) -> int:
+    """Import time of a batch: sum of the cumulative times of its top-level imports."""
+    return sum(cum for _self, cum, depth, _name in entries if depth == 0)
+
+
+def _scratch(root: Path, dest: Path) -> None:
+    for rel in (MANIFEST_PATH, HISTORY_PATH):
+        if (root / rel).exists():
+            (dest / rel).parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(root / rel, dest / rel)
+
+
+def run_once(module: str = DEFAULT_MODULE) -> Dict[str, Any]:
+    """One cold `python -X importtime -m module` run; returns timings and the modules it imported."""
+    root = Path(project_root())
+    with tempfile.TemporaryDirectory(prefix="will-startup-") as tmp:
+        cwd = Path(tmp)
+        _scratch(root, cwd)
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join([root.as_posix(), os.environ.get("PYTHONPATH", "")]),
+                   PYTHONUNBUFFERED="1")
+        env.pop("WILL_PROJECT_ROOT", None)  # measure a truly cold start
+        t0 = time.perf_counter()
+        proc = subprocess.run([sys.executable, "-X", "importtime", "-m", module], cwd=cwd, env=env,
+                              stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, encoding="utf-8")
+        wall = time.perf_counter() - t0
+    startup, later = parse_importtime(proc.stdout)
+    return {
+        "returncode": proc.returncode,
+        "wall_ms": round(wall * 1000, 2),
+        "startup_import_ms": round(total_us(startup) / 1000, 2),
+        "later_import_ms": round(total_us(later) / 1000, 2),
+        "startup": startup,
+        "later": later,
+    }
+
+
+def measure(module: str = DEFAULT_MODULE, *, runs: int = 5, top: int = 15) -> Dict[str, Any]:
+    """Median over `runs` cold starts plus the top modules (by self time) of the last run."""
+    results = [run_once(module) for _ in range(max(1, runs))]
+    last = results[-1]
+    startup_names = {name for _s, _c, _d, name in last["startup"]}
+    return {
+        "module": module,
+        "runs": len(results),
+        "returncodes": sorted({r["returncode"] for r in results}),
+        "startup_import_ms": statistics.median(r["startup_import_ms"] for r in results),
+        "later_import_ms": statistics.median(r["later_import_ms"] for r in results),
+        "wall_ms": statistics.median(r["wall_ms"] for r in results),
+        "startup_modules": len(startup_names),
+        "heavy_at_startup": sorted(startup_names.intersection(HEAVY_MODULES)),
+        "top_self_us": [
+            {"module": name, "self_us": s, "cumulative_us": c}
+            for s, c, _d, name in sorted(last["startup"], reverse=True)[:max(0, top)]
+        ],
+    }
+
+
+def run_cli() -> None:
+    ensure_phase()
+    src = Path(__file__).as_posix()
+
+    parser = argparse.ArgumentParser(description="Benchmark the cold start of a tool with -X importtime.")
+    parser.add_argument("-m", "--module", default=DEFAULT_MODULE, help="Entry point run as `python -m`.")
+    parser.add_argument("--runs", type=int, default=5, help="Cold starts to take the median of.")
+    parser.add_argument("--top", type=int, default=15, help="Most expensive startup modules to list.")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help="Fail (exit 1) when the median startup import time exceeds this.")
+    args = parser.parse_args()
+
+    report = measure(args.module, runs=args.runs, top=args.top)
+    report["budget_ms"] = args.budget_ms
+    report["within_budget"] = report["startup_import_ms"] <= args.budget_ms
+    print(json.dumps(report, indent=2))
+
+    summary = {k: report[k] for k in ("module", "runs", "startup_import_ms", "wall_ms", "heavy_at_startup",
+                                      "budget_ms", "within_budget")}
+    log_memory_event(
+        event_text="bench_startup report",
+        source=src,
+        tags=["tool", "bench", "startup"],
+        content=summary,
+        phase=REQUIRED_PHASE,
+    )
+    log_trace_event(
+        description="bench_startup report",
+        source=src,
+        tags=["tool", "bench", "startup"],
+        content=summary,
+        phase=REQUIRED_PHASE,
+    )
+    if not report["within_budget"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    run_cli()
@@ -11,6 +11,7 @@ from core.phase_control import ensure_phase, REQUIRED_PHASE
 from core.memory_interface import log_memory_event
 from core.trace_logger import log_trace_event
 from core.sqlite_bootstrap import DB_PATH, create_tables
+from core.connection_manager import read_connection
 
 REQUIRED_TABLES = (
     "memory_events",
@@ -43,11 +44,10 @@ def run_cli() -> None:
 
     create_tables()
     missing = []
-    with sqlite3.connect(DB_PATH.as_posix()) as conn:
-        names = set(_list_tables(conn))
-        for table in REQUIRED_TABLES:
-            if table not in names:
-                missing.append(table)
+    names = set(_list_tables(read_connection(DB_PATH)))
+    for table in REQUIRED_TABLES:
+        if table not in names:
+            missing.append(table)
 
     if missing:
         print(f"❌ Missing tables: {', '.join(missing)}")
@@ -0,0 +1,101 @@
+# tools/compliance_sweep.py
+# Combined static compliance sweep: every registered core.repo_scanner checker in one pass.
+# - Importing the checker tools registers their plugins (compliance_guard, phase_guard,
+#   memory_log_calls, utf8, fix_encoding); the tree is walked, read and parsed once for all of them
+# - Prints each checker's usual report, then the scan counters (walked/read/parsed files)
+# - --write lets the fix_encoding checker rewrite non-UTF-8 files (the utf8 report shows the state
+#   before the rewrite); --jobs spreads the files over worker processes
+# - --only limits the sweep to the named checkers
+
+from __future__ import annotations
+from boot.boot_path_initializer import inject_paths
+inject_paths()
+
+import argparse
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from core.phase_control import ensure_phase, REQUIRED_PHASE, get_current_phase
+from core.memory_interface import log_memory_event
+from core.trace_logger import log_trace_event
+from core.repo_scanner import Checker, registered, run
+
+# Tools whose checkers take part in the sweep (imported for their @register side effect)
+CHECKER_TOOLS = (
+    "tools.reflex_compliance_guard",
+    "tools.phase_guard_sweep",
+    "tools.tools_check_memory_log_calls",
+    "tools.tools_check_utf8_encoding",
+    "tools.fix_file_encoding",
+)
+
+
+def load_checkers(options: Dict[str, Dict[str, Any]], only: List[str]) -> List[Checker]:
+    """Instantiate the registered checkers (options: per-checker constructor kwargs)."""
+    import importlib
+
+    for mod in CHECKER_TOOLS:
+        importlib.import_module(mod)
+    available = registered()
+    unknown = [n for n in only if n not in available]
+    if unknown:
+        raise SystemExit(f"Unknown checker(s): {', '.join(unknown)} (available: {', '.join(sorted(available))})")
+    names = only or list(available)
+    return [available[n](**options.get(n, {})) for n in names]
+
+
+def run_cli() -> None:
+    ensure_phase()
+    src = Path(__file__).as_posix()
+
+    parser = argparse.ArgumentParser(description="Run all static compliance checkers in a single repository pass.")
+    parser.add_argument("--root", default=".")
+    parser.add_argument("--jobs", type=int, default=1, help="Worker processes for the scan")
+    parser.add_argument("--write", action="store_true", help="Let fix_encoding rewrite non-UTF-8 files")
+    parser.add_argument("--only", nargs="*", default=[], help="Checker names to run (default: all)")
+    args = parser.parse_args()
+
+    log_memory_event(
+        event_text="compliance_sweep start",
+        source=src,
+        tags=["tool", "start", "compliance_sweep"],
+        content={"root": args.root, "jobs": args.jobs, "write": args.write, "only": args.only},
+        phase=REQUIRED_PHASE,
+    )
+
+    checkers = load_checkers(
+        {
+            "compliance_guard": {"cur_phase": float(get_current_phase())},
+            "fix_encoding": {"write": args.write},
+        },
+        args.only,
+    )
+    t0 = time.perf_counter()
+    summaries, stats = run(Path(args.root), checkers, jobs=args.jobs)
+    elapsed = time.perf_counter() - t0
+
+    for checker in checkers:
+        print(f"== {checker.name}")
+        for line in checker.render(summaries[checker.name]):
+            print(line)
+    print(
+        f"Sweep: walked={stats['walked']} read={stats['read']} parsed={stats['parsed']} "
+        f"jobs={stats['jobs']} in {elapsed:.2f}s"
+    )
+
+    log_trace_event(
+        description="compliance_sweep done",
+        source=src,
+        tags=["tool", "done", "compliance_sweep"],
+        content={
+            "stats": stats,
+            "elapsed_s": round(elapsed, 3),
+            "scanned": {name: s.get("scanned", s.get("total")) for name, s in summaries.items()},
+        },
+        phase=REQUIRED_PHASE,
+    )
+
+
+if __name__ == "__main__":
+    run_cli()
@@ -0,0 +1,78 @@
+# tools/db_migrate.py
+# Applies/inspects the numbered schema migrations (core/migrations) on will_data.db.
+# - Path injection first, phase lock, dual logging
+# - --status lists applied/pending steps; --dry-run applies then rolls back; --verify checks the live schema
+# - The run logs to files only (log_db_sink.forced_mode("file")): the tool's own log entries never
+#   touch will_data.db, so --dry-run and --status leave the database exactly as they found it
+
+from boot.boot_path_initializer import inject_paths
+inject_paths()
+
+import argparse
+import json
+from pathlib import Path
+
+from core.phase_control import ensure_phase, REQUIRED_PHASE
+from core.sqlite_bootstrap import DB_PATH
+from core.connection_manager import get_connection
+from core.schema_migrator import MigrationError, applied_versions, migrate, migrations, verify_schema
+from core.memory_interface import log_memory_event
+from core.trace_logger import log_trace_event
+from core.log_buffer import batched
+from core.log_db_sink import forced_mode
+
+
+def run_cli() -> None:
+    ensure_phase()
+    src = Path(__file__).as_posix()
+
+    parser = argparse.ArgumentParser(description="Apply or inspect will_data.db schema migrations.")
+    parser.add_argument("--dry-run", action="store_true", help="Run pending migrations in a transaction, then roll back.")
+    parser.add_argument("--status", action="store_true", help="List applied and pending migrations only.")
+    parser.add_argument("--verify", action="store_true", help="Verify the live schema against every migration.")
+    args = parser.parse_args()
+
+    with forced_mode("file"), batched():
+        log_memory_event(
+            event_text="db_migrate start",
+            source=src,
+            tags=["tool", "start", "db_migrate"],
+            content={"db_path": DB_PATH.as_posix(), "dry_run": args.dry_run, "status": args.status, "verify": args.verify},
+            phase=REQUIRED_PHASE,
+        )
+
+        con = get_connection(DB_PATH)
+        report = {}
+        code = 0
+        if args.status:
+            done = set(applied_versions(con))
+            report["migrations"] = [
+                {"version": m.version, "name": m.name, "applied": m.version in done, "description": m.description}
+                for m in migrations()
+            ]
+        else:
+            try:
+                report.update(migrate(con, dry_run=args.dry_run))
+            except MigrationError as e:
+                report["error"] = str(e)
+                code = 2
+        if args.verify and code == 0:
+            report["problems"] = verify_schema(con)
+            code = 3 if report["problems"] else 0
+        report["ok"] = code == 0
+
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+
+        log_trace_event(
+            description="db_migrate done",
+            source=src,
+            tags=["tool", "done", "db_migrate"] + ([] if code == 0 else ["error"]),
+            content=report,
+            phase=REQUIRED_PHASE,
+        )
+    if code:
+        raise SystemExit(code)
+
+
+if __name__ == "__main__":
+    run_cli()
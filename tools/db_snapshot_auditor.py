@@ -4,7 +4,7 @@
 # - Phase lock respected
 # - Uses DB_PATH from core.sqlite_bootstrap (no hardcoded paths)
 # - Dual logging: log_memory_event + log_trace_event
-# - Tolerates legacy schemas (e.g., snapshot_index without run_dir)
+# - snapshot_index layout is fixed by core/migrations (ensure_tables() migrates legacy DBs first)
 
 from __future__ import annotations
 
@@ -28,7 +28,8 @@ except Exception:  # pragma: no cover
     def get_current_phase() -> Optional[float]:  # fallback
         return None
 
-from core.sqlite_bootstrap import DB_PATH  # single source of truth
+from core.sqlite_bootstrap import DB_PATH, ensure_tables  # single source of truth
+from core.connection_manager import read_connection
 
 # Dual logging
 try:
@@ -48,49 +49,35 @@ except Exception:  # pragma: no cover
 
 # ---- helpers ----
 
-def _open() -> sqlite3.Connection:
-    # DB_PATH is a PurePosixPath (or str); sqlite3 accepts str-like path
-    return sqlite3.connect(str(DB_PATH))
-
-def _has_table(cur: sqlite3.Cursor, name: str) -> bool:
-    cur.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (name,))
-    return bool(cur.fetchone())
+_SELECT_COLS = ("id", "ts", "run_id", "mode", "tables_changed", "status", "run_dir")
 
-def _cols(cur: sqlite3.Cursor, table: str) -> List[str]:
-    cur.execute("PRAGMA table_info(" + table + ")")
-    return [r[1] for r in cur.fetchall()]
+def _open() -> sqlite3.Connection:
+    ensure_tables()  # migrates legacy snapshot_index layouts; creates the DB if missing
+    return read_connection(DB_PATH)
 
-def _select_recent_snapshots(cur: sqlite3.Cursor, *, limit: int, run_id: Optional[str]) -> Tuple[List[Dict[str, Any]], bool]:
+def _select_recent_snapshots(cur: sqlite3.Cursor, *, limit: int, run_id: Optional[str]) -> List[Dict[str, Any]]:
     """
-    Returns (rows, has_run_dir_column)
-    Rows contain keys: id, ts, run_id, mode, tables_changed, (run_dir if present)
+    Rows contain keys: id, ts, run_id, mode, tables_changed, status, run_dir
     """
-    has_run_dir = False
-    columns = _cols(cur, "snapshot_index")
-    has_run_dir = "run_dir" in columns  # legacy builds
-    base_cols = ["id", "ts", "run_id", "mode", "tables_changed"]
-    select_cols = ", ".join([c for c in base_cols if c in columns])
-    if has_run_dir:
-        select_cols += ", run_dir"
-
     where = ""
     params: Tuple[Any, ...] = ()
     if run_id:
-        where = "WHERE run_id = ?"
+        where = "WHERE run_id = ?"  # idx_snapshot_index_run_id
         params = (run_id,)
 
-    cur.execute(f"SELECT {select_cols} FROM snapshot_index {where} ORDER BY id DESC LIMIT {int(limit)}", params)
-    rows = cur.fetchall()
-    # Map rows to dict with only the fields we actually selected
-    selected = select_cols.replace(" ", "").split(",")
+    cur.execute(
+        "SELECT id, created_at AS ts, run_id, mode, tables_changed, status, run_dir "
+        f"FROM snapshot_index {where} ORDER BY id DESC LIMIT {int(limit)}",
+        params,
+    )
     out: List[Dict[str, Any]] = []
-    for r in rows:
-        d = dict(zip(selected, r))
+    for r in cur.fetchall():
+        d = dict(zip(_SELECT_COLS, r))
         # normalize any path-like strings to posix
-        if "run_dir" in d and isinstance(d["run_dir"], str):
+        if isinstance(d["run_dir"], str):
             d["run_dir"] = PurePosixPath(d["run_dir"]).as_posix()
         out.append(d)
-    return out, has_run_dir
+    return out
 
 # ---- CLI ----
 
@@ -107,27 +94,14 @@ def run_cli() -> None:
                      event_type="tool_log", tags=["tool","snapshot","audit"], phase=get_current_phase())
     log_trace_event("db_snapshot_auditor start",
                     tags=["tool","snapshot","audit"],
-                    content={"run_id": args.run_id, "limit": args.limit, "phase": get_current_phase()})
-
-    with _open() as con:
-        cur = con.cursor()
-        if not _has_table(cur, "snapshot_index"):
-            # hard fail: required by phases >= 0.3
-            reason = "snapshot_index table missing"
-            log_memory_event(f"db_snapshot_auditor error — {reason}",
-                             event_type="error", tags=["tool","snapshot","audit"], phase=get_current_phase(),
-                             content={"reason": reason})
-            log_trace_event("db_snapshot_auditor error", tags=["tool","snapshot","audit"], content={"reason": reason})
-            print(json.dumps({"ok": False, "reason": reason}, indent=2))
-            sys.exit(2)
-
-        rows, has_run_dir = _select_recent_snapshots(cur, limit=args.limit, run_id=args.run_id)
+                    content={"run_filter": args.run_id, "limit": args.limit, "phase": get_current_phase()})
+
+    rows = _select_recent_snapshots(_open().cursor(), limit=args.limit, run_id=args.run_id)
 
     report = {
         "ok": True,
         "db": str(DB_PATH),
         "phase": get_current_phase(),
-        "has_run_dir_column": has_run_dir,
         "count": len(rows),
         "rows": rows,
     }
@@ -0,0 +1,47 @@
+# tools/export_memory_log.py
+# On-demand exporter: materializes the legacy JSON-array view of the memory log
+# (logs/will_memory_log.json by default) from the segmented store.
+# - Path injection first, phase lock, dual logging
+# - UTF-8 JSON; forward slashes
+
+from boot.boot_path_initializer import inject_paths
+inject_paths()
+
+import argparse
+from pathlib import Path
+
+from core.phase_control import ensure_phase, REQUIRED_PHASE
+from core.memory_interface import log_memory_event, export_memory_log, memory_log_location
+from core.trace_logger import log_trace_event
+
+
+def run_cli() -> None:
+    ensure_phase()
+    src = Path(__file__).as_posix()
+
+    parser = argparse.ArgumentParser(description="Export the memory log as a single JSON array.")
+    parser.add_argument("--out", default=None, help="Destination file (default: logs/will_memory_log.json).")
+    args = parser.parse_args()
+
+    log_memory_event(
+        event_text="export_memory_log start",
+        source=src,
+        tags=["tool", "start", "export_memory_log"],
+        content={"out": args.out, "store": memory_log_location().as_posix()},
+        phase=REQUIRED_PHASE,
+    )
+
+    dest = export_memory_log(Path(args.out.replace("\\", "/")) if args.out else None)
+    print(f"Memory log exported -> {dest.as_posix()}")
+
+    log_trace_event(
+        description="export_memory_log done",
+        source=src,
+        tags=["tool", "done", "export_memory_log"],
+        content={"out": dest.as_posix()},
+        phase=REQUIRED_PHASE,
+    )
+
+
+if __name__ == "__main__":
+    run_cli()
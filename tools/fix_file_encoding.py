@@ -6,14 +6,41 @@ inject_paths()
 
 import argparse
 from pathlib import Path
+from typing import Any, Dict, List, Tuple
 
 from core.phase_control import REQUIRED_PHASE, ensure_phase
 from core.memory_interface import log_memory_event
 from core.trace_logger import log_trace_event
+from core.repo_scanner import Checker, ScannedFile, register, run
 
+TEXT_SUFFIXES = (".py", ".md", ".json", ".yaml", ".yml", ".txt")
 
-def _is_text_file(p: Path) -> bool:
-    return p.suffix in {".py", ".md", ".json", ".yaml", ".yml", ".txt"}
+
+@register("fix_encoding")
+class FixEncodingChecker(Checker):
+    """Non-UTF-8 text files; with write=True they are rewritten as UTF-8 (undecodable bytes replaced)."""
+
+    def __init__(self, write: bool = False) -> None:
+        self.write = write
+
+    def wants(self, rel: str) -> bool:
+        return rel.endswith(TEXT_SUFFIXES)
+
+    def check(self, f: ScannedFile) -> bool:
+        """True if the file was rewritten."""
+        if f.utf8_ok or not self.write or f.raw is None:
+            return False
+        try:
+            f.path.write_text(f.raw.decode("utf-8", errors="replace"), encoding="utf-8")
+            return True
+        except Exception:
+            return False
+
+    def summarize(self, results: List[Tuple[str, Any]]) -> Dict[str, Any]:
+        return {"scanned": len(results), "fixed": [p for p, done in results if done], "write": self.write}
+
+    def render(self, summary: Dict[str, Any]) -> List[str]:
+        return [f"Scanned: {summary['scanned']} files; Fixed: {len(summary['fixed'])} files (write={summary['write']})"]
 
 
 def run_cli() -> None:
@@ -23,6 +50,7 @@ def run_cli() -> None:
     parser = argparse.ArgumentParser(description="Normalize file encodings to UTF-8.")
     parser.add_argument("--write", action="store_true", help="Actually rewrite files as UTF-8")
     parser.add_argument("--root", default=".", help="Root directory to scan")
+    parser.add_argument("--jobs", type=int, default=1, help="Worker processes for the scan")
     args = parser.parse_args()
 
     # Normalize incoming path arg
@@ -36,27 +64,10 @@ def run_cli() -> None:
         phase=REQUIRED_PHASE,
     )
 
-    scanned = 0
-    fixed = 0
-    for p in root.rglob("*"):
-        if not p.is_file():
-            continue
-        if not _is_text_file(p):
-            continue
-        scanned += 1
-        try:
-            p.read_text(encoding="utf-8")
-        except Exception:
-            if args.write:
-                raw = p.read_bytes()
-                try:
-                    txt = raw.decode("utf-8", errors="replace")
-                    p.write_text(txt, encoding="utf-8")
-                    fixed += 1
-                except Exception:
-                    pass
-
-    print(f"Scanned: {scanned} files; Fixed: {fixed} files (write={args.write})")
+    checker = FixEncodingChecker(write=args.write)
+    summaries, _ = run(root, [checker], jobs=args.jobs)
+    for line in checker.render(summaries[checker.name]):
+        print(line)
 
     log_trace_event(
         "fix_file_encoding done",
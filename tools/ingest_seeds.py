@@ -16,6 +16,7 @@ from typing import List, Dict, Any
 from core.phase_control import REQUIRED_PHASE, ensure_phase
 from core.memory_interface import log_memory_event
 from core.trace_logger import log_trace_event
+from core.log_buffer import batched
 
 SEEDS_DIR = Path("seeds")
 LOCK_FILE = Path("root/first_boot.lock")
@@ -42,24 +43,26 @@ def ingest_seeds(force: bool = False, dry_run: bool = False) -> Dict[str, Any]:
 
     seeds = _list_seed_files()
     ingested = 0
-    for p in seeds:
-        meta: Dict[str, Any] = {"path": p.as_posix(), "size": p.stat().st_size}
-        try:
-            raw = p.read_bytes()
-            meta["sha256"] = _sha256_of_bytes(raw)
-            # Keep logs compact; do not stuff whole file contents.
-        except Exception as e:
-            meta["error"] = f"read_failed: {e}"
-
-        if not dry_run:
-            log_memory_event(
-                event_text=f"seed ingested: {p.name}",
-                source=Path(__file__).as_posix(),
-                tags=["seed", "ingest"],
-                content=meta,
-                phase=REQUIRED_PHASE,
-            )
-        ingested += 1
+    # One batched write for the whole sweep instead of one file write per seed
+    with batched():
+        for p in seeds:
+            meta: Dict[str, Any] = {"path": p.as_posix(), "size": p.stat().st_size}
+            try:
+                raw = p.read_bytes()
+                meta["sha256"] = _sha256_of_bytes(raw)
+                # Keep logs compact; do not stuff whole file contents.
+            except Exception as e:
+                meta["error"] = f"read_failed: {e}"
+
+            if not dry_run:
+                log_memory_event(
+                    event_text=f"seed ingested: {p.name}",
+                    source=Path(__file__).as_posix(),
+                    tags=["seed", "ingest"],
+                    content=meta,
+                    phase=REQUIRED_PHASE,
+                )
+            ingested += 1
 
     if not dry_run:
         LOCK_FILE.parent.mkdir(parents=True, exist_ok=True)
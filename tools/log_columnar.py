@@ -0,0 +1,88 @@
+# tools/log_columnar.py
+# Compact sealed memory segments / rotated archives into columnar parts and print full-history group-by counts.
+# - Path injection first, phase lock, dual logging
+# - --compact writes parts for sealed inputs that have none yet (logs/columnar/, core.log_columnar)
+# - --by tag|source|event_type|phase counts over the whole history (parts + live files), optionally --since/--until
+
+from boot.boot_path_initializer import inject_paths
+inject_paths()
+
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from core.phase_control import ensure_phase, REQUIRED_PHASE
+from core import log_columnar
+from core.log_buffer import flush_all
+from core.memory_interface import log_memory_event, SEGMENT_DIR, memory_log_files
+from core.segment_store import SegmentStore
+from core.trace_logger import LOG_PATH as TRACE_FILE, log_trace_event
+
+
+def _logs(which: str) -> Dict[str, Dict[str, Any]]:
+    """key -> group_count/compact arguments for the selected logs."""
+    out: Dict[str, Dict[str, Any]] = {}
+    if which in ("memory", "all"):
+        files = memory_log_files()
+        segmented = any(p.parent == SEGMENT_DIR for p in files)
+        out[SEGMENT_DIR.as_posix()] = {
+            "live": files,
+            "sealed": SegmentStore(SEGMENT_DIR).sealed_entries() if segmented else [],
+            "base_dir": SEGMENT_DIR,
+        }
+    if which in ("trace", "all"):
+        out[TRACE_FILE.as_posix()] = {"live": [TRACE_FILE], "sealed": [], "base_dir": None}
+    return out
+
+
+def run_cli() -> None:
+    ensure_phase()
+    src = Path(__file__).as_posix()
+
+    parser = argparse.ArgumentParser(description="Columnar compaction and group-by counts over the log history.")
+    parser.add_argument("--log", choices=("memory", "trace", "all"), default="all")
+    parser.add_argument("--compact", action="store_true", help="Write parts for sealed inputs first.")
+    parser.add_argument("--by", choices=log_columnar.GROUP_BY, default="tag")
+    parser.add_argument("--since", default=None, help="ISO-8601 lower bound (inclusive).")
+    parser.add_argument("--until", default=None, help="ISO-8601 upper bound (inclusive).")
+    args = parser.parse_args()
+
+    log_memory_event(
+        event_text="log_columnar start",
+        source=src,
+        tags=["tool", "start", "log_columnar"],
+        content={"log": args.log, "compact": args.compact, "by": args.by},
+        phase=REQUIRED_PHASE,
+    )
+
+    flush_all()
+    report: Dict[str, Any] = {"by": args.by, "format": log_columnar.part_format(), "logs": {}}
+    for key, spec in _logs(args.log).items():
+        written: List[str] = []
+        if args.compact:
+            inputs = log_columnar.sources(key, spec["sealed"], base_dir=spec["base_dir"])
+            written = [p.as_posix() for p in log_columnar.compact(key, inputs)]
+        t0 = time.perf_counter()
+        counts = log_columnar.group_count(key, args.by, live=spec["live"], sealed=spec["sealed"],
+                                          base_dir=spec["base_dir"], since=args.since, until=args.until)
+        report["logs"][key] = {
+            "compacted": written,
+            "parts": len(log_columnar.parts(key)),
+            "elapsed_s": round(time.perf_counter() - t0, 6),
+            "counts": counts,
+        }
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+    log_trace_event(
+        description="log_columnar done",
+        source=src,
+        tags=["tool", "done", "log_columnar"],
+        content={k: {"parts": v["parts"], "groups": len(v["counts"])} for k, v in report["logs"].items()},
+        phase=REQUIRED_PHASE,
+    )
+
+
+if __name__ == "__main__":
+    run_cli()
@@ -0,0 +1,67 @@
+# tools/log_rotate.py
+# Rotate the trace/boot/memory logs into gzip archives and show the archive manifest.
+# - Path injection first, phase lock, dual logging
+# - Without --force the configured size/age policy applies (WILL_LOG_ROTATE_BYTES / WILL_LOG_ROTATE_AGE_S)
+
+from boot.boot_path_initializer import inject_paths
+inject_paths()
+
+import argparse
+import json
+from pathlib import Path
+
+from core.phase_control import ensure_phase, REQUIRED_PHASE
+from core import log_index, log_rotation
+from core.log_buffer import flush_all
+from core.memory_interface import log_memory_event, SEGMENT_DIR, LOG_PATH as MEMORY_FILE, memory_log_files
+from core.segment_store import SegmentStore
+from core.trace_logger import LOG_PATH as TRACE_FILE, log_trace_event
+
+BOOT_FILE = Path("logs/boot_trace_log.json")
+
+
+def run_cli() -> None:
+    ensure_phase()
+    src = Path(__file__).as_posix()
+
+    parser = argparse.ArgumentParser(description="Rotate logs into gzip archives (logs/archive/).")
+    parser.add_argument("--force", action="store_true", help="Rotate every non-empty log regardless of policy.")
+    parser.add_argument("--status", action="store_true", help="Only print the archive manifest.")
+    args = parser.parse_args()
+
+    log_memory_event(
+        event_text="log_rotate start",
+        source=src,
+        tags=["tool", "start", "log_rotate"],
+        content={"force": args.force, "status": args.status},
+        phase=REQUIRED_PHASE,
+    )
+
+    rotated = []
+    if not args.status:
+        flush_all()
+        limit = 1 if args.force else None
+        for path in (TRACE_FILE, BOOT_FILE, MEMORY_FILE):
+            entry = log_rotation.maybe_rotate(path, limit_bytes=limit)
+            if entry:
+                log_index.forget(path)
+                rotated.append(entry["path"])
+        if any(p.parent == SEGMENT_DIR for p in memory_log_files()):
+            for seg in log_rotation.archive_segments(SegmentStore(SEGMENT_DIR), limit_bytes=limit):
+                log_index.forget(seg)
+                rotated.append(seg.as_posix())
+
+    manifest = log_rotation.load_manifest()
+    print(json.dumps({"rotated": rotated, "archives": manifest["archives"]}, ensure_ascii=False, indent=2))
+
+    log_trace_event(
+        description="log_rotate done",
+        source=src,
+        tags=["tool", "done", "log_rotate"],
+        content={"rotated": rotated, "archives": len(manifest["archives"])},
+        phase=REQUIRED_PHASE,
+    )
+
+
+if __name__ == "__main__":
+    run_cli()
@@ -4,6 +4,11 @@
 # - Runs the official seal check chain (fail-closed on any issue)
 # - On success, bumps manifest current_phase -> 0.6 and appends build log entry
 # - Accepts current_phase 0.4 or 0.5 (typical before sealing 0.5)
+# - Steps run in this process (core.step_runner: own argv, captured output, exit codes), not one
+#   `python -m` subprocess each; --jobs N runs independent steps in N pre-forked worker processes
+# - Per-step wall time is printed and included in the done event
+# - Steps whose declared inputs are unchanged since the last green seal are answered from
+#   root/seal_cache.json instead of being run (--no-cache runs everything)
 # - IronRoot rules: path injection first, phase lock, dual logging, UTF-8 JSON, forward slashes
 
 from boot.boot_path_initializer import inject_paths
@@ -11,10 +16,9 @@ inject_paths()
 
 import argparse
 import json
-import subprocess
-import sys
+import time
 from pathlib import Path
-from typing import List, Tuple
+from typing import List
 
 # Phase lock imports (scanner looks for this exact form)
 from core.phase_control import ensure_phase, REQUIRED_PHASE
@@ -22,20 +26,45 @@ from core.phase_control import get_current_phase
 
 from core.memory_interface import log_memory_event
 from core.trace_logger import log_trace_event
+from core.seal_pipeline import CACHE_PATH, run_pipeline
+from core.step_runner import Step, first_failure
 
 MANIFEST_PATH = Path("configs/ironroot_manifest_data.json")
 BUILD_LOG_PATH = Path("configs/phase_build_log.md")
 
-
-def _run_cmd(module: str, args: List[str]) -> Tuple[int, str]:
-    cmd = [sys.executable, "-m", module] + args
-    proc = subprocess.run(cmd, capture_output=True, text=True)
-    brief = (proc.stdout or proc.stderr or "").strip()
-    return proc.returncode, brief[:3000]
+# Declarative seal pipeline (per spec): dependencies plus the inputs each check reads (core.seal_pipeline).
+# The two 0.5 tests run the snapshot wrapper (DB + log writes), so they are serialized, declare code
+# inputs only, and every reader of their output waits for them and declares the rows it reads
+# (the wrapper's lifecycle rows; other tools also tag their own records "snapshot").
+CODE_INPUTS = ("boot/*.py", "core/**/*.py", "configs/ironroot_manifest_data.json")
+WRAPPER_INPUTS = ("tools/trace_memory_snapshot.py", "tools/trace_memory_crosscheck.py", "reflexes/**/*.py")
+TEXT_INPUTS = tuple(f"**/*{ext}" for ext in (".py", ".md", ".json", ".yaml", ".yml", ".txt")) + (
+    "!.git/*", "!logs/*", "!.snapshots/*", "!root/*",
+)
+LIFECYCLE_ROWS = "message IN ('snapshot_wrapper start', 'snapshot_wrapper done')"
+
+SEAL_STEPS: List[Step] = [
+    Step("core.sqlite_bootstrap", entry="bootstrap", inputs=CODE_INPUTS, tables=("sqlite_master",)),
+    Step("tools.check_db_tables", after=("core.sqlite_bootstrap",),
+         inputs=CODE_INPUTS + ("tools/check_db_tables.py",), tables=("sqlite_master",)),
+    Step("tests.test_phase_0_5_trace_memory_integrity", after=("core.sqlite_bootstrap",),
+         inputs=CODE_INPUTS + WRAPPER_INPUTS + ("tests/test_phase_0_5_trace_memory_integrity.py",)),
+    Step("tests.test_phase_0_5_snapshot_diffs", after=("tests.test_phase_0_5_trace_memory_integrity",),
+         inputs=CODE_INPUTS + WRAPPER_INPUTS + ("tests/test_phase_0_5_snapshot_diffs.py",)),
+    Step("tools.tools_check_utf8_encoding", after=("tests.test_phase_0_5_snapshot_diffs",), inputs=TEXT_INPUTS),
+    Step("tools.trace_inspector", ("--tag", "snapshot"), after=("tests.test_phase_0_5_snapshot_diffs",),
+         inputs=CODE_INPUTS + ("tools/trace_inspector.py",), tables=(f"trace_events WHERE {LIFECYCLE_ROWS}",)),
+    Step("tools.trace_memory_crosscheck", after=("tests.test_phase_0_5_snapshot_diffs",),
+         inputs=CODE_INPUTS + ("tools/trace_memory_crosscheck.py",),
+         tables=(f"memory_events WHERE {LIFECYCLE_ROWS}", f"trace_events WHERE {LIFECYCLE_ROWS}")),
+    Step("tools.db_snapshot_auditor", after=("tests.test_phase_0_5_snapshot_diffs",),
+         inputs=CODE_INPUTS + ("tools/db_snapshot_auditor.py",), tables=("snapshot_index",)),
+    Step("tools.reflex_compliance_guard",
+         inputs=CODE_INPUTS + ("tools/**/*.py", "reflexes/**/*.py")),
+]
 
 
 def _now_iso() -> str:
-    import time
     return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
 
 
@@ -70,6 +99,8 @@ def run_cli() -> None:
 
     parser = argparse.ArgumentParser(description="Phase 0.5 Sealer", allow_abbrev=False)
     parser.add_argument("--dry-run", action="store_true", help="Run checks but do not write manifest/log.")
+    parser.add_argument("--jobs", type=int, default=1, help="Worker processes for independent steps (1 = in-process, in order).")
+    parser.add_argument("--no-cache", action="store_true", help=f"Run every step (ignore {CACHE_PATH.as_posix()}).")
     args = parser.parse_args()
 
     # Dual logging start
@@ -78,24 +109,16 @@ def run_cli() -> None:
     log_memory_event("phase_0_5_sealer start", source=src, tags=["tool", "seal", "phase"], content=payload, phase=REQUIRED_PHASE)
     log_trace_event("phase_0_5_sealer start", source=src, tags=["tool", "seal", "phase"], content=payload, phase=REQUIRED_PHASE)
 
-    # Ordered seal checks (per spec)
-    steps = [
-        ("core.sqlite_bootstrap", []),
-        ("tools.check_db_tables", []),
-        ("tests.test_phase_0_5_trace_memory_integrity", []),
-        ("tests.test_phase_0_5_snapshot_diffs", []),
-        ("tools.tools_check_utf8_encoding", []),
-        ("tools.trace_inspector", ["--tag", "snapshot"]),
-        ("tools.trace_memory_crosscheck", []),
-        ("tools.db_snapshot_auditor", []),
-        ("tools.reflex_compliance_guard", []),
-    ]
-
-    for mod, mod_args in steps:
-        code, brief = _run_cmd(mod, mod_args)
-        if code != 0:
-            reason = f"Seal step failed: py -m {mod} {' '.join(mod_args)} ⇒ exit={code}; out='{brief}'"
-            raise RuntimeError(f"IRONROOT VIOLATION — {reason}. Path/Artifact: tools/phase_0_5_sealer.py. Build cannot proceed.")
+    t0 = time.perf_counter()
+    run = run_pipeline(SEAL_STEPS, jobs=args.jobs, use_cache=not args.no_cache)
+    results = run["results"]
+    for r in results:
+        print(f"[sealer] {r['status']:<7} {r['elapsed_s']:>8.3f}s  {r['command']}")
+    print(f"[sealer] {len(results)} steps ({run['cached']} cached) in {time.perf_counter() - t0:.3f}s (jobs={args.jobs})")
+    failed = first_failure(results)
+    if failed is not None:
+        reason = f"Seal step failed: {failed['command']} ⇒ exit={failed['exit']}; out='{failed['output']}'"
+        raise RuntimeError(f"IRONROOT VIOLATION — {reason}. Path/Artifact: tools/phase_0_5_sealer.py. Build cannot proceed.")
 
     # All checks passed — update manifest + log
     if not args.dry_run:
@@ -123,7 +146,10 @@ def run_cli() -> None:
             _append_build_log(f"{_now_iso()} — Phase 0.5 complete — all seal checks green; manifest bumped {cur_str} → 0.6")
 
     # Dual logging done
-    done = {"ts": _now_iso(), "bumped_to": "0.6", "dry_run": bool(args.dry_run)}
+    done = {
+        "ts": _now_iso(), "bumped_to": "0.6", "dry_run": bool(args.dry_run), "jobs": args.jobs,
+        "steps": {r["step"]: r["elapsed_s"] for r in results}, "cached": run["cached"],
+    }
     log_memory_event("phase_0_5_sealer done", source=src, tags=["tool", "seal", "phase"], content=done, phase=REQUIRED_PHASE)
     log_trace_event("phase_0_5_sealer done", source=src, tags=["tool", "seal", "phase"], content=done, phase=REQUIRED_PHASE)
 
@@ -3,28 +3,42 @@ from boot.boot_path_initializer import inject_paths
 inject_paths()
 
 import argparse
-import ast
 from pathlib import Path
+from typing import Any, Dict, List, Tuple
 
 from core.phase_control import ensure_phase, REQUIRED_PHASE
 from core.memory_interface import log_memory_event
 from core.trace_logger import log_trace_event
+from core.repo_scanner import Checker, ScannedFile, register, run
 
 
-def _has_phase_enforcement(py_code: str) -> bool:
-    try:
-        tree = ast.parse(py_code)
-    except Exception:
-        return False
-    text = py_code
+def _has_phase_markers(text: str) -> bool:
     return ("from core.phase_control import" in text) and ("ensure_phase" in text or "REQUIRED_PHASE" in text)
 
 
+@register("phase_guard")
+class PhaseGuardChecker(Checker):
+    """.py files that do not parse or lack the phase_control import/markers."""
+
+    def check(self, f: ScannedFile) -> bool:
+        return f.tree is not None and _has_phase_markers(f.text)
+
+    def summarize(self, results: List[Tuple[str, Any]]) -> Dict[str, Any]:
+        return {"scanned": len(results), "missing": [p for p, ok in results if not ok]}
+
+    def render(self, summary: Dict[str, Any]) -> List[str]:
+        missing = summary["missing"]
+        return [f"Scanned: {summary['scanned']} files; Missing enforcement: {len(missing)}"] + [
+            f"  - {m}" for m in missing[:100]
+        ]
+
+
 def run_cli() -> None:
     ensure_phase()
     src = Path(__file__).as_posix()
     parser = argparse.ArgumentParser(description="Sweep repository for phase enforcement markers.")
     parser.add_argument("--root", default=".")
+    parser.add_argument("--jobs", type=int, default=1, help="Worker processes for the scan")
     args = parser.parse_args()
 
     log_memory_event(
@@ -35,25 +49,17 @@ def run_cli() -> None:
         phase=REQUIRED_PHASE,
     )
 
-    root = Path(args.root)
-    scanned, missing = 0, []
-    for p in root.rglob("*.py"):
-        if any(part in {"__pycache__", ".venv", "venv"} for part in p.parts):
-            continue
-        code = p.read_text(encoding="utf-8", errors="ignore")
-        scanned += 1
-        if not _has_phase_enforcement(code):
-            missing.append(p.as_posix())
-
-    print(f"Scanned: {scanned} files; Missing enforcement: {len(missing)}")
-    for m in missing[:100]:
-        print("  -", m)
+    checker = PhaseGuardChecker()
+    summaries, _ = run(Path(args.root), [checker], jobs=args.jobs)
+    summary = summaries[checker.name]
+    for line in checker.render(summary):
+        print(line)
 
     log_trace_event(
         description="phase_guard_sweep done",
         source=src,
         tags=["tool", "done", "phase_guard_sweep"],
-        content={"scanned": scanned, "missing": missing[:50]},
+        content={"scanned": summary["scanned"], "missing": summary["missing"][:50]},
         phase=REQUIRED_PHASE,
     )
 
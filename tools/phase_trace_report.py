@@ -4,47 +4,19 @@ from __future__ import annotations
 from boot.boot_path_initializer import inject_paths
 inject_paths()
 
-import json
 from pathlib import Path
-from typing import Any, List, Dict
 
 from core.phase_control import REQUIRED_PHASE, ensure_phase
-from core.memory_interface import log_memory_event
+from core.memory_interface import log_memory_event, memory_log_files, memory_log_location
 from core.trace_logger import log_trace_event
+from core.log_buffer import flush_all
+from core.log_index import count
+from core.log_rotation import archived_count
 
 
-MEM_FILE = Path("logs/will_memory_log.json")
 TRACE_FILE = Path("logs/reflex_trace_log.json")
 
 
-def _load_json_events(path: Path) -> List[Dict[str, Any]]:
-    if not path.exists():
-        return []
-    text = path.read_text(encoding="utf-8").strip()
-    if not text:
-        return []
-    try:
-        data = json.loads(text)
-        if isinstance(data, list):
-            return data
-        if isinstance(data, dict):
-            return [data]
-    except Exception:
-        out: List[Dict[str, Any]] = []
-        for line in text.splitlines():
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                obj = json.loads(line)
-                if isinstance(obj, dict):
-                    out.append(obj)
-            except Exception:
-                continue
-        return out
-    return []
-
-
 def run_cli() -> None:
     ensure_phase()
 
@@ -57,12 +29,15 @@ def run_cli() -> None:
         phase=REQUIRED_PHASE,
     )
 
-    mem = _load_json_events(MEM_FILE)
-    trc = _load_json_events(TRACE_FILE)
+    flush_all()  # include this process's pending records
+    mem_live = count(memory_log_files())  # answered from the sidecar index
+    trc_live = count(TRACE_FILE)
+    mem_archived = archived_count(memory_log_location().as_posix())  # manifest record counts
+    trc_archived = archived_count(TRACE_FILE.as_posix())
 
     print(f"Phase Trace Report @ REQUIRED_PHASE={REQUIRED_PHASE}")
-    print(f"- memory events: {len(mem)}")
-    print(f"- trace events : {len(trc)}")
+    print(f"- memory events: {mem_live + mem_archived} (live {mem_live}, archived {mem_archived})")
+    print(f"- trace events : {trc_live + trc_archived} (live {trc_live}, archived {trc_archived})")
 
     log_trace_event(
         "phase_trace_report done",
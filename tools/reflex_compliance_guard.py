@@ -4,6 +4,7 @@
 # - Verifies main guard for CLI-style modules
 # - Detects Phase 0.5+ future gates (e.g., get_current_phase() < 0.5 raising)
 #   and treats them as SKIPPED (expected) while running at Phase 0.4.
+# - Registered as the "compliance_guard" checker of core.repo_scanner (tools/compliance_sweep.py).
 #
 # Summary line includes: ok, skipped_future, issues.
 
@@ -15,11 +16,12 @@ import argparse
 import ast
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Tuple, Dict, Any
+from typing import List, Optional, Tuple, Dict, Any
 
 from core.phase_control import ensure_phase, REQUIRED_PHASE, get_current_phase
 from core.memory_interface import log_memory_event
 from core.trace_logger import log_trace_event
+from core.repo_scanner import Checker, ScannedFile, register, run
 
 
 @dataclass
@@ -35,13 +37,6 @@ class FileCheck:
 FUTURE_TOOL_HINTS = {"snapshot_db.py", "trace_memory_alignment.py"}
 
 
-def _read(path: Path) -> str:
-    try:
-        return path.read_text(encoding="utf-8", errors="ignore")
-    except Exception:
-        return ""
-
-
 def _is_cli_like(src: str) -> bool:
     # Heuristic: defines run_cli() or parses argparse
     return ("def run_cli" in src) or ("argparse" in src)
@@ -117,11 +112,8 @@ def _detect_future_gate_05(tree: ast.AST, src: str) -> bool:
     return True
 
 
-def _scan_file(p: Path) -> FileCheck:
-    src = _read(p)
-    try:
-        tree = ast.parse(src)
-    except Exception:
+def _scan_file(p: Path, src: str, tree: Optional[ast.AST]) -> FileCheck:
+    if tree is None:
         # Non-parseable file — treat as missing everything
         return FileCheck(
             path=p,
@@ -142,6 +134,62 @@ def _scan_file(p: Path) -> FileCheck:
     )
 
 
+@register("compliance_guard")
+class ComplianceGuardChecker(Checker):
+    """Phase enforcement and main guard of tools/ and reflexes/ modules."""
+
+    # Limit scope to the usual enforcement targets
+    BASES = ("tools/", "reflexes/")
+
+    def __init__(self, cur_phase: Optional[float] = None) -> None:
+        self.cur_phase = float(get_current_phase()) if cur_phase is None else float(cur_phase)
+
+    def wants(self, rel: str) -> bool:
+        return rel.endswith(".py") and rel.startswith(self.BASES)
+
+    def check(self, f: ScannedFile) -> FileCheck:
+        return _scan_file(f.path, f.text, f.tree)
+
+    def summarize(self, results: List[Tuple[str, Any]]) -> Dict[str, Any]:
+        cur_phase = self.cur_phase
+        issues: Dict[str, List[str]] = {}
+        ok_count = 0
+        skipped_future = 0
+
+        for _, r in results:
+            reasons: List[str] = []
+
+            # Future tools gated to 0.5 are allowed to "fail" at 0.4 — classify as skipped
+            if r.has_future_gate_05 and cur_phase < 0.5:
+                skipped_future += 1
+            else:
+                if not r.has_phase_import or not r.calls_ensure_phase:
+                    reasons.append("missing_phase_enforcement")
+                # Only require main guard for CLI-like modules
+                if r.is_cli_like and not r.has_main_guard:
+                    reasons.append("missing_main_guard")
+
+            if reasons:
+                issues[r.path.as_posix()] = reasons
+            else:
+                # Count as OK unless it's a skipped-future (already counted)
+                if not (r.has_future_gate_05 and cur_phase < 0.5):
+                    ok_count += 1
+
+        return {"total": len(results), "ok": ok_count, "skipped_future": skipped_future, "issues": issues}
+
+    def render(self, summary: Dict[str, Any]) -> List[str]:
+        issues = summary["issues"]
+        lines = [
+            f"Compliance scanned: {summary['total']} files; ok={summary['ok']}; "
+            f"skipped_future={summary['skipped_future']}; issues={len(issues)}"
+        ]
+        if issues:
+            lines.append("Non-compliant files (reason -> file):")
+            lines.extend(" - " + ", ".join(rs) + " -> " + fp for fp, rs in issues.items())
+        return lines
+
+
 def run_cli() -> None:
     ensure_phase()
     cur_phase = float(get_current_phase())
@@ -149,6 +197,7 @@ def run_cli() -> None:
 
     parser = argparse.ArgumentParser(description="Reflex/Tool compliance guard (AST-based).")
     parser.add_argument("--root", default=".")
+    parser.add_argument("--jobs", type=int, default=1, help="Worker processes for the scan")
     args = parser.parse_args()
 
     log_memory_event(
@@ -159,48 +208,14 @@ def run_cli() -> None:
         phase=REQUIRED_PHASE,
     )
 
-    root = Path(args.root)
-    candidates: List[Path] = []
-    # Limit scope to the usual enforcement targets
-    for base in ("tools", "reflexes"):
-        b = root / base
-        if b.exists():
-            candidates.extend(p for p in b.rglob("*.py") if "__pycache__" not in p.parts)
-
-    results: List[FileCheck] = [_scan_file(p) for p in sorted(candidates)]
-    issues: Dict[str, List[str]] = {}
-    ok_count = 0
-    skipped_future = 0
-
-    for r in results:
-        reasons: List[str] = []
-
-        # Future tools gated to 0.5 are allowed to "fail" at 0.4 — classify as skipped
-        if r.has_future_gate_05 and cur_phase < 0.5:
-            skipped_future += 1
-        else:
-            if not r.has_phase_import or not r.calls_ensure_phase:
-                reasons.append("missing_phase_enforcement")
-            # Only require main guard for CLI-like modules
-            if r.is_cli_like and not r.has_main_guard:
-                reasons.append("missing_main_guard")
-
-        if reasons:
-            issues[r.path.as_posix()] = reasons
-        else:
-            # Count as OK unless it's a skipped-future (already counted)
-            if not (r.has_future_gate_05 and cur_phase < 0.5):
-                ok_count += 1
-
-    total = len(results)
-    issue_count = len(issues)
+    checker = ComplianceGuardChecker(cur_phase)
+    summaries, _ = run(Path(args.root), [checker], jobs=args.jobs)
+    summary = summaries[checker.name]
+    issues: Dict[str, List[str]] = summary["issues"]
 
     # Console report
-    print(f"Compliance scanned: {total} files; ok={ok_count}; skipped_future={skipped_future}; issues={issue_count}")
-    if issue_count:
-        print("Non-compliant files (reason -> file):")
-        for fp, rs in issues.items():
-            print(" - " + ", ".join(rs) + " -> " + fp)
+    for line in checker.render(summary):
+        print(line)
 
     # Trace log summary (trim long lists)
     log_trace_event(
@@ -208,10 +223,10 @@ def run_cli() -> None:
         source=src_path,
         tags=["tool", "done", "compliance_guard"],
         content={
-            "total": total,
-            "ok": ok_count,
-            "skipped_future": skipped_future,
-            "issues": issue_count,
+            "total": summary["total"],
+            "ok": summary["ok"],
+            "skipped_future": summary["skipped_future"],
+            "issues": len(issues),
             "issue_examples": [{k: v} for k, v in list(issues.items())[:10]],
         },
         phase=REQUIRED_PHASE,
@@ -0,0 +1,63 @@
+# tools/run_reflexes_async.py
+# Fire several reflex/tool entry points concurrently on one event loop (core.async_runner).
+# - Path injection first, phase lock, dual logging
+# - Modules with `async def arun()` run on the loop; run_cli()/run() are offloaded to worker threads
+# - A -m value may carry the module's own arguments ("-m 'pkg.mod --flag x'"); run_cli() sees only those
+
+from boot.boot_path_initializer import inject_paths
+inject_paths()
+
+import argparse
+import json
+import shlex
+from pathlib import Path
+
+from core.phase_control import ensure_phase, REQUIRED_PHASE
+from core.async_runner import DEFAULT_CONCURRENCY, run
+from core.memory_interface import log_memory_event
+from core.trace_logger import log_trace_event
+
+
+def run_cli() -> None:
+    ensure_phase()
+    src = Path(__file__).as_posix()
+
+    parser = argparse.ArgumentParser(description="Run reflex modules concurrently on one asyncio loop.")
+    parser.add_argument("--module", "-m", action="append", required=True,
+                        help="Module to run, optionally with its arguments (repeatable), "
+                             "e.g. reflexes.reflex_core.reflex_trace_ping")
+    parser.add_argument("--repeat", type=int, default=1, help="Run each module this many times.")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Max targets in flight.")
+    args = parser.parse_args()
+
+    specs = [shlex.split(m) for m in args.module]
+    targets = [(spec[0], tuple(spec[1:])) for spec in specs if spec for _ in range(max(1, args.repeat))]
+    log_memory_event(
+        event_text="run_reflexes_async start",
+        source=src,
+        tags=["tool", "start", "async_runner"],
+        content={"targets": len(targets), "concurrency": args.concurrency},
+        phase=REQUIRED_PHASE,
+    )
+
+    results = run(targets, concurrency=args.concurrency)
+    summary = {
+        "ok": sum(1 for r in results if r["status"] == "ok"),
+        "error": [r for r in results if r["status"] != "ok"],
+        "elapsed_s": round(sum(r["elapsed_s"] for r in results), 6),
+    }
+    print(json.dumps(summary, ensure_ascii=False, indent=2, default=str))
+
+    log_trace_event(
+        description="run_reflexes_async done",
+        source=src,
+        tags=["tool", "done", "async_runner"],
+        content=summary,
+        phase=REQUIRED_PHASE,
+    )
+    if summary["error"]:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    run_cli()
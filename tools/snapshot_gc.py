@@ -0,0 +1,61 @@
+# tools/snapshot_gc.py
+# Retention + garbage collection for the snapshot blob store (.snapshots/blobs).
+# - Path injection first, phase lock, dual logging
+# - Keeps the newest --keep-last runs plus the newest --keep-per-phase runs of each phase;
+#   older runs are marked pruned in snapshot_index and unreferenced blobs are deleted
+
+from boot.boot_path_initializer import inject_paths
+inject_paths()
+
+import argparse
+import json
+from pathlib import Path
+
+from core.phase_control import ensure_phase, REQUIRED_PHASE
+from core.sqlite_bootstrap import DB_PATH, ensure_tables
+from core.connection_manager import get_connection
+from core.snapshot_store import gc
+from core.memory_interface import log_memory_event
+from core.trace_logger import log_trace_event
+
+
+def run_cli() -> None:
+    ensure_phase()
+    src = Path(__file__).as_posix()
+
+    parser = argparse.ArgumentParser(description="Apply snapshot retention and delete unreferenced blobs.")
+    parser.add_argument("--keep-last", type=int, default=20, help="Newest runs to keep overall.")
+    parser.add_argument("--keep-per-phase", type=int, default=3, help="Newest runs to keep per phase.")
+    parser.add_argument("--grace-seconds", type=float, default=3600.0, help="Never delete blobs younger than this.")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would be pruned/deleted.")
+    args = parser.parse_args()
+
+    log_memory_event(
+        event_text="snapshot_gc start",
+        source=src,
+        tags=["tool", "start", "snapshot_gc"],
+        content={"keep_last": args.keep_last, "keep_per_phase": args.keep_per_phase, "dry_run": args.dry_run},
+        phase=REQUIRED_PHASE,
+    )
+
+    ensure_tables()
+    report = gc(
+        get_connection(DB_PATH),
+        keep_last=args.keep_last,
+        keep_per_phase=args.keep_per_phase,
+        dry_run=args.dry_run,
+        grace_s=args.grace_seconds,
+    )
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+    log_trace_event(
+        description="snapshot_gc done",
+        source=src,
+        tags=["tool", "done", "snapshot_gc"],
+        content=report,
+        phase=REQUIRED_PHASE,
+    )
+
+
+if __name__ == "__main__":
+    run_cli()
@@ -7,7 +7,7 @@ inject_paths()
 from pathlib import Path
 
 from core.phase_control import REQUIRED_PHASE, ensure_phase
-from core.memory_interface import log_memory_event
+from core.memory_interface import log_memory_event, memory_log_location
 from core.trace_logger import log_trace_event
 
 
@@ -24,7 +24,7 @@ def run_cli() -> None:
     )
 
     required = [
-        Path("logs/will_memory_log.json"),
+        memory_log_location(),
         Path("logs/reflex_trace_log.json"),
         Path("core/phase_control.py"),
     ]
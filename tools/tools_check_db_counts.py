@@ -4,12 +4,12 @@ from __future__ import annotations
 from boot.boot_path_initializer import inject_paths
 inject_paths()
 
-import sqlite3
 from pathlib import Path
 
 from core.phase_control import REQUIRED_PHASE, ensure_phase
 from core.memory_interface import log_memory_event
 from core.trace_logger import log_trace_event
+from core.connection_manager import read_connection
 
 
 DB_PATH = Path("root/will_data.db")  # unified path per Phase 0.4 guidance
@@ -31,15 +31,14 @@ def run_cli() -> None:
         print(f"DB not found: {DB_PATH.as_posix()}")
         raise SystemExit(7)
 
-    with sqlite3.connect(DB_PATH.as_posix()) as conn:
-        cur = conn.cursor()
-        counts = {}
-        for table in ("memory_events", "trace_events", "boot_events"):
-            try:
-                cur.execute(f"SELECT COUNT(*) FROM {table}")
-                counts[table] = cur.fetchone()[0]
-            except Exception:
-                counts[table] = None
+    cur = read_connection(DB_PATH).cursor()
+    counts = {}
+    for table in ("memory_events", "trace_events", "boot_events"):
+        try:
+            cur.execute(f"SELECT COUNT(*) FROM {table}")
+            counts[table] = cur.fetchone()[0]
+        except Exception:
+            counts[table] = None
 
     print("DB counts:", counts)
 
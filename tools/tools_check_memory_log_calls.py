@@ -4,30 +4,50 @@ inject_paths()
 
 import argparse
 from pathlib import Path
-from typing import List, Tuple
+from typing import Any, Dict, List, Tuple
 
 from core.phase_control import ensure_phase, REQUIRED_PHASE
 from core.memory_interface import log_memory_event
 from core.trace_logger import log_trace_event
+from core.repo_scanner import Checker, ScannedFile, register, run
 
 
-def _scan_file(p: Path) -> Tuple[bool, bool]:
+def _scan_text(text: str) -> Tuple[bool, bool]:
     """
     Returns (has_memory_log_call, has_trace_log_call)
     """
-    try:
-        text = p.read_text(encoding="utf-8", errors="ignore")
-    except Exception:
-        return (False, False)
     return ("log_memory_event(" in text, "log_trace_event(" in text)
 
 
+@register("memory_log_calls")
+class MemoryLogCallsChecker(Checker):
+    """.py files without a log_memory_event(/log_trace_event( call."""
+
+    def check(self, f: ScannedFile) -> Tuple[bool, bool]:
+        return _scan_text(f.text)
+
+    def summarize(self, results: List[Tuple[str, Any]]) -> Dict[str, Any]:
+        return {
+            "scanned": len(results),
+            "missing_memory": [p for p, (mem, _) in results if not mem],
+            "missing_trace": [p for p, (_, trace) in results if not trace],
+        }
+
+    def render(self, summary: Dict[str, Any]) -> List[str]:
+        return [
+            f"Scanned {summary['scanned']} files",
+            f"Files missing log_memory_event: {len(summary['missing_memory'])}",
+            f"Files missing log_trace_event: {len(summary['missing_trace'])}",
+        ]
+
+
 def run_cli() -> None:
     ensure_phase()
     src = Path(__file__).as_posix()
 
     parser = argparse.ArgumentParser(description="Scan .py files for memory/trace logging calls.")
     parser.add_argument("--root", default=".")
+    parser.add_argument("--jobs", type=int, default=1, help="Worker processes for the scan")
     args = parser.parse_args()
 
     log_memory_event(
@@ -38,33 +58,20 @@ def run_cli() -> None:
         phase=REQUIRED_PHASE,
     )
 
-    root = Path(args.root)
-    scanned = 0
-    missing_mem: List[str] = []
-    missing_trace: List[str] = []
-
-    for p in root.rglob("*.py"):
-        if any(part in {"__pycache__", ".venv", "venv"} for part in p.parts):
-            continue
-        scanned += 1
-        has_mem, has_trace = _scan_file(p)
-        if not has_mem:
-            missing_mem.append(p.as_posix())
-        if not has_trace:
-            missing_trace.append(p.as_posix())
-
-    print(f"Scanned {scanned} files")
-    print(f"Files missing log_memory_event: {len(missing_mem)}")
-    print(f"Files missing log_trace_event: {len(missing_trace)}")
+    checker = MemoryLogCallsChecker()
+    summaries, _ = run(Path(args.root), [checker], jobs=args.jobs)
+    summary = summaries[checker.name]
+    for line in checker.render(summary):
+        print(line)
 
     log_trace_event(
         description="tools_check_memory_log_calls done",
         source=src,
         tags=["tool", "done", "scan_logs"],
         content={
-            "scanned": scanned,
-            "missing_memory": missing_mem[:50],
-            "missing_trace": missing_trace[:50],
+            "scanned": summary["scanned"],
+            "missing_memory": summary["missing_memory"][:50],
+            "missing_trace": summary["missing_trace"][:50],
         },
         phase=REQUIRED_PHASE,
     )
@@ -4,19 +4,37 @@ inject_paths()
 
 import argparse
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, List, Sequence, Tuple
 
 from core.phase_control import ensure_phase, REQUIRED_PHASE
 from core.memory_interface import log_memory_event
 from core.trace_logger import log_trace_event
+from core.repo_scanner import Checker, ScannedFile, register, run
 
+DEFAULT_EXTS = [".py", ".md", ".json", ".yaml", ".yml", ".txt"]
 
-def _is_utf8(p: Path) -> bool:
-    try:
-        _ = p.read_text(encoding="utf-8")
-        return True
-    except Exception:
-        return False
+
+@register("utf8")
+class Utf8Checker(Checker):
+    """Strict UTF-8 decode of the text files (suffix match is case-insensitive)."""
+
+    def __init__(self, exts: Sequence[str] = DEFAULT_EXTS) -> None:
+        self.exts = tuple(e.lower() for e in exts)
+
+    def wants(self, rel: str) -> bool:
+        return rel.lower().endswith(self.exts)
+
+    def check(self, f: ScannedFile) -> bool:
+        return f.utf8_ok
+
+    def summarize(self, results: List[Tuple[str, Any]]) -> Dict[str, Any]:
+        return {"scanned": len(results), "non_utf8": [p for p, ok in results if not ok]}
+
+    def render(self, summary: Dict[str, Any]) -> List[str]:
+        bad = summary["non_utf8"]
+        if not bad:
+            return [f"✅ UTF-8 check ok across {summary['scanned']} files"]
+        return [f"❌ Non-UTF8 files ({len(bad)}):"] + [f"  - {b}" for b in bad[:100]]
 
 
 def run_cli() -> None:
@@ -25,7 +43,8 @@ def run_cli() -> None:
 
     parser = argparse.ArgumentParser(description="Verify repository text files are UTF-8.")
     parser.add_argument("--root", default=".")
-    parser.add_argument("--exts", nargs="*", default=[".py", ".md", ".json", ".yaml", ".yml", ".txt"])
+    parser.add_argument("--exts", nargs="*", default=DEFAULT_EXTS)
+    parser.add_argument("--jobs", type=int, default=1, help="Worker processes for the scan")
     args = parser.parse_args()
 
     log_memory_event(
@@ -36,27 +55,17 @@ def run_cli() -> None:
         phase=REQUIRED_PHASE,
     )
 
-    root = Path(args.root)
-    scanned = 0
-    bad: List[str] = []
-    for p in root.rglob("*"):
-        if p.is_file() and p.suffix.lower() in {e.lower() for e in args.exts}:
-            scanned += 1
-            if not _is_utf8(p):
-                bad.append(p.as_posix())
-
-    if bad:
-        print(f"❌ Non-UTF8 files ({len(bad)}):")
-        for b in bad[:100]:
-            print("  -", b)
-    else:
-        print(f"✅ UTF-8 check ok across {scanned} files")
+    checker = Utf8Checker(args.exts)
+    summaries, _ = run(Path(args.root), [checker], jobs=args.jobs)
+    summary = summaries[checker.name]
+    for line in checker.render(summary):
+        print(line)
 
     log_trace_event(
         description="tools_check_utf8_encoding done",
         source=src,
         tags=["tool", "done", "utf8_check"],
-        content={"scanned": scanned, "non_utf8": bad[:50]},
+        content={"scanned": summary["scanned"], "non_utf8": summary["non_utf8"][:50]},
         phase=REQUIRED_PHASE,
     )
 
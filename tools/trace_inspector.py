@@ -5,52 +5,26 @@ from boot.boot_path_initializer import inject_paths
 inject_paths()
 
 import argparse
-import json
 from pathlib import Path
-from typing import List, Dict, Any
 
 from core.phase_control import REQUIRED_PHASE, ensure_phase
 from core.memory_interface import log_memory_event
 from core.trace_logger import log_trace_event
+from core.log_buffer import flush_all
+from core.log_index import query
 
 
 TRACE_FILE = Path("logs/reflex_trace_log.json")
 
 
-def _load_events(path: Path) -> List[Dict[str, Any]]:
-    if not path.exists():
-        return []
-    text = path.read_text(encoding="utf-8").strip()
-    if not text:
-        return []
-    try:
-        data = json.loads(text)
-        if isinstance(data, list):
-            return data
-        if isinstance(data, dict):
-            return [data]
-    except Exception:
-        events: List[Dict[str, Any]] = []
-        for line in text.splitlines():
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                obj = json.loads(line)
-                if isinstance(obj, dict):
-                    events.append(obj)
-            except Exception:
-                continue
-        return events
-    return []
-
-
 def run_cli() -> None:
     ensure_phase()
 
     parser = argparse.ArgumentParser(description="Inspect trace log by tag.")
     parser.add_argument("--tag", type=str, default=None, help="Filter events containing this tag")
     parser.add_argument("--limit", type=int, default=50, help="Max events to show")
+    parser.add_argument("--since", type=str, default=None, help="Only events at/after this ISO timestamp")
+    parser.add_argument("--until", type=str, default=None, help="Only events at/before this ISO timestamp")
     args = parser.parse_args()
 
     tool_name = Path(__file__).as_posix()
@@ -62,11 +36,9 @@ def run_cli() -> None:
         phase=REQUIRED_PHASE,
     )
 
-    events = _load_events(TRACE_FILE)
-    if args.tag:
-        events = [e for e in events if isinstance(e, dict) and args.tag in (e.get("tags") or [])]
-
-    out = events[-args.limit :] if args.limit and args.limit > 0 else events
+    flush_all()  # include this process's pending trace records
+    # tag/time filters go through the sidecar index; only matching lines are parsed
+    out = query(TRACE_FILE, tag=args.tag, since=args.since, until=args.until, limit=args.limit)
     for e in out:
         desc = e.get("description") or e.get("event") or "event"
         tags = e.get("tags") or []
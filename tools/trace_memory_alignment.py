@@ -1,12 +1,27 @@
+# tools/trace_memory_alignment.py
+# Align memory and trace events over the full log history (core.log_alignment).
+# - Path injection first, phase lock (Phase >= 0.5), dual logging
+# - Sort-merge join on (run_id, source, normalized event name) within --tolerance seconds
+# - Both tracks are streamed from archives + live NDJSON files and externally sorted (--chunk-size rows in memory)
+# - Misaligned pairs go to an NDJSON report (first --limit); statistics are printed as JSON
+
 from __future__ import annotations
 from boot.boot_path_initializer import inject_paths
 inject_paths()
 
 import argparse
+import json
 from pathlib import Path
+from typing import Any, Dict
+
 from core.phase_control import ensure_phase, get_current_phase, REQUIRED_PHASE
-from core.memory_interface import log_memory_event
-from core.trace_logger import log_trace_event
+from core import log_alignment, log_rotation, serializer
+from core.external_sort import DEFAULT_CHUNK_SIZE
+from core.log_buffer import flush_all
+from core.memory_interface import log_memory_event, memory_log_files, memory_log_location
+from core.trace_logger import LOG_PATH as TRACE_FILE, log_trace_event
+
+REPORT_PATH = Path("logs/alignment_report.ndjson")
 
 
 def run_cli() -> None:
@@ -19,23 +34,50 @@ def run_cli() -> None:
         raise RuntimeError("trace_memory_alignment requires Phase >= 0.5")
 
     parser = argparse.ArgumentParser(description="Align trace and memory events (Phase 0.5+).")
-    _ = parser.parse_args()
+    parser.add_argument("--tolerance", type=float, default=log_alignment.DEFAULT_TOLERANCE_S,
+                        help="Max timestamp skew (seconds) for two events to align.")
+    parser.add_argument("--run-id", default=None, help="Only events of this run_id.")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="Rows held in memory per external-sort run.")
+    parser.add_argument("--report", default=REPORT_PATH.as_posix(), help="NDJSON file for misaligned pairs.")
+    parser.add_argument("--limit", type=int, default=1000, help="Max misaligned pairs written to the report.")
+    args = parser.parse_args()
 
     log_memory_event(
         event_text="trace_memory_alignment start",
         source=src,
         tags=["tool", "start", "trace_memory_alignment"],
-        content="starting",
+        content={"tolerance_s": args.tolerance, "run_filter": args.run_id},
         phase=REQUIRED_PHASE,
     )
 
-    # (Real alignment logic will be added in 0.5)
+    flush_all()
+    report = Path(args.report)
+    report.parent.mkdir(parents=True, exist_ok=True)
+    written = 0
+    with report.open("wb") as out:
+        def on_misaligned(pair: Dict[str, Any]) -> None:
+            nonlocal written
+            if written < args.limit:
+                out.write(serializer.ndjson([pair]))
+                written += 1
+
+        stats = log_alignment.align(
+            log_rotation.iter_history(memory_log_location().as_posix(), memory_log_files()),
+            log_rotation.iter_history(TRACE_FILE.as_posix(), [TRACE_FILE]),
+            tolerance=args.tolerance,
+            run_id=args.run_id,
+            chunk_size=args.chunk_size,
+            on_misaligned=on_misaligned,
+        )
+    stats["report"] = {"path": report.as_posix(), "written": written}
+    print(json.dumps(stats, ensure_ascii=False, indent=2))
 
     log_trace_event(
         description="trace_memory_alignment done",
         source=src,
         tags=["tool", "done", "trace_memory_alignment"],
-        content="ok",
+        content={k: stats[k] for k in ("memory_events", "trace_events", "aligned", "misaligned", "aligned_rate")},
         phase=REQUIRED_PHASE,
     )
 
@@ -1,7 +1,7 @@
 # tools/trace_memory_snapshot.py
 # Snapshot wrapper for CLI/reflex test runs.
 # - Path injection first (IronRoot), no __future__ import in runnable scripts
-# - Phase lock, dual logging, run_id generation
+# - Phase lock, dual logging, run_id generation (bound via core.run_context while the target runs)
 # - Pre/Post snapshots, diffs, audit line, DB index
 # - UTF-8 JSON; forward slashes; DB path from core.sqlite_bootstrap
 
@@ -19,12 +19,17 @@ from core.phase_control import ensure_phase, REQUIRED_PHASE
 from core.sqlite_bootstrap import DB_PATH
 from core.memory_interface import log_memory_event
 from core.trace_logger import log_trace_event
+from core.run_context import run_scope
 from core.snapshot_manager import (
+    SNAPSHOT_MODES,
+    HASH_POOLS,
     take_snapshot,
     compare_snapshots,
     write_audit_line,
     index_snapshot,
+    store_snapshot_blobs,
 )
+from core.snapshot_store import COMPRESSIONS
 
 def _new_run_id() -> str:
     return str(uuid.uuid4())
@@ -57,9 +62,37 @@ def run_cli() -> None:
     )
     parser.add_argument(
         "--snapshot-mode",
-        choices=["off", "light", "heavy"],
+        choices=list(SNAPSHOT_MODES),
         default="heavy",
-        help="Snapshot strategy; heavy recommended for tests.",
+        help="Snapshot strategy; heavy recommended for tests, incremental for large DBs (no DB copies).",
+    )
+    parser.add_argument(
+        "--row-diff",
+        action="store_true",
+        help="Also write per-row diff records to <run_dir>/diff/rows.ndjson (heavy/light modes).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Checksum tables concurrently on N read-only connections (heavy mode; 1 = serial).",
+    )
+    parser.add_argument(
+        "--hash-pool",
+        choices=list(HASH_POOLS),
+        default="thread",
+        help="Pool used when --workers > 1.",
+    )
+    parser.add_argument(
+        "--compression",
+        choices=list(COMPRESSIONS),
+        default=None,
+        help="Compression for stored snapshot blobs (default: WILL_SNAPSHOT_COMPRESSION or none).",
+    )
+    parser.add_argument(
+        "--keep-copies",
+        action="store_true",
+        help="Leave will_data.db copies in the run dir instead of moving them into .snapshots/blobs.",
     )
     args = parser.parse_args()
 
@@ -77,12 +110,13 @@ def run_cli() -> None:
     # Pre snapshot (if enabled)
     pre_meta = None
     if mode != "off":
-        pre_meta = take_snapshot(label="pre", run_id=run_id, mode=mode)
+        pre_meta = take_snapshot(label="pre", run_id=run_id, mode=mode, workers=args.workers, pool=args.hash_pool)
 
     # Start logs (dual)
     log_memory_event(
         event_text="snapshot_wrapper start",
         source=tool,
+        run_id=run_id,
         tags=["tool", "snapshot", "start"],
         content={"run_id": run_id, "mode": mode, "db": Path(DB_PATH).as_posix(), "module": args.module},
         phase=REQUIRED_PHASE,
@@ -90,6 +124,7 @@ def run_cli() -> None:
     log_trace_event(
         description="snapshot_wrapper start",
         source=tool,
+        run_id=run_id,
         tags=["tool", "snapshot", "start"],
         content={"run_id": run_id, "mode": mode},
         phase=REQUIRED_PHASE,
@@ -102,7 +137,8 @@ def run_cli() -> None:
     try:
         target = _resolve_callable(args.module)
         if target is not None:
-            result = target(**target_args) if target_args else target()
+            with run_scope(run_id):  # the target's own events carry this run_id too
+                result = target(**target_args) if target_args else target()
     except BaseException as e:
         status = "error"
         error = e
@@ -111,8 +147,10 @@ def run_cli() -> None:
     post_meta = None
     diff_summary = None
     if mode != "off":
-        post_meta = take_snapshot(label="post", run_id=run_id, mode=mode)
-        diff_summary = compare_snapshots(pre_meta, post_meta) if pre_meta else None
+        post_meta = take_snapshot(label="post", run_id=run_id, mode=mode, workers=args.workers, pool=args.hash_pool)
+        diff_summary = compare_snapshots(pre_meta, post_meta, row_diff=args.row_diff) if pre_meta else None
+        if not args.keep_copies:
+            store_snapshot_blobs(pre_meta, post_meta, compression=args.compression)
 
     # Audit line + index
     run_dir = Path(pre_meta["run_dir"] if pre_meta else Path(".").as_posix())
@@ -124,14 +162,25 @@ def run_cli() -> None:
         "status": status,
         "diff": diff_summary or {},
     })
-    pre_cs = (pre_meta or {}).get("db_checksum")
-    post_cs = (post_meta or {}).get("db_checksum")
-    index_snapshot(run_id=run_id, run_dir=run_dir, pre_checksum=pre_cs, post_checksum=post_cs, status=status)
+    pre_cs = (pre_meta or {}).get("db_checksum") or (pre_meta or {}).get("state_root")
+    post_cs = (post_meta or {}).get("db_checksum") or (post_meta or {}).get("state_root")
+    index_snapshot(
+        run_id=run_id,
+        run_dir=run_dir,
+        pre_checksum=pre_cs,
+        post_checksum=post_cs,
+        status=status,
+        mode=mode,
+        tables_changed=len((diff_summary or {}).get("tables_changed", [])),
+        pre_blob=((pre_meta or {}).get("blob") or {}).get("hash"),
+        post_blob=((post_meta or {}).get("blob") or {}).get("hash"),
+    )
 
     # End logs (dual)
     log_memory_event(
         event_text="snapshot_wrapper done",
         source=tool,
+        run_id=run_id,
         tags=["tool", "snapshot", "done"],
         content={"run_id": run_id, "status": status, "diff": diff_summary},
         phase=REQUIRED_PHASE,
@@ -139,6 +188,7 @@ def run_cli() -> None:
     log_trace_event(
         description="snapshot_wrapper done",
         source=tool,
+        run_id=run_id,
         tags=["tool", "snapshot", "done"],
         content={"run_id": run_id, "status": status},
         phase=REQUIRED_PHASE,
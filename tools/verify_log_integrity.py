@@ -4,40 +4,19 @@ from __future__ import annotations
 from boot.boot_path_initializer import inject_paths
 inject_paths()
 
-import json
 from pathlib import Path
 
 from core.phase_control import REQUIRED_PHASE, ensure_phase
-from core.memory_interface import log_memory_event
+from core.memory_interface import log_memory_event, memory_log_files
 from core.trace_logger import log_trace_event
+from core.log_buffer import flush_all
+from core.log_reader import is_valid
 
 
-MEM_FILE = Path("logs/will_memory_log.json")
 TRACE_FILE = Path("logs/reflex_trace_log.json")
 BOOT_FILE = Path("logs/boot_trace_log.json")
 
 
-def _valid_json(path: Path) -> bool:
-    if not path.exists():
-        return False
-    text = path.read_text(encoding="utf-8", errors="strict").strip()
-    if not text:
-        return True
-    try:
-        json.loads(text)
-        return True
-    except Exception:
-        try:
-            for line in text.splitlines():
-                line = line.strip()
-                if not line:
-                    continue
-                json.loads(line)
-            return True
-        except Exception:
-            return False
-
-
 def run_cli() -> None:
     ensure_phase()
     tool_name = Path(__file__).as_posix()
@@ -50,7 +29,9 @@ def run_cli() -> None:
         phase=REQUIRED_PHASE,
     )
 
-    ok = all(_valid_json(p) for p in (MEM_FILE, TRACE_FILE, BOOT_FILE))
+    flush_all()  # validate what this process has written too
+    mem_files = memory_log_files()
+    ok = bool(mem_files) and all(is_valid(p) for p in (*mem_files, TRACE_FILE, BOOT_FILE))
     print(f"Log integrity: {'OK' if ok else 'FAILED'}")
 
     log_trace_event(